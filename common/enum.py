@@ -4,6 +4,7 @@ from enum import Enum
 class HTTP_METHOD(Enum):
     GET = "GET"
     POST = "POST"
+    PATCH = "PATCH"
 
 
 class ChangeItemScenario(str, Enum):
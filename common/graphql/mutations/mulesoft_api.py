@@ -1,6 +1,7 @@
 import graphene
 from django.db import transaction
 
+from common.helpers import queue_mulesoft_retry
 from common.models import MulesoftLog
 from saleor.graphql.core.mutations import ModelMutation
 from saleor.graphql.core.types import ModelObjectType
@@ -42,5 +43,7 @@ class MulesoftAPILogCreate(ModelMutation):
     def perform_mutation(cls, root, info, **kw):
         with transaction.atomic():
             data = kw.get("input")
-            MulesoftLog.objects.create(**data)
+            log = MulesoftLog.objects.create(**data)
+            if log.retry:
+                queue_mulesoft_retry(log)
         return MulesoftAPILogCreate(success=True)
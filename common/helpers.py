@@ -20,7 +20,7 @@ from scg_checkout.graphql.enums import (
 )
 
 from .enum import ChangeItemScenario
-from .models import MulesoftLog, PluginConfig
+from .models import MulesoftLog, MulesoftRetry, MulesoftRetryStatus, PluginConfig
 from .product_group import ProductGroup
 
 
@@ -364,12 +364,32 @@ def save_mulesoft_api_log_entry(filter_values, params):
             return log, JsonResponse({"error": "Error log mulesoft api (not found)"})
         [setattr(log, k, v) for k, v in params.items() if k != "filter"]
         log.save()
+        if params.get("retry"):
+            queue_mulesoft_retry(log)
     else:
         # create log
         log = MulesoftLog.objects.create(**params)
+        if log.retry:
+            queue_mulesoft_retry(log)
     return log, None
 
 
+def queue_mulesoft_retry(log):
+    """Queue a Mulesoft api log for the R5 retry job, once until it is retried"""
+    is_queued = MulesoftRetry.objects.filter(
+        mulesoft_log=log,
+        status__in=[MulesoftRetryStatus.PENDING, MulesoftRetryStatus.RUNNING],
+    ).exists()
+    if is_queued:
+        return
+    MulesoftRetry.objects.create(
+        mulesoft_log=log,
+        url=log.url or "",
+        orderid=log.orderid,
+        attempts=log.retry_count,
+    )
+
+
 def format_sap_decimal_values_for_pdf(value):
     """format_sap_decimal_values_for_pdf : if the netWeightTon is < 0 or None from sap  pdf will show Blank
     otherwise showing in 3 decimal point"""
@@ -0,0 +1,100 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def queue_pending_retries(apps, schema_editor):
+    MulesoftLog = apps.get_model("common", "MulesoftLog")
+    MulesoftRetry = apps.get_model("common", "MulesoftRetry")
+    logs = (
+        MulesoftLog.objects.filter(retry=True, retry_count__lte=settings.RETRY_COUNT)
+        .order_by("updated_at")
+        .values_list("id", "url", "orderid", "retry_count")
+    )
+    retries = [
+        MulesoftRetry(
+            mulesoft_log_id=log_id,
+            url=url or "",
+            orderid=orderid,
+            attempts=retry_count,
+        )
+        for log_id, url, orderid, retry_count in logs.iterator()
+    ]
+    MulesoftRetry.objects.bulk_create(retries, batch_size=BACKFILL_BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0008_rename_on_hold_pmtmaterialmaster_is_hold"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MulesoftRetry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("url", models.CharField(max_length=255)),
+                ("orderid", models.IntegerField(blank=True, null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.IntegerField(default=0)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "last_error",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "mulesoft_log",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="common.mulesoftlog",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "mulesoft_api_retries",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="mulesoftretry",
+            index=models.Index(
+                fields=["status", "next_attempt_at"],
+                name="mulesoft_retry_status_next_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mulesoftretry",
+            index=models.Index(fields=["orderid"], name="mulesoft_retry_orderid_idx"),
+        ),
+        migrations.RunPython(queue_pending_retries, migrations.RunPython.noop),
+    ]
@@ -33,6 +33,57 @@ class MulesoftLog(models.Model):
         db_table = "mulesoft_api_logs"
 
 
+class MulesoftRetryStatus:
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+
+class MulesoftRetry(models.Model):
+    """
+    Queue of Mulesoft api calls to retry (R5), the request body stays in mulesoft_api_logs.
+    A running retry is leased until next_attempt_at, after that it can be claimed again.
+    """
+
+    # no db constraint, old logs are cleaned up independently of the queue
+    mulesoft_log = models.ForeignKey(
+        MulesoftLog,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    url = models.CharField(max_length=255)
+    orderid = models.IntegerField(blank=True, null=True)
+    status = models.CharField(
+        max_length=10,
+        choices=MulesoftRetryStatus.CHOICES,
+        default=MulesoftRetryStatus.PENDING,
+    )
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.CharField(max_length=255, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "mulesoft_api_retries"
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="mulesoft_retry_status_next_idx",
+            ),
+            models.Index(fields=["orderid"], name="mulesoft_retry_orderid_idx"),
+        ]
+
+
 class PmtMaterialMaster(models.Model):
     material_code = models.CharField(max_length=50, unique=True)
     is_hold = models.BooleanField(default=False)
@@ -2,25 +2,29 @@ import json
 import logging
 import time
 import uuid
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Union
 
-import requests
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
 from django.utils import timezone
 
-from common.enum import MulesoftServiceType
-from saleor.plugins.manager import get_plugins_manager
+from common.enum import HTTP_METHOD, MulesoftServiceType
+from saleor.plugins.manager import get_cached_plugins_manager
 from scg_checkout.graphql.enums import ContractCheckoutErrorCode
 from scgp_export.graphql.enums import IPlanEndPoint, SapEnpoint
 from scgp_po_upload.graphql.enums import BeingProcessConstants
 
 from .models import MulesoftLog
+from .mulesoft_client import MulesoftSessionPool
 from .util.middleware.scgp_threadlocal_middleware import (
     THREAD_LOCAL_KEY_M,
     THREAD_LOCAL_KEY_METRIC,
     add_to_thread_local,
+    clear_thread_local,
+    get_active_thread_local,
 )
 
 METRIC_NAME = "Custom/MulesoftAPI"
@@ -79,47 +83,77 @@ class MulesoftApiError(Exception):
     pass
 
 
+def _run_batch_call(call: Callable[[], Any]):
+    """Run one call of a batch on a worker thread
+
+    Mulesoft logs and metrics are collected in thread local storage, so they are
+    taken from the worker and handed back to be merged into the caller thread.
+    """
+    clear_thread_local()
+    try:
+        try:
+            result, error = call(), None
+        except Exception as e:
+            result, error = None, e
+        logs = get_active_thread_local(THREAD_LOCAL_KEY_M) or []
+        metrics = get_active_thread_local(THREAD_LOCAL_KEY_METRIC) or []
+        return result, error, logs, metrics
+    finally:
+        clear_thread_local()
+        # worker threads open their own db connection (e.g. plugin config)
+        connections.close_all()
+
+
 class MulesoftApiRequest:
-    _instance = None
-    _url: str
-    _client_id: str
-    _client_secret: str
-    _service_type: Union[str, None] = None  # sap or iplan
-    _log_options: dict = {}
+    _url: Union[str, None] = None
+    _client_id: Union[str, None] = None
+    _client_secret: Union[str, None] = None
+    _avail_model_fields: list = []
     _map_endpoints: dict = {}
 
+    def __init__(self, service_type=None, **kwargs) -> None:
+        # per call context, never shared between concurrent calls
+        self._service_type: Union[str, None] = service_type  # sap or iplan
+        self._log_options: dict = {
+            "feature": kwargs.get("feature"),
+            "order_number": kwargs.get("order_number"),
+            "orderid": kwargs.get("orderid"),
+            "created_at": timezone.now(),
+            "contract_no": kwargs.get("contract_no"),
+        }
+
     @classmethod
     def instance(cls, service_type=None, **kwargs):
-        """Create a single instance of config for calling Mulesoft api
+        """Create a new request context for calling Mulesoft api
 
-        Raises:
-            Exception: Config not found in DB
+        Connection config is loaded once per process and HTTP connections are
+        reused through MulesoftSessionPool, only the service type and log options
+        belong to the returned object.
 
         Returns:
             _type_: MulesoftApiRequest
         """
-        if cls._instance is None:
-            cls._instance = cls.__new__(cls)
-            cls._url: str = settings.MULESOFT_API_URL
-            cls._client_id: str = settings.MULESOFT_CLIENT_ID
-            cls._client_secret: str = settings.MULESOFT_CLIENT_SECRET
-            cls._avail_model_fields = [f.name for f in MulesoftLog._meta.get_fields()]
-        cls._service_type = service_type
-        cls._log_options = {
-            "feature": kwargs.get("feature"),
-            "order_number": kwargs.get("order_number"),
-            "orderid": kwargs.get("orderid"),
-            "created_at": timezone.now(),
-            "contract_no": kwargs.get("contract_no"),
-        }
-        return cls._instance
+        cls._load_config()
+        _instance = cls.__new__(cls)
+        MulesoftApiRequest.__init__(_instance, service_type, **kwargs)
+        return _instance
+
+    @classmethod
+    def _load_config(cls) -> None:
+        if MulesoftApiRequest._url is not None:
+            return
+        MulesoftApiRequest._client_id = settings.MULESOFT_CLIENT_ID
+        MulesoftApiRequest._client_secret = settings.MULESOFT_CLIENT_SECRET
+        MulesoftApiRequest._avail_model_fields = [
+            f.name for f in MulesoftLog._meta.get_fields()
+        ]
+        MulesoftApiRequest._url = settings.MULESOFT_API_URL
 
     @classmethod
     def get_endpoint_name(cls, url):
-        if not cls._url:
-            cls._url = settings.MULESOFT_API_URL  # XXX: fix this
+        cls._load_config()
         if not cls._map_endpoints:
-            cls._map_endpoints = dict(
+            MulesoftApiRequest._map_endpoints = dict(
                 [(cls._url + v, k) for k, v in MULESOFT_ENDPOINTS]
             )
         name = cls._map_endpoints.get(url, None)
@@ -138,9 +172,8 @@ class MulesoftApiRequest:
             "clientSecret": cls._client_secret,
         }
 
-    @classmethod
     def _log_request(
-        cls,
+        self,
         url: str = "",
         request="",
         response=None,
@@ -152,15 +185,15 @@ class MulesoftApiRequest:
             f"MulesoftApiRequest._log_request {url} [{response_time_ms} ms] exception: {exception}"
         )
         # prevent for transaction rollback
-        manager = get_plugins_manager()
+        manager = get_cached_plugins_manager()
         _plugin = manager.get_plugin("scg.settings")
         config = _plugin.config
         if not config.enable_mulesoft_log:
             return
         log_opts = {
             k: v
-            for k, v in cls._log_options.items()
-            if v is not None and k in cls._avail_model_fields
+            for k, v in self._log_options.items()
+            if v is not None and k in self._avail_model_fields
         }
         data = {
             "url": url,
@@ -180,16 +213,18 @@ class MulesoftApiRequest:
             "timestamp": ts,
             "attributes": {
                 "orderId": data.get("orderid"),
-                "mulesoftapi.name": cls.get_endpoint_name(url),
+                "mulesoftapi.name": self.get_endpoint_name(url),
                 "mulesoftapi.created_at": created_at.strftime(
                     settings.NEW_RELIC_DATETIME_FORMAT
                 ),
             },
         }
         add_to_thread_local(THREAD_LOCAL_KEY_METRIC, metric_val)
-        metric_function_name = MAP_METRIC_FUNCTION_NAMES.get(cls.get_endpoint_name(url))
+        metric_function_name = MAP_METRIC_FUNCTION_NAMES.get(
+            self.get_endpoint_name(url)
+        )
         if metric_function_name:
-            contract_no = cls._log_options.get("contract_no")
+            contract_no = self._log_options.get("contract_no")
             # add metric name later if needed
             metric_function_val = {
                 "type": "gauge",
@@ -203,7 +238,7 @@ class MulesoftApiRequest:
             if contract_no:
                 metric_function_val["attributes"]["contract_no"] = contract_no
             add_to_thread_local(THREAD_LOCAL_KEY_METRIC, metric_function_val)
-        if not cls._should_log(url):
+        if not self._should_log(url):
             return
         try:
             data = json.dumps(data, cls=DjangoJSONEncoder)
@@ -217,7 +252,7 @@ class MulesoftApiRequest:
             f"MulesoftApiRequest.log_request_update filter => {filter} / update value => {values}"
         )
         try:
-            manager = get_plugins_manager()
+            manager = get_cached_plugins_manager()
             _plugin = manager.get_plugin("scg.settings")
             config = _plugin.config
             if not config.enable_mulesoft_log:
@@ -244,22 +279,21 @@ class MulesoftApiRequest:
             data = {"piMessageId": str(uuid.uuid1().int), **data}
         return url, headers, data
 
-    @classmethod
-    def _check_error_and_raise(cls, url, response, data):
-        if cls._service_type == MulesoftServiceType.CP.value:
-            return cls._check_error_and_raise_for_cp(url, data, response)
-        if cls._service_type == MulesoftServiceType.OTS.value:
-            return cls._check_error_and_raise_for_ots(url, data, response)
+    def _check_error_and_raise(self, url, response, data):
+        if self._service_type == MulesoftServiceType.CP.value:
+            return self._check_error_and_raise_for_cp(url, data, response)
+        if self._service_type == MulesoftServiceType.OTS.value:
+            return self._check_error_and_raise_for_ots(url, data, response)
         # improve this
-        if cls._service_type == MulesoftServiceType.PMT.value:
-            return cls._check_error_and_raise_for_pmt(url, data, response)
-        if cls._service_type in [
+        if self._service_type == MulesoftServiceType.PMT.value:
+            return self._check_error_and_raise_for_pmt(url, data, response)
+        if self._service_type in [
             MulesoftServiceType.SAP.value,
             MulesoftServiceType.IPLAN.value,
         ]:
             # support for sap and iplan (the plugin version)
-            return cls._check_error_and_raise_base(
-                url, data, response, cls._service_type
+            return self._check_error_and_raise_base(
+                url, data, response, self._service_type
             )
         err = response.get("error", None)
         message = response.get("message", None)
@@ -415,27 +449,21 @@ class MulesoftApiRequest:
     def _should_log(cls, url: str):
         return url in [cls._url + path for path in LOG_ENDPOINT]
 
-    @classmethod
-    def request_mulesoft_get(cls, uri: str, params):
-        url, headers, params = cls._build_request_data(uri, params)
+    def _send(self, method: str, url: str, log_val: dict, log_request=True, **kwargs):
+        """Send request through the pooled session of the current service type"""
+        session = MulesoftSessionPool.get_session(self._service_type)
         t0 = time.time()
-        log_val = {
-            "url": url,
-            "request": params,
-            "response_time_ms": 0,
-        }
         try:
-            response = requests.get(
-                url=url,
-                headers=headers,
-                params=params,
-                timeout=settings.MULESOFT_API_TIMEOUT,
+            response = session.request(
+                method,
+                url,
+                timeout=MulesoftSessionPool.get_timeout(),
+                **kwargs,
             ).json()
-            t1 = time.time()
-            dt = (t1 - t0) * 1000
-            # no need log response because it's too big
-            # log_val["response"] = response
-            cls._check_error_and_raise(url, response, params)
+            if method != HTTP_METHOD.GET.value:
+                # no need log GET response because it's too big
+                log_val["response"] = response
+            self._check_error_and_raise(url, response, log_val.get("request"))
             return response
         except ValidationError as v_ex:
             log_val["exception"] = v_ex
@@ -444,87 +472,118 @@ class MulesoftApiRequest:
             log_val["exception"] = ex
             raise ex
         finally:
-            t1 = time.time()
-            dt = (t1 - t0) * 1000
-            log_val = {**log_val, "response_time_ms": dt}
-            cls._log_request(**log_val)
+            if log_request:
+                dt = (time.time() - t0) * 1000
+                log_val = {**log_val, "response_time_ms": dt}
+                self._log_request(**log_val)
+
+    def request_mulesoft_get(self, uri: str, params):
+        url, headers, params = self._build_request_data(uri, params)
+        log_val = {
+            "url": url,
+            "request": params,
+            "response_time_ms": 0,
+        }
+        return self._send(
+            HTTP_METHOD.GET.value, url, log_val, headers=headers, params=params
+        )
 
-    @classmethod
     def request_mulesoft_post(
-        cls, url: str, data: dict, encode=False, log_request=True
+        self, url: str, data: dict, encode=False, log_request=True
     ):
-        url, headers, params = cls._build_request_data(url, data, False)
+        url, headers, params = self._build_request_data(url, data, False)
         if encode:
             data = json.dumps(data, ensure_ascii=False).encode("utf-8")
         else:
             data = json.dumps(data)
-        t0 = time.time()
         log_val = {
             "url": url,
             "request": params,
             "response_time_ms": 0,
         }
-        try:
-            response = requests.post(
-                url=url,
-                headers=headers,
-                data=data,
-                timeout=settings.MULESOFT_API_TIMEOUT,
-            ).json()
-            t1 = time.time()
-            dt = (t1 - t0) * 1000
-            log_val["response"] = response
-            cls._check_error_and_raise(url, response, params)
-            return response
-        except ValidationError as v_ex:
-            log_val["exception"] = v_ex
-            raise v_ex
-        except Exception as ex:
-            log_val["exception"] = ex
-            raise ex
-        finally:
-            if log_request:
-                t1 = time.time()
-                dt = (t1 - t0) * 1000
-                log_val = {**log_val, "response_time_ms": dt}
-                cls._log_request(**log_val)
+        return self._send(
+            HTTP_METHOD.POST.value,
+            url,
+            log_val,
+            log_request=log_request,
+            headers=headers,
+            data=data,
+        )
 
-    @classmethod
     def request_mulesoft_patch(
-        cls, url: str, data: dict, encode=False, log_request=True
+        self, url: str, data: dict, encode=False, log_request=True
     ):
-        url, headers, params = cls._build_request_data(url, data, False)
+        url, headers, params = self._build_request_data(url, data, False)
         if encode:
             data = json.dumps(data, ensure_ascii=False).encode("utf-8")
         else:
             data = json.dumps(data)
-        t0 = time.time()
         log_val = {
             "url": url,
             "request": params,
             "response_time_ms": 0,
         }
+        return self._send(
+            HTTP_METHOD.PATCH.value,
+            url,
+            log_val,
+            log_request=log_request,
+            headers=headers,
+            data=data,
+        )
+
+    @classmethod
+    def batch_call(
+        cls,
+        calls: List[Callable[[], Any]],
+        max_workers: Union[int, None] = None,
+        return_exceptions=False,
+    ) -> list:
+        """Run independent Mulesoft calls concurrently
+
+        Each call is a no-arg callable, e.g.
+        `partial(SapApiRequest.call_es_14_contract_detail, contract_no)`.
+        Calls should only do the HTTP request, prepare params and read the DB
+        before, since worker threads do not share the caller's transaction.
+
+        Args:
+            calls: list of callables, one per request
+            max_workers: pool size, default settings.MULESOFT_BATCH_MAX_WORKERS
+            return_exceptions: put the exception of a failed call in its slot
+                instead of raising the first one (in input order)
+
+        Returns:
+            list: results in the same order as `calls`
+        """
+        if len(calls) <= 1:
+            return [cls._run_inline(call, return_exceptions) for call in calls]
+        max_workers = min(
+            max_workers or settings.MULESOFT_BATCH_MAX_WORKERS, len(calls)
+        )
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="mulesoft-batch"
+        ) as executor:
+            outcomes = list(executor.map(_run_batch_call, calls))
+        results = []
+        first_error = None
+        for result, error, logs, metrics in outcomes:
+            for log in logs:
+                add_to_thread_local(THREAD_LOCAL_KEY_M, log)
+            for metric in metrics:
+                add_to_thread_local(THREAD_LOCAL_KEY_METRIC, metric)
+            if error is not None:
+                first_error = first_error or error
+                result = error
+            results.append(result)
+        if first_error is not None and not return_exceptions:
+            raise first_error
+        return results
+
+    @classmethod
+    def _run_inline(cls, call: Callable[[], Any], return_exceptions=False):
         try:
-            response = requests.patch(
-                url=url,
-                headers=headers,
-                data=data,
-                timeout=settings.MULESOFT_API_TIMEOUT,
-            ).json()
-            t1 = time.time()
-            dt = (t1 - t0) * 1000
-            log_val["response"] = response
-            cls._check_error_and_raise(url, response, params)
-            return response
-        except ValidationError as v_ex:
-            log_val["exception"] = v_ex
-            raise v_ex
-        except Exception as ex:
-            log_val["exception"] = ex
-            raise ex
-        finally:
-            if log_request:
-                t1 = time.time()
-                dt = (t1 - t0) * 1000
-                log_val = {**log_val, "response_time_ms": dt}
-                cls._log_request(**log_val)
+            return call()
+        except Exception as e:
+            if not return_exceptions:
+                raise e
+            return e
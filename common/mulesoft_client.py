@@ -0,0 +1,62 @@
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_KEY = "default"
+
+
+class MulesoftSessionPool:
+    """Process wide keep-alive sessions to the Mulesoft gateway.
+
+    One `requests.Session` is kept per service type (sap, iplan, cp, ots, pmt)
+    so each backend gets its own connection pool and a slow service can not
+    starve the others. Sessions are created lazily and are safe to share
+    between threads since urllib3 pools handle their own locking.
+    """
+
+    _sessions: Dict[str, requests.Session] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls, service_type: Optional[str] = None) -> requests.Session:
+        key = service_type or DEFAULT_POOL_KEY
+        session = cls._sessions.get(key)
+        if session is not None:
+            return session
+        with cls._lock:
+            session = cls._sessions.get(key)
+            if session is None:
+                session = cls._create_session()
+                cls._sessions[key] = session
+                logging.info(
+                    f"MulesoftSessionPool: created session for service type {key}"
+                )
+        return session
+
+    @classmethod
+    def _create_session(cls) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=settings.MULESOFT_POOL_CONNECTIONS,
+            pool_maxsize=settings.MULESOFT_POOL_MAXSIZE,
+            max_retries=settings.MULESOFT_CONNECT_RETRIES,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @classmethod
+    def get_timeout(cls) -> Tuple[float, float]:
+        """(connect, read) timeout used for every Mulesoft call"""
+        return settings.MULESOFT_API_CONNECT_TIMEOUT, settings.MULESOFT_API_TIMEOUT
+
+    @classmethod
+    def close_all(cls) -> None:
+        with cls._lock:
+            for session in cls._sessions.values():
+                session.close()
+            cls._sessions = {}
@@ -1,3 +1,4 @@
+import gzip
 import json
 import logging
 import os
@@ -47,7 +48,7 @@ class NewRelicMetric:
         }
         self._metric_list.append(val)
 
-    def send_metric(self, *args, **kwargs):
+    def send_metric(self, *args, compress=False, **kwargs):
         if not self._metric_list:
             logging.info("NewRelicMetric.send_metric: No metric to send")
             return
@@ -55,8 +56,11 @@ class NewRelicMetric:
             logging.warning("NewRelicMetric.send_metric: No New Relic API key")
             return
         headers = self._get_headers()
-        data = [{"metrics": self._metric_list}]
-        response = requests.post(self._base_url, headers=headers, data=json.dumps(data))
+        data = json.dumps([{"metrics": self._metric_list}])
+        if compress:
+            headers["Content-Encoding"] = "gzip"
+            data = gzip.compress(data.encode("utf-8"))
+        response = requests.post(self._base_url, headers=headers, data=data)
         if response.status_code != 202:
             logging.error(
                 f"NewRelicMetric.send_metric: Failed to send metric to New Relic, status code: {response.status_code}"
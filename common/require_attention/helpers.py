@@ -1,30 +1,22 @@
 from typing import List
 
 from sap_migration.models import OrderLines
+from scgp_require_attention_items.attention_types import (
+    format_attention_types,
+    parse_attention_types,
+)
 
 
 def add_flag_attention(order_line: OrderLines, flags: List[str]) -> None:
-    flags.sort()
-    # If empty attention type, return flags from input
-    attention_type = order_line.attention_type or ""
-    if not attention_type:
-        order_line.attention_type = ", ".join(flags)
-
-    attention_type_arr = list(set(attention_type.split(",") + flags))
-    attention_type_arr.sort()
-    order_line.attention_type = ", ".join(attention_type_arr)
+    order_line.attention_type = format_attention_types(
+        parse_attention_types(order_line.attention_type) + flags
+    )
 
 
 def remove_flag_attention(order_line: OrderLines, flags: List[str]) -> None:
-    attention_type = order_line.attention_type
     # If empty attention type, do nothing
-    if not attention_type:
+    if not order_line.attention_type:
         return
-
-    attention_type_set = set(attention_type.split(", "))
-    flags_set = set(flags)
-
-    remaining_flags = list(attention_type_set - flags_set)
-    remaining_flags.sort()
-
-    order_line.attention_type = ", ".join(remaining_flags)
+    order_line.attention_type = format_attention_types(
+        set(parse_attention_types(order_line.attention_type)) - set(flags)
+    )
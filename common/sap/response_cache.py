@@ -0,0 +1,60 @@
+import hashlib
+import json
+import time
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from common.util.middleware.scgp_threadlocal_middleware import (
+    THREAD_LOCAL_KEY_METRIC,
+    add_to_thread_local,
+)
+
+
+def get_cached_sap_response(
+    api_name: str,
+    key: Any,
+    call: Callable[[], dict],
+    timeout: int,
+    bypass_cache: bool = False,
+) -> dict:
+    """Return the SAP response of `call`, cached for `timeout` seconds by `key`.
+
+    Only successful responses (with `data`) are cached. `bypass_cache` always
+    calls SAP and refreshes the cached response, for flows which must see the
+    latest SAP data. Hits and misses are sent to New Relic as
+    `settings.NEW_RELIC_SAP_RESPONSE_CACHE_METRIC_NAME`.
+    """
+    if not settings.SAP_RESPONSE_CACHE_ENABLED or not timeout:
+        return call()
+    cache_key = f"sap_response:{api_name}:{make_payload_hash(key, hashlib.sha1)}"
+    if not bypass_cache:
+        response = cache.get(cache_key)
+        if response is not None:
+            _add_metric(api_name, "hit")
+            return response
+    response = call()
+    _add_metric(api_name, "bypass" if bypass_cache else "miss")
+    if isinstance(response, dict) and response.get("data"):
+        cache.set(cache_key, response, timeout=timeout)
+    return response
+
+
+def make_payload_hash(data: Any, algorithm=hashlib.sha256) -> str:
+    """Stable hash of JSON serializable `data`, independent of key order"""
+    payload = json.dumps(data, sort_keys=True, default=str, separators=(",", ":"))
+    return algorithm(payload.encode("utf-8")).hexdigest()
+
+
+def _add_metric(api_name: str, result: str) -> None:
+    add_to_thread_local(
+        THREAD_LOCAL_KEY_METRIC,
+        {
+            "metric_name": settings.NEW_RELIC_SAP_RESPONSE_CACHE_METRIC_NAME,
+            "type": "gauge",
+            "value": 1,
+            "timestamp": time.time(),
+            "attributes": {"mulesoftapi.name": api_name, "result": result},
+        },
+    )
@@ -1,18 +1,27 @@
+from django.conf import settings
+
 from scgp_export.graphql.enums import SapEnpoint
 
 from ..mulesoft_api import MulesoftApiRequest
+from .response_cache import get_cached_sap_response
 
 
 class SapApiRequest(MulesoftApiRequest):
     # Throw SAP function here under format
 
     @classmethod
-    def call_es_14_contract_detail(cls, contract_no: str):
+    def call_es_14_contract_detail(cls, contract_no: str, bypass_cache=False):
         log_val = {
             "contract_no": contract_no,
         }
-        return MulesoftApiRequest.instance(**log_val).request_mulesoft_get(
-            uri=SapEnpoint.ES_14.value + "/" + contract_no, params={}
+        return get_cached_sap_response(
+            SapEnpoint.ES_14.value,
+            contract_no,
+            lambda: MulesoftApiRequest.instance(**log_val).request_mulesoft_get(
+                uri=SapEnpoint.ES_14.value + "/" + contract_no, params={}
+            ),
+            settings.SAP_ES14_CACHE_TTL,
+            bypass_cache=bypass_cache,
         )
 
     @classmethod
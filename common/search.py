@@ -0,0 +1,68 @@
+import re
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models import Case, Func, IntegerField, TextField, Value, When
+
+# separators between (and inside) searched columns, they all match each other
+SEARCH_SEPARATORS = re.compile(r"[\s/,.-]+")
+SEARCH_SEPARATORS_SQL = "[[:space:]/,.-]+"
+
+# default connection ordering of a queryset filtered with `search_by_text`
+TYPEAHEAD_ORDERING = ["typeahead_rank", "typeahead_text", "pk"]
+
+
+class SearchText(Func):
+    """
+    Normalized search text of `fields`: upper case, the columns joined by a
+    space and every run of separators replaced by one space, so "ABC - Name"
+    and "abc / name" both become "ABC NAME".
+
+    Only immutable functions are used (CONCAT is not), so the expression can
+    be indexed with `search_text_index`. The SQL must stay the same as the one
+    of the existing indexes, otherwise they are not used anymore.
+    """
+
+    output_field = TextField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        columns = []
+        params = []
+        for expression in self.get_source_expressions():
+            sql, expression_params = compiler.compile(expression)
+            columns.append(f"coalesce({sql}, '')")
+            params.extend(expression_params)
+        text = " || ' ' || ".join(columns)
+        sql = (
+            f"btrim(regexp_replace(upper({text}), '{SEARCH_SEPARATORS_SQL}', ' ', 'g'))"
+        )
+        return sql, params
+
+
+def search_text_index(name, *fields):
+    """pg_trgm GIN index answering `search_by_text` on `fields`"""
+    return GinIndex(OpClass(SearchText(*fields), name="gin_trgm_ops"), name=name)
+
+
+def normalize_search_text(value) -> str:
+    return SEARCH_SEPARATORS.sub(" ", str(value or "")).strip().upper()
+
+
+def search_by_text(qs, value, *fields):
+    """
+    Rows of `qs` whose `fields` contain `value`, looked up on the trigram
+    index of `search_text_index(..., *fields)`.
+
+    Rows starting with `value` rank first (`typeahead_rank` 0), connections
+    without an explicit sort use `TYPEAHEAD_ORDERING`.
+    """
+    value = normalize_search_text(value)
+    if not value:
+        return qs
+    return qs.annotate(
+        typeahead_text=SearchText(*fields),
+        typeahead_rank=Case(
+            When(typeahead_text__startswith=value, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        ),
+    ).filter(typeahead_text__contains=value)
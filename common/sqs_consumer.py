@@ -0,0 +1,196 @@
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+from common.util.log_shipper import ship_logs
+from common.util.middleware.scgp_threadlocal_middleware import (
+    THREAD_LOCAL_KEY_M,
+    THREAD_LOCAL_KEY_METRIC,
+    clear_thread_local,
+    get_active_thread_local,
+)
+
+SQS_MAX_NUMBER_OF_MESSAGES = 10
+SQS_MAX_WAIT_TIME_SECONDS = 20
+
+
+class SqsBatchConsumer:
+    """Drain an SQS queue in batches within a time budget.
+
+    Messages are received 10 at a time with long polling until the queue is
+    empty or `time_budget` seconds are spent. Messages of a batch are split into
+    partitions by `partition_keys` (e.g. order numbers): different partitions are
+    handled in parallel, messages sharing a key stay in receive order. Handled
+    messages are deleted with one `delete_messages` call per batch.
+
+    Stats of the run (throughput, queue lag, backlog) are returned by `run` and
+    sent to New Relic as `settings.NEW_RELIC_SQS_CONSUMER_METRIC_NAME`.
+    """
+
+    def __init__(
+        self,
+        queue,
+        handler: Callable,
+        name: str,
+        partition_keys: Optional[Callable[..., Iterable[str]]] = None,
+        max_workers: int = 1,
+        time_budget: float = 50,
+        wait_time_seconds: int = SQS_MAX_WAIT_TIME_SECONDS,
+        delete_on_error: bool = True,
+    ) -> None:
+        self.queue = queue
+        self.handler = handler
+        self.name = name
+        self.partition_keys = partition_keys
+        self.max_workers = max(max_workers, 1)
+        self.time_budget = time_budget
+        self.wait_time_seconds = min(wait_time_seconds, SQS_MAX_WAIT_TIME_SECONDS)
+        self.delete_on_error = delete_on_error
+
+    def run(self) -> dict:
+        stats = {
+            "received": 0,
+            "processed": 0,
+            "failed": 0,
+            "deleted": 0,
+            "max_lag_ms": 0,
+        }
+        t0 = time.time()
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=f"sqs-{self.name}"
+        ) as executor:
+            while True:
+                remaining = self.time_budget - (time.time() - t0)
+                if remaining <= 0:
+                    break
+                messages = self.queue.receive_messages(
+                    MaxNumberOfMessages=SQS_MAX_NUMBER_OF_MESSAGES,
+                    WaitTimeSeconds=int(min(self.wait_time_seconds, remaining)),
+                    AttributeNames=["SentTimestamp"],
+                )
+                if not messages:
+                    break
+                stats["received"] += len(messages)
+                stats["max_lag_ms"] = max(stats["max_lag_ms"], self._max_lag(messages))
+                partitions = self._partition(messages)
+                results = executor.map(self._handle_partition, partitions)
+                to_delete = []
+                for partition_result in results:
+                    for message, success in partition_result:
+                        stats["processed" if success else "failed"] += 1
+                        if success or self.delete_on_error:
+                            to_delete.append(message)
+                stats["deleted"] += self._delete(to_delete)
+        elapsed = time.time() - t0
+        stats["elapsed_ms"] = int(elapsed * 1000)
+        stats["throughput"] = round(stats["received"] / elapsed, 2) if elapsed else 0
+        stats["backlog"] = self._approximate_backlog()
+        logging.info(f"[SqsBatchConsumer] {self.name} finished: {stats}")
+        self._send_metric(stats)
+        return stats
+
+    def _partition(self, messages: List) -> List[List]:
+        """Group messages sharing any partition key, keep receive order"""
+        if not self.partition_keys:
+            return [[message] for message in messages]
+        parent = list(range(len(messages)))
+
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        key_owner = {}
+        for index, message in enumerate(messages):
+            try:
+                keys = self.partition_keys(message) or []
+            except Exception as e:
+                logging.warning(f"[SqsBatchConsumer] {self.name} partition key: {e}")
+                keys = []
+            for key in keys:
+                if key in key_owner:
+                    parent[find(index)] = find(key_owner[key])
+                else:
+                    key_owner[key] = index
+        groups: "OrderedDict[int, List]" = OrderedDict()
+        for index, message in enumerate(messages):
+            groups.setdefault(find(index), []).append(message)
+        return list(groups.values())
+
+    def _handle_partition(self, messages: List) -> List:
+        clear_thread_local()
+        result = []
+        try:
+            for message in messages:
+                try:
+                    self.handler(message)
+                    result.append((message, True))
+                except Exception as e:
+                    logging.exception(
+                        f"[SqsBatchConsumer] {self.name} error: {e} | {message.body}"
+                    )
+                    result.append((message, False))
+            ship_logs(
+                get_active_thread_local(THREAD_LOCAL_KEY_M),
+                get_active_thread_local(THREAD_LOCAL_KEY_METRIC),
+            )
+        finally:
+            clear_thread_local()
+            connections.close_all()
+        return result
+
+    def _delete(self, messages: List) -> int:
+        deleted = 0
+        for i in range(0, len(messages), SQS_MAX_NUMBER_OF_MESSAGES):
+            chunk = messages[i : i + SQS_MAX_NUMBER_OF_MESSAGES]
+            response = self.queue.delete_messages(
+                Entries=[
+                    {"Id": str(index), "ReceiptHandle": message.receipt_handle}
+                    for index, message in enumerate(chunk)
+                ]
+            )
+            deleted += len(response.get("Successful", []))
+            for failed in response.get("Failed", []):
+                logging.error(
+                    f"[SqsBatchConsumer] {self.name} delete message failed: {failed}"
+                )
+        return deleted
+
+    @staticmethod
+    def _max_lag(messages: List) -> int:
+        now_ms = int(time.time() * 1000)
+        sent = [
+            int((message.attributes or {}).get("SentTimestamp", now_ms))
+            for message in messages
+        ]
+        return max(now_ms - ts for ts in sent) if sent else 0
+
+    def _approximate_backlog(self) -> Optional[int]:
+        try:
+            self.queue.load()
+            return int(self.queue.attributes.get("ApproximateNumberOfMessages", 0))
+        except Exception as e:
+            logging.warning(f"[SqsBatchConsumer] {self.name} backlog: {e}")
+            return None
+
+    def _send_metric(self, stats: dict) -> None:
+        ts = time.time()
+        attributes = {"queue": self.name}
+        metrics = [
+            {
+                "metric_name": f"{settings.NEW_RELIC_SQS_CONSUMER_METRIC_NAME}.{key}",
+                "type": "gauge",
+                "value": stats[key],
+                "timestamp": ts,
+                "attributes": attributes,
+            }
+            for key in ("received", "failed", "max_lag_ms", "throughput", "backlog")
+            if stats.get(key) is not None
+        ]
+        ship_logs(None, metrics)
@@ -0,0 +1,76 @@
+from unittest import mock
+
+import pytest
+
+from common.util.log_shipper import MulesoftLogShipper
+from common.util.middleware.scgp_threadlocal_middleware import save_metric
+
+MIDDLEWARE = "common.util.middleware.scgp_threadlocal_middleware"
+
+
+@pytest.fixture
+def shipper():
+    shipper = MulesoftLogShipper(
+        max_queue_size=2, batch_size=10, flush_interval=0.1, shutdown_timeout=1
+    )
+    # no background thread, batches are shipped by flush
+    with mock.patch.object(shipper, "_ensure_started"):
+        yield shipper
+
+
+@pytest.fixture
+def saved_logs():
+    with mock.patch(f"{MIDDLEWARE}.save_mulesoft_api_log") as save:
+        yield save
+
+
+@pytest.fixture
+def saved_metrics():
+    with mock.patch(f"{MIDDLEWARE}.save_metric") as save:
+        yield save
+
+
+def test_shipped_entries_are_counted(shipper, saved_logs, saved_metrics):
+    shipper.submit(["log-1", "log-2"], [{"metric_name": "a"}])
+    shipper.submit(["log-3"], None)
+
+    shipper.flush()
+
+    saved_logs.assert_called_once_with(["log-1", "log-2", "log-3"], raise_errors=True)
+    saved_metrics.assert_called_once_with(
+        [{"metric_name": "a"}], compress=True, raise_errors=True
+    )
+    assert shipper.stats() == {"queued": 0, "shipped": 4, "dropped": 0, "failed": 0}
+
+
+@pytest.mark.parametrize("failing", ["saved_logs", "saved_metrics"])
+def test_entries_of_a_failed_batch_are_not_counted_as_shipped(
+    shipper, saved_logs, saved_metrics, failing, request
+):
+    request.getfixturevalue(failing).side_effect = ValueError("database is down")
+    shipper.submit(["log-1"], [{"metric_name": "a"}])
+
+    shipper.flush()
+
+    assert shipper.stats() == {"queued": 0, "shipped": 0, "dropped": 0, "failed": 2}
+
+
+def test_entries_are_dropped_when_the_queue_is_full(shipper, saved_logs, saved_metrics):
+    shipper.submit(["log-1"], None)
+    shipper.submit(["log-2"], None)
+    shipper.submit(["log-3", "log-4"], [{"metric_name": "a"}])
+
+    assert shipper.stats() == {"queued": 2, "shipped": 0, "dropped": 3, "failed": 0}
+
+    shipper.stop()
+
+    assert shipper.stats() == {"queued": 0, "shipped": 2, "dropped": 3, "failed": 0}
+
+
+def test_save_metric_raises_errors_only_when_asked():
+    with mock.patch(f"{MIDDLEWARE}.NewRelicMetric") as metric:
+        metric.return_value.send_metric.side_effect = ValueError("unreachable")
+
+        save_metric([{"metric_name": "a"}])
+        with pytest.raises(ValueError):
+            save_metric([{"metric_name": "a"}], raise_errors=True)
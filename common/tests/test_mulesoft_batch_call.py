@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from common.mulesoft_api import MulesoftApiRequest
+from common.util.middleware.scgp_threadlocal_middleware import (
+    THREAD_LOCAL_KEY_M,
+    THREAD_LOCAL_KEY_METRIC,
+    add_to_thread_local,
+    clear_thread_local,
+    get_active_thread_local,
+)
+
+
+@pytest.fixture(autouse=True)
+def thread_local():
+    clear_thread_local()
+    yield
+    clear_thread_local()
+
+
+def delayed(value, delay):
+    def call():
+        time.sleep(delay)
+        return value
+
+    return call
+
+
+def failing(error, delay=0):
+    def call():
+        time.sleep(delay)
+        raise error
+
+    return call
+
+
+def test_batch_call_returns_results_in_input_order():
+    calls = [delayed(1, 0.03), delayed(2, 0.01), delayed(3, 0)]
+
+    assert MulesoftApiRequest.batch_call(calls, max_workers=3) == [1, 2, 3]
+
+
+def test_batch_call_runs_calls_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    calls = [lambda: barrier.wait() is not None] * 2
+
+    # both calls only return once the other one is running as well
+    assert MulesoftApiRequest.batch_call(calls, max_workers=2) == [True, True]
+
+
+def test_batch_call_raises_first_error_in_input_order():
+    first, second = ValueError("first"), ValueError("second")
+    # the second error happens first
+    calls = [failing(first, 0.03), failing(second), delayed(3, 0)]
+
+    with pytest.raises(ValueError) as error:
+        MulesoftApiRequest.batch_call(calls, max_workers=3)
+    assert error.value is first
+
+
+def test_batch_call_puts_exceptions_in_their_slots():
+    error = ValueError("failed")
+
+    results = MulesoftApiRequest.batch_call(
+        [delayed(1, 0), failing(error), delayed(3, 0)],
+        max_workers=3,
+        return_exceptions=True,
+    )
+
+    assert results == [1, error, 3]
+
+
+def test_batch_call_runs_one_call_inline():
+    caller = threading.current_thread()
+
+    assert MulesoftApiRequest.batch_call(
+        [lambda: threading.current_thread() is caller]
+    ) == [True]
+    error = ValueError("failed")
+    assert MulesoftApiRequest.batch_call([failing(error)], return_exceptions=True) == [
+        error
+    ]
+    with pytest.raises(ValueError):
+        MulesoftApiRequest.batch_call([failing(error)])
+    assert MulesoftApiRequest.batch_call([]) == []
+
+
+def test_batch_call_forwards_worker_logs_and_metrics():
+    def logging_call(value):
+        def call():
+            add_to_thread_local(THREAD_LOCAL_KEY_M, {"url": value})
+            add_to_thread_local(THREAD_LOCAL_KEY_METRIC, {"metric_name": value})
+            if value == "b":
+                raise ValueError(value)
+            return value
+
+        return call
+
+    add_to_thread_local(THREAD_LOCAL_KEY_M, {"url": "caller"})
+
+    MulesoftApiRequest.batch_call(
+        [logging_call("a"), logging_call("b")], max_workers=2, return_exceptions=True
+    )
+
+    assert get_active_thread_local(THREAD_LOCAL_KEY_M) == [
+        {"url": "caller"},
+        {"url": "a"},
+        {"url": "b"},
+    ]
+    assert get_active_thread_local(THREAD_LOCAL_KEY_METRIC) == [
+        {"metric_name": "a"},
+        {"metric_name": "b"},
+    ]
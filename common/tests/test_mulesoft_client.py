@@ -0,0 +1,165 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from common.enum import MulesoftServiceType
+from common.mulesoft_api import MulesoftApiRequest
+from common.mulesoft_client import MulesoftSessionPool
+from common.util.middleware.scgp_threadlocal_middleware import (
+    THREAD_LOCAL_KEY_M,
+    THREAD_LOCAL_KEY_METRIC,
+    clear_thread_local,
+    get_active_thread_local,
+)
+from scgp_export.graphql.enums import IPlanEndPoint, SapEnpoint
+
+API_URL = "https://mulesoft.example.com/"
+
+
+@pytest.fixture(autouse=True)
+def mulesoft_config(settings, monkeypatch):
+    settings.MULESOFT_API_URL = API_URL
+    settings.MULESOFT_CLIENT_ID = "client-id"
+    settings.MULESOFT_CLIENT_SECRET = "client-secret"
+    # reload the process wide config from the settings above
+    monkeypatch.setattr(MulesoftApiRequest, "_url", None)
+    monkeypatch.setattr(MulesoftApiRequest, "_client_id", None)
+    monkeypatch.setattr(MulesoftApiRequest, "_client_secret", None)
+    monkeypatch.setattr(MulesoftApiRequest, "_map_endpoints", {})
+    manager = mock.Mock()
+    manager.get_plugin.return_value.config.enable_mulesoft_log = True
+    monkeypatch.setattr(
+        "common.mulesoft_api.get_cached_plugins_manager", lambda: manager
+    )
+    MulesoftSessionPool.close_all()
+    clear_thread_local()
+    yield
+    MulesoftSessionPool.close_all()
+    clear_thread_local()
+
+
+@pytest.fixture
+def sent_requests():
+    """Answer every pooled request with its own body, without any network"""
+    sent = []
+
+    def send(adapter, request, **kwargs):
+        sent.append(request)
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response._content = json.dumps({"echo": json.loads(request.body)}).encode()
+        return response
+
+    with mock.patch.object(HTTPAdapter, "send", autospec=True, side_effect=send):
+        yield sent
+
+
+def call_in_thread(service_type, uri, order_number, barrier=None):
+    clear_thread_local()
+    api = MulesoftApiRequest.instance(
+        service_type=service_type,
+        order_number=order_number,
+        orderid=int(order_number),
+    )
+    session = MulesoftSessionPool.get_session(service_type)
+    if barrier:
+        barrier.wait()
+    response = api.request_mulesoft_post(uri, {"orderNumber": order_number})
+    return (
+        response,
+        session,
+        get_active_thread_local(THREAD_LOCAL_KEY_M),
+        get_active_thread_local(THREAD_LOCAL_KEY_METRIC),
+    )
+
+
+def test_concurrent_calls_keep_their_own_context(sent_requests):
+    barrier = threading.Barrier(2, timeout=5)
+    calls = [
+        (MulesoftServiceType.SAP.value, SapEnpoint.ES_21.value, "0410000001"),
+        (
+            MulesoftServiceType.IPLAN.value,
+            IPlanEndPoint.I_PLAN_REQUEST.value,
+            "0410000002",
+        ),
+    ]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(call_in_thread, *call, barrier=barrier) for call in calls
+        ]
+        results = [future.result(timeout=10) for future in futures]
+
+    assert len(sent_requests) == 2
+    for (_, uri, order_number), (response, _, logs, metrics) in zip(calls, results):
+        assert response == {"echo": {"orderNumber": order_number}}
+        # the request that went out belongs to this call
+        sent = next(r for r in sent_requests if r.url == API_URL + uri)
+        assert json.loads(sent.body) == {"orderNumber": order_number}
+        assert sent.headers["clientId"] == "client-id"
+        assert sent.headers["clientSecret"] == "client-secret"
+        # and only this call's log ended up in this thread
+        assert len(logs) == 1
+        log = json.loads(logs[0])
+        assert log["url"] == API_URL + uri
+        assert log["order_number"] == order_number
+        assert log["orderid"] == int(order_number)
+        assert {m["attributes"]["orderId"] for m in metrics} == {int(order_number)}
+
+
+def test_each_service_type_gets_its_own_pooled_session():
+    sap_session = MulesoftSessionPool.get_session(MulesoftServiceType.SAP.value)
+    iplan_session = MulesoftSessionPool.get_session(MulesoftServiceType.IPLAN.value)
+
+    assert sap_session is not iplan_session
+    assert MulesoftSessionPool.get_session(MulesoftServiceType.SAP.value) is (
+        sap_session
+    )
+    assert MulesoftSessionPool.get_session() is MulesoftSessionPool.get_session(None)
+
+
+def test_reused_session_does_not_leak_state_between_calls(sent_requests):
+    sap = MulesoftServiceType.SAP.value
+    first = call_in_thread(sap, SapEnpoint.ES_21.value, "0410000001")
+    default_headers = dict(requests.Session().headers)
+
+    clear_thread_local()
+    api = MulesoftApiRequest.instance(service_type=sap)
+    second = api.request_mulesoft_post(SapEnpoint.ES_21.value, {"contractNo": "1"})
+
+    session = first[1]
+    assert MulesoftSessionPool.get_session(sap) is session
+    # per call headers are sent with the request, never stored on the session
+    assert dict(session.headers) == default_headers
+    assert not session.cookies
+    assert second == {"echo": {"contractNo": "1"}}
+    assert json.loads(sent_requests[1].body) == {"contractNo": "1"}
+    # the log options of the first call are not carried over
+    log = json.loads(get_active_thread_local(THREAD_LOCAL_KEY_M)[0])
+    assert "order_number" not in log
+    assert "orderid" not in log
+
+
+def test_instances_do_not_share_call_context():
+    first = MulesoftApiRequest.instance(
+        service_type=MulesoftServiceType.SAP.value, order_number="0410000001"
+    )
+    second = MulesoftApiRequest.instance(service_type=MulesoftServiceType.IPLAN.value)
+
+    assert first is not second
+    assert first._service_type == MulesoftServiceType.SAP.value
+    assert second._service_type == MulesoftServiceType.IPLAN.value
+    assert first._log_options["order_number"] == "0410000001"
+    assert second._log_options["order_number"] is None
+
+    _, headers, _ = first._build_request_data("uri", {}, False)
+    headers["clientId"] = "changed"
+    _, other_headers, _ = second._build_request_data("uri", {}, False)
+    assert other_headers["clientId"] == "client-id"
@@ -0,0 +1,281 @@
+import json
+import threading
+from unittest import mock
+
+import pytest
+
+from common.sqs_consumer import SqsBatchConsumer
+
+
+class FakeMessage:
+    def __init__(self, order_no, seq):
+        self.order_no = order_no
+        self.seq = seq
+        self.receipt_handle = f"receipt-{order_no}-{seq}"
+        self.body = json.dumps({"orderNo": order_no, "seq": seq})
+        self.attributes = {}
+
+
+def order_keys(message):
+    return {message.order_no}
+
+
+def fake_queue(*batches, backlog="0"):
+    """boto3 sqs.Queue returning `batches`, then an empty receive"""
+    queue = mock.Mock()
+    queue.receive_messages.side_effect = [list(batch) for batch in batches] + [[]]
+    queue.delete_messages.side_effect = lambda Entries: {
+        "Successful": [{"Id": entry["Id"]} for entry in Entries]
+    }
+    queue.attributes = {"ApproximateNumberOfMessages": backlog}
+    return queue
+
+
+def deleted_receipts(queue):
+    return [
+        entry["ReceiptHandle"]
+        for call in queue.delete_messages.call_args_list
+        for entry in call.kwargs["Entries"]
+    ]
+
+
+@pytest.fixture(autouse=True)
+def shipped_metrics():
+    with mock.patch("common.sqs_consumer.ship_logs") as ship_logs:
+        yield ship_logs
+
+
+def test_partition_groups_messages_of_the_same_order_in_receive_order():
+    messages = [
+        FakeMessage("A", 1),
+        FakeMessage("B", 1),
+        FakeMessage("A", 2),
+        FakeMessage("C", 1),
+        FakeMessage("B", 2),
+    ]
+    consumer = SqsBatchConsumer(
+        fake_queue(), handler=mock.Mock(), name="test", partition_keys=order_keys
+    )
+
+    partitions = consumer._partition(messages)
+
+    assert [[(m.order_no, m.seq) for m in p] for p in partitions] == [
+        [("A", 1), ("A", 2)],
+        [("B", 1), ("B", 2)],
+        [("C", 1)],
+    ]
+
+
+def test_partition_merges_messages_sharing_any_order():
+    messages = [FakeMessage("A", 1), FakeMessage("B", 1), FakeMessage("A+B", 1)]
+    consumer = SqsBatchConsumer(
+        fake_queue(),
+        handler=mock.Mock(),
+        name="test",
+        partition_keys=lambda message: message.order_no.split("+"),
+    )
+
+    assert consumer._partition(messages) == [messages]
+
+
+def test_partition_key_error_puts_message_on_its_own():
+    def keys(message):
+        if message.seq == 2:
+            raise ValueError("invalid body")
+        return order_keys(message)
+
+    messages = [FakeMessage("A", 1), FakeMessage("A", 2), FakeMessage("A", 3)]
+    consumer = SqsBatchConsumer(
+        fake_queue(), handler=mock.Mock(), name="test", partition_keys=keys
+    )
+
+    assert consumer._partition(messages) == [
+        [messages[0], messages[2]],
+        [messages[1]],
+    ]
+
+
+def test_run_handles_orders_in_parallel_and_each_order_in_sequence():
+    barrier = threading.Barrier(2, timeout=5)
+    handled = []
+    lock = threading.Lock()
+
+    def handler(message):
+        if message.seq == 1:
+            # the first message of A and B only finish once both are running
+            barrier.wait()
+        with lock:
+            handled.append((message.order_no, message.seq))
+
+    queue = fake_queue(
+        [
+            FakeMessage("A", 1),
+            FakeMessage("B", 1),
+            FakeMessage("A", 2),
+            FakeMessage("B", 2),
+            FakeMessage("A", 3),
+        ]
+    )
+    consumer = SqsBatchConsumer(
+        queue, handler=handler, name="test", partition_keys=order_keys, max_workers=2
+    )
+
+    stats = consumer.run()
+
+    assert stats["received"] == stats["processed"] == stats["deleted"] == 5
+    assert [seq for order_no, seq in handled if order_no == "A"] == [1, 2, 3]
+    assert [seq for order_no, seq in handled if order_no == "B"] == [1, 2]
+
+
+def test_run_deletes_only_successful_messages():
+    messages = [FakeMessage("A", 1), FakeMessage("A", 2), FakeMessage("B", 1)]
+    handler = mock.Mock(side_effect=[None, ValueError("sync failed"), None])
+    queue = fake_queue(messages)
+    consumer = SqsBatchConsumer(
+        queue,
+        handler=handler,
+        name="test",
+        partition_keys=order_keys,
+        delete_on_error=False,
+    )
+
+    stats = consumer.run()
+
+    # the failed message does not stop the next ones of the same order
+    assert handler.call_count == 3
+    assert stats["processed"] == 2
+    assert stats["failed"] == 1
+    assert stats["deleted"] == 2
+    # one delete call per batch, with one entry per handled message
+    assert queue.delete_messages.call_count == 1
+    assert deleted_receipts(queue) == ["receipt-A-1", "receipt-B-1"]
+
+
+def test_run_keeps_failed_messages_for_redelivery():
+    failed = FakeMessage("A", 1)
+    handler = mock.Mock(side_effect=ValueError("sync failed"))
+    queue = fake_queue([failed])
+    consumer = SqsBatchConsumer(
+        queue, handler=handler, name="test", delete_on_error=False
+    )
+
+    stats = consumer.run()
+
+    assert stats["failed"] == 1
+    assert stats["deleted"] == 0
+    assert failed.receipt_handle not in deleted_receipts(queue)
+
+
+def test_run_deletes_failed_messages_by_default():
+    queue = fake_queue([FakeMessage("A", 1), FakeMessage("B", 1)])
+    handler = mock.Mock(side_effect=[ValueError("sync failed"), None])
+    consumer = SqsBatchConsumer(queue, handler=handler, name="test")
+
+    stats = consumer.run()
+
+    assert stats["failed"] == 1
+    assert stats["deleted"] == 2
+    assert deleted_receipts(queue) == ["receipt-A-1", "receipt-B-1"]
+
+
+def test_run_does_not_count_messages_sqs_failed_to_delete():
+    queue = fake_queue([FakeMessage("A", 1), FakeMessage("B", 1)])
+    queue.delete_messages.side_effect = lambda Entries: {
+        "Successful": [{"Id": Entries[0]["Id"]}],
+        "Failed": [{"Id": Entries[1]["Id"], "Code": "ReceiptHandleIsInvalid"}],
+    }
+    consumer = SqsBatchConsumer(queue, handler=mock.Mock(), name="test")
+
+    stats = consumer.run()
+
+    assert stats["processed"] == 2
+    assert stats["deleted"] == 1
+
+
+def test_run_drains_the_queue_until_it_is_empty():
+    queue = fake_queue(
+        [FakeMessage(str(i), 1) for i in range(10)], [FakeMessage("10", 1)]
+    )
+    consumer = SqsBatchConsumer(queue, handler=mock.Mock(), name="test")
+
+    stats = consumer.run()
+
+    assert queue.receive_messages.call_count == 3
+    assert queue.receive_messages.call_args.kwargs["MaxNumberOfMessages"] == 10
+    assert stats["received"] == stats["deleted"] == 11
+    assert queue.delete_messages.call_count == 2
+
+
+def test_run_stops_receiving_once_the_time_budget_is_spent():
+    clock = mock.Mock()
+    clock.time.return_value = 1000.0
+    handled = []
+
+    def handler(message):
+        handled.append(message)
+        # each message takes 20 of the 50 seconds
+        clock.time.return_value += 20
+
+    queue = fake_queue(
+        [FakeMessage("A", 1)], [FakeMessage("A", 2)], [FakeMessage("A", 3)]
+    )
+    consumer = SqsBatchConsumer(queue, handler=handler, name="test", time_budget=50)
+
+    with mock.patch("common.sqs_consumer.time", clock):
+        stats = consumer.run()
+
+    assert queue.receive_messages.call_count == 3
+    # long polling never waits past the budget
+    wait_times = [
+        call.kwargs["WaitTimeSeconds"] for call in queue.receive_messages.call_args_list
+    ]
+    assert wait_times == [20, 20, 10]
+    # the batch received before the budget ran out is still handled and deleted
+    assert len(handled) == 3
+    assert stats["received"] == stats["deleted"] == 3
+    assert stats["elapsed_ms"] == 60000
+
+
+def test_run_waits_for_running_partitions_before_returning():
+    started = threading.Event()
+    release = threading.Event()
+
+    def handler(message):
+        if message.order_no == "slow":
+            started.set()
+            release.wait(timeout=5)
+
+    queue = fake_queue([FakeMessage("slow", 1), FakeMessage("fast", 1)])
+    consumer = SqsBatchConsumer(
+        queue, handler=handler, name="test", partition_keys=order_keys, max_workers=2
+    )
+    result = {}
+    runner = threading.Thread(target=lambda: result.update(consumer.run()))
+    runner.start()
+
+    assert started.wait(timeout=5)
+    runner.join(timeout=0.2)
+    assert runner.is_alive()
+    assert not queue.delete_messages.called
+
+    release.set()
+    runner.join(timeout=5)
+    assert not runner.is_alive()
+    assert result["deleted"] == 2
+    assert sorted(deleted_receipts(queue)) == ["receipt-fast-1", "receipt-slow-1"]
+
+
+def test_run_sends_stats_as_metrics(settings, shipped_metrics):
+    settings.NEW_RELIC_SQS_CONSUMER_METRIC_NAME = "Custom/SqsConsumer"
+    queue = fake_queue([FakeMessage("A", 1)], backlog="7")
+    consumer = SqsBatchConsumer(queue, handler=mock.Mock(), name="ES38")
+
+    stats = consumer.run()
+
+    assert stats["backlog"] == 7
+    _, metrics = shipped_metrics.call_args_list[-1].args
+    values = {metric["metric_name"]: metric["value"] for metric in metrics}
+    assert values["Custom/SqsConsumer.received"] == 1
+    assert values["Custom/SqsConsumer.failed"] == 0
+    assert values["Custom/SqsConsumer.backlog"] == 7
+    assert {metric["attributes"]["queue"] for metric in metrics} == {"ES38"}
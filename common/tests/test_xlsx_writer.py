@@ -0,0 +1,114 @@
+import base64
+import io
+
+import openpyxl
+import pytest
+from openpyxl.styles import Alignment, Font
+
+from common.util.xlsx_writer import (
+    StreamingXlsxWriter,
+    XlsxCellStyle,
+    export_xlsx_file,
+)
+
+BOLD = XlsxCellStyle(font=Font(bold=True))
+QTY = XlsxCellStyle(
+    alignment=Alignment(horizontal="right", vertical="top"),
+    number_format="#,##0.000",
+    convert=float,
+)
+
+
+def read_back(writer):
+    temporary_file = writer.save()
+    return openpyxl.load_workbook(temporary_file.name).active
+
+
+def test_rows_are_written_in_order():
+    writer = StreamingXlsxWriter()
+    writer.append(("Material", "Qty"))
+    writer.append(("MAT-001", 10))
+    writer.append(("MAT-002", None))
+
+    sheet = read_back(writer)
+
+    assert writer.row_count == 3
+    assert [list(row) for row in sheet.iter_rows(values_only=True)] == [
+        ["Material", "Qty"],
+        ["MAT-001", 10],
+        ["MAT-002", None],
+    ]
+
+
+def test_styles_widths_and_heights_are_set_while_writing():
+    writer = StreamingXlsxWriter({1: 30, 3: 12.5}, title="Report")
+    writer.append(("Material", "Qty", "Weight"), style=BOLD, height=50)
+    writer.append(("MAT-001", "1234.5", "n/a"), column_styles={2: QTY, 3: QTY})
+
+    sheet = read_back(writer)
+
+    assert sheet.title == "Report"
+    assert sheet.column_dimensions["A"].width == 30
+    assert sheet.column_dimensions["C"].width == 12.5
+    assert sheet.row_dimensions[1].height == 50
+    assert all(cell.font.bold for cell in sheet[1])
+    material, qty, weight = sheet[2]
+    assert not material.font.bold
+    assert material.number_format == "General"
+    # converted to a number, so the number format applies
+    assert qty.value == 1234.5
+    assert qty.number_format == "#,##0.000"
+    assert qty.alignment.horizontal == "right"
+    assert qty.alignment.vertical == "top"
+    # a value the style can not convert is kept as text, without number format
+    assert weight.value == "n/a"
+    assert weight.number_format == "General"
+    assert weight.alignment.horizontal == "right"
+
+
+def test_column_style_overrides_row_style():
+    writer = StreamingXlsxWriter()
+    writer.append(("Total", "5"), style=BOLD, column_styles={2: QTY})
+
+    total, qty = read_back(writer)[1]
+
+    assert total.font.bold
+    assert not qty.font.bold
+    assert qty.value == 5
+
+
+def test_merged_cells_are_kept():
+    writer = StreamingXlsxWriter()
+    writer.merge("A1:A2")
+    writer.merge("B1:C1")
+    writer.append(("S/O No.", "Qty", None))
+    writer.append((None, "Order", "Change"))
+
+    sheet = read_back(writer)
+
+    assert {str(cell_range) for cell_range in sheet.merged_cells.ranges} == {
+        "A1:A2",
+        "B1:C1",
+    }
+    assert sheet["A1"].value == "S/O No."
+    assert sheet["C2"].value == "Change"
+
+
+def test_export_xlsx_file_returns_small_files_inline(settings):
+    settings.EXCEL_EXPORT_INLINE_MAX_SIZE = 10 * 1024 * 1024
+    writer = StreamingXlsxWriter()
+    writer.append(("Material",))
+
+    base64_file, download_url = export_xlsx_file(writer.save(), "report.xlsx")
+
+    assert download_url is None
+    workbook = openpyxl.load_workbook(io.BytesIO(base64.b64decode(base64_file)))
+    assert workbook.active["A1"].value == "Material"
+
+
+@pytest.mark.parametrize("value", [None, ""])
+def test_empty_values_are_not_converted(value):
+    writer = StreamingXlsxWriter()
+    writer.append(("Qty", value), column_styles={2: QTY})
+
+    assert read_back(writer)["B1"].value is None
@@ -0,0 +1,190 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_STOP = object()
+
+
+class MulesoftLogShipper:
+    """Ship Mulesoft api logs and New Relic metrics off the request path.
+
+    Requests and Celery tasks hand their thread local log/metric lists to
+    `submit`, which only puts them on a bounded in-memory queue. A daemon
+    thread drains the queue in batches, bulk inserts `MulesoftLog` rows and
+    sends one gzip compressed metric payload per batch. When the queue is
+    full the entries are dropped and counted instead of blocking the caller,
+    entries of a batch which fails to ship are counted as failed.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        shutdown_timeout: float,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.shutdown_timeout = shutdown_timeout
+        self.dropped_count = 0
+        self.failed_count = 0
+        self.shipped_count = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+
+    def submit(self, mulesoft_logs: Optional[List], metrics: Optional[List]) -> None:
+        if not mulesoft_logs and not metrics:
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((mulesoft_logs or [], metrics or []))
+        except queue.Full:
+            with self._lock:
+                self.dropped_count += len(mulesoft_logs or []) + len(metrics or [])
+                dropped_count = self.dropped_count
+            logging.warning(
+                f"MulesoftLogShipper: queue is full, dropped entries {dropped_count}"
+            )
+
+    def flush(self) -> None:
+        """Ship everything queued so far on the calling thread"""
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+        self._ship(batch)
+
+    def stop(self) -> None:
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            self.flush()
+        else:
+            try:
+                self._queue.put(_STOP, timeout=self.shutdown_timeout)
+            except queue.Full:
+                logging.warning("MulesoftLogShipper: queue is full on shutdown")
+            thread.join(timeout=self.shutdown_timeout)
+            self._thread = None
+        stats = self.stats()
+        if stats["dropped"] or stats["failed"]:
+            logging.warning(f"MulesoftLogShipper: stopped, entries lost {stats}")
+        else:
+            logging.info(f"MulesoftLogShipper: stopped {stats}")
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "shipped": self.shipped_count,
+            "dropped": self.dropped_count,
+            "failed": self.failed_count,
+        }
+
+    def _ensure_started(self) -> None:
+        # after fork (gunicorn/celery prefork) the thread has to be started again
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="mulesoft-log-shipper", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            stop = item is _STOP
+            batch = [] if stop else [item]
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+            self._ship(batch)
+            if stop:
+                self.flush()
+                close_old_connections()
+                return
+
+    def _ship(self, batch: List) -> None:
+        # prevent circular import
+        from common.util.middleware.scgp_threadlocal_middleware import (
+            save_metric,
+            save_mulesoft_api_log,
+        )
+
+        if not batch:
+            return
+        mulesoft_logs = [log for logs, _ in batch for log in logs]
+        metrics = [metric for _, metric_list in batch for metric in metric_list]
+        entries = len(mulesoft_logs) + len(metrics)
+        try:
+            close_old_connections()
+            save_mulesoft_api_log(mulesoft_logs, raise_errors=True)
+            save_metric(metrics, compress=True, raise_errors=True)
+        except Exception as e:
+            with self._lock:
+                self.failed_count += entries
+                failed_count = self.failed_count
+            logging.exception(
+                f"MulesoftLogShipper: error when shipping batch of {entries} "
+                f"entries, failed entries {failed_count}: {e}"
+            )
+            return
+        with self._lock:
+            self.shipped_count += entries
+
+
+_shipper: Optional[MulesoftLogShipper] = None
+_shipper_lock = threading.Lock()
+
+
+def get_log_shipper() -> MulesoftLogShipper:
+    global _shipper
+    if _shipper is None:
+        with _shipper_lock:
+            if _shipper is None:
+                _shipper = MulesoftLogShipper(
+                    max_queue_size=settings.MULESOFT_LOG_SHIPPER_QUEUE_SIZE,
+                    batch_size=settings.MULESOFT_LOG_SHIPPER_BATCH_SIZE,
+                    flush_interval=settings.MULESOFT_LOG_SHIPPER_FLUSH_INTERVAL,
+                    shutdown_timeout=settings.MULESOFT_LOG_SHIPPER_SHUTDOWN_TIMEOUT,
+                )
+                atexit.register(_shipper.stop)
+    return _shipper
+
+
+def ship_logs(mulesoft_logs: Optional[List], metrics: Optional[List]) -> None:
+    """Hand over logs and metrics of a request or task to the shipper"""
+    if not settings.MULESOFT_LOG_SHIPPER_ASYNC:
+        # prevent circular import
+        from common.util.middleware.scgp_threadlocal_middleware import (
+            save_metric,
+            save_mulesoft_api_log,
+        )
+
+        save_mulesoft_api_log(mulesoft_logs)
+        save_metric(metrics)
+        return
+    get_log_shipper().submit(mulesoft_logs, metrics)
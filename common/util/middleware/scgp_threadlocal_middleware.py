@@ -1,4 +1,3 @@
-import concurrent.futures
 import logging
 
 from _threading_local import local
@@ -8,7 +7,9 @@ from common.helpers import (
     save_mulesoft_api_log_entry,
     set_thread_local_based_api_log_capturing_enabled,
 )
+from common.models import MulesoftLog
 from common.newrelic_metric import NewRelicMetric
+from common.util.log_shipper import ship_logs
 
 _thread_locals = local()
 
@@ -38,14 +39,11 @@ class ThreadLocalMiddleware:
         clear_thread_local()
         _thread_locals.THREAD_LOCAL_KEY_M = None
         response = self.get_response(request)
-        if getattr(_thread_locals, THREAD_LOCAL_KEY_M, None):
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                mulesoft_api_log_list = getattr(_thread_locals, THREAD_LOCAL_KEY_M)
-                executor.submit(save_mulesoft_api_log, mulesoft_api_log_list)
-        metric_list = getattr(_thread_locals, THREAD_LOCAL_KEY_METRIC, None)
-        if metric_list:
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                executor.submit(save_metric, metric_list)
+        # saved by the background shipper, the response is not held back
+        ship_logs(
+            getattr(_thread_locals, THREAD_LOCAL_KEY_M, None),
+            getattr(_thread_locals, THREAD_LOCAL_KEY_METRIC, None),
+        )
         clear_thread_local()
         return response
 
@@ -69,28 +67,42 @@ get_active_thread_local = lambda key, default=None: getattr(
 )
 
 
-def save_mulesoft_api_log(mulesoft_api_log_list):
+def save_mulesoft_api_log(mulesoft_api_log_list, raise_errors=False):
     """
     This will be invoked after completing process of a request and this will retrieve the list of mulesoft log entries
     from thread local and will save to db
     :param mulesoft_api_log_list:
+    :param raise_errors: raise instead of logging errors
     :return:
     """
     try:
-        if mulesoft_api_log_list:
-            for mulesoft_api_log_str in mulesoft_api_log_list:
-                mulesoft_api_log = deserialize_data(mulesoft_api_log_str)
-                filter_values = mulesoft_api_log.get("filter") and mulesoft_api_log.pop(
-                    "filter"
-                )
-                save_mulesoft_api_log_entry(filter_values, mulesoft_api_log)
+        if not mulesoft_api_log_list:
+            return
+        new_logs = []
+        for mulesoft_api_log_str in mulesoft_api_log_list:
+            mulesoft_api_log = deserialize_data(mulesoft_api_log_str)
+            filter_values = mulesoft_api_log.get("filter") and mulesoft_api_log.pop(
+                "filter"
+            )
+            if not filter_values:
+                new_logs.append(MulesoftLog(**mulesoft_api_log))
+                continue
+            # an update may target a log of this batch, insert pending ones first
+            if new_logs:
+                MulesoftLog.objects.bulk_create(new_logs)
+                new_logs = []
+            save_mulesoft_api_log_entry(filter_values, mulesoft_api_log)
+        if new_logs:
+            MulesoftLog.objects.bulk_create(new_logs)
     except Exception as e:
+        if raise_errors:
+            raise
         logging.exception(
             f"Some error has occurred while saving mulesoft api log entries from thread local: {e}"
         )
 
 
-def save_metric(metric_list):
+def save_metric(metric_list, compress=False, raise_errors=False):
     if not metric_list:
         return
     try:
@@ -104,8 +116,10 @@ def save_metric(metric_list):
                 continue
             # custom here
             metric.add_metric(**metric_val)
-        metric.send_metric()
+        metric.send_metric(compress=compress)
     except Exception as e:
+        if raise_errors:
+            raise
         logging.exception(
             "Some error has occurred while saving metrics from thread local %s" % e
         )
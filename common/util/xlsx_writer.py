@@ -0,0 +1,138 @@
+import base64
+import logging
+import os
+import uuid
+from tempfile import NamedTemporaryFile
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class XlsxCellStyle:
+    """Style of a cell written by StreamingXlsxWriter.
+
+    `convert` is applied to non-empty values before writing (e.g. `float` so
+    numbers are not stored as text), a value it can not convert is kept as is.
+    """
+
+    def __init__(
+        self,
+        font: Optional[Font] = None,
+        alignment: Optional[Alignment] = None,
+        number_format: Optional[str] = None,
+        convert: Optional[Callable] = None,
+    ) -> None:
+        self.font = font
+        self.alignment = alignment
+        self.number_format = number_format
+        self.convert = convert
+
+
+class StreamingXlsxWriter:
+    """Single pass xlsx writer for reports.
+
+    Rows go straight to a write-only openpyxl workbook, so memory does not grow
+    with the report and styles are set while writing instead of reloading and
+    restyling the finished file. Because of the write-only mode column widths
+    are given up front and a row height has to be set when the row is appended.
+    """
+
+    def __init__(
+        self, column_widths: Optional[Dict[int, float]] = None, title=None
+    ) -> None:
+        self._workbook = Workbook(write_only=True)
+        self.worksheet = self._workbook.create_sheet(title)
+        self.row_count = 0
+        for column, width in (column_widths or {}).items():
+            self.worksheet.column_dimensions[get_column_letter(column)].width = width
+
+    def append(
+        self,
+        values: Iterable,
+        style: Optional[XlsxCellStyle] = None,
+        column_styles: Optional[Dict[int, XlsxCellStyle]] = None,
+        height: Optional[float] = None,
+    ) -> None:
+        """
+        Write one row
+        @param values: cell values
+        @param style: style of every cell of the row
+        @param column_styles: style by column index (from 1), overrides `style`
+        @param height: row height
+        """
+        self.row_count += 1
+        if height:
+            self.worksheet.row_dimensions[self.row_count].height = height
+        column_styles = column_styles or {}
+        row = []
+        for column, value in enumerate(values, 1):
+            cell_style = column_styles.get(column, style)
+            row.append(self._make_cell(value, cell_style) if cell_style else value)
+        self.worksheet.append(row)
+
+    def merge(self, range_string: str) -> None:
+        self.worksheet.merged_cells.add(CellRange(range_string))
+
+    def save(self):
+        """Write the workbook to a temporary file and return it"""
+        temporary_file = NamedTemporaryFile("ab+", suffix=".xlsx")
+        self._workbook.save(temporary_file.name)
+        return temporary_file
+
+    def _make_cell(self, value, style: XlsxCellStyle) -> WriteOnlyCell:
+        if style.convert and value not in (None, ""):
+            try:
+                value = style.convert(value)
+            except (TypeError, ValueError):
+                pass
+        cell = WriteOnlyCell(self.worksheet, value=value)
+        if style.font:
+            cell.font = style.font
+        if style.alignment:
+            cell.alignment = style.alignment
+        if style.number_format and isinstance(value, (int, float)):
+            cell.number_format = style.number_format
+        return cell
+
+
+def export_xlsx_file(
+    temporary_file, file_name: str
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Hand over an exported xlsx file to the client.
+    Files up to settings.EXCEL_EXPORT_INLINE_MAX_SIZE are returned base64 encoded,
+    bigger files are uploaded to S3 and returned as a pre-signed download link
+    @return: (base64 content, download url)
+    """
+    size = os.path.getsize(temporary_file.name)
+    if size <= settings.EXCEL_EXPORT_INLINE_MAX_SIZE:
+        with open(temporary_file.name, "rb") as exported_file:
+            return base64.b64encode(exported_file.read()).decode("utf-8"), None
+
+    # prevent circular import
+    from scgp_po_upload.s3_storage import EOrderingS3Storage
+
+    storage = EOrderingS3Storage(
+        querystring_auth=True,
+        querystring_expire=settings.EXCEL_EXPORT_LINK_EXPIRE,
+    )
+    with open(temporary_file.name, "rb") as exported_file:
+        path = storage.save(
+            f"{settings.EXCEL_EXPORT_S3_PREFIX}/{uuid.uuid4()}/{file_name}",
+            exported_file,
+        )
+    logging.info(f"[Excel export] {file_name} ({size} bytes) uploaded to {path}")
+    return None, storage.url(
+        path,
+        parameters={
+            "ResponseContentDisposition": f'attachment; filename="{file_name}"',
+            "ResponseContentType": XLSX_CONTENT_TYPE,
+        },
+    )
@@ -2,7 +2,7 @@ import logging
 import os
 
 from celery import Celery, Task
-from celery.signals import setup_logging
+from celery.signals import setup_logging, worker_process_shutdown
 from django.conf import settings
 
 from .plugins import discover_plugins_modules
@@ -33,30 +33,35 @@ class CustomLogBaseTask(Task):
 
     def on_success(self, *args, **kwargs):
         # prevent circular import
+        from common.util.log_shipper import ship_logs
         from common.util.middleware.scgp_threadlocal_middleware import (
             THREAD_LOCAL_KEY_M,
             THREAD_LOCAL_KEY_METRIC,
             _thread_locals,
             clear_thread_local,
-            save_metric,
-            save_mulesoft_api_log,
         )
 
         logging.info(f"CustomLogBaseTask.on_success.task_name={self.name}")
 
-        ######## save Mulesoft Log ########
-        # get all mulesoft log from thread local and save to db
-        mulesoft_log_list = getattr(_thread_locals, THREAD_LOCAL_KEY_M, None)
-        save_mulesoft_api_log(mulesoft_log_list)
-
-        ######## save New Relic metric ########
-        # get all metric from thread local and save to new relic
-        metric_list = getattr(_thread_locals, THREAD_LOCAL_KEY_METRIC, None)
-        save_metric(metric_list)
+        ######## save Mulesoft Log and New Relic metric ########
+        # get all mulesoft log and metric from thread local,
+        # the background shipper saves them to db and new relic
+        ship_logs(
+            getattr(_thread_locals, THREAD_LOCAL_KEY_M, None),
+            getattr(_thread_locals, THREAD_LOCAL_KEY_METRIC, None),
+        )
         # clear all thread local
         clear_thread_local()
 
 
+@worker_process_shutdown.connect
+def flush_log_shipper(**kwargs):
+    """Ship the remaining Mulesoft logs and metrics before the worker exits."""
+    from common.util.log_shipper import get_log_shipper
+
+    get_log_shipper().stop()
+
+
 app = Celery("saleor")
 
 
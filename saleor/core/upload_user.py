@@ -8,7 +8,7 @@ from pandas.io.excel import read_excel
 
 import sap_migration.models as migration_models
 from saleor.account.models import User
-from saleor.plugins.manager import get_plugins_manager
+from saleor.plugins.manager import get_cached_plugins_manager
 from sap_master_data.models import SoldToMaster
 from scgp_user_management.implementations.scgp_users import (
     create_or_update_user_base,
@@ -390,7 +390,7 @@ def create_external_customers(external_user_list: List[ExternalUser]):
 
 
 def _check_enable_upload_user():
-    manager = get_plugins_manager()
+    manager = get_cached_plugins_manager()
     _plugin = manager.get_plugin("scg.settings")
     config = _plugin.config
     return config.enable_upload_user or False
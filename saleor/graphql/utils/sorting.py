@@ -3,6 +3,8 @@ from typing import Optional, Tuple
 from django.db.models import QuerySet
 from graphql.error import GraphQLError
 
+from common.search import TYPEAHEAD_ORDERING
+
 from ..channel.utils import get_default_channel_slug_or_graphql_error
 from ..core.enums import OrderDirection
 from ..core.types import SortInputObjectType
@@ -110,7 +112,9 @@ def sort_queryset_by_default(
     """Sort queryset by it's default ordering."""
     queryset_model = queryset.model
     default_ordering = ["pk"]
-    if queryset_model and queryset_model._meta.ordering:
+    if "typeahead_rank" in queryset.query.annotations:
+        default_ordering = TYPEAHEAD_ORDERING
+    elif queryset_model and queryset_model._meta.ordering:
         default_ordering = get_model_default_ordering(queryset_model)
 
     ordering_fields = [field.replace("-", "") for field in default_ordering]
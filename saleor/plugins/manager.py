@@ -1,3 +1,6 @@
+import threading
+import time
+import uuid
 from collections import defaultdict
 from decimal import Decimal
 from typing import (
@@ -15,7 +18,9 @@ from typing import (
 
 import opentracing
 from django.conf import settings
+from django.core.cache import cache
 from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
 from django.http import HttpResponse, HttpResponseNotFound
 from django.utils.module_loading import import_string
 from django_countries.fields import Country
@@ -1157,6 +1162,7 @@ class PluginsManager(PaymentInterface):
                 configuration.description = plugin.PLUGIN_DESCRIPTION
                 plugin.active = configuration.active
                 plugin.configuration = configuration.configuration
+                transaction.on_commit(invalidate_plugins_manager_cache)
                 return configuration
 
     def get_plugin(
@@ -1635,3 +1641,62 @@ def get_plugins_manager(
 ) -> PluginsManager:
     with opentracing.global_tracer().start_active_span("get_plugins_manager"):
         return PluginsManager(settings.PLUGINS, requestor_getter)
+
+
+PLUGINS_MANAGER_CACHE_VERSION_KEY = "plugins_manager_cache_version"
+
+_cached_manager: Optional[PluginsManager] = None
+_cached_manager_version: Optional[str] = None
+_cached_manager_loaded_at = 0.0
+_cached_manager_checked_at = 0.0
+_cached_manager_lock = threading.Lock()
+
+
+def get_cached_plugins_manager() -> PluginsManager:
+    """Return a process level manager shared by all requests and tasks.
+
+    Use it instead of `get_plugins_manager` on hot paths that read plugin
+    configuration (e.g. `scg.settings` flags) or call plugins without a
+    requestor. Loading the manager reads every plugin configuration from the
+    database, the cached one does not run any query.
+
+    The manager is rebuilt when the configuration version in the cache is bumped
+    by `invalidate_plugins_manager_cache`, which is checked at most every
+    `PLUGINS_MANAGER_CACHE_CHECK_INTERVAL` seconds, or when it is older than
+    `PLUGINS_MANAGER_CACHE_TTL` seconds.
+    """
+    global _cached_manager, _cached_manager_version
+    global _cached_manager_loaded_at, _cached_manager_checked_at
+
+    now = time.monotonic()
+    manager = _cached_manager
+    if (
+        manager is not None
+        and now - _cached_manager_checked_at
+        < settings.PLUGINS_MANAGER_CACHE_CHECK_INTERVAL
+    ):
+        return manager
+    with _cached_manager_lock:
+        version = cache.get(PLUGINS_MANAGER_CACHE_VERSION_KEY)
+        if (
+            _cached_manager is None
+            or version != _cached_manager_version
+            or now - _cached_manager_loaded_at > settings.PLUGINS_MANAGER_CACHE_TTL
+        ):
+            with opentracing.global_tracer().start_active_span(
+                "get_cached_plugins_manager"
+            ):
+                _cached_manager = PluginsManager(settings.PLUGINS)
+            _cached_manager_version = version
+            _cached_manager_loaded_at = now
+        _cached_manager_checked_at = now
+        return _cached_manager
+
+
+def invalidate_plugins_manager_cache():
+    """Drop cached managers of every process after plugin configuration changes."""
+    global _cached_manager
+
+    cache.set(PLUGINS_MANAGER_CACHE_VERSION_KEY, str(uuid.uuid4()), timeout=None)
+    with _cached_manager_lock:
+        _cached_manager = None
@@ -74,7 +74,7 @@ class ScgSqsPoUploadPlugin(BasePlugin):
             MessageDeduplicationId=message_deduplication_id,
         )
 
-    def sqs_receive_message(self):
+    def get_queue(self):
         config = self.config
         sqs = boto3.resource(
             "sqs",
@@ -82,7 +82,8 @@ class ScgSqsPoUploadPlugin(BasePlugin):
             aws_secret_access_key=config.client_secret,
             region_name=config.region_name,
         )
-        queue_url = config.queue_url
-        queue = sqs.Queue(queue_url)
-        messages = queue.receive_messages(MaxNumberOfMessages=1)
+        return sqs.Queue(config.queue_url)
+
+    def sqs_receive_message(self):
+        messages = self.get_queue().receive_messages(MaxNumberOfMessages=1)
         return messages
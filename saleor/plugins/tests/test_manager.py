@@ -16,7 +16,12 @@ from ...graphql.discount.mutations import convert_catalogue_info_to_global_ids
 from ...payment.interface import PaymentGateway
 from ...product.models import Product
 from ..base_plugin import ExternalAccessTokens
-from ..manager import PluginsManager, get_plugins_manager
+from ..manager import (
+    PluginsManager,
+    get_cached_plugins_manager,
+    get_plugins_manager,
+    invalidate_plugins_manager_cache,
+)
 from ..models import PluginConfiguration
 from ..tests.sample_plugins import (
     ACTIVE_PLUGINS,
@@ -637,6 +642,34 @@ def test_manager_save_plugin_configuration(plugin_configuration):
     assert not plugin_configuration.active
 
 
+def test_get_cached_plugins_manager(settings, plugin_configuration):
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    invalidate_plugins_manager_cache()
+    manager = get_cached_plugins_manager()
+    assert isinstance(manager, PluginsManager)
+    assert len(manager.all_plugins) == 1
+    assert get_cached_plugins_manager() is manager
+
+
+def test_save_plugin_configuration_invalidates_cached_manager(
+    settings, plugin_configuration, django_capture_on_commit_callbacks
+):
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    settings.PLUGINS_MANAGER_CACHE_CHECK_INTERVAL = 0
+    invalidate_plugins_manager_cache()
+    manager = get_cached_plugins_manager()
+    assert manager.get_plugin(PluginSample.PLUGIN_ID).active
+
+    with django_capture_on_commit_callbacks(execute=True):
+        manager.save_plugin_configuration(
+            PluginSample.PLUGIN_ID, None, {"active": False}
+        )
+
+    cached_manager = get_cached_plugins_manager()
+    assert cached_manager is not manager
+    assert not cached_manager.get_plugin(PluginSample.PLUGIN_ID).active
+
+
 def test_plugin_updates_configuration_shape(
     new_config,
     new_config_structure,
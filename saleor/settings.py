@@ -97,8 +97,18 @@ USE_L10N = True
 USE_TZ = True
 RETRY_COUNT = 10
 BATCH_SIZE = 2
-CLEAR_MULES_SOFT_LOG_DATE_RANGE = os.environ.get("CLEAR_MULES_SOFT_LOG_DATE_RANGE", 30)
-CLEAR_SQS_LOG_DATE_RANGE = os.environ.get("CLEAR_SQS_LOG_DATE_RANGE", 60)
+CLEAR_MULES_SOFT_LOG_DATE_RANGE = int(
+    os.environ.get("CLEAR_MULES_SOFT_LOG_DATE_RANGE", 30)
+)
+CLEAR_SQS_LOG_DATE_RANGE = int(os.environ.get("CLEAR_SQS_LOG_DATE_RANGE", 60))
+# nightly purges (scgp_record_cleanup.implementation.purge): rows per transaction
+# and time spent per run, rows left are purged by the next run
+PURGE_BATCH_SIZE = int(os.environ.get("PURGE_BATCH_SIZE", "1000"))
+PURGE_TIME_BUDGET = parse(os.environ.get("PURGE_TIME_BUDGET", "30 minutes"))
+if PURGE_TIME_BUDGET is None:
+    raise ImproperlyConfigured(
+        "PURGE_TIME_BUDGET must be a duration, e.g. '30 minutes' or '1800'."
+    )
 
 FORM_RENDERER = "django.forms.renderers.TemplatesSetting"
 
@@ -159,6 +169,9 @@ loaders = [
     "django.template.loaders.filesystem.Loader",
     "django.template.loaders.app_directories.Loader",
 ]
+if not DEBUG:
+    # templates (pdf and e-mail ones) are compiled once per process
+    loaders = [("django.template.loaders.cached.Loader", loaders)]
 
 TEMPLATES_DIR = os.path.join(PROJECT_ROOT, "templates")
 TEMPLATES = [
@@ -532,6 +545,13 @@ EMPTY_CHECKOUTS_TIMEDELTA = timedelta(
 EXPORT_FILES_TIMEDELTA = timedelta(
     seconds=parse(os.environ.get("EXPORT_FILES_TIMEDELTA", "30 days"))
 )
+# Excel reports bigger than this (bytes) are returned as S3 download link
+# instead of base64 content, expire objects under the prefix with a bucket lifecycle rule
+EXCEL_EXPORT_INLINE_MAX_SIZE = int(
+    os.environ.get("EXCEL_EXPORT_INLINE_MAX_SIZE", str(5 * 1024 * 1024))
+)
+EXCEL_EXPORT_S3_PREFIX = os.environ.get("EXCEL_EXPORT_S3_PREFIX", "excel_exports")
+EXCEL_EXPORT_LINK_EXPIRE = parse(os.environ.get("EXCEL_EXPORT_LINK_EXPIRE", "1 hour"))
 
 # CELERY SETTINGS
 AWS_CELERY_ACCESS_KEY = safequote(os.environ.get("AWS_CELERY_ACCESS_KEY") or "")
@@ -633,12 +653,82 @@ CELERY_BEAT_SCHEDULE = {
         "task": "scgp_require_attention_items.tasks.mulesoftlog_cleanup",
         "schedule": crontab(hour=17, minute=0),  # Schedule at midnight BKK time,
     },
+    "send_order_notifications": {
+        "task": "scg_checkout.tasks.send_order_notifications",
+        "schedule": crontab(minute="*/1"),
+    },
+    "refresh_material_selling_profiles": {
+        "task": "sap_master_data.tasks.refresh_material_selling_profiles",
+        "schedule": crontab(hour=18, minute=0),  # 1am BKK time, after master loads
+    },
 }
 
+# YT-65218 iPlan order status sync (scg.sqs_update_order)
+IPLAN_SYNC_BATCH_CONSUMER_ENABLED = get_bool_from_env(
+    "IPLAN_SYNC_BATCH_CONSUMER_ENABLED", True
+)
+IPLAN_SYNC_MAX_WORKERS = int(os.environ.get("IPLAN_SYNC_MAX_WORKERS", "4"))
+# keep below the beat interval of sync_orders_data_iplan
+IPLAN_SYNC_TIME_BUDGET = int(os.environ.get("IPLAN_SYNC_TIME_BUDGET", "50"))
+
+# SAP ES38 delivery/GI sync (scg.sqs_delivery_gi)
+ES38_SYNC_BATCH_CONSUMER_ENABLED = get_bool_from_env(
+    "ES38_SYNC_BATCH_CONSUMER_ENABLED", True
+)
+ES38_SYNC_MAX_WORKERS = int(os.environ.get("ES38_SYNC_MAX_WORKERS", "4"))
+# keep below the beat interval of sync_orders_data
+ES38_SYNC_TIME_BUDGET = int(os.environ.get("ES38_SYNC_TIME_BUDGET", "50"))
+
+# PO / Excel upload to SAP (scg.sqs_po_upload)
+PO_UPLOAD_BATCH_CONSUMER_ENABLED = get_bool_from_env(
+    "PO_UPLOAD_BATCH_CONSUMER_ENABLED", True
+)
+# files of different uploaders are handled in parallel
+PO_UPLOAD_MAX_WORKERS = int(os.environ.get("PO_UPLOAD_MAX_WORKERS", "4"))
+PO_UPLOAD_TIME_BUDGET = int(os.environ.get("PO_UPLOAD_TIME_BUDGET", "50"))
+
 ENABLE_RETRY_R5 = get_bool_from_env("ENABLE_RETRY_R5", True)
 if not ENABLE_RETRY_R5:
     warnings.warn("RETRY_R5 Job is disabled")
     CELERY_BEAT_SCHEDULE.pop("r5_retry")
+# R5 retry queue (common.models.MulesoftRetry), orders are retried in parallel
+R5_RETRY_MAX_WORKERS = int(os.environ.get("R5_RETRY_MAX_WORKERS", "4"))
+R5_RETRY_BATCH_SIZE = int(os.environ.get("R5_RETRY_BATCH_SIZE", "100"))
+# a claimed retry not finished within the lease is claimed again
+R5_RETRY_LEASE = parse(os.environ.get("R5_RETRY_LEASE", "5 minutes"))
+# delay after the n-th failed attempt: base * 2 ** (n - 1), at most max
+R5_RETRY_BACKOFF_BASE = parse(os.environ.get("R5_RETRY_BACKOFF_BASE", "1 minute"))
+R5_RETRY_BACKOFF_MAX = parse(os.environ.get("R5_RETRY_BACKOFF_MAX", "1 hour"))
+
+# Order e-mails outbox (scg_checkout.models.OrderNotification), sent by workers
+ORDER_NOTIFICATION_BATCH_SIZE = int(
+    os.environ.get("ORDER_NOTIFICATION_BATCH_SIZE", "50")
+)
+ORDER_NOTIFICATION_MAX_ATTEMPTS = int(
+    os.environ.get("ORDER_NOTIFICATION_MAX_ATTEMPTS", "5")
+)
+# a claimed notification not sent within the lease is claimed again
+ORDER_NOTIFICATION_LEASE = parse(
+    os.environ.get("ORDER_NOTIFICATION_LEASE", "10 minutes")
+)
+# delay after the n-th failed attempt: base * 2 ** (n - 1), at most max
+ORDER_NOTIFICATION_BACKOFF_BASE = parse(
+    os.environ.get("ORDER_NOTIFICATION_BACKOFF_BASE", "1 minute")
+)
+ORDER_NOTIFICATION_BACKOFF_MAX = parse(
+    os.environ.get("ORDER_NOTIFICATION_BACKOFF_MAX", "1 hour")
+)
+
+# nightly GDC employee sync (scgp_user_management.tasks.map_gdc_users)
+GDC_API_TIMEOUT = int(os.environ.get("GDC_API_TIMEOUT", "30"))
+GDC_SYNC_MAX_WORKERS = int(os.environ.get("GDC_SYNC_MAX_WORKERS", "8"))
+GDC_SYNC_CHUNK_SIZE = int(os.environ.get("GDC_SYNC_CHUNK_SIZE", "200"))
+# an interrupted run is resumed by the next one within this delay
+GDC_SYNC_CHECKPOINT_TTL = parse(os.environ.get("GDC_SYNC_CHECKPOINT_TTL", "2 days"))
+
+# PDF rendering (weasyprint) runs on a pool of processes, 0 renders in process
+PDF_RENDER_MAX_WORKERS = int(os.environ.get("PDF_RENDER_MAX_WORKERS", "2"))
+PDF_RENDER_TIMEOUT = parse(os.environ.get("PDF_RENDER_TIMEOUT", "2 minutes"))
 
 EVENT_PAYLOAD_DELETE_PERIOD = timedelta(
     seconds=parse(os.environ.get("EVENT_PAYLOAD_DELETE_PERIOD", "14 days"))
@@ -781,6 +871,43 @@ if REDIS_URL:
 CACHES = {"default": django_cache_url.config()}
 CACHES["default"]["TIMEOUT"] = parse(os.environ.get("CACHE_TIMEOUT", "7 days"))
 
+# process level plugins manager, see saleor.plugins.manager.get_cached_plugins_manager
+PLUGINS_MANAGER_CACHE_CHECK_INTERVAL = parse(
+    os.environ.get("PLUGINS_MANAGER_CACHE_CHECK_INTERVAL", "5 seconds")
+)
+PLUGINS_MANAGER_CACHE_TTL = parse(
+    os.environ.get("PLUGINS_MANAGER_CACHE_TTL", "10 minutes")
+)
+
+# read-through cache of SAP master data by code, see sap_master_data.cache
+MASTER_DATA_CACHE_ENABLED = get_bool_from_env("MASTER_DATA_CACHE_ENABLED", True)
+# master data loads invalidate the cache with the master_data_loaded command,
+# the ttl bounds staleness when a load does not
+MASTER_DATA_CACHE_TTL = parse(os.environ.get("MASTER_DATA_CACHE_TTL", "15 minutes"))
+MASTER_DATA_CACHE_LOCAL_SIZE = int(os.environ.get("MASTER_DATA_CACHE_LOCAL_SIZE", 4096))
+MASTER_DATA_CACHE_CHECK_INTERVAL = parse(
+    os.environ.get("MASTER_DATA_CACHE_CHECK_INTERVAL", "5 seconds")
+)
+# how long materials without sale master are not rebuilt on read,
+# see sap_master_data.selling_profiles
+SELLING_PROFILE_MISS_TTL = parse(
+    os.environ.get("SELLING_PROFILE_MISS_TTL", "5 minutes")
+)
+
+# short lived cache of SAP ES14 / ES15 responses, see common.sap.response_cache
+SAP_RESPONSE_CACHE_ENABLED = get_bool_from_env("SAP_RESPONSE_CACHE_ENABLED", True)
+SAP_ES14_CACHE_TTL = parse(os.environ.get("SAP_ES14_CACHE_TTL", "1 minute"))
+SAP_ES15_CACHE_TTL = parse(os.environ.get("SAP_ES15_CACHE_TTL", "5 minutes"))
+# skip re-syncing a contract when its ES14 data did not change since the last sync
+CONTRACT_SYNC_SKIP_UNCHANGED = get_bool_from_env("CONTRACT_SYNC_SKIP_UNCHANGED", True)
+
+# total counts of listing connections, see scgp_export.graphql.resolvers.connection_counts
+CONNECTION_COUNT_MODE = os.environ.get("CONNECTION_COUNT_MODE", "cached")
+CONNECTION_COUNT_CACHE_TTL = parse(
+    os.environ.get("CONNECTION_COUNT_CACHE_TTL", "30 seconds")
+)
+CONNECTION_COUNT_CAP = int(os.environ.get("CONNECTION_COUNT_CAP", 10000))
+
 # Todo: Need to create ENV variable
 JWT_EXPIRE = get_bool_from_env("JWT_EXPIRE", True)
 JWT_TTL_ACCESS = timedelta(
@@ -804,6 +931,27 @@ MULESOFT_API_URL = os.environ.get("MULESOFT_API_URL", None)
 MULESOFT_CLIENT_ID = os.environ.get("MULESOFT_CLIENT_ID", None)
 MULESOFT_CLIENT_SECRET = os.environ.get("MULESOFT_CLIENT_SECRET", None)
 MULESOFT_API_TIMEOUT = int(os.environ.get("MULESOFT_API_TIMEOUT", "300"))
+MULESOFT_API_CONNECT_TIMEOUT = int(os.environ.get("MULESOFT_API_CONNECT_TIMEOUT", "10"))
+# keep-alive connection pool per service type (sap, iplan, cp, ots, pmt)
+MULESOFT_POOL_CONNECTIONS = int(os.environ.get("MULESOFT_POOL_CONNECTIONS", "4"))
+MULESOFT_POOL_MAXSIZE = int(os.environ.get("MULESOFT_POOL_MAXSIZE", "20"))
+MULESOFT_CONNECT_RETRIES = int(os.environ.get("MULESOFT_CONNECT_RETRIES", "1"))
+# max concurrent calls of MulesoftApiRequest.batch_call
+MULESOFT_BATCH_MAX_WORKERS = int(os.environ.get("MULESOFT_BATCH_MAX_WORKERS", "8"))
+# background shipping of mulesoft api logs and new relic metrics
+MULESOFT_LOG_SHIPPER_ASYNC = get_bool_from_env("MULESOFT_LOG_SHIPPER_ASYNC", True)
+MULESOFT_LOG_SHIPPER_QUEUE_SIZE = int(
+    os.environ.get("MULESOFT_LOG_SHIPPER_QUEUE_SIZE", "10000")
+)
+MULESOFT_LOG_SHIPPER_BATCH_SIZE = int(
+    os.environ.get("MULESOFT_LOG_SHIPPER_BATCH_SIZE", "200")
+)
+MULESOFT_LOG_SHIPPER_FLUSH_INTERVAL = float(
+    os.environ.get("MULESOFT_LOG_SHIPPER_FLUSH_INTERVAL", "1")
+)
+MULESOFT_LOG_SHIPPER_SHUTDOWN_TIMEOUT = float(
+    os.environ.get("MULESOFT_LOG_SHIPPER_SHUTDOWN_TIMEOUT", "10")
+)
 MULESOFT_LOG_URL = os.environ.get(
     "MULESOFT_LOG_URL", None
 )  # ex. http://localhost:8000/api/log-mulesoft
@@ -835,6 +983,9 @@ NEW_RELIC_LICENSE_KEY = os.environ.get("NEW_RELIC_LICENSE_KEY", None)
 NEW_RELIC_ENTITY_NAME = os.environ.get("NEW_RELIC_ENTITY_NAME", None)
 NEW_RELIC_E2E_METRIC_NAME = "Custom/E2E"
 NEW_RELIC_MULESOFT_METRIC_NAME = "Custom/MulesoftAPI"
+NEW_RELIC_SQS_CONSUMER_METRIC_NAME = "Custom/SqsConsumer"
+NEW_RELIC_SAP_RESPONSE_CACHE_METRIC_NAME = "Custom/SapResponseCache"
+NEW_RELIC_PO_UPLOAD_METRIC_NAME = "Custom/PoUpload"
 NEW_RELIC_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
 NEW_RELIC_CREATE_ORDER_METRIC_NAME = "eor.e2e.createorder"
 NEW_RELIC_CHANGE_ORDER_METRIC_NAME = "eor.e2e.changeorder"
@@ -22,6 +22,13 @@ def lazy_re_compile(regex, flags=0):
 
 CELERY_TASK_ALWAYS_EAGER = True
 
+MULESOFT_LOG_SHIPPER_ASYNC = False
+
+MASTER_DATA_CACHE_ENABLED = False
+SAP_RESPONSE_CACHE_ENABLED = False
+CONNECTION_COUNT_MODE = "exact"
+PDF_RENDER_MAX_WORKERS = 0
+
 SECRET_KEY = "NOTREALLY"
 
 ALLOWED_CLIENT_HOSTS = ["www.example.com"]
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class SapMasterDataConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "sap_master_data"
+
+    def ready(self):
+        from .cache import connect_master_data_cache_signals
+
+        connect_master_data_cache_signals()
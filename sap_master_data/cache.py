@@ -0,0 +1,150 @@
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from sap_master_data import models
+
+MASTER_DATA_CACHE_VERSION_KEY = "sap_master_data_cache_version"
+ALL_ROWS = "__all__"
+
+# cached model -> field the rows are looked up by
+CACHED_MODELS = {
+    models.SalesOrganizationMaster: "code",
+    models.DistributionChannelMaster: "code",
+    models.DivisionMaster: "code",
+    models.CustomerGroupMaster: "code",
+    models.CustomerGroup1Master: "code",
+    models.CustomerGroup2Master: "code",
+    models.CustomerGroup3Master: "code",
+    models.CustomerGroup4Master: "code",
+    models.Incoterms1Master: "code",
+    models.SalesGroup: "sales_group_code",
+    models.CurrencyMaster: "code",
+    models.SoldToMaster: "sold_to_code",
+}
+
+# key -> (pickled row, loaded at)
+_local_rows: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+_local_lock = threading.Lock()
+_version: Optional[str] = None
+_version_checked_at = 0.0
+
+
+def get_master_by_code(model, code):
+    """Return the master row of `model` for `code`, None when there is none.
+
+    Rows are read through a per-process LRU and the default cache, keyed by
+    the master data version, so a lookup costs no query after the first one.
+    Every call returns a fresh instance, changing it does not affect the cache.
+    """
+    if not code:
+        return None
+    if not settings.MASTER_DATA_CACHE_ENABLED:
+        return _query_by_code(model, code)
+    return _read_through(model, str(code), lambda: _query_by_code(model, code))
+
+
+def get_all_masters(model) -> List:
+    """Return every row of a (small) master table, ordered by pk"""
+    if not settings.MASTER_DATA_CACHE_ENABLED:
+        return list(model.objects.order_by("pk"))
+    return _read_through(model, ALL_ROWS, lambda: list(model.objects.order_by("pk")))
+
+
+def invalidate_master_data_cache():
+    """Drop cached master data of every process.
+
+    Called on commit when a cached model is saved or deleted through the ORM.
+    Master data loads, which write the tables outside of the ORM, call it
+    through the master_data_loaded command / task when they finish.
+    """
+    global _version, _version_checked_at
+
+    version = str(uuid.uuid4())
+    cache.set(MASTER_DATA_CACHE_VERSION_KEY, version, timeout=None)
+    with _local_lock:
+        _local_rows.clear()
+        _version = version
+        _version_checked_at = time.monotonic()
+
+
+def connect_master_data_cache_signals():
+    for model in CACHED_MODELS:
+        post_save.connect(
+            _on_master_data_change,
+            sender=model,
+            dispatch_uid=f"master_data_cache_post_save_{model.__name__}",
+        )
+        post_delete.connect(
+            _on_master_data_change,
+            sender=model,
+            dispatch_uid=f"master_data_cache_post_delete_{model.__name__}",
+        )
+
+
+def _on_master_data_change(sender, **kwargs):
+    transaction.on_commit(invalidate_master_data_cache)
+
+
+def _query_by_code(model, code):
+    field = CACHED_MODELS[model]
+    return model.objects.filter(**{field: code}).order_by("pk").first()
+
+
+def _read_through(model, code: str, query):
+    version = _current_version()
+    key = f"sap_master_data:{version}:{model._meta.label_lower}:{code}"
+    now = time.monotonic()
+    data = None
+    with _local_lock:
+        entry = _local_rows.get(key)
+        if entry is not None and now - entry[1] < settings.MASTER_DATA_CACHE_TTL:
+            data = entry[0]
+            _local_rows.move_to_end(key)
+    if data is None:
+        data = cache.get(key)
+        if data is None:
+            row = query()
+            if row is None:
+                # not cached, a row loaded later is found by the next lookup
+                return None
+            data = pickle.dumps(row, pickle.HIGHEST_PROTOCOL)
+            cache.set(key, data, timeout=settings.MASTER_DATA_CACHE_TTL)
+        with _local_lock:
+            _local_rows[key] = (data, now)
+            _local_rows.move_to_end(key)
+            while len(_local_rows) > settings.MASTER_DATA_CACHE_LOCAL_SIZE:
+                _local_rows.popitem(last=False)
+    return pickle.loads(data)
+
+
+def _current_version() -> str:
+    """Version of the master data, checked in the cache at most every
+    MASTER_DATA_CACHE_CHECK_INTERVAL seconds"""
+    global _version, _version_checked_at
+
+    now = time.monotonic()
+    version = _version
+    if (
+        version is not None
+        and now - _version_checked_at < settings.MASTER_DATA_CACHE_CHECK_INTERVAL
+    ):
+        return version
+    version = cache.get(MASTER_DATA_CACHE_VERSION_KEY)
+    if version is None:
+        cache.add(MASTER_DATA_CACHE_VERSION_KEY, str(uuid.uuid4()), timeout=None)
+        version = cache.get(MASTER_DATA_CACHE_VERSION_KEY)
+    with _local_lock:
+        if version != _version:
+            _local_rows.clear()
+            _version = version
+        _version_checked_at = now
+    return version
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from sap_master_data.tasks import master_data_loaded
+
+
+class Command(BaseCommand):
+    help = (
+        "Drops data cached from the SAP master tables and rebuilds material "
+        "selling profiles, run after loading the tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--material-codes",
+            nargs="+",
+            help="Materials loaded, every material when not given.",
+        )
+
+    def handle(self, *args, **options):
+        master_data_loaded(options["material_codes"])
+        self.stdout.write("Master data caches invalidated.")
@@ -0,0 +1,48 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+import common.search
+
+
+class Migration(migrations.Migration):
+    # master tables stay writable while the indexes are built
+    atomic = False
+
+    dependencies = [
+        ("sap_master_data", "0033_alter_bommaterial_unique_together"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="materialmaster",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    common.search.SearchText("material_code", "description_en"),
+                    name="gin_trgm_ops",
+                ),
+                name="material_search_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="materialclassificationmaster",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    common.search.SearchText("grade", "basis_weight"),
+                    name="gin_trgm_ops",
+                ),
+                name="matclass_search_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="soldtomaster",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    common.search.SearchText("sold_to_code", "sold_to_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="soldto_search_trgm_idx",
+            ),
+        ),
+    ]
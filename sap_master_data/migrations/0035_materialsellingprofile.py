@@ -0,0 +1,115 @@
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sap_master_data", "0034_search_trgm_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MaterialSellingProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("material_code", models.CharField(max_length=50)),
+                ("sales_organization_code", models.CharField(max_length=10)),
+                ("distribution_channel_code", models.CharField(max_length=10)),
+                (
+                    "material_type",
+                    models.CharField(blank=True, max_length=10, null=True),
+                ),
+                ("sales_unit", models.CharField(blank=True, max_length=10, null=True)),
+                (
+                    "material_weight_unit",
+                    models.CharField(blank=True, max_length=10, null=True),
+                ),
+                (
+                    "delivery_plant",
+                    models.CharField(blank=True, max_length=10, null=True),
+                ),
+                (
+                    "material_group1",
+                    models.CharField(blank=True, max_length=10, null=True),
+                ),
+                (
+                    "item_category_group",
+                    models.CharField(blank=True, max_length=10, null=True),
+                ),
+                (
+                    "sale_text1_th",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "sale_text2_th",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "sale_text3_th",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "sale_text4_th",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "sale_text1_en",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "sale_text2_en",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "sale_text3_en",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "sale_text4_en",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "customer_material_code",
+                    models.CharField(blank=True, max_length=128, null=True),
+                ),
+                ("weight_unit", models.CharField(blank=True, max_length=10, null=True)),
+                ("weight", models.FloatField(blank=True, null=True)),
+                (
+                    "bom_components",
+                    models.JSONField(
+                        default=list,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                    ),
+                ),
+                ("refreshed_at", models.DateTimeField(auto_now=True)),
+                (
+                    "material",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="sap_master_data.materialmaster",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "sap_master_data_material_selling_profile",
+                "unique_together": {
+                    (
+                        "material_code",
+                        "sales_organization_code",
+                        "distribution_channel_code",
+                    )
+                },
+            },
+        ),
+    ]
@@ -1,5 +1,7 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
+from common.search import search_text_index
 from saleor.account.models import User
 from scg_checkout.models import ScgpMaterialGroup
 
@@ -105,6 +107,13 @@ class MaterialMaster(models.Model):
     )
     batch_flag = models.CharField(max_length=1, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            search_text_index(
+                "material_search_trgm_idx", "material_code", "description_en"
+            ),
+        ]
+
 
 class MaterialSaleMaster(models.Model):
     material_code = models.CharField(max_length=50, null=True, blank=True)
@@ -216,6 +225,11 @@ class MaterialClassificationMaster(models.Model):
         MaterialMaster, null=True, blank=True, on_delete=models.CASCADE
     )
 
+    class Meta:
+        indexes = [
+            search_text_index("matclass_search_trgm_idx", "grade", "basis_weight"),
+        ]
+
 
 class Conversion1Master(models.Model):
     material_code = models.CharField(max_length=50, null=True, blank=True, unique=True)
@@ -260,6 +274,11 @@ class SoldToMaster(models.Model):
     language = models.CharField(max_length=10, null=True, blank=True)
     user = models.ManyToManyField(User, related_name="master_sold_to")
 
+    class Meta:
+        indexes = [
+            search_text_index("soldto_search_trgm_idx", "sold_to_code", "sold_to_name"),
+        ]
+
 
 class SoldToUnloadingPointMaster(models.Model):
     sold_to_code = models.CharField(max_length=10, null=True, blank=True)
@@ -491,3 +510,49 @@ class BomMaterial(models.Model):
     class Meta:
         db_table = "sap_master_data_bom_material"
         unique_together = ("parent_material_code", "material_code")
+
+
+class MaterialSellingProfile(models.Model):
+    """
+    What an order line needs from the material master data, by material, sales
+    org and distribution channel: one row per MaterialSaleMaster row, built by
+    sap_master_data.selling_profiles from MaterialMaster, MaterialSaleMaster,
+    SoldToMaterialMaster, Conversion2Master and BomMaterial.
+    """
+
+    material = models.ForeignKey(
+        MaterialMaster, on_delete=models.CASCADE, related_name="+"
+    )
+    material_code = models.CharField(max_length=50)
+    sales_organization_code = models.CharField(max_length=10)
+    distribution_channel_code = models.CharField(max_length=10)
+    material_type = models.CharField(max_length=10, null=True, blank=True)
+    # sales unit of the sale master, base unit of the material otherwise
+    sales_unit = models.CharField(max_length=10, null=True, blank=True)
+    material_weight_unit = models.CharField(max_length=10, null=True, blank=True)
+    delivery_plant = models.CharField(max_length=10, null=True, blank=True)
+    material_group1 = models.CharField(max_length=10, null=True, blank=True)
+    item_category_group = models.CharField(max_length=10, null=True, blank=True)
+    sale_text1_th = models.CharField(max_length=255, null=True, blank=True)
+    sale_text2_th = models.CharField(max_length=255, null=True, blank=True)
+    sale_text3_th = models.CharField(max_length=255, null=True, blank=True)
+    sale_text4_th = models.CharField(max_length=255, null=True, blank=True)
+    sale_text1_en = models.CharField(max_length=255, null=True, blank=True)
+    sale_text2_en = models.CharField(max_length=255, null=True, blank=True)
+    sale_text3_en = models.CharField(max_length=255, null=True, blank=True)
+    sale_text4_en = models.CharField(max_length=255, null=True, blank=True)
+    customer_material_code = models.CharField(max_length=128, null=True, blank=True)
+    # Conversion2Master of the sales unit
+    weight_unit = models.CharField(max_length=10, null=True, blank=True)
+    weight = models.FloatField(null=True, blank=True)
+    # [{"material_code", "quantity", "unit", "valid_from", "valid_to"}]
+    bom_components = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "sap_master_data_material_selling_profile"
+        unique_together = (
+            "material_code",
+            "sales_organization_code",
+            "distribution_channel_code",
+        )
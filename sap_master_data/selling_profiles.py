@@ -0,0 +1,242 @@
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from sap_master_data import models
+
+SALE_TEXT_FIELDS = ["sale_text1", "sale_text2", "sale_text3", "sale_text4"]
+
+
+def get_selling_profile(
+    material_code, sales_organization_code, distribution_channel_code
+) -> Optional[models.MaterialSellingProfile]:
+    return get_selling_profiles(
+        [material_code], sales_organization_code, distribution_channel_code
+    ).get(material_code)
+
+
+def get_selling_profiles(
+    material_codes: Iterable[str], sales_organization_code, distribution_channel_code
+) -> Dict[str, models.MaterialSellingProfile]:
+    """
+    Profiles of `material_codes` by material code, in one indexed lookup.
+    Materials which are not sold in the sales org / channel are missing from
+    the result. Materials without a profile yet are built in memory and stored
+    by a refresh task once the current transaction is committed, the read
+    itself writes nothing.
+    """
+    material_codes = {code for code in material_codes if code}
+    if not material_codes:
+        return {}
+    key = (sales_organization_code, distribution_channel_code)
+    profiles = {}
+    built_codes = set()
+    for profile in models.MaterialSellingProfile.objects.filter(
+        material_code__in=material_codes
+    ):
+        # profiles of other sales orgs / channels: the material is built
+        # and not sold here
+        built_codes.add(profile.material_code)
+        if _profile_key(profile) == key:
+            profiles[profile.material_code] = profile
+
+    missing_codes = material_codes - built_codes
+    if missing_codes:
+        missing_codes -= _known_misses(missing_codes)
+    if missing_codes:
+        built = build_selling_profiles(missing_codes)
+        for profile in built:
+            if _profile_key(profile) == key:
+                profiles[profile.material_code] = profile
+        found_codes = {profile.material_code for profile in built}
+        _remember_misses(missing_codes - found_codes)
+        schedule_selling_profile_refresh(found_codes)
+    return profiles
+
+
+def get_sale_texts(profile, language) -> List[Optional[str]]:
+    """Sale texts 1 to 4 in the language of the sold to ("E" english, thai otherwise)"""
+    suffix = "en" if language == "E" else "th"
+    return [getattr(profile, f"{field}_{suffix}") for field in SALE_TEXT_FIELDS]
+
+
+def get_bom_components(profile, date) -> List[dict]:
+    """BOM components of the profile valid on `date`"""
+    return [
+        component
+        for component in profile.bom_components
+        if component["valid_from"]
+        and parse_date(str(component["valid_from"])) <= date
+        and component["valid_to"]
+        and parse_date(str(component["valid_to"])) >= date
+    ]
+
+
+def refresh_selling_profiles(material_codes: Optional[Iterable[str]] = None) -> int:
+    """
+    (Re)build the profiles of `material_codes`, of every material when None.
+    Master data loads call it through the master_data_loaded command / task
+    with the material codes they changed.
+    @return: number of profiles built
+    """
+    if material_codes is None:
+        return refresh_all_selling_profiles()
+    material_codes = {code for code in material_codes if code}
+    if not material_codes:
+        return 0
+
+    profiles = build_selling_profiles(material_codes)
+    with transaction.atomic():
+        models.MaterialSellingProfile.objects.filter(
+            material_code__in=material_codes
+        ).delete()
+        # a concurrent refresh of the same materials builds the same rows
+        models.MaterialSellingProfile.objects.bulk_create(
+            profiles, ignore_conflicts=True
+        )
+    cache.delete_many([_miss_key(code) for code in material_codes])
+    return len(profiles)
+
+
+def build_selling_profiles(
+    material_codes: Iterable[str],
+) -> List[models.MaterialSellingProfile]:
+    """Unsaved profiles of `material_codes` built from the master data"""
+    materials = {
+        code: material
+        for (code,), material in _first_by(
+            models.MaterialMaster.objects.filter(material_code__in=material_codes),
+            "material_code",
+        ).items()
+    }
+    sale_masters = _first_by(
+        models.MaterialSaleMaster.objects.filter(material_code__in=materials),
+        "material_code",
+        "sales_organization_code",
+        "distribution_channel_code",
+    )
+    customer_materials = _first_by(
+        models.SoldToMaterialMaster.objects.filter(material_code__in=materials),
+        "material_code",
+    )
+    conversions = _first_by(
+        models.Conversion2Master.objects.filter(material_code__in=materials),
+        "material_code",
+        "to_unit",
+    )
+    bom_components = {}
+    for bom_material in models.BomMaterial.objects.filter(
+        parent_material_code__in=materials
+    ).order_by("pk"):
+        bom_components.setdefault(bom_material.parent_material_code, []).append(
+            {
+                "material_code": bom_material.material_code,
+                "quantity": bom_material.quantity,
+                "unit": bom_material.unit,
+                "valid_from": bom_material.valid_from,
+                "valid_to": bom_material.valid_to,
+            }
+        )
+
+    profiles = []
+    for (material_code, sales_org, channel), sale_master in sale_masters.items():
+        if not sales_org or not channel:
+            continue
+        material = materials[material_code]
+        sales_unit = sale_master.sales_unit or material.base_unit
+        conversion = conversions.get((material_code, sales_unit))
+        customer_material = customer_materials.get((material_code,))
+        profiles.append(
+            models.MaterialSellingProfile(
+                material=material,
+                material_code=material_code,
+                sales_organization_code=sales_org,
+                distribution_channel_code=channel,
+                material_type=material.material_type,
+                sales_unit=sales_unit,
+                material_weight_unit=material.weight_unit,
+                delivery_plant=sale_master.delivery_plant,
+                material_group1=sale_master.material_group1,
+                item_category_group=sale_master.item_category_group,
+                customer_material_code=customer_material
+                and customer_material.sold_to_material_code,
+                weight_unit=conversion and conversion.from_unit,
+                weight=conversion and conversion.calculation,
+                bom_components=bom_components.get(material_code, []),
+                **{
+                    f"{field}_{suffix}": getattr(sale_master, f"{field}_{suffix}")
+                    for field in SALE_TEXT_FIELDS
+                    for suffix in ("en", "th")
+                },
+            )
+        )
+    return profiles
+
+
+def refresh_all_selling_profiles(chunk_size=1000) -> int:
+    """Rebuild every profile, `chunk_size` materials at a time"""
+    material_codes = sorted(
+        set(
+            models.MaterialSaleMaster.objects.exclude(material_code__isnull=True)
+            .values_list("material_code", flat=True)
+            .distinct()
+        )
+    )
+    count = 0
+    for start in range(0, len(material_codes), chunk_size):
+        count += refresh_selling_profiles(material_codes[start : start + chunk_size])
+    # materials not sold anymore
+    models.MaterialSellingProfile.objects.exclude(
+        material_code__in=models.MaterialSaleMaster.objects.exclude(
+            material_code__isnull=True
+        ).values("material_code")
+    ).delete()
+    return count
+
+
+def schedule_selling_profile_refresh(material_codes: Iterable[str]):
+    """
+    Refresh the profiles of `material_codes` in a task once the current
+    transaction is committed.
+    """
+    material_codes = sorted({code for code in material_codes if code})
+    if not material_codes:
+        return
+    from sap_master_data.tasks import refresh_material_selling_profiles
+
+    transaction.on_commit(
+        lambda: refresh_material_selling_profiles.delay(material_codes)
+    )
+
+
+def _profile_key(profile):
+    return profile.sales_organization_code, profile.distribution_channel_code
+
+
+def _miss_key(material_code):
+    return f"selling_profile_miss:{material_code}"
+
+
+def _known_misses(material_codes) -> Set[str]:
+    """Materials recently found without any sale master"""
+    keys = {_miss_key(code): code for code in material_codes}
+    return {keys[key] for key in cache.get_many(list(keys))}
+
+
+def _remember_misses(material_codes):
+    if material_codes:
+        cache.set_many(
+            {_miss_key(code): True for code in material_codes},
+            timeout=settings.SELLING_PROFILE_MISS_TTL,
+        )
+
+
+def _first_by(queryset, *key_fields):
+    """{key: first row by pk}, as `.first()` returns for each key"""
+    rows = {}
+    for row in queryset.order_by("pk"):
+        rows.setdefault(tuple(getattr(row, field) for field in key_fields), row)
+    return rows
@@ -0,0 +1,29 @@
+import logging
+
+from saleor.celeryconf import app
+from sap_master_data.cache import invalidate_master_data_cache
+from sap_master_data.selling_profiles import refresh_selling_profiles
+
+
+@app.task
+def refresh_material_selling_profiles(material_codes=None):
+    """
+    Rebuild material selling profiles, of every material when no codes are given.
+    """
+    logging.info("invoked refresh_material_selling_profiles")
+    count = refresh_selling_profiles(material_codes)
+    logging.info(f"refresh_material_selling_profiles: {count} profiles built")
+
+
+@app.task
+def master_data_loaded(material_codes=None):
+    """
+    Called by master data loads when they finish, the loads write the master
+    tables outside of the ORM so no model signal tells the caches about them.
+    Selling profiles of `material_codes` are rebuilt, of every material when
+    no codes are given.
+    """
+    logging.info("invoked master_data_loaded")
+    invalidate_master_data_cache()
+    count = refresh_selling_profiles(material_codes)
+    logging.info(f"master_data_loaded: {count} selling profiles built")
@@ -0,0 +1,81 @@
+import pytest
+from django.core.management import call_command
+
+from sap_master_data.cache import (
+    get_all_masters,
+    get_master_by_code,
+    invalidate_master_data_cache,
+)
+from sap_master_data.models import SalesOrganizationMaster, SoldToMaster
+
+
+@pytest.fixture
+def master_data_cache(settings):
+    settings.MASTER_DATA_CACHE_ENABLED = True
+    settings.MASTER_DATA_CACHE_CHECK_INTERVAL = 0
+    invalidate_master_data_cache()
+    yield
+    invalidate_master_data_cache()
+
+
+@pytest.mark.django_db
+def test_get_master_by_code_reads_through_cache(
+    master_data_cache, django_assert_num_queries
+):
+    sales_org = SalesOrganizationMaster.objects.create(code="0750", name="SKIC")
+
+    with django_assert_num_queries(1):
+        cached = get_master_by_code(SalesOrganizationMaster, "0750")
+        assert get_master_by_code(SalesOrganizationMaster, "0750") == cached
+    assert cached.pk == sales_org.pk
+    assert cached is not get_master_by_code(SalesOrganizationMaster, "0750")
+
+
+@pytest.mark.django_db
+def test_get_master_by_code_does_not_cache_missing_row(
+    master_data_cache, django_assert_num_queries
+):
+    with django_assert_num_queries(1):
+        assert get_master_by_code(SoldToMaster, "0000000001") is None
+    SoldToMaster.objects.create(sold_to_code="0000000001", sold_to_name="New")
+
+    assert get_master_by_code(SoldToMaster, "0000000001").sold_to_name == "New"
+    with django_assert_num_queries(0):
+        assert get_master_by_code(SoldToMaster, None) is None
+
+
+@pytest.mark.django_db
+def test_save_invalidates_master_data_cache(
+    master_data_cache, django_capture_on_commit_callbacks
+):
+    sales_org = SalesOrganizationMaster.objects.create(code="0750", name="SKIC")
+    assert get_master_by_code(SalesOrganizationMaster, "0750").name == "SKIC"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        sales_org.name = "SCG Packaging"
+        sales_org.save()
+
+    assert get_master_by_code(SalesOrganizationMaster, "0750").name == "SCG Packaging"
+    assert [x.code for x in get_all_masters(SalesOrganizationMaster)] == ["0750"]
+
+
+@pytest.mark.django_db
+def test_master_data_cache_disabled(settings, django_assert_num_queries):
+    settings.MASTER_DATA_CACHE_ENABLED = False
+    SalesOrganizationMaster.objects.create(code="0750", name="SKIC")
+
+    with django_assert_num_queries(2):
+        get_master_by_code(SalesOrganizationMaster, "0750")
+        get_master_by_code(SalesOrganizationMaster, "0750")
+
+
+@pytest.mark.django_db
+def test_master_data_loaded_invalidates_cache(master_data_cache):
+    SoldToMaster.objects.create(sold_to_code="0000000001", sold_to_name="Old")
+    assert get_master_by_code(SoldToMaster, "0000000001").sold_to_name == "Old"
+    # master loads write the tables without model signals
+    SoldToMaster.objects.filter(sold_to_code="0000000001").update(sold_to_name="New")
+
+    call_command("master_data_loaded")
+
+    assert get_master_by_code(SoldToMaster, "0000000001").sold_to_name == "New"
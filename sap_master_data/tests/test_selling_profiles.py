@@ -0,0 +1,158 @@
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from sap_master_data.models import (
+    BomMaterial,
+    Conversion2Master,
+    MaterialMaster,
+    MaterialSaleMaster,
+    MaterialSellingProfile,
+    SoldToMaterialMaster,
+)
+from sap_master_data.selling_profiles import (
+    get_bom_components,
+    get_sale_texts,
+    get_selling_profile,
+    get_selling_profiles,
+    refresh_selling_profiles,
+)
+
+
+@pytest.fixture
+def selling_master_data():
+    material = MaterialMaster.objects.create(
+        material_code="BOM-001",
+        material_type="ZBOM",
+        base_unit="EA",
+        weight_unit="KG",
+    )
+    MaterialMaster.objects.create(material_code="CHILD-001", base_unit="ROL")
+    MaterialSaleMaster.objects.create(
+        material_code="BOM-001",
+        sales_organization_code="0750",
+        distribution_channel_code="10",
+        sales_unit="TON",
+        material_group1="K01",
+        item_category_group="LUMF",
+        sale_text1_th="ข้อความ",
+        sale_text1_en="Sale text",
+    )
+    MaterialSaleMaster.objects.create(
+        material_code="CHILD-001",
+        sales_organization_code="0750",
+        distribution_channel_code="10",
+    )
+    Conversion2Master.objects.create(
+        material_code="BOM-001", from_unit="KG", to_unit="TON", calculation=1000
+    )
+    SoldToMaterialMaster.objects.create(
+        sold_to_code="0000000001",
+        sales_organization_code="0750",
+        distribution_channel_code="10",
+        sold_to_material_code="CUST-BOM-001",
+        material_code="BOM-001",
+    )
+    BomMaterial.objects.create(
+        parent_material_code="BOM-001",
+        item_number="10",
+        material_code="CHILD-001",
+        quantity=2,
+        unit="ROL",
+        valid_from=datetime.date(2023, 1, 1),
+        valid_to=datetime.date(2023, 12, 31),
+    )
+    return material
+
+
+@pytest.fixture
+def no_selling_profile_misses():
+    cache.delete_many(["selling_profile_miss:BOM-001", "selling_profile_miss:NEW-001"])
+    yield
+    cache.delete_many(["selling_profile_miss:BOM-001", "selling_profile_miss:NEW-001"])
+
+
+@pytest.mark.django_db
+def test_get_selling_profile_builds_profile(selling_master_data):
+    profile = get_selling_profile("BOM-001", "0750", "10")
+
+    assert profile.material_id == selling_master_data.id
+    assert profile.sales_unit == "TON"
+    assert profile.material_weight_unit == "KG"
+    assert (profile.weight_unit, profile.weight) == ("KG", 1000)
+    assert profile.customer_material_code == "CUST-BOM-001"
+    assert profile.item_category_group == "LUMF"
+    assert get_sale_texts(profile, "E")[0] == "Sale text"
+    assert get_sale_texts(profile, "2")[0] == "ข้อความ"
+    assert [
+        component["material_code"]
+        for component in get_bom_components(profile, datetime.date(2023, 6, 1))
+    ] == ["CHILD-001"]
+    assert get_bom_components(profile, datetime.date(2024, 1, 1)) == []
+
+
+@pytest.mark.django_db
+def test_get_selling_profiles_stores_profiles_on_commit(
+    selling_master_data, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks() as callbacks:
+        profiles = get_selling_profiles(["BOM-001", "CHILD-001"], "0750", "10")
+    assert profiles["CHILD-001"].sales_unit == "ROL"
+    # the read writes nothing itself
+    assert not MaterialSellingProfile.objects.exists()
+
+    for callback in callbacks:
+        callback()
+
+    assert set(
+        MaterialSellingProfile.objects.values_list("material_code", flat=True)
+    ) == {"BOM-001", "CHILD-001"}
+
+
+@pytest.mark.django_db
+def test_get_selling_profiles_one_query(selling_master_data, django_assert_num_queries):
+    refresh_selling_profiles(["BOM-001", "CHILD-001"])
+
+    with django_assert_num_queries(1):
+        profiles = get_selling_profiles(["BOM-001", "CHILD-001"], "0750", "10")
+    assert profiles["CHILD-001"].sales_unit == "ROL"
+    with django_assert_num_queries(1):
+        # not sold in the sales org, nothing to build
+        assert get_selling_profile("BOM-001", "0710", "10") is None
+
+
+@pytest.mark.django_db
+def test_get_selling_profiles_remembers_material_without_sale_master(
+    selling_master_data,
+    no_selling_profile_misses,
+    django_assert_num_queries,
+):
+    assert get_selling_profile("NEW-001", "0750", "10") is None
+    with django_assert_num_queries(1):
+        assert get_selling_profile("NEW-001", "0750", "10") is None
+
+    MaterialMaster.objects.create(material_code="NEW-001", base_unit="EA")
+    MaterialSaleMaster.objects.create(
+        material_code="NEW-001",
+        sales_organization_code="0750",
+        distribution_channel_code="10",
+    )
+    call_command("master_data_loaded", "--material-codes", "NEW-001")
+
+    assert get_selling_profile("NEW-001", "0750", "10").sales_unit == "EA"
+
+
+@pytest.mark.django_db
+def test_master_data_loaded_refreshes_profile(selling_master_data):
+    refresh_selling_profiles(["BOM-001"])
+    assert get_selling_profile("BOM-001", "0750", "10").material_group1 == "K01"
+    # master loads write the tables without model signals
+    MaterialSaleMaster.objects.filter(material_code="BOM-001").update(
+        material_group1="K02"
+    )
+
+    call_command("master_data_loaded", "--material-codes", "BOM-001")
+
+    assert get_selling_profile("BOM-001", "0750", "10").material_group1 == "K02"
@@ -0,0 +1,24 @@
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+
+
+class AttentionTypes(models.Transform):
+    """
+    Flags of a comma separated attention type ("R1, R3") as a text array, e.g.
+    `OrderLines.objects.filter(attention_type__flags__overlap=["R2", "R4"])`.
+    OrderLines has a GIN index on this expression, changing the template needs
+    a new index.
+    """
+
+    lookup_name = "flags"
+    template = (
+        "string_to_array(replace(upper(coalesce(%(expressions)s, '')), ' ', ''), ',')"
+    )
+    output_field = ArrayField(models.TextField())
+
+
+class AttentionTypeField(models.CharField):
+    """Comma separated required attention flags, searchable with `__flags`"""
+
+
+AttentionTypeField.register_lookup(AttentionTypes)
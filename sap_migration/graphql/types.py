@@ -27,6 +27,9 @@ from sap_migration.graphql.resolvers.sold_tos import (
 
 class ScgCountableConnection(CountableConnection):
     latest_page_item_number = graphene.Int(description="Item in last page.")
+    total_count_is_exact = graphene.Boolean(
+        description="False when totalCount is capped or estimated."
+    )
 
     class Meta:
         abstract = True
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sap_migration", "0147_auto_20240502_1307"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contract",
+            name="es14_payload_hash",
+            field=models.CharField(blank=True, max_length=128, null=True),
+        ),
+    ]
@@ -0,0 +1,31 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+import sap_migration.fields
+
+
+class Migration(migrations.Migration):
+    # order lines are not locked while the index is built
+    atomic = False
+
+    dependencies = [
+        ("sap_migration", "0148_contract_es14_payload_hash"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="orderlines",
+            name="attention_type",
+            field=sap_migration.fields.AttentionTypeField(
+                blank=True, max_length=255, null=True
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="orderlines",
+            index=django.contrib.postgres.indexes.GinIndex(
+                sap_migration.fields.AttentionTypes("attention_type"),
+                name="orderlines_attention_flags_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+import common.search
+
+
+class Migration(migrations.Migration):
+    # material variants and orders stay writable while the indexes are built
+    atomic = False
+
+    dependencies = [
+        ("sap_master_data", "0034_search_trgm_indexes"),
+        ("sap_migration", "0149_orderlines_attention_flags_idx"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="materialvariantmaster",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    common.search.SearchText("code", "description_en"),
+                    name="gin_trgm_ops",
+                ),
+                name="variant_search_en_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="materialvariantmaster",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    common.search.SearchText("code", "description_th"),
+                    name="gin_trgm_ops",
+                ),
+                name="variant_search_th_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="order",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    common.search.SearchText("sales_employee"),
+                    name="gin_trgm_ops",
+                ),
+                name="order_sales_employee_trgm_idx",
+            ),
+        ),
+    ]
@@ -1,6 +1,8 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils import timezone
 
+from common.search import search_text_index
 from saleor.account.models import User
 from saleor.order import OrderStatus
 from sap_master_data.models import (
@@ -18,6 +20,7 @@ from sap_master_data.models import (
     SalesOrganizationMaster,
     SoldToMaster,
 )
+from sap_migration.fields import AttentionTypeField, AttentionTypes
 from scgp_eo_upload.models import EoUploadLog
 from scgp_export.graphql.enums import ScgpExportOrderStatusSAP
 from scgp_po_upload.models import PoUploadFileLog
@@ -41,6 +44,8 @@ class MaterialVariantMaster(models.Model):
             models.Index(fields=["material"]),
             models.Index(fields=["variant_type"]),
             models.Index(fields=["type"]),
+            search_text_index("variant_search_en_trgm_idx", "code", "description_en"),
+            search_text_index("variant_search_th_trgm_idx", "code", "description_th"),
         ]
 
     material = models.ForeignKey(
@@ -237,6 +242,8 @@ class Contract(models.Model):
     )
     web_user_line_lang = models.CharField(max_length=10, blank=True, null=True)
     web_user_line = models.CharField(max_length=255, blank=True, null=True)
+    # "<sync flow>:<sha256 of the ES14 contract data>" of the last full sync
+    es14_payload_hash = models.CharField(max_length=128, blank=True, null=True)
 
 
 class ContractMaterialDefaultManager(models.Manager):
@@ -580,6 +587,11 @@ class Order(models.Model):
     )
     product_group = models.CharField(max_length=255, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            search_text_index("order_sales_employee_trgm_idx", "sales_employee"),
+        ]
+
 
 class OrderLineDefaultManager(models.Manager):
     def get_queryset(self):
@@ -747,7 +759,7 @@ class OrderLines(models.Model):
     overdue_1 = models.BooleanField(blank=True, null=True, default=False)
     overdue_2 = models.BooleanField(blank=True, null=True, default=False)
     flag = models.CharField(max_length=255, blank=True, default="Customer", null=True)
-    attention_type = models.CharField(max_length=255, blank=True, null=True)
+    attention_type = AttentionTypeField(max_length=255, blank=True, null=True)
     item_cat_pi = models.CharField(max_length=255, blank=True, null=True)
     price_currency = models.CharField(max_length=255, blank=True, null=True)
     no_of_rolls = models.CharField(max_length=255, blank=True, null=True)
@@ -849,6 +861,13 @@ class OrderLines(models.Model):
     )
     force_flag = models.BooleanField(null=True, blank=True, default=False)
 
+    class Meta:
+        indexes = [
+            GinIndex(
+                AttentionTypes("attention_type"), name="orderlines_attention_flags_idx"
+            ),
+        ]
+
 
 class Route(models.Model):
     route_code = models.CharField(null=True, blank=True, max_length=255)
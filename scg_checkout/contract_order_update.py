@@ -33,6 +33,7 @@ from scgp_export.implementations.orders import (
 )
 from scgp_export.implementations.sap import get_web_user_name
 from scgp_po_upload.graphql.helpers import html_to_pdf
+from scgp_record_cleanup.implementation.purge import purge
 from scgp_require_attention_items.graphql.helper import (
     add_class_mark_into_order_line,
     update_attention_type_r1,
@@ -636,22 +637,12 @@ def contract_order_delete(order_id):
         raise ImproperlyConfigured(e)
 
 
-@transaction.atomic
 def delete_contract_order_drafts():
-    try:
-        order_ids = migration_models.Order.objects.filter(
-            status__in=("draft", "pre-draft")
-        ).values_list("id")
-        order_line_ids = migration_models.OrderLines.objects.filter(
-            order_id__in=order_ids
-        ).values_list("id")
-
-        migration_models.OrderLines.objects.filter(pk__in=order_line_ids).delete()
-
-        return migration_models.Order.objects.filter(pk__in=order_ids).delete()
-    except Exception as ex:
-        transaction.set_rollback(True)
-        raise ImproperlyConfigured(ex)
+    """Delete draft orders with their lines, by batches committed one by one"""
+    return purge(
+        "contract order drafts",
+        migration_models.Order.objects.filter(status__in=("draft", "pre-draft")),
+    )
 
 
 def contract_order_line_delete(id):
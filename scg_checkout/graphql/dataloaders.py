@@ -0,0 +1,185 @@
+from collections import defaultdict
+
+from promise import Promise
+
+from saleor.graphql.core.dataloaders import DataLoader
+from sap_master_data import models as master_models
+from sap_migration import models as migration_models
+from scg_checkout.models import AlternatedMaterial
+
+
+class FirstByFieldLoader(DataLoader):
+    """First row of `model` by `ordering` for each value of `field`.
+
+    Like .first(), rows are ordered by the model ordering or the pk unless
+    `ordering` is set. Resolves to `empty_value` when nothing matches or the
+    key is None.
+    """
+
+    model = None
+    field = "code"
+    ordering = None
+    empty_value = None
+
+    def load(self, key):
+        if key is None:
+            return Promise.resolve(self.empty_value)
+        return super().load(key)
+
+    def get_queryset(self):
+        return self.model.objects.using(self.database_connection_name)
+
+    def get_rows(self, keys):
+        queryset = self.get_queryset().filter(**{f"{self.field}__in": keys})
+        return queryset.order_by(
+            *(self.ordering or self.model._meta.ordering or ("pk",))
+        )
+
+    def batch_load(self, keys):
+        rows = {}
+        for row in self.get_rows(keys):
+            rows.setdefault(getattr(row, self.field), row)
+        return [rows.get(key, self.empty_value) for key in keys]
+
+
+class ListByFieldLoader(FirstByFieldLoader):
+    """All rows of `model` by `ordering` for each value of `field`"""
+
+    empty_value = []
+
+    def batch_load(self, keys):
+        rows = defaultdict(list)
+        for row in self.get_rows(keys):
+            rows[getattr(row, self.field)].append(row)
+        return [rows.get(key, []) for key in keys]
+
+
+class MaterialMasterByCodeLoader(FirstByFieldLoader):
+    context_key = "material_master_by_code"
+    model = master_models.MaterialMaster
+    field = "material_code"
+
+
+class MaterialClassificationByMaterialCodeLoader(FirstByFieldLoader):
+    context_key = "material_classification_by_material_code"
+    model = master_models.MaterialClassificationMaster
+    field = "material_code"
+
+
+class MaterialClassificationByMaterialIdLoader(FirstByFieldLoader):
+    context_key = "material_classification_by_material_id"
+    model = master_models.MaterialClassificationMaster
+    field = "material_id"
+
+
+class RolConversionByMaterialCodeLoader(FirstByFieldLoader):
+    """Latest Conversion2Master to ROL of each material code"""
+
+    context_key = "rol_conversion_by_material_code"
+    model = master_models.Conversion2Master
+    field = "material_code"
+    ordering = ("-id",)
+
+    def get_queryset(self):
+        return super().get_queryset().filter(to_unit="ROL")
+
+
+class ContractMaterialByIdLoader(FirstByFieldLoader):
+    context_key = "contract_material_by_id"
+    model = migration_models.ContractMaterial
+    field = "id"
+
+
+class ContractMaterialsByContractNoLoader(ListByFieldLoader):
+    context_key = "contract_materials_by_contract_no"
+    model = migration_models.ContractMaterial
+    field = "contract_no"
+
+
+class MaterialVariantByIdLoader(FirstByFieldLoader):
+    context_key = "material_variant_by_id"
+    model = migration_models.MaterialVariantMaster
+    field = "id"
+
+
+class StandardMaterialVariantByCodeLoader(FirstByFieldLoader):
+    """Standard / Non-Standard material variant of a code with its material"""
+
+    context_key = "standard_material_variant_by_code"
+    model = migration_models.MaterialVariantMaster
+
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .filter(variant_type__in=("Standard", "Non-Standard"))
+            .select_related("material")
+        )
+
+
+class AlternatedMaterialsByOrderLineIdLoader(ListByFieldLoader):
+    context_key = "alternated_materials_by_order_line_id"
+    model = AlternatedMaterial
+    field = "order_line_id"
+
+
+class OrderBySoNoLoader(FirstByFieldLoader):
+    context_key = "order_by_so_no"
+    model = migration_models.Order
+    field = "so_no"
+
+
+class DistributionChannelByCodeLoader(FirstByFieldLoader):
+    context_key = "distribution_channel_by_code"
+    model = master_models.DistributionChannelMaster
+
+
+class SalesOrganizationByCodeLoader(FirstByFieldLoader):
+    context_key = "sales_organization_by_code"
+    model = master_models.SalesOrganizationMaster
+
+
+class SalesOfficeByCodeLoader(FirstByFieldLoader):
+    context_key = "sales_office_by_code"
+    model = migration_models.SalesOfficeMaster
+
+
+class DivisionByCodeLoader(FirstByFieldLoader):
+    context_key = "division_by_code"
+    model = master_models.DivisionMaster
+
+
+class CustomerGroupByCodeLoader(FirstByFieldLoader):
+    context_key = "customer_group_by_code"
+    model = master_models.CustomerGroupMaster
+
+
+class CustomerGroup1ByCodeLoader(FirstByFieldLoader):
+    context_key = "customer_group_1_by_code"
+    model = master_models.CustomerGroup1Master
+
+
+class CustomerGroup2ByCodeLoader(FirstByFieldLoader):
+    context_key = "customer_group_2_by_code"
+    model = master_models.CustomerGroup2Master
+
+
+class CustomerGroup3ByCodeLoader(FirstByFieldLoader):
+    context_key = "customer_group_3_by_code"
+    model = master_models.CustomerGroup3Master
+
+
+class CustomerGroup4ByCodeLoader(FirstByFieldLoader):
+    context_key = "customer_group_4_by_code"
+    model = master_models.CustomerGroup4Master
+
+
+class Incoterms1ByCodeLoader(FirstByFieldLoader):
+    context_key = "incoterms_1_by_code"
+    model = master_models.Incoterms1Master
+
+
+class SalesGroupByCodeLoader(FirstByFieldLoader):
+    context_key = "sales_group_by_code"
+    model = master_models.SalesGroup
+    field = "sales_group_code"
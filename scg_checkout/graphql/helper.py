@@ -10,7 +10,7 @@ from typing import Union
 
 import pytz
 from django.core.exceptions import ValidationError
-from django.db.models import Q, IntegerField, Max
+from django.db.models import Count, Q, IntegerField, Max
 from django.db.models.functions import Cast
 from django.utils import timezone
 
@@ -21,7 +21,7 @@ from common.enum import MulesoftServiceType, MulesoftFeatureType
 from common.helpers import mock_confirm_date, get_data_path
 from common.mulesoft_api import MulesoftApiRequest
 from common.product_group import ProductGroup, SalesUnitEnum
-from saleor.plugins.manager import get_plugins_manager
+from saleor.plugins.manager import get_cached_plugins_manager
 from saleor.settings import SAP_ENV
 from sap_master_data import models as sap_master_data_models
 from sap_master_data.models import SalesOrganizationMaster, SoldToChannelMaster
@@ -266,15 +266,94 @@ def update_date_range_with_timezone(date_range: dict, timezone: Union[int, float
 
 
 # Order Status helper
-def update_order_status(order_id):
+def _order_lines_for_order_status():
     # SEO-4576,SEO-4933: Exclude Container Items to decide Order status from Order Items Status only for export orders
-    order_line_status = list(
-        models.OrderLines.objects.filter(order_id=order_id).exclude(Q(status__in=["Disable", "Delete", ""]) |
-                                                                    Q(Q(item_cat_eo__in=[
-                                                                        ItemCat.ZKC0.value]) & Q(
-                                                                        type__in=[
-                                                                            OrderType.EXPORT.value]))).values_list(
-            'item_status_en', flat=True))
+    return models.OrderLines.objects.exclude(Q(status__in=["Disable", "Delete", ""]) |
+                                             Q(Q(item_cat_eo__in=[ItemCat.ZKC0.value]) &
+                                               Q(type__in=[OrderType.EXPORT.value])))
+
+
+def update_order_status(order_id):
+    return update_orders_status([order_id])[order_id]
+
+
+def update_orders_status(order_ids):
+    """
+    Same as update_order_status for many orders with one grouped query
+    @param order_ids: list of order id
+    @return: dict of order id: (status_en, status_th)
+    """
+    counts_by_order = count_order_lines_status(order_ids)
+    return {
+        order_id: compute_order_status_from_counts(counts_by_order.get(order_id))
+        for order_id in order_ids
+    }
+
+
+def save_orders_status(orders):
+    """
+    Compute status of `orders` and save the ones which changed with one bulk_update
+    @return: orders updated
+    """
+    orders = list(orders)
+    orders_status = update_orders_status([order.id for order in orders])
+    changed_orders = []
+    for order in orders:
+        status_en, status_thai = orders_status[order.id]
+        if (order.status, order.status_thai) == (status_en, status_thai):
+            continue
+        logging.info(f"Order so_no:{order.so_no}, db status:{order.status} updated to:{status_en}")
+        order.status = status_en
+        order.status_thai = status_thai
+        # bulk_update skips auto_now
+        order.updated_at = timezone.now()
+        changed_orders.append(order)
+    if changed_orders:
+        sap_migration_models.Order.objects.bulk_update(changed_orders, fields=["status", "status_thai", "updated_at"])
+    return changed_orders
+
+
+def count_order_lines_status(order_ids):
+    """
+    Counts of the line item statuses deciding the order status, grouped by order
+    @return: dict of order id: counts, orders without lines are missing
+    """
+    return {
+        counts.pop("order_id"): counts
+        for counts in _order_lines_for_order_status().filter(order_id__in=order_ids).order_by().values(
+            "order_id"
+        ).annotate(
+            total=Count("id"),
+            unknown=Count("id", filter=Q(item_status_en__isnull=True)),
+            cancel=Count("id", filter=Q(item_status_en=IPlanOrderItemStatus.CANCEL.value)),
+            complete=Count("id", filter=Q(item_status_en=IPlanOrderItemStatus.COMPLETE_DELIVERY.value)),
+            partial=Count("id", filter=Q(item_status_en=IPlanOrderItemStatus.PARTIAL_DELIVERY.value)),
+            full_committed=Count("id", filter=Q(item_status_en=IPlanOrderItemStatus.FULL_COMMITTED_ORDER.value)),
+        )
+    }
+
+
+def compute_order_status_from_counts(counts):
+    """Same as compute_order_status, from the counts of count_order_lines_status"""
+    total = counts and counts["total"]
+    if not total or counts["unknown"]:
+        order_status = IPlanOrderStatus.RECEIVED_ORDER.value
+    elif counts["partial"]:
+        order_status = IPlanOrderStatus.PARTIAL_DELIVERY.value
+    elif counts["cancel"] == total:
+        order_status = IPlanOrderStatus.CANCEL.value
+    elif counts["cancel"] + counts["complete"] == total:
+        order_status = IPlanOrderStatus.COMPLETED_DELIVERY.value
+    elif counts["cancel"] + counts["full_committed"] == total:
+        order_status = IPlanOrderStatus.FULL_COMMITTED_ORDER.value
+    elif counts["full_committed"]:
+        order_status = IPlanOrderStatus.PARTIAL_COMMITTED_ORDER.value
+    else:
+        order_status = IPlanOrderStatus.RECEIVED_ORDER.value
+    return order_status, IPlanOrderStatus.IPLAN_ORDER_STATUS_TH.value.get(order_status)
+
+
+def compute_order_status(order_line_status):
     if not order_line_status or None in order_line_status:
         order_status = IPlanOrderStatus.RECEIVED_ORDER.value
         return order_status, IPlanOrderStatus.IPLAN_ORDER_STATUS_TH.value.get(order_status)
@@ -3152,7 +3231,7 @@ def update_log_mat_os_quantity_details(order, response):
 
 
 def perform_rounding_on_iplan_qty_with_decimals(i_plan_response):
-    manager = get_plugins_manager()
+    manager = get_cached_plugins_manager()
     _plugin = manager.get_plugin("scg.settings")
     config = _plugin.config
     if not config.enable_target_qty_decimal_round_up:
@@ -3483,18 +3562,6 @@ def get_order_line_material_type(line, material_variant):
     return material_type
 
 
-def update_active_for_missing_contract_materials(contract_materials, contract_material_pks):
-    inactive_contract_materials = []
-    for material in contract_materials:
-        if material.pk not in contract_material_pks:
-            material.is_active = False
-            inactive_contract_materials.append(material)
-    if inactive_contract_materials:
-        sap_migration_models.ContractMaterial.objects.bulk_update(
-            inactive_contract_materials, ["is_active"]
-        )
-
-
 def get_parent_directory(directory, levels=1):
     """
     Get the parent directory of the specified directory.
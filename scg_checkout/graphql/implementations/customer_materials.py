@@ -8,6 +8,7 @@ from django.db import transaction
 from django.db.models import Subquery
 
 from sap_master_data import models as master_models
+from sap_master_data.selling_profiles import schedule_selling_profile_refresh
 from sap_migration.models import CustomerMaterialMappingFileLog
 from scg_checkout.error_codes import ContractCheckoutErrorCode
 from scg_checkout.graphql.enums import CustomerMaterialMapping, CustomerMaterialUploadError, \
@@ -125,13 +126,17 @@ def import_customer_material_mappings(input_param, file_data, user):
             raise_validation_errors(validation_errors, error_line_data)
 
         # delete the existing lines
-        deleted = master_models.SoldToMaterialMaster.objects.filter(distribution_channel_code=distribution_channel,
-                                                                    sales_organization_code=sales_org,
-                                                                    sold_to_code=sold_to_code).delete()
+        existing = master_models.SoldToMaterialMaster.objects.filter(distribution_channel_code=distribution_channel,
+                                                                     sales_organization_code=sales_org,
+                                                                     sold_to_code=sold_to_code)
+        material_codes = set(existing.values_list("material_code", flat=True))
+        deleted = existing.delete()
         logging.info(f"[Customer Material Mapping:Upload] "
                      f" Deleted Records : {deleted} for Sold To {sold_to_code} Sales Org. {sales_org} Distribution Channel {distribution_channel}")
 
         objs = master_models.SoldToMaterialMaster.objects.bulk_create(sold_to_material_list)
+        material_codes.update(obj.material_code for obj in objs)
+        schedule_selling_profile_refresh(material_codes)
         rows = len(objs)
         logging.info(
             f"[Customer Material Master Mapping:Upload] "
@@ -18,7 +18,8 @@ from common.helpers import format_sap_decimal_values_for_pdf
 from common.iplan.item_level_helpers import get_product_code, get_product_and_ddq_alt_prod_of_order_line
 from common.mulesoft_api import MulesoftApiRequest
 from common.product_group import ProductGroup, SalesUnitEnum
-from saleor.plugins.manager import get_plugins_manager
+from saleor.plugins.manager import get_cached_plugins_manager
+from sap_master_data.cache import get_master_by_code
 from sap_master_data import models as sap_master_data_models
 from sap_migration import models as sap_migration_models
 from sap_migration.graphql.enums import InquiryMethodType, OrderType
@@ -68,7 +69,8 @@ from scg_checkout.graphql.implementations.sap import (
     get_sap_warning_messages,
     get_error_messages_from_sap_response_for_create_order
 )
-from scg_checkout.models import AlternatedMaterial
+from scg_checkout.models import AlternatedMaterial, OrderNotificationKind
+from scg_checkout.notifications import get_batch_recipients, queue_order_notification
 from scgp_eo_upload.implementations.helpers import eo_upload_send_email_when_call_api_fail
 from scgp_export.graphql.enums import IPlanEndPoint, ItemCat
 from scgp_export.graphql.resolvers.export_sold_tos import resolve_display_text, resolve_sold_to_name
@@ -445,8 +447,9 @@ def call_i_plan_create_order(order, manager, call_type=None, user=None, order_he
                         order.save()
                         if order.type != OrderType.EXPORT.value:
                             partner_emails = get_partner_emails_from_es17_response(sap_response)
-                            send_mail_customer_create_order(order, manager, user, partner_emails=partner_emails,
-                                                            error_message_object=error_message_object)
+                            queue_order_notification(OrderNotificationKind.CREATE_ORDER, order, user,
+                                                     partner_emails=partner_emails,
+                                                     error_message_object=error_message_object)
                             try:
                                 send_mail_customer_fail_alternate(order, manager)
                             except Exception as e:
@@ -574,8 +577,9 @@ def call_i_plan_create_order(order, manager, call_type=None, user=None, order_he
 
                 if order.type != OrderType.EXPORT.value:
                     partner_emails = get_partner_emails_from_es17_response(sap_response)
-                    send_mail_customer_create_order(order, manager, user, partner_emails=partner_emails,
-                                                    error_message_object=error_message_object)
+                    queue_order_notification(OrderNotificationKind.CREATE_ORDER, order, user,
+                                             partner_emails=partner_emails,
+                                             error_message_object=error_message_object)
                     try:
                         send_mail_customer_fail_alternate(order, manager)
                     except Exception as e:
@@ -1098,7 +1102,7 @@ def prepare_alternate_materials_list(alt_mat_i_plan_dict, alt_mat_variant_obj_di
     If config.enable_alt_mat_outsource_feature is False, the system will immediately return from the function; otherwise
     (if config.enable_alt_mat_outsource_feature is True), it will prepare_alternate_materials_list.
     """
-    manager = get_plugins_manager()
+    manager = get_cached_plugins_manager()
     _plugin = manager.get_plugin("scg.settings")
     config = _plugin.config
     if not config.enable_alt_mat_outsource_feature:
@@ -1551,17 +1555,22 @@ def send_mail_customer_create_order(order, manager, user, partner_emails=None, e
     }
     pdf = html_to_pdf(template_pdf_data, "header.html", "content.html")
 
-    internal_emails = get_internal_emails_by_config(EmailConfigurationFeatureChoices.CREATE_ORDER,
-                                                    order.sales_organization.code,
-                                                    order.product_group)
-    external_email_to_list, external_cc_to_list = get_external_emails_by_config(
-        EmailConfigurationFeatureChoices.CREATE_ORDER,
-        sold_to_code,
-        order.product_group)
+    internal_emails = get_batch_recipients(
+        ("internal", EmailConfigurationFeatureChoices.CREATE_ORDER, order.sales_organization.code,
+         str(order.product_group)),
+        lambda: get_internal_emails_by_config(EmailConfigurationFeatureChoices.CREATE_ORDER,
+                                              order.sales_organization.code,
+                                              order.product_group))
+    external_email_to_list, external_cc_to_list = get_batch_recipients(
+        ("external", EmailConfigurationFeatureChoices.CREATE_ORDER, sold_to_code, str(order.product_group)),
+        lambda: get_external_emails_by_config(
+            EmailConfigurationFeatureChoices.CREATE_ORDER,
+            sold_to_code,
+            order.product_group))
     if partner_emails is None:
         partner_emails = []
 
-    mail_to = list(set(external_email_to_list + [user.email]))
+    mail_to = list(set(external_email_to_list + ([user.email] if user else [])))
     cc_list = list(set(partner_emails + internal_emails + external_cc_to_list))
 
     manager.scgp_po_upload_send_mail(
@@ -1577,6 +1586,17 @@ def send_mail_customer_create_order(order, manager, user, partner_emails=None, e
     return mail_to, cc_list
 
 
+def send_create_order_notification(notification, manager):
+    """Sender of OrderNotificationKind.CREATE_ORDER, see scg_checkout.notifications"""
+    return send_mail_customer_create_order(
+        notification.order,
+        manager,
+        notification.created_by,
+        partner_emails=notification.payload.get("partner_emails"),
+        error_message_object=notification.payload.get("error_message_object") or {},
+    )
+
+
 def get_external_emails_by_config(feature_name, sold_to_code, product_group):
     product_group_query = Q()
     if type(product_group) == list:
@@ -1770,7 +1790,7 @@ def get_sold_to_no_name(sold_to_code, subject=False, return_only_name=False):
 
 def get_sold_to_name(sold_to_code, show_code=False):
     try:
-        val = sap_master_data_models.SoldToMaster.objects.filter(sold_to_code=sold_to_code).first().sold_to_name
+        val = get_master_by_code(sap_master_data_models.SoldToMaster, sold_to_code).sold_to_name
         if show_code:
             val = f"{sold_to_code} - {val}"
         return val
@@ -1,20 +1,16 @@
-import base64
 import logging
 import os
 from datetime import datetime
 
 import pandas as pd
-import petl as etl
 from dateutil.relativedelta import relativedelta
 from django.core.exceptions import ImproperlyConfigured, ValidationError
 from django.db import transaction
 from django.db.models import Q, Subquery
-from openpyxl import load_workbook
 from openpyxl.styles import Alignment
 from openpyxl.utils import get_column_letter
 
-from saleor.csv import FileTypes
-from saleor.csv.utils.export import create_file_with_headers
+from common.util.xlsx_writer import XLSX_CONTENT_TYPE, StreamingXlsxWriter, XlsxCellStyle, export_xlsx_file
 from sap_master_data import models as master_models
 from sap_migration import models as migration_models
 from sap_migration.models import AlternateMaterialOSMappingFileLog
@@ -534,9 +530,11 @@ def raise_validation_errors(validation_errors):
     raise ValidationError(errors_response)
 
 
+EXPORT_CHUNK_SIZE = 2000
+
+
 def export_alternative_material_excel_file():
     try:
-        content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         export_file = "Alternated Material.xlsx"
         export_headers = ("Sale Org.", "Sold to code", "Material Input", "Alternated Material", "Dia", "Type",
                           "Priority")
@@ -550,29 +548,25 @@ def export_alternative_material_excel_file():
             "priority",
         )
 
-        temp_file = create_file_with_headers(export_headers, delimiter=",", file_type=FileTypes.XLSX)
+        writer = StreamingXlsxWriter()
+        writer.append(export_headers)
+        rows = migration_models.AlternateMaterialOs.objects.order_by("pk").values_list(*fields)
+        for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            writer.append(row)
 
-        count = migration_models.AlternateMaterialOs.objects.count()
-        step = 100_000
-        for x in range(0, count, step):
-            rows = list(migration_models.AlternateMaterialOs.objects.values_list(*fields)[x:x + step])
-            etl.io.xlsx.appendxlsx([export_headers] + rows, temp_file.name)
-
-        return export_file, content_type, base64.b64encode(temp_file.read()).decode("utf-8")
+        base64_file, download_url = export_xlsx_file(writer.save(), export_file)
+        return export_file, XLSX_CONTENT_TYPE, base64_file, download_url
     except Exception as e:
         logging.error(e)
         raise ImproperlyConfigured("Internal Server Error.")
 
 
-CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CONTENT_TYPE = XLSX_CONTENT_TYPE
 EXPORT_FILE = "alternate_log_change_material.xlsx"
 DATE_FORMAT = "%d/%m/%Y"
-COLUMN_WIDTHS = {
-    "H": 20,  # Width for "substitute product" column
-    "I": 20,  # Width for "No. of Rolls changed" column
-    "J": 20,  # Width for "Amount of change (TON)" column
-    "K": 20,  # Width for "plant" column
-}
+# "จำนวนที่สั่ง" group header over the sub headers in columns H..K
+SUB_HEADER_START_COL = 8
+SUB_HEADER_END_COL = 11
 
 
 def export_alternative_material_log_excel_file():
@@ -614,85 +608,48 @@ def export_alternative_material_log_excel_file():
             "quantity_change_of_ton"  # index: 18
         )
 
-        temp_file = create_file_with_headers(export_headers, delimiter=",", file_type=FileTypes.XLSX)
-
-        count = filtered_rows.count()
-        step = 100_000
-        fields_tuple = tuple(fields)
+        writer = StreamingXlsxWriter(
+            {col_num: max(len(header), 4) + 2 for col_num, header in enumerate(export_headers, 1)}
+        )
+        write_alternative_material_log_headers(writer, export_headers)
 
-        for x in range(0, count, step):
-            rows = list(filtered_rows.values_list(*fields)[x:x + step])
-            combined_rows = [{**dict(zip(export_headers, (
+        rows = filtered_rows.order_by("pk").values_list(*fields)
+        for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            writer.append((
                 row[0], row[1], f"{row[2]}-{row[3]}", f"{row[4]}-{row[5]}", row[5], row[6], row[7],
                 row[8] if row[8] else row[9], row[9], row[18], row[10], row[11], row[12],
                 row[13].strftime(DATE_FORMAT) if row[13] else '', row[14].strftime(DATE_FORMAT) if row[14] else '',
                 row[15], row[16].strftime(DATE_FORMAT) if row[16] else '', row[17]
-            )))} for row in rows]
-            excel_rows = []
-            # Add an empty row (a list of empty strings) to the excel_rows list
-            empty_row = [""] * len(export_headers)
-            excel_rows.append(empty_row)
-
-            for y in combined_rows:
-                excel_rows.append(y.values())
-
-            etl.io.xlsx.appendxlsx([export_headers], temp_file.name, write_header=True)
-            etl.io.xlsx.appendxlsx([list(values) for values in excel_rows], temp_file.name)
-
-            workbook = load_workbook(temp_file.name)
-            sheet = workbook.active
-
-            # Merge cells for row1 and row2 in all columns except H to K
-            start_col = 8
-            end_col = 12
-            merge_row_headers(sheet, export_headers, start_col, end_col)
-
-            sheet.merge_cells('H1:K1')
-            sheet['H1'].value = "จำนวนที่สั่ง"
-            sheet['H1'].alignment = Alignment(horizontal='center', vertical='center')
-
-            merge_columns = {
-                "รหัสสินค้าทดแทน": "H2:H2",
-                "จำนวนม้วนที่เปลี่ยน": "I2:I2",
-                "จำนวนที่เปลี่ยน (TON)": "J2:J2",
-                "plant": "K2:K2",
-            }
-
-            # Merge cells under the "จำนวนที่สั่ง" column for sub-headers
-
-            merge_sub_headers(sheet, merge_columns)
+            ))
 
-            for col_num, header in enumerate(export_headers, 1):
-                column_letter = get_column_letter(col_num)
-                column_width = max(len(str(header)), len(str(sheet.cell(row=2, column=col_num).value))) + 2
-                sheet.column_dimensions[column_letter].width = column_width
-
-            workbook.save(temp_file.name)
-
-        with open(temp_file.name, "rb") as exported_file:
-            base64_file = base64.b64encode(exported_file.read())
-
-        return EXPORT_FILE, CONTENT_TYPE, base64_file.decode("utf-8")
+        base64_file, download_url = export_xlsx_file(writer.save(), EXPORT_FILE)
+        return EXPORT_FILE, CONTENT_TYPE, base64_file, download_url
 
     except Exception as e:
         logging.error(e)
         raise ImproperlyConfigured("Internal Server Error.")
 
 
-def merge_row_headers(sheet, export_headers, start_col, end_col):
-    num_cols = len(export_headers)
-    for col_num in range(1, num_cols + 1):
+def write_alternative_material_log_headers(writer, export_headers):
+    """
+    Two header rows: headers are merged over both rows except columns H..K,
+    which get "จำนวนที่สั่ง" as group header and their own header below
+    """
+    group_header_style = XlsxCellStyle(alignment=Alignment(horizontal='center', vertical='center'))
+    first_row = []
+    second_row = []
+    for col_num, header in enumerate(export_headers, 1):
         col_letter = get_column_letter(col_num)
-        if col_num not in range(start_col, end_col):  # Exclude columns H to K
-            sheet.merge_cells(f"{col_letter}1:{col_letter}2")
-            sheet[f"{col_letter}1"].value = export_headers[col_num - 1]
-
-
-def merge_sub_headers(sheet, merge_columns):
-    for col_header, cell_range in merge_columns.items():
-        sheet.merge_cells(cell_range)
-        col_start, col_end = cell_range.split(":")
-        sheet[col_start].value = col_header
+        if SUB_HEADER_START_COL <= col_num <= SUB_HEADER_END_COL:
+            first_row.append("จำนวนที่สั่ง" if col_num == SUB_HEADER_START_COL else None)
+            second_row.append(header)
+        else:
+            writer.merge(f"{col_letter}1:{col_letter}2")
+            first_row.append(header)
+            second_row.append(None)
+    writer.merge(f"{get_column_letter(SUB_HEADER_START_COL)}1:{get_column_letter(SUB_HEADER_END_COL)}1")
+    writer.append(first_row, column_styles={SUB_HEADER_START_COL: group_header_style})
+    writer.append(second_row)
 
 
 def get_diameter_from_code(full_code):
@@ -3,6 +3,7 @@ import shutil
 import time
 import uuid
 from copy import deepcopy
+from functools import partial
 from math import floor
 
 import boto3
@@ -15,6 +16,7 @@ from scg_checkout.graphql.enums import ContractCheckoutErrorCode
 
 from common.product_group import ProductGroup
 from common.weight_calculation import resolve_weight_common
+from sap_master_data.cache import get_master_by_code
 from sap_master_data.models import SoldToMaterialMaster
 from sap_migration.implementations.class_mark import class_mark_logic, update_class_mark_to_sap
 import scg_checkout.contract_order_update as fn
@@ -27,12 +29,10 @@ from django.db import transaction, models
 from django.db.models import *
 
 from datetime import datetime
-import petl as etl
 from scg_checkout.graphql.helper import get_name_from_sold_to_partner_address_master,get_sold_to_partner
 from common.helpers import parse_json_if_possible, snake_to_camel, net_price_calculation
 from common.enum import MulesoftServiceType, EorderingItemStatusEN, EorderingItemStatusTH
 from common.mulesoft_api import MulesoftApiRequest
-from saleor.csv.utils.export import create_file_with_headers
 from saleor.plugins.manager import get_plugins_manager
 from sap_migration import models as sap_migration_models
 from sap_master_data import models as sap_master_data_modes
@@ -46,7 +46,8 @@ from scg_checkout.graphql.enums import (
     SapOrderConfirmationStatus,
     ScgOrderStatusSAP,
     DeliveryStatus,
-    IPlanTypeOfDelivery, AtpCtpStatus, PendingOrderFieldHeaderColumn, WeightUnitEnum
+    IPlanTypeOfDelivery, AtpCtpStatus, PendingOrderFieldHeaderColumn, WeightUnitEnum, ALIGNMENT_STYLE,
+    ALIGNMENT_VERTICAL_TOP
 )
 from django.db.models import F, Sum
 from openpyxl.styles import Font
@@ -78,12 +79,13 @@ from scgp_export.implementations.orders import (
     _update_reject_reason_for_items, )
 from common.iplan.item_level_helpers import get_product_code
 from scgp_po_upload.graphql.helpers import html_to_pdf, html_to_pdf_order_confirmation
-from scg_checkout.graphql.helper import update_order_status, update_dtr_dtp_to_sap, deepgetattr, is_default_sale_unit_from_contract, is_other_product_group, get_parent_directory, mapping_order_partners, is_materials_product_group_matching, update_order_product_group
+from scg_checkout.graphql.helper import update_order_status, update_orders_status, save_orders_status, update_dtr_dtp_to_sap, deepgetattr, is_default_sale_unit_from_contract, is_other_product_group, get_parent_directory, mapping_order_partners, is_materials_product_group_matching, update_order_product_group
+from scgp_require_attention_items.attention_types import set_attention_type
 from scgp_require_attention_items.graphql.enums import IPlanEndpoint
 from scgp_require_attention_items.graphql.helper import (
     add_class_mark_into_order_line,
     update_attention_type_r5,
-    scg_round, camel_to_snake, multiple_sort_for_pending_order, set_style
+    scg_round, camel_to_snake, multiple_sort_for_pending_order
 )
 from scgp_require_attention_items.graphql.resolvers.require_attention_items import \
     resolve_list_of_sale_order_sap_order_pending
@@ -91,6 +93,9 @@ from scgp_require_attention_items.graphql.resolvers.require_attention_items impo
 from sap_migration.implementations.dtr_dtp import calculate_dtp_dtr
 
 from common.sap.sap_api import SapApiRequest
+from common.sqs_consumer import SqsBatchConsumer
+from common.util.xlsx_writer import StreamingXlsxWriter, XlsxCellStyle
+from django.conf import settings
 
 import os
 
@@ -388,6 +393,15 @@ def sync_i_plan_data():
         region_name=region_name,
     )
     queue = sqs.Queue(queue_url)
+    if settings.IPLAN_SYNC_BATCH_CONSUMER_ENABLED:
+        return SqsBatchConsumer(
+            queue,
+            handler=i_plan_update_order,
+            name="YT-65218",
+            partition_keys=yt65218_message_order_numbers,
+            max_workers=settings.IPLAN_SYNC_MAX_WORKERS,
+            time_budget=settings.IPLAN_SYNC_TIME_BUDGET,
+        ).run()
     messages = queue.receive_messages(MaxNumberOfMessages=1)
     for message in messages:
         task_logger.info(f"Start sync iPlan data: {message.body}")
@@ -402,6 +416,18 @@ def sync_i_plan_data():
         message.delete()
 
 
+def yt65218_message_order_numbers(message):
+    """
+    SAP order numbers of a YT-65218 message, messages of the same order are synced in sequence
+    @param message: Message of SQS
+    @return: set of so_no
+    """
+    body = json.loads(message.body)
+    body_message = parse_json_if_possible(body.get("Message"))
+    lines_data = body_message.get("orderStatusRequest", {}).get("orderStatusRequestLine", [])
+    return {str(line_data.get("orderNumber", "")).zfill(10) for line_data in lines_data}
+
+
 def order_lines_by_yt65218_message(body_message):
     order_status_request_data = body_message.get("orderStatusRequest")
     lines_data = order_status_request_data.get("orderStatusRequestLine")
@@ -501,6 +527,7 @@ def i_plan_update_order(message):
         except Exception as e:
             logging.info(f"[Iplan_sync] Exception while preparing items for update: {e}")
 
+    updated_orders = []
     for order in orders_set:
         try:
             with transaction.atomic():
@@ -526,14 +553,15 @@ def i_plan_update_order(message):
                         "run",
                         "paper_machine",
                     ])
-                status_en, status_thai = update_order_status(order.id)
-                logging.info(f"[Iplan_sync] order id : {order.id},"
-                             f"status_en : {status_en},DB order status: {order.status}")
-                order.status = status_en
-                order.status_thai = status_thai
-                order.save()
+            updated_orders.append(order)
         except Exception as e:
             logging.info(f"[Iplan_sync] Exception while updating i_plan_sync data: {e}")
+    try:
+        # status of all the synced orders with one query and one bulk update
+        changed_orders = save_orders_status(updated_orders)
+        logging.info(f"[Iplan_sync] status updated for {len(changed_orders)}/{len(updated_orders)} orders")
+    except Exception as e:
+        logging.info(f"[Iplan_sync] Exception while updating orders status: {e}")
     update_class_mark_to_sap(dict_order_line_update_class_mark)
     logging.info(f"[Iplan_sync] Sync completed in :{time.time() - start_time} seconds")
     return True
@@ -619,6 +647,15 @@ def sync_sap_data():
         region_name=region_name,
     )
     queue = sqs.Queue(queue_url)
+    if settings.ES38_SYNC_BATCH_CONSUMER_ENABLED:
+        return SqsBatchConsumer(
+            queue,
+            handler=sap_update_order,
+            name="ES38",
+            partition_keys=es38_message_order_numbers,
+            max_workers=settings.ES38_SYNC_MAX_WORKERS,
+            time_budget=settings.ES38_SYNC_TIME_BUDGET,
+        ).run()
     messages = queue.receive_messages(MaxNumberOfMessages=10)
     for message in messages:
         task_logger.info(f"Start sync SAP data: {message.body}")
@@ -627,6 +664,17 @@ def sync_sap_data():
         message.delete()
 
 
+def es38_message_order_numbers(message):
+    """
+    SAP order numbers of an ES38 message, messages of the same order are synced in sequence
+    @param message: Message of SQS
+    @return: set of so_no
+    """
+    body = json.loads(message.body)
+    body_message = parse_json_if_possible(body.get("Message"))
+    return {str(line_data.get("salesOrder", "")) for line_data in body_message.get("data") or []}
+
+
 def sap_update_order(message):
     """
     Update eOrdering order with data in message of SQS ES38
@@ -650,7 +698,7 @@ def sap_update_order(message):
                 target_numbers = [line_number, str(int(line_number))]
                 query = query | Q(item_no__in=target_numbers, order__so_no=order_number)
 
-            qs_order_lines = sap_migration_models.OrderLines.objects.filter(query)
+            qs_order_lines = sap_migration_models.OrderLines.objects.filter(query).select_related("order")
 
             dict_object_lines = {}  # Get dict line by item_no and order so_no
             for qs_line in qs_order_lines:
@@ -658,9 +706,7 @@ def sap_update_order(message):
                 item_no = str(qs_line.item_no)
                 dict_object_lines[f"{so_no}_{item_no}"] = qs_line
 
-            update_lines = []
-            list_orders = []
-            list_order_line_update = []
+            es38_lines = []
             for line_data in lines_data:
                 so_no = str(line_data.get("salesOrder"))
                 item_no = str(line_data.get("salesOrderItem"))
@@ -673,11 +719,19 @@ def sap_update_order(message):
                 if not object_line:
                     task_logger.error(f"[SAP ES38 sync] Order item no: {item_no} of order: {so_no} doesn't exist!")
                     continue
+                es38_lines.append((line_data, object_line))
+
+            sap_convert_items_data(es38_lines)
 
-                list_orders.append(object_line.order)
-                object_line = sap_convert_item_data(line_data, object_line)
-                list_order_line_update = get_data_from_es26(object_line.order)
-                logging.info(f"[Sync SAP ES38] so_no: {so_no},item_no: {item_no},"
+            orders = {}
+            for _, object_line in es38_lines:
+                orders.setdefault(object_line.order_id, object_line.order)
+            # one ES26 call per order of the message
+            list_order_line_update = get_data_from_es26_for_orders(list(orders.values()))
+
+            update_lines = []
+            for line_data, object_line in es38_lines:
+                logging.info(f"[Sync SAP ES38] so_no: {object_line.order.so_no},item_no: {object_line.item_no},"
                              f"DB delivery: {object_line.delivery} updated to :{line_data.get('delivery', '')},"
                              f"DB gi_status: {object_line.gi_status} updated to: {line_data.get('GiStatus', '')}")
                 # update data from es38 message
@@ -704,7 +758,7 @@ def sap_update_order(message):
                 for order_line in update_lines:
                     item_status_en, item_status_th = item_status_dict.get(order_line.id, (
                         order_line.item_status_en, order_line.item_status_th))
-                    logging.info(f"[Sync SAP ES38] so_no: {so_no},item_no: {item_no},"
+                    logging.info(f"[Sync SAP ES38] so_no: {order_line.order.so_no},item_no: {order_line.item_no},"
                                  f"db item_status_en: {order_line.item_status_en} updated to: {item_status_en}")
                     order_line.item_status_en = item_status_en
                     order_line.item_status_th = item_status_th
@@ -719,15 +773,14 @@ def sap_update_order(message):
                     "dtp"
                 ])
 
-            need_update_orders = []
-            for order in list_orders:
-                if order not in need_update_orders:
-                    status_en, status_thai = update_order_status(order.id)
-                    logging.info(
-                        f"[Sync SAP ES38] Order so_no:{order.so_no}, db status:{order.status} updated to:{status_en}")
-                    order.status = status_en
-                    order.status_thai = status_thai
-                    need_update_orders.append(order)
+            need_update_orders = list(orders.values())
+            orders_status = update_orders_status(list(orders.keys()))
+            for order in need_update_orders:
+                status_en, status_thai = orders_status[order.id]
+                logging.info(
+                    f"[Sync SAP ES38] Order so_no:{order.so_no}, db status:{order.status} updated to:{status_en}")
+                order.status = status_en
+                order.status_thai = status_thai
 
             if len(need_update_orders):
                 sap_migration_models.Order.objects.bulk_update(need_update_orders, fields=[
@@ -745,46 +798,61 @@ def sap_update_order(message):
             return False
 
 
-def sap_convert_item_data(line_data, object_line):
+def sap_convert_items_data(es38_lines):
     """
     convert SAP data to E-ordering
-    @param line_data: Data received from SAP ES38
-    @param object_line: Order item object in eOrdering
+    @param es38_lines: list of (line_data, object_line), data received from SAP ES38 and its order item in eOrdering
     @return:
     """
-    delivery = line_data.get("delivery")
-
-    # Case update new delivery for order item
-    if line_data.get("GiStatus") == DeliveryStatus.COMPLETED_DELIVERY.value:
-        # actualGiDate in SAP has formatted as dd/mm/yyyy
-        actual_gi_date = datetime.strptime(line_data.get("actualGiDate"), "%d/%m/%Y")
-        sap_migration_models.OrderLineDeliveries.objects.create(
-            order_line_id=object_line.id,
-            sales_order=line_data.get("salesOrderItem"),
-            sales_order_item=line_data.get("salesOrderItem"),
-            delivery=delivery,
-            actual_gi_date=actual_gi_date,
-            gi_status=line_data.get("GiStatus"),
-            sales_org=line_data.get("salesOrg"),
-            distribution_channel=line_data.get("distributionChannel"),
-            shipping_point=line_data.get("shippingPoint"),
+    # keyed by (order_line_id, delivery), a cancel drops the deliveries created before it in the same message
+    deliveries_to_create = {}
+    deliveries_to_cancel = set()
+    for line_data, object_line in es38_lines:
+        delivery = line_data.get("delivery")
+        key = (object_line.id, delivery)
+
+        # Case update new delivery for order item
+        if line_data.get("GiStatus") == DeliveryStatus.COMPLETED_DELIVERY.value:
+            # actualGiDate in SAP has formatted as dd/mm/yyyy
+            actual_gi_date = datetime.strptime(line_data.get("actualGiDate"), "%d/%m/%Y")
+            deliveries_to_create.setdefault(key, []).append(sap_migration_models.OrderLineDeliveries(
+                order_line_id=object_line.id,
+                sales_order=line_data.get("salesOrderItem"),
+                sales_order_item=line_data.get("salesOrderItem"),
+                delivery=delivery,
+                actual_gi_date=actual_gi_date,
+                gi_status=line_data.get("GiStatus"),
+                sales_org=line_data.get("salesOrg"),
+                distribution_channel=line_data.get("distributionChannel"),
+                shipping_point=line_data.get("shippingPoint"),
+            ))
+
+        # Case update cancel delivery of order item
+        if line_data.get("GiStatus") == DeliveryStatus.CANCEL.value:
+            deliveries_to_create.pop(key, None)
+            deliveries_to_cancel.add(key)
+
+    if deliveries_to_cancel:
+        query = Q()
+        for order_line_id, delivery in deliveries_to_cancel:
+            query = query | Q(order_line_id=order_line_id, delivery=delivery)
+        sap_migration_models.OrderLineDeliveries.objects.filter(query).delete()
+    if deliveries_to_create:
+        sap_migration_models.OrderLineDeliveries.objects.bulk_create(
+            [line_delivery for line_deliveries in deliveries_to_create.values() for line_delivery in line_deliveries]
         )
 
-    # Case update cancel delivery of order item
-    if line_data.get("GiStatus") == DeliveryStatus.CANCEL.value:
-        sap_migration_models.OrderLineDeliveries.objects.filter(
-            order_line_id=object_line.id,
-            delivery=delivery,
-        ).delete()
-
     # Update giDate to giDate of earliest remain delivery in DB or None when don't have delivery
-    earliest_gi_date = sap_migration_models.OrderLineDeliveries.objects.filter(
-        order_line_id=object_line.id
-    ).order_by("actual_gi_date").values_list("actual_gi_date", flat=True).first()
-
-    object_line.actual_gi_date = earliest_gi_date
-
-    return object_line
+    order_line_ids = {object_line.id for _, object_line in es38_lines}
+    earliest_gi_dates = dict(
+        sap_migration_models.OrderLineDeliveries.objects.filter(order_line_id__in=order_line_ids)
+        .order_by()
+        .values("order_line_id")
+        .annotate(earliest_gi_date=Min("actual_gi_date"))
+        .values_list("order_line_id", "earliest_gi_date")
+    )
+    for _, object_line in es38_lines:
+        object_line.actual_gi_date = earliest_gi_dates.get(object_line.id)
 
 
 def get_sqs_config(plugin):
@@ -803,7 +871,7 @@ def get_sqs_config(plugin):
 
 
 def get_company_from_order(code):
-    obj = sap_master_data_modes.SalesOrganizationMaster.objects.filter(code=code).first()
+    obj = get_master_by_code(sap_master_data_modes.SalesOrganizationMaster, code)
     return deepgetattr(obj, "full_name", "")
 
 
@@ -1056,6 +1124,42 @@ def resolve_list_of_customer_material(distribution_channel_id, sale_organization
         ).distinct("material_code")
 
 def download_pending_order_report_excel(data_input, info):
+    """
+    Pending order report as raw bytes (report_format excel) or base64
+    @return: (file_name, content)
+    """
+    file_name, temporary_file = make_pending_order_report_excel(data_input, info)
+    with open(temporary_file.name, "rb") as exported_file:
+        if data_input.report_format == 'excel':
+            excel_file = exported_file.read()
+            return None, excel_file
+        base64_file = base64.b64encode(exported_file.read())
+    return file_name, base64_file.decode("utf-8")
+
+
+# column widths and header wrap of the pending order report (column A..N)
+PENDING_ORDER_REPORT_COLUMN_WIDTHS = {1: 15, 3: 18, 4: 18, 6: 27, 7: 54, 8: 14, 9: 14, 10: 14, 11: 14, 12: 14, 13: 9,
+                                      14: 86}
+PENDING_ORDER_REPORT_HEADER_WRAP = {1: True, 2: True, 3: True, 4: True, 5: True, 6: True, 7: True, 8: False, 9: False,
+                                    10: False, 11: False, 12: True, 13: True, 14: True}
+PENDING_ORDER_REPORT_BOLD_STYLE = XlsxCellStyle(font=Font(bold=True))
+PENDING_ORDER_REPORT_QTY_STYLE = XlsxCellStyle(alignment=Alignment(wrap_text=True, horizontal='right', vertical='top'),
+                                               number_format='#,##0.000', convert=float)
+PENDING_ORDER_REPORT_VALUE_STYLES = {
+    3: XlsxCellStyle(alignment=Alignment(horizontal='left', vertical='top')),
+    **{column: PENDING_ORDER_REPORT_QTY_STYLE for column in range(8, 13)},
+}
+PENDING_ORDER_REPORT_SUMMARY_STYLES = {
+    7: PENDING_ORDER_REPORT_BOLD_STYLE,
+    **{column: PENDING_ORDER_REPORT_QTY_STYLE for column in range(8, 13)},
+}
+
+
+def make_pending_order_report_excel(data_input, info):
+    """
+    Write the pending order report in one pass, styles are applied while writing
+    @return: (file_name, temporary file)
+    """
     try:
         field_header_column = PendingOrderFieldHeaderColumn()
         sort_columns = data_input.get('sold_to_sort')
@@ -1065,17 +1169,21 @@ def download_pending_order_report_excel(data_input, info):
         if data_input.get("is_order_tracking", False):
             file_name = f'Pending_Order_Tracking_{date_time_format.strftime("%d%m%Y")}'
         row_headers = [f'อัพเดตข้อมูล: {date_time_format.strftime("%d/%m/%Y : %H:%M")}']
-        temporary_file = create_file_with_headers(row_headers, ",", "xlsx")
+        _row_headers = [item['th'] for item in field_header_column.find("ALL", "")]
+        writer = StreamingXlsxWriter(PENDING_ORDER_REPORT_COLUMN_WIDTHS)
+        writer.append(row_headers)
+        header_styles = {
+            column: XlsxCellStyle(font=Font(bold=True), alignment=ALIGNMENT_STYLE if wrap else ALIGNMENT_VERTICAL_TOP)
+            for column, wrap in PENDING_ORDER_REPORT_HEADER_WRAP.items()
+        }
         default_sort_field_list = ['so_no', 'item_no']
 
         for item in response:
             sold_to_name = get_sold_to_name_and_address_from_order_for_sending_email(item.get("sold_to"))["name"]
-            row_group = [[f'Sold to: {item.get("sold_to")} {sold_to_name}']]
+            writer.append([f'Sold to: {item.get("sold_to")} {sold_to_name}'], style=PENDING_ORDER_REPORT_BOLD_STYLE)
             for material_group in item.get("product_groups"):
-                row_material_group = [material_group.get("product_group", "")]
-                _row_headers = [item['th'] for item in field_header_column.find("ALL", "")]
-                row_group.append(row_material_group)
-                row_group.append(_row_headers)
+                writer.append([material_group.get("product_group", "")])
+                writer.append(_row_headers, column_styles=header_styles, height=50)
                 order_lines = material_group.get("order_lines")
                 totals = material_group.get("summary")
                 row_body = []
@@ -1121,7 +1229,8 @@ def download_pending_order_report_excel(data_input, info):
                                 reverse=reverse)
                 else:
                     row_body.sort(key=lambda x: multiple_sort_for_pending_order(x, default_sort_field_list, true))
-                row_group = row_group + row_body
+                for _row in row_body:
+                    writer.append(_row, column_styles=PENDING_ORDER_REPORT_VALUE_STYLES)
                 for total in totals:
                     sale_unit = total.get("sale_unit", "").upper() if total.get("sale_unit", "") else ""
                     summary = [
@@ -1139,69 +1248,14 @@ def download_pending_order_report_excel(data_input, info):
                         scg_round(total.get("delivery_qty", 0)),
                         sale_unit
                     ]
-                    row_group.append(summary)
-            row_headers.append(row_group)
-            etl.io.xlsx.appendxlsx(row_group, temporary_file.name, write_header=True)
+                    writer.append(summary, column_styles=PENDING_ORDER_REPORT_SUMMARY_STYLES)
 
-        return set_excel_column_style_for_pending_order_report(data_input, file_name, temporary_file)
+        return file_name, writer.save()
 
     except Exception as e:
         raise ValueError(e)
 
 
-def set_excel_column_style_for_pending_order_report(data_input, file_name, temporary_file):
-    wb = openpyxl.load_workbook(temporary_file)
-    ws = wb.active
-    for i, row in enumerate(ws.iter_rows(values_only=False)):
-        row_bold = False
-        for cell in row:
-            if isinstance(cell.value, str):
-                if "Sold to" in cell.value or "Total" in cell.value:
-                    cell.font = Font(bold=True)
-                if "วันที่ประมาณ\nการส่งมอบ" == cell.value:
-                    row_bold = True
-                    set_style(ws, 'A', cell.row, width=15, alignment_style=True, height=50, auto_size=False)
-                if "วันที่สั่งซื้อ\n(Create Date)" == cell.value:
-                    set_style(ws, 'B', cell.row, alignment_style=True, auto_size=False)
-                if "เลขที่ใบสั่งซื้อ PO\n(PO No.)" == cell.value:
-                    set_style(ws, 'C', cell.row, width=18, alignment_style=True, wrap_cell_value=True,
-                              min_row=cell.row + 1, min_col=3, max_col=3, auto_size=False, cell_value_alignment_horizontal_left=True)
-                if "เลขที่ใบสั่งซื้อ SO\n(SO No.)" == cell.value:
-                    set_style(ws, 'D', cell.row, width=18, alignment_style=True, auto_size=False)
-                if "ลำดับที่\n(Item No.)"==cell.value:
-                    set_style(ws, 'E', cell.row,alignment_style=True, auto_size=False)
-                if "รายการสินค้า\n(Material Code)" == cell.value:
-                    set_style(ws, 'F', cell.row, width=27, alignment_style=True)
-                if "รายละเอียดสินค้า\n(Material Description)" == cell.value:
-                    set_style(ws, 'G', cell.row, width=54, alignment_style=True)
-                if "จำนวนสั่งซื้อ\n(Order Qty)" == cell.value:
-                    set_style(ws, 'H', cell.row, width=14, alignment_style=False, number_format='#,##0.000', min_row=1,
-                              min_col=8, max_col=8)
-                if "จำนวนค้างส่ง\n(Pending Qty)" == cell.value:
-                    set_style(ws, 'I', cell.row, width=14, alignment_style=False, number_format='#,##0.000', min_row=1,
-                              min_col=9, max_col=9)
-                if "พร้อมส่ง\n(ATP Qty)" == cell.value:
-                    set_style(ws, 'J', cell.row, width=14, alignment_style=False, number_format='#,##0.000', min_row=1,
-                              min_col=10, max_col=10)
-                if "รอผลิต\n(CTP Qty)" == cell.value:
-                    set_style(ws, 'K', cell.row, width=14, alignment_style=False, number_format='#,##0.000', min_row=1,
-                              min_col=11, max_col=11)
-                if "ส่งแล้ว\n(Delivery Qty)" == cell.value:
-                    set_style(ws, 'L', cell.row, width=14, alignment_style=True, number_format='#,##0.000', min_row=1,
-                              min_col=12, max_col=12)
-                if "หน่วย\n(Unit)" == cell.value:
-                    set_style(ws, 'M', cell.row, width=9, alignment_style=True)
-                if "สถานที่ส่ง\n(Sold to)" == cell.value:
-                    set_style(ws, 'N', cell.row, width=86, alignment_style=True)
-            if row_bold:
-                cell.font = Font(bold=True)
-    wb.save(temporary_file.name)
-    with open(temporary_file.name, "rb") as exported_file:
-        if data_input.report_format == 'excel':
-            excel_file = exported_file.read()
-            return None, excel_file
-        base64_file = base64.b64encode(exported_file.read())
-    return file_name, base64_file.decode("utf-8")
 
 
 def get_material_variant_by_contract_product(contract_product_objects, contract_product_id):
@@ -1612,10 +1666,31 @@ def get_data_from_es26(order):
     @param order:
     @return:
     """
-    list_order_line_update = []
     manager = get_plugins_manager()
     sap_fn = manager.call_api_sap_client
     es26_response = call_sap_es26(so_no=order.so_no, sap_fn=sap_fn)
+    return sync_order_lines_from_es26_response(order, es26_response)
+
+
+def get_data_from_es26_for_orders(orders):
+    """
+    Get data from es26 for many orders and sync to eOrdering, ES26 calls run concurrently
+    @param orders: list of order
+    @return: order lines updated of all orders
+    """
+    manager = get_plugins_manager()
+    sap_fn = manager.call_api_sap_client
+    es26_responses = MulesoftApiRequest.batch_call(
+        [partial(call_sap_es26, so_no=order.so_no, sap_fn=sap_fn) for order in orders]
+    )
+    list_order_line_update = []
+    for order, es26_response in zip(orders, es26_responses):
+        list_order_line_update.extend(sync_order_lines_from_es26_response(order, es26_response))
+    return list_order_line_update
+
+
+def sync_order_lines_from_es26_response(order, es26_response):
+    list_order_line_update = []
     _order_lines_from_es26 = es26_response["data"][0].get("orderItems", None)
     if _order_lines_from_es26:
         order_text_mapping = make_order_text_mapping(es26_response["data"][0]["orderText"])
@@ -2168,29 +2243,20 @@ def update_iplan_for_order_line(so_no, response, parameter):
 
 
 def update_attention_type_r1(line, confirm_output_date):
-    attention_type = line.attention_type or "R1"
     '''
     SEO-4434: 
         Flag R1: request date < confirmed date or request date < confirm availability date
         Unflag R1: request >= confirmed date or request >= confirm availability date
     '''
-    if line.request_date < line.confirmed_date or line.request_date < confirm_output_date:
-        attention_type = ','.join(sorted(attention_type.replace("R1", "").split() + ['R1'])).strip(", ")
-    else:
-        attention_type = attention_type.replace("R1", "").strip(", ")
-    line.attention_type = attention_type
+    line.attention_type = set_attention_type(
+        line.attention_type,
+        "R1",
+        flagged=line.request_date < line.confirmed_date or line.request_date < confirm_output_date,
+    )
 
 
 def update_attention_type_r2(line, for_attention):
-    attention_type = line.attention_type or ""
-    attention_list = [att.strip() for att in attention_type.split(",") if att.strip()]
-    if for_attention:
-        if "R2" not in attention_list:
-            attention_list.append("R2")
-    else:
-        if "R2" in attention_list:
-            attention_list.remove("R2")
-    line.attention_type = ", ".join(sorted(attention_list)).strip(", ")
+    line.attention_type = set_attention_type(line.attention_type, "R2", flagged=for_attention)
 
 
 def _parse_datetime(date_str):
@@ -2208,17 +2274,16 @@ def _parse_datetime(date_str):
 
 
 def update_attention_type_r4(line, confirm_output_date):
-    attention_type = line.attention_type or ""
-    attention_list = [att.strip() for att in attention_type.split(",") if att.strip()]
     etd = _parse_datetime(line.order.etd)
     if etd:
-        if (line.confirmed_date and line.confirmed_date > etd) or (confirm_output_date and confirm_output_date > etd):
-            if "R4" not in attention_list:
-                attention_list.append("R4")
-        else:
-            if "R4" in attention_list:
-                attention_list.remove("R4")
-    line.attention_type = ", ".join(sorted(attention_list)).strip(", ")
+        line.attention_type = set_attention_type(
+            line.attention_type,
+            "R4",
+            flagged=bool(
+                (line.confirmed_date and line.confirmed_date > etd)
+                or (confirm_output_date and confirm_output_date > etd)
+            ),
+        )
 
 
 def prepare_for_ddq_request_line_delete(order_line, flag, order):
@@ -3,6 +3,7 @@ import logging
 import re
 import uuid
 from datetime import datetime
+from functools import partial
 
 from common.enum import MulesoftServiceType, MulesoftFeatureType
 from common.helpers import mock_confirm_date, DateHelper
@@ -20,7 +21,7 @@ from scg_checkout.graphql.enums import (
     IPlanOrderItemStatus, )
 from scg_checkout.graphql.helper import add_item_to_dict_with_index, round_qty_decimal
 from scg_checkout.graphql.helper import (
-    update_order_status,
+    save_orders_status,
     prepare_param_es21_order_text_for_change_order_domestic,
     deepgetattr
 )
@@ -1088,32 +1089,52 @@ def es_21_delete_cancel_order(success_item_from_i_plan_request, status, manager)
     try:
         # if one of items return fail, can not cancel/delete that order items
         success, failed, item_no_for_special_plant = [], [], []
+        lines_by_so_no = []
         for item in success_item_from_i_plan_request:
             for k, v in item.items():
                 if v:
                     so_no = k.zfill(10)
-                    line_send_to_es_21 = OrderLines.objects.filter(item_no__in=[line for line in v], order__so_no=so_no)
-                    response = call_es_21_to_delete_cancel_order(line_send_to_es_21, status, manager)
-                    if response.get("return")[0].get("type") == "success":
-                        origin_lines_success = copy.deepcopy(line_send_to_es_21)
-                        success_item_from_es_21 = [line for line in origin_lines_success]
-                        success = get_message_response(success_item_from_es_21, success)
-                        if status == "Delete":
-                            OrderLines.objects.filter(
-                                id__in=[line.id for line in line_send_to_es_21]
-                            ).delete()
-                        if status == "Cancel" or status == "Cancel 93":
-                            _update_cancelled_status_for_order_line(line_send_to_es_21)
-                            order = Order.objects.filter(so_no=so_no).first()
-                            status_en, status_thai = update_order_status(order.id)
-                            order.status = status_en
-                            order.status_thai = status_thai
-                            order.save()
-                    else:
-                        message = response.get("return")[0].get("message", "")
-                        fail_item_from_es_21 = [line for line in line_send_to_es_21]
-                        update_attention_type_r5(fail_item_from_es_21)
-                        failed = get_message_response(fail_item_from_es_21, failed, message)
+                    line_send_to_es_21 = list(
+                        OrderLines.objects.filter(item_no__in=[line for line in v], order__so_no=so_no)
+                        .select_related("order", "contract_material", "material_variant")
+                    )
+                    lines_by_so_no.append((so_no, line_send_to_es_21))
+        # ES21 calls of different orders are independent, send them concurrently
+        responses = MulesoftApiRequest.batch_call(
+            [
+                partial(call_es_21_to_delete_cancel_order, line_send_to_es_21, status, manager)
+                for _, line_send_to_es_21 in lines_by_so_no
+            ],
+            return_exceptions=True,
+        )
+        # every order was sent already: each response is handled on its own, an error
+        # of one order must not leave the lines of the others out of sync with SAP
+        cancelled_so_nos = []
+        for (so_no, line_send_to_es_21), response in zip(lines_by_so_no, responses):
+            if isinstance(response, Exception):
+                logging.error(
+                    f"[ES21 delete/cancel] order {so_no} error: {response}", exc_info=response
+                )
+                message = str(response)
+            elif response.get("return")[0].get("type") == "success":
+                origin_lines_success = copy.deepcopy(line_send_to_es_21)
+                success_item_from_es_21 = [line for line in origin_lines_success]
+                success = get_message_response(success_item_from_es_21, success)
+                if status == "Delete":
+                    OrderLines.objects.filter(
+                        id__in=[line.id for line in line_send_to_es_21]
+                    ).delete()
+                if status == "Cancel" or status == "Cancel 93":
+                    _update_cancelled_status_for_order_line(line_send_to_es_21)
+                    cancelled_so_nos.append(so_no)
+                continue
+            else:
+                message = response.get("return")[0].get("message", "")
+            fail_item_from_es_21 = [line for line in line_send_to_es_21]
+            update_attention_type_r5(fail_item_from_es_21)
+            failed = get_message_response(fail_item_from_es_21, failed, message)
+        if cancelled_so_nos:
+            save_orders_status(Order.objects.filter(so_no__in=cancelled_so_nos))
 
         return success, failed
     except Exception as e:
@@ -1,4 +1,64 @@
-from weasyprint import CSS, HTML
+import hashlib
+import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+from django.conf import settings
+from weasyprint import CSS, HTML, default_url_fetcher
+
+# resources fetched while rendering (Google Fonts stylesheet and font files of
+# the templates), kept by url so they are downloaded once per process
+URL_CACHE_SIZE = 64
+# layouts of rendered headers / footers, by their html
+OVERLAY_CACHE_SIZE = 32
+
+_url_cache = OrderedDict()
+_overlay_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _cache_get(cache, key):
+    with _cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_set(cache, key, value, size):
+    with _cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > size:
+            cache.popitem(last=False)
+
+
+def cached_url_fetcher(url, *args, **kwargs):
+    """weasyprint url fetcher keeping remote resources in memory"""
+    if not url.startswith(("http://", "https://")):
+        return default_url_fetcher(url, *args, **kwargs)
+    resource = _cache_get(_url_cache, url)
+    if resource is None:
+        resource = default_url_fetcher(url, *args, **kwargs)
+        file_obj = resource.pop("file_obj", None)
+        if file_obj is not None:
+            resource["string"] = file_obj.read()
+            file_obj.close()
+        _cache_set(_url_cache, url, resource, URL_CACHE_SIZE)
+    return dict(resource)
+
+
+@lru_cache(maxsize=32)
+def get_page_stylesheet(page_css):
+    return CSS(string=page_css)
 
 
 class PdfGenerator:
@@ -27,26 +87,40 @@ class PdfGenerator:
         self.orientation = orientation
 
     def _compute_overlay_element(self, element: str):
+        element_html = getattr(self, f"{element}_html")
+        cache_key = hashlib.sha1(
+            f"{element}\0{self.orientation}\0{self.base_url}\0{element_html}".encode("utf-8")
+        ).hexdigest()
+        overlay = _cache_get(_overlay_cache, cache_key)
+        if overlay is None:
+            overlay = self._layout_overlay_element(element, element_html)
+            _cache_set(_overlay_cache, cache_key, overlay, OVERLAY_CACHE_SIZE)
+        # the rendered document is kept with its boxes, they are drawn with it
+        _, element_body, element_height = overlay
+        return element_body, element_height
+
+    def _layout_overlay_element(self, element, element_html):
         html = HTML(
-            string=getattr(self, f"{element}_html"),
+            string=element_html,
             base_url=self.base_url,
+            url_fetcher=cached_url_fetcher,
         )
         overlay_layout = "@page {size: A4 %s; margin: 0;}" % (self.orientation)
-        element_doc = html.render(stylesheets=[CSS(string=overlay_layout)])
+        element_doc = html.render(stylesheets=[get_page_stylesheet(overlay_layout)])
         element_page = element_doc.pages[0]
         element_body = PdfGenerator.get_element(
             element_page._page_box.all_children(), "body"
         )
         element_body = element_body.copy_with_children(element_body.all_children())
-        element_html = PdfGenerator.get_element(
+        element_box = PdfGenerator.get_element(
             element_page._page_box.all_children(), element
         )
         if element == "header":
-            element_height = element_html.height + 30
+            element_height = element_box.height + 30
         if element == "footer":
             element_height = 30
 
-        return element_body, element_height
+        return element_doc, element_body, element_height
 
     def _apply_overlay_on_main(self, main_doc, header_body=None, footer_body=None):
         for page in main_doc.pages:
@@ -57,7 +131,8 @@ class PdfGenerator:
             if footer_body:
                 page_body.children += footer_body.all_children()
 
-    def render_pdf(self):
+    def render(self):
+        """Laid out weasyprint Document of the pdf, with header and footer on every page"""
         if self.header_html:
             header_body, header_height = self._compute_overlay_element("header")
         else:
@@ -80,14 +155,16 @@ class PdfGenerator:
         html = HTML(
             string=self.main_html,
             base_url=self.base_url,
+            url_fetcher=cached_url_fetcher,
         )
-        main_doc = html.render(stylesheets=[CSS(string=content_print_layout)])
+        main_doc = html.render(stylesheets=[get_page_stylesheet(content_print_layout)])
 
         if self.header_html or self.footer_html:
             self._apply_overlay_on_main(main_doc, header_body, footer_body)
-        pdf = main_doc.write_pdf()
+        return main_doc
 
-        return pdf
+    def render_pdf(self):
+        return self.render().write_pdf()
 
     @staticmethod
     def get_element(boxes, element):
@@ -95,3 +172,91 @@ class PdfGenerator:
             if box.element_tag == element:
                 return box
             return PdfGenerator.get_element(box.all_children(), element)
+
+
+class PdfRenderTimeout(Exception):
+    pass
+
+
+def render_pdf(**kwargs):
+    """
+    Render `PdfGenerator(**kwargs)` to pdf bytes, on the render pool when there is one
+    """
+    return _run_on_pool(_render_pdf, kwargs)
+
+
+def render_pdfs(documents):
+    """
+    Render many documents (list of `PdfGenerator` kwargs) into one pdf, every
+    document keeps its own header, footer and page numbers
+    """
+    if not documents:
+        raise ValueError("No document to render")
+    return _run_on_pool(_render_pdfs, list(documents))
+
+
+def _render_pdf(kwargs):
+    return PdfGenerator(**kwargs).render_pdf()
+
+
+def _render_pdfs(documents):
+    rendered = [PdfGenerator(**kwargs).render() for kwargs in documents]
+    pages = [page for document in rendered for page in document.pages]
+    return rendered[0].copy(pages).write_pdf()
+
+
+def _run_on_pool(fn, arg):
+    pool = _get_pool()
+    if pool is None:
+        return fn(arg)
+    try:
+        future = pool.submit(fn, arg)
+        return future.result(timeout=settings.PDF_RENDER_TIMEOUT)
+    except BrokenProcessPool as e:
+        logging.warning(f"[PDF] render pool is broken, rendering in process: {e}")
+        _reset_pool()
+        return fn(arg)
+    except FutureTimeoutError:
+        future.cancel()
+        logging.error(
+            f"[PDF] render took longer than {settings.PDF_RENDER_TIMEOUT}s, "
+            "restarting the render pool"
+        )
+        # the stuck render would keep its worker busy for good
+        _reset_pool(terminate=True)
+        raise PdfRenderTimeout(
+            f"PDF rendering took longer than {settings.PDF_RENDER_TIMEOUT} seconds"
+        )
+
+
+def _get_pool():
+    """
+    Bounded pool of render processes, None when disabled or when this process
+    can't have children (celery prefork workers are daemonic, they render in process)
+    """
+    global _pool
+    if settings.PDF_RENDER_MAX_WORKERS <= 0 or multiprocessing.current_process().daemon:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawned workers only import weasyprint, nothing is inherited from the web worker
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_RENDER_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _reset_pool(terminate=False):
+    """
+    Drop the render pool, `terminate` also kills its processes, running renders
+    of other threads then fail over to render in process
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            processes = list((_pool._processes or {}).values()) if terminate else []
+            _pool.shutdown(wait=False, cancel_futures=terminate)
+            for process in processes:
+                process.terminate()
+        _pool = None
@@ -198,6 +198,7 @@ class AlternativeMaterialExport(BaseMutation):
     file_name = graphene.String()
     content_type = graphene.String()
     exported_file_base_64 = graphene.String()
+    download_url = graphene.String(description="Link to download a large excel instead of base64 excel")
 
     class Meta:
         description = "export alternated materials and return link to download"
@@ -205,11 +206,12 @@ class AlternativeMaterialExport(BaseMutation):
 
     @classmethod
     def perform_mutation(cls, _root, info, **data):
-        file_name, content_type, base64_string = export_alternative_material_excel_file()
+        file_name, content_type, base64_string, download_url = export_alternative_material_excel_file()
         return AlternativeMaterialExport(
             file_name=file_name,
             content_type=content_type,
-            exported_file_base_64=base64_string
+            exported_file_base_64=base64_string,
+            download_url=download_url,
         )
 
 
@@ -217,6 +219,7 @@ class AlternativeMaterialLogExport(BaseMutation):
     file_name = graphene.String()
     content_type = graphene.String()
     exported_file_base_64 = graphene.String()
+    download_url = graphene.String(description="Link to download a large excel instead of base64 excel")
 
     class Meta:
         description = "export alternated material log and return link to download"
@@ -224,9 +227,10 @@ class AlternativeMaterialLogExport(BaseMutation):
 
     @classmethod
     def perform_mutation(cls, _root, info, **data):
-        file_name, content_type, base64_string = export_alternative_material_log_excel_file()
+        file_name, content_type, base64_string, download_url = export_alternative_material_log_excel_file()
         return AlternativeMaterialLogExport(
             file_name=file_name,
             content_type=content_type,
-            exported_file_base_64=base64_string
+            exported_file_base_64=base64_string,
+            download_url=download_url,
         )
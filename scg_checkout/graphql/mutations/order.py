@@ -19,6 +19,7 @@ from common.enum import MulesoftServiceType
 from common.mulesoft_api import MulesoftApiRequest
 from common.product_group import ProductGroup
 from common.newrelic_metric import add_metric_process_order, force_update_attributes
+from common.util.xlsx_writer import export_xlsx_file
 from saleor.core.permissions import AuthorizationFilters
 from saleor.graphql.core.mutations import (
     ModelMutation,
@@ -97,6 +98,7 @@ from scg_checkout.graphql.implementations.orders import (
     prepare_order_confirmation_pdf,
     print_pdf_pending_order_report,
     download_pending_order_report_excel,
+    make_pending_order_report_excel,
     cancel_delete_order_lines,
     undo_order_lines,
 )
@@ -943,6 +945,7 @@ class SendEmailPendingOrder(BaseMutation):
 class DownloadPendingOrderReportExcel(BaseMutation):
     exported_file_base_64 = graphene.String()
     file_name = graphene.String()  # Pending Order Report_DDMMYYYY
+    download_url = graphene.String(description="Link to download a large excel instead of base64 excel")
 
     class Arguments:
         input = SAPPendingOrderReportInput(required=False)
@@ -956,8 +959,9 @@ class DownloadPendingOrderReportExcel(BaseMutation):
     @classmethod
     def perform_mutation(cls, _root, info, **data):
         data_input = data.get("input")
-        file_name, base64_string = download_pending_order_report_excel(data_input, info)
-        return cls(exported_file_base_64=base64_string, file_name=file_name)
+        file_name, temporary_file = make_pending_order_report_excel(data_input, info)
+        base64_string, download_url = export_xlsx_file(temporary_file, f"{file_name}.xlsx")
+        return cls(exported_file_base_64=base64_string, file_name=file_name, download_url=download_url)
 
 
 class CancelDeleteOrderLines(BaseMutation):
@@ -5,13 +5,15 @@ import uuid
 from datetime import datetime, timedelta
 from functools import reduce
 
-from django.core.exceptions import MultipleObjectsReturned
+from django.conf import settings
 from django.db.models import Q, Subquery, OuterRef
 
 import sap_migration.models
+from sap_master_data.cache import get_master_by_code
 import sap_master_data.models as master_model
-from common.helpers import update_instance_fields
+from common.helpers import update_instance_fields, update_instance_fields_from_dic
 from common.enum import MulesoftServiceType
+from common.sap.response_cache import get_cached_sap_response, make_payload_hash
 from common.mulesoft_api import MulesoftApiRequest
 from saleor.plugins.manager import get_plugins_manager
 from sap_master_data import models as master_models
@@ -20,7 +22,7 @@ from sap_migration import models as migration_models
 from sap_migration.models import ContractMaterial
 from scg_checkout.graphql.enums import MaterialType
 from scg_checkout.graphql.helper import get_name1_from_partner_code, make_order_header_text_mapping, \
-    is_default_sale_unit_from_contract, extract_item_text_data_sap_es14, update_active_for_missing_contract_materials
+    is_default_sale_unit_from_contract, extract_item_text_data_sap_es14
 from scg_checkout.sap_contract_list import sap_contract_mapping
 from scgp_export.graphql.enums import SapEnpoint, MaterialGroup
 from scgp_export.graphql.resolvers.export_sold_tos import resolve_display_text
@@ -30,6 +32,17 @@ mapping_code_for_contract_materials = {
     "Z004": "remark"
 }
 
+CONTRACT_SYNC_BATCH_SIZE = 500
+VARIANT_FROM_CONTRACT_FIELDS = [
+    "description_en",
+    "determine_type",
+    "sales_unit",
+    "type",
+    "basis_weight",
+    "diameter",
+    "grade",
+]
+
 
 def resolve_contracts(info, **kwargs):
     sold_to_code = kwargs.get("sold_to_code")
@@ -79,18 +92,29 @@ def call_sap_api(info, api, method, params):
     return response.get("data", [])
 
 
-def call_sap_api_get_contracts_export_pis(contract_code, context: Union[dict, None] = None):
+def call_sap_api_get_contracts_export_pis(contract_code, context: Union[dict, None] = None, bypass_cache=False,
+                                          unchanged_flow: Union[str, None] = None):
+    """
+    Call ES14 and save the contract header
+    @param unchanged_flow: flow of the caller, when the contract was last synced by it from the same ES14 data
+    the header is not written again, the full sync of that flow already overwrote it
+    @return: contract, ES14 response
+    """
     manager = get_plugins_manager()
     sap_fn = manager.call_api_sap_client
     contract_code = contract_code.zfill(10)
 
-    response = get_sap_contract_items(sap_fn, contract_no=contract_code, context=context)
+    response = get_sap_contract_items(sap_fn, contract_no=contract_code, context=context, bypass_cache=bypass_cache)
 
     response_data = response.get("data", [])
     if len(response_data) == 0:
         return None, {}
 
     response_data = response_data[0]
+    if unchanged_flow:
+        contract = migration_models.Contract.objects.filter(code=contract_code).first()
+        if is_contract_payload_unchanged(contract, unchanged_flow, make_payload_hash(response_data)):
+            return contract, response
     contact_person_list = response_data.get("contactPerson", [])
     contact_persons = ", ".join(
         [f"{contact_person.get('contactPersonNo')} - {contact_person.get('contactPersonName')}"
@@ -276,8 +300,24 @@ def get_data_from_order_text_list(order_text_list):
     return result
 
 
+def is_contract_payload_unchanged(contract, flow: str, payload_hash: str) -> bool:
+    """Whether `contract` was last synced by `flow` from the same ES14 data"""
+    return bool(
+        settings.CONTRACT_SYNC_SKIP_UNCHANGED
+        and contract
+        and contract.es14_payload_hash == f"{flow}:{payload_hash}"
+    )
+
+
+def save_contract_payload_hash(contract, flow: str, payload_hash: str):
+    contract.es14_payload_hash = f"{flow}:{payload_hash}"
+    migration_models.Contract.objects.filter(pk=contract.pk).update(
+        es14_payload_hash=contract.es14_payload_hash
+    )
+
+
 def sync_contract_material(contract_id=None, contract_no=None, es26_response=None, is_create=False,
-                           context: Union[dict, None] = None):
+                           context: Union[dict, None] = None, bypass_cache=False):
     try:
         contract = (
             migration_models.Contract.objects
@@ -287,7 +327,9 @@ def sync_contract_material(contract_id=None, contract_no=None, es26_response=Non
         contract_no = contract_no or contract.code
     except migration_models.Contract.DoesNotExist and not is_create:
         pass
-    contract, response = call_sap_api_get_contracts_export_pis(contract_no, context=context)
+    contract, response = call_sap_api_get_contracts_export_pis(
+        contract_no, context=context, bypass_cache=bypass_cache, unchanged_flow="contract"
+    )
     currency = ""
 
     try:
@@ -296,6 +338,14 @@ def sync_contract_material(contract_id=None, contract_no=None, es26_response=Non
             return list()
 
         response_data = response_data[0]
+        payload_hash = make_payload_hash(response_data)
+        if is_contract_payload_unchanged(contract, "contract", payload_hash):
+            # contract and its materials are already in sync with this ES14 data
+            if es26_response:
+                es26_response["contractItem"] = response_data.get("contractItem", [])
+            return list(
+                ContractMaterial.objects.filter(contract=contract).order_by("item_no").values_list("pk", flat=True)
+            )
 
         # Save payment term code for contract
         update_instance_fields(
@@ -354,11 +404,7 @@ def sync_contract_material(contract_id=None, contract_no=None, es26_response=Non
         contract_sale_detail = {**contract_sale_detail, **order_text_list_data, **order_header_text_data}
         sync_contract_sale_detail(contract, contract_sale_detail)
         list_condition = response_data.get("conditionList", [])
-        contract_item_objects = reduce(
-            lambda previous, current: {**previous, current.get('itemNo'): current},
-            list_items,
-            {}
-        )
+        contract_item_objects = {item.get('itemNo'): item for item in list_items}
 
         extracted_condition_type = ['ZN00', 'ZPR2']
         for item_no in contract_item_objects.keys():
@@ -390,7 +436,9 @@ def sync_contract_material(contract_id=None, contract_no=None, es26_response=Non
             contract_item_objects.get(item_no)['commission_zcm1'] = commission_zcm1
             contract_item_objects.get(item_no)['commission_zcm3'] = commission_zcm3
 
-        return map_sap_contract_item(contract, contract_item_objects, order_text_list)
+        synced_contract_materials = map_sap_contract_item(contract, contract_item_objects, order_text_list)
+        save_contract_payload_hash(contract, "contract", payload_hash)
+        return synced_contract_materials
     except AttributeError as e:
         # Consider in the future use logger to catch exception
         return list()
@@ -409,9 +457,8 @@ def get_bill_to_obj(bill_to):
 
 
 def sync_contract_sale_detail(contract: migration_models.Contract, params: dict):
-    distribution_channel = migration_models.DistributionChannelMaster.objects.filter(
-        code=params.get("distribution_channel")).first()
-    division = migration_models.DivisionMaster.objects.filter(code=params.get("division")).first()
+    distribution_channel = get_master_by_code(migration_models.DistributionChannelMaster, params.get("distribution_channel"))
+    division = get_master_by_code(migration_models.DivisionMaster, params.get("division"))
     sale_group = migration_models.SalesGroupMaster.objects.filter(code=params.get("sale_group")).first()
     sale_office = migration_models.SalesOfficeMaster.objects.filter(code=params.get("sale_office")).first()
 
@@ -467,19 +514,37 @@ def sync_contract_sale_detail(contract: migration_models.Contract, params: dict)
     contract.save()
 
 
+def get_changed_model_fields(instance, values: dict) -> list:
+    """
+    Fields of `instance` whose value differs from `values`, compared as the model field stores them
+    (e.g. a float rate of a CharField is compared as its string) so a resync of unchanged data writes nothing
+    """
+    return [
+        key for key, value in values.items()
+        if getattr(instance, key) != instance._meta.get_field(key).to_python(value)
+    ]
+
+
 def map_sap_contract_item(contract: migration_models.Contract, item_objs: dict, order_text_list, **kwargs):
+    """
+    Sync contract materials of a contract with the ES14 contract items.
+    Existing rows are loaded once and diffed against the payload: new items are bulk created, changed
+    items bulk updated and rows missing from the payload (or rejected with reason 93) are deactivated
+    @return: ids of the active contract materials, or for PO upload the active contract materials of
+    items with duplicated rows
+    """
     is_po_upload_flow = kwargs.get('is_po_upload_flow', False)
     list_po_codes = kwargs.get('list_po_codes', [])
-    material_code = {k: v.get('matNo') for k, v in item_objs.items()}
-    material_ids = list(
+    material_codes = {v.get('matNo') for v in item_objs.values()}
+    materials = (
         migration_models.MaterialMaster.objects
-        .filter(material_code__in=list(material_code.values()))
-        .values_list('id', 'material_code')
+        .filter(material_code__in=material_codes)
+        .in_bulk(field_name="material_code")
     )
 
     quantity_unit = (
         master_models.Conversion2Master.objects
-        .filter(material_code__in=list(material_code.values()))
+        .filter(material_code__in=material_codes)
         .values_list("material_code", "from_value", "to_unit")
         .all()
     )
@@ -488,18 +553,25 @@ def map_sap_contract_item(contract: migration_models.Contract, item_objs: dict,
         f"{material_code}-{to_unit}": from_value
         for (material_code, from_value, to_unit) in list(quantity_unit)
     }
-    list_contract_material = []
-    list_contract_material_id = []
-    contract_materials = migration_models.ContractMaterial.objects.filter(
-        contract=contract)
 
+    existing_contract_materials = {}
+    for contract_material in migration_models.ContractMaterial.all_objects.filter(contract=contract).order_by("pk"):
+        existing_contract_materials.setdefault(
+            (contract_material.item_no, contract_material.material_id), []
+        ).append(contract_material)
+
+    create_list_obj = []
+    update_list_obj = []
+    synced_contract_materials = []
+    duplicated_contract_materials = []
+    variant_items = []
+    update_fields = set()
     for item_no, v in item_objs.items():
-        material_id = [mat_id for (mat_id, mat_code) in material_ids if mat_code == v.get('matNo')]
+        material = materials.get(v.get('matNo'))
         # Uncomment this one in case SAP data is sync with EO, or customer don't want to see the error
         # Until then, only use 0007985657 to test (0001003615)
-        if not material_id:
+        if not material:
             continue
-        material_id = material_id[0]
 
         remain_quantity = v.get('RemainQty', 0)
         remain_quantity_ex = v.get('remainQtyEx', 0)
@@ -524,14 +596,18 @@ def map_sap_contract_item(contract: migration_models.Contract, item_objs: dict,
             if len(v.get("conditions", [])) > 0
             else 0
         )
-        "Random value that will need to confirm"
-        rand_delivery_over = round(random.uniform(0.0, 10.0), 2)
-        rand_delivery_under = round(random.uniform(rand_delivery_over, 99.9), 2)
         quantity_unit = quantity_unit_mapped_objs.get(
             f"{v.get('matNo')}-{v.get('salesUnit')}"
         )
-        rand_total_quantity = v.get('targetQty', round(random.uniform(remain_quantity, remain_quantity + 100), 2))
-        rand_weight = round(random.uniform(0.0, 10.0), 2)
+        "Random value that will need to confirm, only set on new rows so a resync does not rewrite them"
+        rand_delivery_over = round(random.uniform(0.0, 10.0), 2)
+        placeholder_param = {
+            "delivery_over": rand_delivery_over,
+            "delivery_under": round(random.uniform(rand_delivery_over, 99.9), 2),
+        }
+        if "targetQty" not in v:
+            placeholder_param["total_quantity"] = round(random.uniform(remain_quantity, remain_quantity + 100), 2)
+            placeholder_param["weight"] = round(random.uniform(0.0, 10.0), 2)
         additional_remark = {}
         extract_item_text_data_sap_es14(mapping_code_for_contract_materials, order_text_list, additional_remark,
                                         item_no)
@@ -541,17 +617,13 @@ def map_sap_contract_item(contract: migration_models.Contract, item_objs: dict,
             "material_description": v.get("matDescription", ""),
             "contract_no": contract.code,
             "currency": v.get('currency', "THB"),
-            "delivery_over": rand_delivery_over,
-            "delivery_under": rand_delivery_under,
             "plant": v.get('plant', "7554"),
             # In the future, we will have 2 type of price for contract material (domestic and export)
             # TODO: Need to update this case and db structure
             "price_per_unit": price_per_unit,
             "quantity_unit": quantity_unit,
-            "total_quantity": rand_total_quantity,
             "remaining_quantity": remain_quantity,
             "remaining_quantity_ex": remain_quantity_ex,
-            "weight": v.get("targetQty", rand_weight),
             "weight_unit": v.get('salesUnit', "TON"),
             "payment_term": v.get('paymentTerm'),
             "condition_group1": v.get("conditionGroup1", ""),
@@ -561,48 +633,75 @@ def map_sap_contract_item(contract: migration_models.Contract, item_objs: dict,
             "mat_type": v.get("matType", "81"),
             "mat_group_1": v.get("matGroup1", ""),
             "additional_remark": additional_remark.get('remark'),
-            "is_active": True,
+            # rejected items are kept but not offered any more
+            "is_active": v.get("rejectReason") != "93",
         }
-
-        try:
-            obj, _created = (
-                migration_models.ContractMaterial.all_objects.update_or_create(
-                    contract=contract,
-                    material_id=material_id,
-                    item_no=item_no,
-                    defaults=param
+        if "targetQty" in v:
+            param["total_quantity"] = param["weight"] = v["targetQty"]
+
+        contract_materials = existing_contract_materials.pop((item_no, material.id), None)
+        if contract_materials is None:
+            contract_materials = [
+                migration_models.ContractMaterial(contract=contract, material=material, **param, **placeholder_param)
+            ]
+            create_list_obj.extend(contract_materials)
+        else:
+            for contract_material in contract_materials:
+                changed_fields = get_changed_model_fields(contract_material, param)
+                if changed_fields:
+                    update_instance_fields_from_dic(contract_material, param)
+                    update_fields.update(changed_fields)
+                    update_list_obj.append(contract_material)
+                contract_material.material = material
+            if len(contract_materials) > 1:
+                duplicated_contract_materials.extend(
+                    contract_material for contract_material in contract_materials if contract_material.is_active
                 )
-            )
-            if v.get("matType") in MaterialType.MATERIAL_WITHOUT_VARIANT.value:
-                if is_po_upload_flow:
-                    if obj.material.material_code in list_po_codes:
-                        update_variant_when_get_contract(material_id, v)
-                else:
-                    update_variant_when_get_contract(material_id, v)
-            if not v.get("rejectReason") == "93":
-                list_contract_material_id.append(obj.pk)
-
-        except MultipleObjectsReturned:
-            objects_data = migration_models.ContractMaterial.objects \
-                .filter(contract=contract, material_id=material_id, item_no=item_no)
-            objects_data.update(**param)
-            if is_po_upload_flow:
-                list_contract_material.extend([x for x in objects_data])
-            list_contract_material_id.extend([x.pk for x in objects_data])
-
-    update_active_for_missing_contract_materials(contract_materials, list_contract_material_id)
-    return list_contract_material if is_po_upload_flow else list_contract_material_id
-
-
-def get_sap_contract_items(sap_fn, contract_no, context: Union[dict, None] = None):
+        synced_contract_materials.extend(contract_materials)
+
+        if v.get("matType") in MaterialType.MATERIAL_WITHOUT_VARIANT.value and (
+            not is_po_upload_flow or material.material_code in list_po_codes
+        ):
+            variant_items.append((material, v))
+
+    if create_list_obj:
+        migration_models.ContractMaterial.objects.bulk_create(create_list_obj, batch_size=CONTRACT_SYNC_BATCH_SIZE)
+    if update_list_obj:
+        migration_models.ContractMaterial.objects.bulk_update(
+            update_list_obj, list(update_fields), batch_size=CONTRACT_SYNC_BATCH_SIZE
+        )
+    missing_contract_material_ids = [
+        contract_material.pk
+        for contract_materials in existing_contract_materials.values()
+        for contract_material in contract_materials
+        if contract_material.is_active
+    ]
+    if missing_contract_material_ids:
+        migration_models.ContractMaterial.all_objects.filter(pk__in=missing_contract_material_ids).update(
+            is_active=False
+        )
+    if variant_items:
+        update_variants_when_get_contract(variant_items)
+
+    if is_po_upload_flow:
+        return duplicated_contract_materials
+    return [contract_material.pk for contract_material in synced_contract_materials if contract_material.is_active]
+
+
+def get_sap_contract_items(sap_fn, contract_no, context: Union[dict, None] = None, bypass_cache=False):
     param = {}
     order_id = context and context.get("order_id", None)
     log_val = {
         "orderid": order_id,
     }
-    response = MulesoftApiRequest.instance(service_type=MulesoftServiceType.SAP.value, **log_val).request_mulesoft_get(
-        SapEnpoint.ES_14.value + "/" + contract_no,
-        param
+    response = get_cached_sap_response(
+        SapEnpoint.ES_14.value,
+        contract_no,
+        lambda: MulesoftApiRequest.instance(
+            service_type=MulesoftServiceType.SAP.value, **log_val
+        ).request_mulesoft_get(SapEnpoint.ES_14.value + "/" + contract_no, param),
+        settings.SAP_ES14_CACHE_TTL,
+        bypass_cache=bypass_cache,
     )
     return response
 
@@ -704,9 +803,6 @@ def sap_mapping_contract_material_variant(material_id, list_obj, variant_type, d
         }
 
         if mapping_variant_id_code_obj.get(mat_code) is None:
-            if len(create_list_obj) == 10:
-                migration_models.MaterialVariantMaster.objects.bulk_create(create_list_obj)
-                create_list_obj = []
             new_data_param = {
                 **params,
                 "code": mat_code,
@@ -720,19 +816,18 @@ def sap_mapping_contract_material_variant(material_id, list_obj, variant_type, d
 
             create_list_obj.append(new_variant)
         else:
-            if len(update_list_obj) == 10:
-                migration_models.MaterialVariantMaster.objects.bulk_update(update_list_obj, list(params.keys()))
-                update_list_obj = []
             update_variant = mapping_variant_id_code_obj.get(mat_code)
             for key, value in params.items():
                 setattr(update_variant, key, value)
             update_list_obj.append(update_variant)
 
     if len(update_list_obj) > 0:
-        migration_models.MaterialVariantMaster.objects.bulk_update(update_list_obj, list(params.keys()))
+        migration_models.MaterialVariantMaster.objects.bulk_update(
+            update_list_obj, list(params.keys()), batch_size=CONTRACT_SYNC_BATCH_SIZE
+        )
 
     if len(create_list_obj) > 0:
-        migration_models.MaterialVariantMaster.objects.bulk_create(create_list_obj)
+        migration_models.MaterialVariantMaster.objects.bulk_create(create_list_obj, batch_size=CONTRACT_SYNC_BATCH_SIZE)
 
     return list_variant_code
 
@@ -856,39 +951,63 @@ def resolve_variants(root, info):
     return migration_models.MaterialVariantMaster.objects.filter(material_id=root.id)
 
 
-def update_variant_when_get_contract(material_id, es_14_item):
+def update_variants_when_get_contract(es_14_items):
     """
     Apply for material type as 81 or 82
-    Delete all needless variants
-    @param material_id:
-    @param es_14_item:
+    Upsert the variant of each material and delete all needless variants
+    @param es_14_items: list of (material, ES14 contract item), the last item of a material wins
     @return:
     """
-    material_code = es_14_item.get("matNo")
-    material = master_models.MaterialMaster.objects.filter(id=material_id).first()
-    param = {
-        "material_id": material_id,
-        "description_en": es_14_item.get("matDescription"),
-        "determine_type": es_14_item.get("matDetermineType", 'A001'),
-        "sales_unit": es_14_item.get("salesUnit",
-                                     '') if material.material_group == MaterialGroup.PK00.value or is_default_sale_unit_from_contract(
-            es_14_item.get("matGroup1")) else 'ROL',
-        "type": es_14_item.get("matType", "81"),
-        "code": material_code,
-        "basis_weight": material_code[6:9],
-        "diameter": material_code[14:17],
-        "grade": material_code[3:6].strip("-")
-    }
-    migration_models.MaterialVariantMaster.objects.update_or_create(
-        material_id=material_id,
-        code=material_code,
-        defaults=param
+    params_by_material_id = {}
+    for material, es_14_item in es_14_items:
+        material_code = es_14_item.get("matNo")
+        params_by_material_id[material.id] = {
+            "material_id": material.id,
+            "description_en": es_14_item.get("matDescription"),
+            "determine_type": es_14_item.get("matDetermineType", 'A001'),
+            "sales_unit": es_14_item.get("salesUnit",
+                                         '') if material.material_group == MaterialGroup.PK00.value or is_default_sale_unit_from_contract(
+                es_14_item.get("matGroup1")) else 'ROL',
+            "type": es_14_item.get("matType", "81"),
+            "code": material_code,
+            "basis_weight": material_code[6:9],
+            "diameter": material_code[14:17],
+            "grade": material_code[3:6].strip("-")
+        }
+
+    variants = migration_models.MaterialVariantMaster.objects.filter(
+        material_id__in=params_by_material_id.keys()
     )
-    migration_models.MaterialVariantMaster.objects.filter(
-        material_id=material_id
-    ).exclude(
-        code=material_code
-    ).delete()
+    existing_variants = {}
+    needless_variant_ids = []
+    for variant in variants:
+        if variant.code != params_by_material_id[variant.material_id]["code"]:
+            needless_variant_ids.append(variant.pk)
+            continue
+        existing_variants.setdefault(variant.material_id, []).append(variant)
+
+    create_list_obj = []
+    update_list_obj = []
+    for material_id, param in params_by_material_id.items():
+        variants = existing_variants.get(material_id)
+        if not variants:
+            create_list_obj.append(migration_models.MaterialVariantMaster(**param))
+            continue
+        for variant in variants:
+            if get_changed_model_fields(variant, param):
+                update_instance_fields_from_dic(variant, param)
+                update_list_obj.append(variant)
+
+    if update_list_obj:
+        migration_models.MaterialVariantMaster.objects.bulk_update(
+            update_list_obj, VARIANT_FROM_CONTRACT_FIELDS, batch_size=CONTRACT_SYNC_BATCH_SIZE
+        )
+    if create_list_obj:
+        migration_models.MaterialVariantMaster.objects.bulk_create(
+            create_list_obj, batch_size=CONTRACT_SYNC_BATCH_SIZE
+        )
+    if needless_variant_ids:
+        migration_models.MaterialVariantMaster.objects.filter(pk__in=needless_variant_ids).delete()
 
 
 def resolve_search_suggestion_domestic_sold_tos(account_groups):
@@ -904,7 +1023,8 @@ def resolve_search_suggestion_domestic_ship_tos():
     return qs
 
 
-def call_es15_get_list_detail(sap_fn, sold_to_code: str, material_codes: list):
+def call_es15_get_list_detail(sap_fn, sold_to_code: str, material_codes: list, bypass_cache=False):
+    material_codes = list(material_codes)
     pi_message_id = str(uuid.uuid1().int)
 
     param = {
@@ -918,9 +1038,15 @@ def call_es15_get_list_detail(sap_fn, sold_to_code: str, material_codes: list):
         ]
     }
     uri = "sales/materials/search"
-    response = MulesoftApiRequest.instance(service_type=MulesoftServiceType.SAP.value).request_mulesoft_post(
-        uri,
-        param
+    response = get_cached_sap_response(
+        SapEnpoint.ES_15.value,
+        (sold_to_code, param["date"], sorted(set(material_codes))),
+        lambda: MulesoftApiRequest.instance(service_type=MulesoftServiceType.SAP.value).request_mulesoft_post(
+            uri,
+            param
+        ),
+        settings.SAP_ES15_CACHE_TTL,
+        bypass_cache=bypass_cache,
     )
     return response
 
@@ -51,6 +51,10 @@ def resolve_contract_order(info, id):
     return order
 
 
+def resolve_order_notifications(so_no):
+    return models.OrderNotification.objects.filter(order__so_no=so_no).order_by("-id")
+
+
 def resolve_contract_order_by_so_no(info, so_no):
     order = migration_models.Order.objects.filter(so_no=so_no).first()
     _so_no = order and order.so_no or so_no
@@ -5,6 +5,7 @@ from django.db.models import Q
 from graphene import ConnectionField
 
 from saleor.core.permissions import AuthorizationFilters
+from sap_master_data.cache import get_master_by_code
 from sap_master_data import models as master_models
 from sap_master_data.graphql.types import SoldToPartnerAddressMasterCountableConnection
 from sap_master_data.models import SalesOrganizationMaster, SoldToChannelMaster
@@ -45,6 +46,7 @@ from scg_checkout.graphql.types import (
     ContractCheckoutProductVariant,
     ContractCheckoutTotal,
     DistributionChannel,
+    OrderNotification,
     SalesGroup,
     SalesOffice,
     SalesOrganization,
@@ -253,7 +255,8 @@ from .resolves.orders import (
     resolve_list_order_confirmation_sap,
     resolve_show_atp_ctp_popup_change_order,
     resolve_get_lms_report_cs_customer,
-    resolve_get_gps_report_cs_customer
+    resolve_get_gps_report_cs_customer,
+    resolve_order_notifications,
 )
 from .resolves.sold_tos import (
     resolve_scg_sold_to,
@@ -622,6 +625,12 @@ class ContractOrderQueries(graphene.ObjectType):
         id=graphene.Argument(graphene.ID, description="ID of order", required=True),
     )
 
+    order_notifications = graphene.List(
+        OrderNotification,
+        description="Delivery status of the e-mails of an order, latest first",
+        so_no=graphene.Argument(graphene.String, description="SO No. of order", required=True),
+    )
+
     order_confirmation_status = graphene.List(OrderEnums)
 
     domestic_order_confirmation = FilterConnectionField(
@@ -813,6 +822,10 @@ class ContractOrderQueries(graphene.ObjectType):
             validate_date(create_date.get("gte"), create_date.get("lte"))
         return resolve_connection_slice(qs, info, kwargs, TempOrderCountableConnection)
 
+    @login_required
+    def resolve_order_notifications(self, info, **kwargs):
+        return resolve_order_notifications(kwargs["so_no"])
+
     @staticmethod
     def resolve_preview_domestic_page_order(self, info, **kwargs):
         order_id, so_no = get_order_id_and_so_no_of_order(kwargs["id"])
@@ -857,7 +870,7 @@ class ContractOrderQueries(graphene.ObjectType):
         bu = kwargs.get("bu", "")
         to, cc = get_list_email_by_product_group([sold_to_code], sale_org_code, bu,
                                                  EmailConfigurationFeatureChoices.PENDING_ORDER, product_group)
-        sold_to_master = master_models.SoldToMaster.objects.filter(sold_to_code=sold_to_code).first()
+        sold_to_master = get_master_by_code(master_models.SoldToMaster, sold_to_code)
         return {
             "sold_to_name": str(sold_to_master.sold_to_name),
             "to": to,
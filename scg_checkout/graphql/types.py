@@ -5,6 +5,7 @@ from datetime import datetime
 import graphene
 from django.contrib.auth import get_user_model
 from graphene import relay, ObjectType, InputObjectType
+from promise import Promise
 
 from common.iplan.item_level_helpers import get_item_production_status, EOrderingProductionStatus
 
@@ -27,8 +28,6 @@ from sap_migration.graphql import types as master_types
 from sap_migration.graphql.enums import InquiryMethodType
 from sap_migration.graphql.types import SoldToMaster, ScgCountableConnection
 from scg_checkout import models
-from scg_checkout.models import AlternatedMaterial
-from sap_migration.models import MaterialVariantMaster
 from scgp_cip.common.constants import SAP_RESPONSE_TRUE_VALUE
 from scgp_cip.dao.master_repo.country_master_repo import CountryMasterRepo
 from scgp_export.graphql.resolvers.connections import resolve_connection_slice
@@ -36,7 +35,7 @@ from scg_checkout.graphql.helper import (
     from_api_response_es26_to_change_order,
     PAYMENT_TERM_MAPPING,
     deepgetattr,
-    get_order_type_desc, is_other_product_group, get_mat_desc_from_master_for_alt_mat_old, get_sold_to_partner
+    get_order_type_desc, is_other_product_group, get_sold_to_partner
 )
 from scg_checkout.graphql.enums import (
     IPLanResponseStatus,
@@ -51,6 +50,30 @@ from scg_checkout.graphql.enums import (
     AlternatedMaterialLogChangeError
 )
 from scgp_export.graphql.resolvers.export_sold_tos import resolve_display_text
+from scgp_require_attention_items.attention_types import has_attention_type
+from .dataloaders import (
+    AlternatedMaterialsByOrderLineIdLoader,
+    ContractMaterialByIdLoader,
+    ContractMaterialsByContractNoLoader,
+    CustomerGroup1ByCodeLoader,
+    CustomerGroup2ByCodeLoader,
+    CustomerGroup3ByCodeLoader,
+    CustomerGroup4ByCodeLoader,
+    CustomerGroupByCodeLoader,
+    DistributionChannelByCodeLoader,
+    DivisionByCodeLoader,
+    Incoterms1ByCodeLoader,
+    MaterialClassificationByMaterialCodeLoader,
+    MaterialClassificationByMaterialIdLoader,
+    MaterialMasterByCodeLoader,
+    MaterialVariantByIdLoader,
+    OrderBySoNoLoader,
+    RolConversionByMaterialCodeLoader,
+    SalesGroupByCodeLoader,
+    SalesOfficeByCodeLoader,
+    SalesOrganizationByCodeLoader,
+    StandardMaterialVariantByCodeLoader,
+)
 from .enums import (
     MaterialType,
     ReasonForChangeRequestDateEnum,
@@ -285,37 +308,29 @@ class TempProductVariant(ModelObjectType):
 
     @staticmethod
     def resolve_width_of_roll(root, info):
-        rs = root.material.materialclassificationmaster_set.first()
-        if rs:
-            return rs.roll_width or 0
-        return 0
+        return MaterialClassificationByMaterialIdLoader(info.context).load(root.material_id).then(
+            lambda rs: (rs.roll_width or 0) if rs else 0
+        )
 
     @staticmethod
     def resolve_length_of_roll(root, info):
-        rs = root.material.materialclassificationmaster_set.first()
-        if rs:
-            return rs.roll_length or 0
-        return 0
+        return MaterialClassificationByMaterialIdLoader(info.context).load(root.material_id).then(
+            lambda rs: (rs.roll_length or 0) if rs else 0
+        )
 
     @staticmethod
     def resolve_weight(root, info):
         calculation = getattr(root, "calculation", 0)
-        if not calculation:
-            mat_code = root.code
-            conversion_objects = (
-                master_models.Conversion2Master.objects.filter(
-                    material_code=mat_code,
-                    to_unit="ROL",
-                )
-                .order_by("material_code", "-id")
-                .distinct("material_code")
-                .in_bulk(field_name="material_code")
-            )
-            conversion_object = conversion_objects.get(str(mat_code), None)
-            calculation = 0
-            if conversion_object:
-                calculation = conversion_object.calculation
-        return round(calculation / 1000, 3)
+        if calculation:
+            return round(calculation / 1000, 3)
+        if not root.code:
+            return 0
+
+        def _weight(conversion_object):
+            calculation = conversion_object.calculation if conversion_object else 0
+            return round((calculation or 0) / 1000, 3)
+
+        return RolConversionByMaterialCodeLoader(info.context).load(str(root.code)).then(_weight)
 
 
 class MaterialInfo(ModelObjectType):
@@ -345,21 +360,21 @@ class MaterialInfo(ModelObjectType):
 
     @staticmethod
     def resolve_grade(root, info):
-        material_code = root.material_code
-        material_class = master_models.MaterialClassificationMaster.objects.filter(material_code=material_code).first()
-        return material_class.grade if material_class else None
+        return MaterialClassificationByMaterialCodeLoader(info.context).load(root.material_code).then(
+            lambda material_class: material_class.grade if material_class else None
+        )
 
     @staticmethod
     def resolve_gram(root, info):
-        material_code = root.material_code
-        material_class = master_models.MaterialClassificationMaster.objects.filter(material_code=material_code).first()
-        return material_class.basis_weight if material_class else None
+        return MaterialClassificationByMaterialCodeLoader(info.context).load(root.material_code).then(
+            lambda material_class: material_class.basis_weight if material_class else None
+        )
 
     @staticmethod
     def resolve_dia(root, info):
-        material_code = root.material_code
-        material_class = master_models.MaterialClassificationMaster.objects.filter(material_code=material_code).first()
-        return material_class.diameter[0:3] if material_class and material_class.diameter else None
+        return MaterialClassificationByMaterialCodeLoader(info.context).load(root.material_code).then(
+            lambda material_class: material_class.diameter[0:3] if material_class and material_class.diameter else None
+        )
 
     @staticmethod
     def resolve_code(root, info):
@@ -437,21 +452,21 @@ class TempProduct(ModelObjectType):
 
     @staticmethod
     def resolve_grade(root, info):
-        material_code = root.material_code
-        material_class = master_models.MaterialClassificationMaster.objects.filter(material_code=material_code).first()
-        return material_class.grade if material_class else None
+        return MaterialClassificationByMaterialCodeLoader(info.context).load(root.material_code).then(
+            lambda material_class: material_class.grade if material_class else None
+        )
 
     @staticmethod
     def resolve_gram(root, info):
-        material_code = root.material_code
-        material_class = master_models.MaterialClassificationMaster.objects.filter(material_code=material_code).first()
-        return material_class.basis_weight if material_class else None
+        return MaterialClassificationByMaterialCodeLoader(info.context).load(root.material_code).then(
+            lambda material_class: material_class.basis_weight if material_class else None
+        )
 
     @staticmethod
     def resolve_dia(root, info):
-        material_code = root.material_code
-        material_class = master_models.MaterialClassificationMaster.objects.filter(material_code=material_code).first()
-        return material_class.diameter[0:3] if material_class else None
+        return MaterialClassificationByMaterialCodeLoader(info.context).load(root.material_code).then(
+            lambda material_class: material_class.diameter[0:3] if material_class else None
+        )
 
     @staticmethod
     def resolve_grade_gram(root, info):
@@ -1315,15 +1330,12 @@ class TempOrderLine(ModelObjectType):
 
     @staticmethod
     def resolve_remaining(root, info):
-        try:
-            contract_material_id = root.contract_material.id
-            contract_mat = sap_migration.models.ContractMaterial.objects.filter(
-                id=contract_material_id
-            ).first()
-            contract_remaining = contract_mat.remaining_quantity if contract_mat else 0
-            return contract_remaining
-        except AttributeError:
+        contract_material_id = getattr(root, "contract_material_id", None)
+        if not contract_material_id:
             return 0
+        return ContractMaterialByIdLoader(info.context).load(contract_material_id).then(
+            lambda contract_mat: contract_mat.remaining_quantity if contract_mat else 0
+        )
 
 
 class PreviewTempOrderLine(TempOrderLine):
@@ -1335,23 +1347,33 @@ class PreviewTempOrderLine(TempOrderLine):
 
     @staticmethod
     def resolve_log_errors(root, info):
-        try:
-            alternated_material = AlternatedMaterial.objects.get(order_line_id=root.id,
-                                                                 error_type=AlternatedMaterialLogChangeError
-                                                                 .NO_STOCK_ALT_MAT.value)
-            error_type = alternated_material.error_type
-            return error_type
-        except AlternatedMaterial.DoesNotExist:
-            return None
+        def _error_type(alternated_materials):
+            no_stock_error = AlternatedMaterialLogChangeError.NO_STOCK_ALT_MAT.value
+            return next((x.error_type for x in alternated_materials if x.error_type == no_stock_error), None)
+
+        return AlternatedMaterialsByOrderLineIdLoader(info.context).load(root.id).then(_error_type)
 
     @staticmethod
     def resolve_log_old_product(root, info):
-        try:
-            alternated_material = AlternatedMaterial.objects.get(order_line_id=root.id, error_type__isnull=True)
-            old_product = MaterialVariantMaster.objects.get(id=alternated_material.old_product_id)
-        except (AlternatedMaterial.DoesNotExist, MaterialVariantMaster.DoesNotExist):
-            return None
-        return get_mat_desc_from_master_for_alt_mat_old(old_product)
+        def _old_product(alternated_materials):
+            alternated_material = next((x for x in alternated_materials if x.error_type is None), None)
+            if not alternated_material:
+                return None
+            return MaterialVariantByIdLoader(info.context).load(alternated_material.old_product_id).then(
+                _old_product_description
+            )
+
+        def _old_product_description(old_product):
+            # get_mat_desc_from_master_for_alt_mat_old, batched by material code
+            if not old_product:
+                return None
+            return MaterialMasterByCodeLoader(info.context).load(old_product.code).then(
+                lambda mat_master: mat_master.description_en
+                if mat_master and mat_master.description_en
+                else old_product.code
+            )
+
+        return AlternatedMaterialsByOrderLineIdLoader(info.context).load(root.id).then(_old_product)
 
 
 class ScgSoldTo(ModelObjectType):
@@ -1419,6 +1441,9 @@ class AlternativeMaterialOs(ModelObjectType):
 
 class AlternativeMaterialCountableConnection(CountableConnection):
     latest_page_item_number = graphene.Int(description="Item in last page.")
+    total_count_is_exact = graphene.Boolean(
+        description="False when totalCount is capped or estimated."
+    )
 
     class Meta:
         node = AlternativeMaterial
@@ -1426,6 +1451,9 @@ class AlternativeMaterialCountableConnection(CountableConnection):
 
 class AlternativeMaterialOsCountableConnection(CountableConnection):
     latest_page_item_number = graphene.Int(description="Item in last page.")
+    total_count_is_exact = graphene.Boolean(
+        description="False when totalCount is capped or estimated."
+    )
     last_update_date = graphene.DateTime(description="last_update_event")
 
     class Meta:
@@ -1438,6 +1466,9 @@ class AlternativeMaterialOsCountableConnection(CountableConnection):
 
 class ScgCountableConnection(CountableConnection):
     latest_page_item_number = graphene.Int(description="Item in last page.")
+    total_count_is_exact = graphene.Boolean(
+        description="False when totalCount is capped or estimated."
+    )
 
     class Meta:
         abstract = True
@@ -1493,6 +1524,21 @@ class AlternatedMaterialCountableConnection(ScgCountableConnection):
         node = ALternatedMaterial
 
 
+class OrderNotification(ModelObjectType):
+    id = graphene.ID()
+    kind = graphene.String()
+    status = graphene.String(description="pending, sending, sent or failed")
+    attempts = graphene.Int()
+    last_error = graphene.String()
+    mail_to = graphene.List(graphene.String)
+    cc_list = graphene.List(graphene.String)
+    sent_at = graphene.DateTime()
+    created_at = graphene.DateTime()
+
+    class Meta:
+        model = models.OrderNotification
+
+
 class OrderDraft(graphene.ObjectType):
     unique_id = graphene.String()
     id = graphene.Int()
@@ -1956,6 +2002,26 @@ class InvoiceNo(graphene.ObjectType):
         return root.get('billingNo')
 
 
+def load_change_order_contract_material(info, material_code):
+    """First contract material of `material_code` in the contract of the ES26 order"""
+    contract_no = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'contractNo')
+    return ContractMaterialsByContractNoLoader(info.context).load(contract_no).then(
+        lambda contract_materials: next((x for x in contract_materials if x.material_code == material_code), None)
+    )
+
+
+def get_change_order_raw_items(info):
+    """ES26 order items as SAP sent them.
+
+    Unlike from_api_response_es26_to_change_order, no order line is looked up,
+    so resolvers of every item can read the other items without a query.
+    """
+    try:
+        return info.variable_values["sap_order_response"]["data"][0].get("orderItems") or []
+    except (AttributeError, IndexError, KeyError, TypeError):
+        return []
+
+
 class OrderItems(graphene.ObjectType):
     id = graphene.ID()
     item_no = graphene.String()
@@ -2054,10 +2120,7 @@ class OrderItems(graphene.ObjectType):
     @staticmethod
     def resolve_flag_r5(root, info):
         order_line = root.get("order_line_instance")
-        if order_line and order_line.attention_type and "R5" in order_line.attention_type:
-            return True
-        else:
-            return False
+        return bool(order_line) and has_attention_type(order_line.attention_type, "R5")
 
     @staticmethod
     def resolve_order_type(root, info):
@@ -2073,21 +2136,25 @@ class OrderItems(graphene.ObjectType):
     def resolve_contract_product_id(root, info):
         contract_no = root.get("contractNo", "")
         material_code = root.get("material", "")
-        product_material = OrderItems.resolve_product_material(root, info)
         contract_item_no = root.get("contractItemNo", None)
-        contract_material = []
-        if contract_item_no:
-            contract_material = sap_migration.models.ContractMaterial.objects.filter(
-                contract_no=contract_no,
-                material_code__in=(material_code, product_material),
-                item_no=contract_item_no, )
-        if contract_item_no is None or not contract_material:
-            contract_material = sap_migration.models.ContractMaterial.objects.filter(
-                contract_no=contract_no,
-                material_code__in=(material_code, product_material))
-        contract_material = {x.material_code: x for x in contract_material}
-        contract_material_object = contract_material.get(material_code) or contract_material.get(product_material)
-        return getattr(contract_material_object, "id", None)
+
+        def _contract_product_id(result):
+            product_material, contract_materials = result
+            contract_material = [
+                x for x in contract_materials if x.material_code in (material_code, product_material)
+            ]
+            if contract_item_no:
+                contract_material = [
+                    x for x in contract_material if str(x.item_no) == str(contract_item_no)
+                ] or contract_material
+            contract_material = {x.material_code: x for x in contract_material}
+            contract_material_object = contract_material.get(material_code) or contract_material.get(product_material)
+            return getattr(contract_material_object, "id", None)
+
+        return Promise.all([
+            OrderItems.resolve_product_material(root, info),
+            ContractMaterialsByContractNoLoader(info.context).load(contract_no),
+        ]).then(_contract_product_id)
 
     @staticmethod
     def resolve_under_delivery_tol(root, info):
@@ -2167,35 +2234,31 @@ class OrderItems(graphene.ObjectType):
     @staticmethod
     def resolve_item_remain(root, info):
         material_code = root.get('material')
-        contract_no = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'contractNo')
+        order_items = get_change_order_raw_items(info)
 
-        contract_mat = sap_migration.models.ContractMaterial.objects.filter(
-            contract_no=contract_no,
-            material_code=material_code,
-        ).first()
-        contract_remaining = contract_mat and contract_mat.remaining_quantity or 0
+        def _item_remain(contract_mat):
+            contract_remaining = contract_mat and contract_mat.remaining_quantity or 0
+            order_item_quantity = sum(
+                [float(x.get('orderQty', 0)) for x in order_items if x and x.get('material') == material_code])
+            try:
+                for order_item in order_items:
+                    if order_item.get("material") == material_code:
+                        sale_qty_factor = 1000 if order_item.get("salesUnit") == "EA" else order_item.get("saleQtyFactor")
 
-        order_items = from_api_response_es26_to_change_order(info, 'orderItems')
-        order_item_quantity = sum(
-            [float(x.get('orderQty', 0)) for x in order_items if x and x.get('material') == material_code])
-        try:
-            for order_item in order_items:
-                if order_item.get("material") == material_code:
-                    sale_qty_factor = 1000 if order_item.get("salesUnit") == "EA" else order_item.get("saleQtyFactor")
+                conversion_rate = (1000 / sale_qty_factor)
+                contract_remaining *= conversion_rate
+                return round(contract_remaining + order_item_quantity, 3)
+            except:
+                return contract_remaining + order_item_quantity
 
-            conversion_rate = (1000 / sale_qty_factor)
-            contract_remaining *= conversion_rate
-            return round(contract_remaining + order_item_quantity, 3)
-        except:
-            return contract_remaining + order_item_quantity
+        return load_change_order_contract_material(info, material_code).then(_item_remain)
 
     @staticmethod
     def resolve_product_material(root, info):
         item_material = root.get('material', "")
-        material_variant = sap_migration.models.MaterialVariantMaster.objects. \
-            filter(code=item_material, variant_type__in=('Standard', 'Non-Standard')).first()
-        material = getattr(material_variant, 'material', None)
-        return getattr(material, "material_code", "")
+        return StandardMaterialVariantByCodeLoader(info.context).load(item_material).then(
+            lambda material_variant: getattr(getattr(material_variant, 'material', None), "material_code", "")
+        )
 
     @staticmethod
     def resolve_remain_weight(root, info):
@@ -2420,13 +2483,9 @@ class OrderItems(graphene.ObjectType):
 
     @staticmethod
     def resolve_remaining_quantity(root, info):
-        material_code = root.get('material')
-        contract_no = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'contractNo')
-        contract_mat = sap_migration.models.ContractMaterial.objects.filter(
-            contract_no=contract_no,
-            material_code=material_code,
-        ).first()
-        return contract_mat and contract_mat.remaining_quantity or 0
+        return load_change_order_contract_material(info, root.get('material')).then(
+            lambda contract_mat: contract_mat and contract_mat.remaining_quantity or 0
+        )
 
     @staticmethod
     def resolve_net_price(root, info):
@@ -2443,13 +2502,9 @@ class OrderItems(graphene.ObjectType):
 
     @staticmethod
     def resolve_remaining_quantity_ex(root, info):
-        material_code = root.get('material')
-        contract_no = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'contractNo')
-        contract_mat = sap_migration.models.ContractMaterial.objects.filter(
-            contract_no=contract_no,
-            material_code=material_code,
-        ).first()
-        return contract_mat and contract_mat.remaining_quantity_ex or 0
+        return load_change_order_contract_material(info, root.get('material')).then(
+            lambda contract_mat: contract_mat and contract_mat.remaining_quantity_ex or 0
+        )
 
     @staticmethod
     def resolve_weight_display(root, info):
@@ -2664,8 +2719,9 @@ class ChangeOrder(graphene.ObjectType):
     @staticmethod
     def resolve_distribution_channel_name(root, info):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'distributionChannel')
-        distribution_channel = master_models.DistributionChannelMaster.objects.filter(code=code).first()
-        return distribution_channel.name if distribution_channel else ""
+        return DistributionChannelByCodeLoader(info.context).load(code).then(
+            lambda distribution_channel: distribution_channel.name if distribution_channel else ""
+        )
 
     @staticmethod
     def resolve_sales_org(root, info):
@@ -2674,14 +2730,16 @@ class ChangeOrder(graphene.ObjectType):
     @staticmethod
     def resolve_sales_org_name(root, info):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'salesOrg')
-        sales_org = master_models.SalesOrganizationMaster.objects.filter(code=code).first()
-        return sales_org.name if sales_org else ""
+        return SalesOrganizationByCodeLoader(info.context).load(code).then(
+            lambda sales_org: sales_org.name if sales_org else ""
+        )
 
     @staticmethod
     def resolve_sales_org_short_name(root, info):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'salesOrg')
-        sales_org = master_models.SalesOrganizationMaster.objects.filter(code=code).first()
-        return sales_org.short_name if sales_org else ""
+        return SalesOrganizationByCodeLoader(info.context).load(code).then(
+            lambda sales_org: sales_org.short_name if sales_org else ""
+        )
 
     @staticmethod
     def resolve_sales_off(root, info):
@@ -2690,8 +2748,9 @@ class ChangeOrder(graphene.ObjectType):
     @staticmethod
     def resolve_sales_off_name(root, info):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'salesOff')
-        sales_off = migration_models.SalesOfficeMaster.objects.filter(code=code).first()
-        return sales_off.name if sales_off else ""
+        return SalesOfficeByCodeLoader(info.context).load(code).then(
+            lambda sales_off: sales_off.name if sales_off else ""
+        )
 
     @staticmethod
     def resolve_division(root, info):
@@ -2700,8 +2759,9 @@ class ChangeOrder(graphene.ObjectType):
     @staticmethod
     def resolve_division_name(root, info):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'division')
-        division = master_models.DivisionMaster.objects.filter(code=code).first()
-        return division.name if division else ""
+        return DivisionByCodeLoader(info.context).load(code).then(
+            lambda division: division.name if division else ""
+        )
 
     @staticmethod
     def resolve_price_date(root, info):
@@ -2710,8 +2770,7 @@ class ChangeOrder(graphene.ObjectType):
     @staticmethod
     def resolve_status(root, info):
         so_no = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'saleDocument')
-        order = migration_models.Order.objects.filter(so_no=so_no).first()
-        return order.status if order else ""
+        return OrderBySoNoLoader(info.context).load(so_no).then(lambda order: order.status if order else "")
 
     @staticmethod
     def resolve_order_amt_before_vat(root, info):
@@ -2736,8 +2795,9 @@ class ChangeOrder(graphene.ObjectType):
     @staticmethod
     def resolve_customer_group_name(root, info):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'customerGroup')
-        customer_group = master_models.CustomerGroupMaster.objects.filter(code=code).first()
-        return customer_group.name if customer_group else ""
+        return CustomerGroupByCodeLoader(info.context).load(code).then(
+            lambda customer_group: customer_group.name if customer_group else ""
+        )
 
     @staticmethod
     def resolve_customer_group_1(root, info):
@@ -2746,8 +2806,9 @@ class ChangeOrder(graphene.ObjectType):
     @staticmethod
     def resolve_customer_group_1_name(root, info):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'customerGroup1')
-        customer_group = master_models.CustomerGroup1Master.objects.filter(code=code).first()
-        return customer_group.name if customer_group else ""
+        return CustomerGroup1ByCodeLoader(info.context).load(code).then(
+            lambda customer_group: customer_group.name if customer_group else ""
+        )
 
     @staticmethod
     def resolve_customer_group_2(root, info):
@@ -2756,8 +2817,9 @@ class ChangeOrder(graphene.ObjectType):
     @staticmethod
     def resolve_customer_group_2_name(root, info):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'customerGroup2')
-        customer_group = master_models.CustomerGroup2Master.objects.filter(code=code).first()
-        return customer_group.name if customer_group else ""
+        return CustomerGroup2ByCodeLoader(info.context).load(code).then(
+            lambda customer_group: customer_group.name if customer_group else ""
+        )
 
     @staticmethod
     def resolve_customer_group_3(root, info):
@@ -2766,8 +2828,9 @@ class ChangeOrder(graphene.ObjectType):
     @staticmethod
     def resolve_customer_group_3_name(root, info):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'customerGroup3')
-        customer_group = master_models.CustomerGroup3Master.objects.filter(code=code).first()
-        return customer_group.name if customer_group else ""
+        return CustomerGroup3ByCodeLoader(info.context).load(code).then(
+            lambda customer_group: customer_group.name if customer_group else ""
+        )
 
     @staticmethod
     def resolve_customer_group_4(root, info):
@@ -2776,8 +2839,9 @@ class ChangeOrder(graphene.ObjectType):
     @staticmethod
     def resolve_customer_group_4_name(root, info):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'customerGroup4')
-        customer_group = master_models.CustomerGroup4Master.objects.filter(code=code).first()
-        return customer_group.name if customer_group else ""
+        return CustomerGroup4ByCodeLoader(info.context).load(code).then(
+            lambda customer_group: customer_group.name if customer_group else ""
+        )
 
     @staticmethod
     def resolve_request_date(root, info):
@@ -2795,8 +2859,9 @@ class ChangeOrder(graphene.ObjectType):
     @staticmethod
     def resolve_incoterms_1_name(root, info):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'incoterms1')
-        incoterms_1 = master_models.Incoterms1Master.objects.filter(code=code).first()
-        return incoterms_1.description if incoterms_1 else ""
+        return Incoterms1ByCodeLoader(info.context).load(code).then(
+            lambda incoterms_1: incoterms_1.description if incoterms_1 else ""
+        )
 
     @staticmethod
     def resolve_incoterms_2(root, info):
@@ -2813,20 +2878,23 @@ class ChangeOrder(graphene.ObjectType):
     @staticmethod
     def resolve_sales_group_name(root, info):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'salesGroup')
-        sales_group = master_models.SalesGroup.objects.filter(sales_group_code=code).first()
-        return sales_group.sales_group_description if sales_group else ""
+        return SalesGroupByCodeLoader(info.context).load(code).then(
+            lambda sales_group: sales_group.sales_group_description if sales_group else ""
+        )
 
     @staticmethod
     def resolve_under_tol(root, info):
         contract_no = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'contractNo')
-        contract_material = sap_migration.models.ContractMaterial.objects.filter(contract_no=contract_no).first()
-        return contract_material.delivery_under if contract_material else 0
+        return ContractMaterialsByContractNoLoader(info.context).load(contract_no).then(
+            lambda contract_materials: contract_materials[0].delivery_under if contract_materials else 0
+        )
 
     @staticmethod
     def resolve_over_tol(root, info):
         contract_no = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'contractNo')
-        contract_material = sap_migration.models.ContractMaterial.objects.filter(contract_no=contract_no).first()
-        return contract_material.delivery_over if contract_material else 0
+        return ContractMaterialsByContractNoLoader(info.context).load(contract_no).then(
+            lambda contract_materials: contract_materials[0].delivery_over if contract_materials else 0
+        )
 
     @staticmethod
     def resolve_assigned_qty(root, info):
@@ -2854,8 +2922,9 @@ class ChangeOrder(graphene.ObjectType):
 
     @staticmethod
     def resolve_item_no_latest(root, info, **kwargs):
-        order = sap_migration.models.Order.objects.filter(so_no=info.variable_values.get('soNo')).first()
-        return getattr(order, "item_no_latest", 0)
+        return OrderBySoNoLoader(info.context).load(info.variable_values.get('soNo')).then(
+            lambda order: getattr(order, "item_no_latest", 0)
+        )
 
     @staticmethod
     def resolve_dp(root, info):
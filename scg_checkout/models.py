@@ -1,5 +1,7 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 from saleor.account.models import User
 from scgp_export.graphql.enums import ScgpExportOrderStatus
@@ -385,3 +387,66 @@ class AlternativeMaterialLastUpdateBy(models.Model):
         related_name="alternative_material_last_updated_by",
     )
     updated_at = models.DateTimeField(auto_now=True, null=True)
+
+
+class OrderNotificationKind:
+    CREATE_ORDER = "create_order"
+    CREATE_ORDER_CIP = "create_order_cip"
+
+    CHOICES = [
+        (CREATE_ORDER, "Order submitted"),
+        (CREATE_ORDER_CIP, "Order submitted (CIP)"),
+    ]
+
+
+class OrderNotificationStatus:
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    CHOICES = [
+        (PENDING, "Pending"),
+        (SENDING, "Sending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    ]
+
+
+class OrderNotification(models.Model):
+    """
+    Outbox of order e-mails, recorded with the order and sent by the
+    scg_checkout.tasks.send_order_notifications worker (see scg_checkout.notifications).
+    A notification being sent is leased until next_attempt_at, after that it can be claimed again.
+    """
+
+    order = models.ForeignKey(
+        "sap_migration.Order", on_delete=models.CASCADE, related_name="notifications"
+    )
+    kind = models.CharField(max_length=50, choices=OrderNotificationKind.CHOICES)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_by = models.ForeignKey(
+        User, null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=OrderNotificationStatus.CHOICES,
+        default=OrderNotificationStatus.PENDING,
+    )
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, null=True)
+    mail_to = models.JSONField(default=list)
+    cc_list = models.JSONField(default=list)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "scg_checkout_order_notifications"
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="order_notif_status_next_idx",
+            ),
+        ]
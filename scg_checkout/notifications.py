@@ -0,0 +1,158 @@
+import logging
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from saleor.plugins.manager import get_plugins_manager
+from scg_checkout.models import (
+    OrderNotification,
+    OrderNotificationKind,
+    OrderNotificationStatus,
+)
+
+# kind -> function(notification, manager) sending it, returns (mail_to, cc_list)
+ORDER_NOTIFICATION_SENDERS = {
+    OrderNotificationKind.CREATE_ORDER: (
+        "scg_checkout.graphql.implementations.iplan.send_create_order_notification"
+    ),
+    OrderNotificationKind.CREATE_ORDER_CIP: (
+        "scgp_cip.service.orders_pdf_and_email_service.send_create_order_cip_notification"
+    ),
+}
+
+# recipients resolved while a batch of notifications is sent, see get_batch_recipients
+_batch_recipients: ContextVar = ContextVar(
+    "order_notification_recipients", default=None
+)
+
+
+def queue_order_notification(kind, order, user=None, **payload):
+    """
+    Record an order e-mail in the outbox, it is rendered and sent by a worker
+    once the current transaction is committed. `payload` has to be JSON serializable.
+    """
+    notification = OrderNotification.objects.create(
+        kind=kind,
+        order=order,
+        created_by=user if user and user.pk else None,
+        payload=payload,
+    )
+    from scg_checkout.tasks import send_order_notifications
+
+    transaction.on_commit(lambda: send_order_notifications.delay(notification.id))
+    return notification
+
+
+def send_order_notifications_batch(notification_id=None):
+    """
+    Send due notifications of the outbox (only `notification_id` when given),
+    recipients of the same e-mail configuration are resolved once per batch.
+    @return: number of notifications sent
+    """
+    notifications = claim_order_notifications(
+        settings.ORDER_NOTIFICATION_BATCH_SIZE, notification_id
+    )
+    if not notifications:
+        return 0
+    manager = get_plugins_manager()
+    token = _batch_recipients.set({})
+    try:
+        return sum(
+            send_order_notification(notification, manager)
+            for notification in notifications
+        )
+    finally:
+        _batch_recipients.reset(token)
+
+
+def claim_order_notifications(limit, notification_id=None):
+    """Lease due notifications with SELECT ... FOR UPDATE SKIP LOCKED"""
+    now = timezone.now()
+    queryset = OrderNotification.objects.filter(
+        status__in=[OrderNotificationStatus.PENDING, OrderNotificationStatus.SENDING],
+        next_attempt_at__lte=now,
+    )
+    if notification_id is not None:
+        queryset = queryset.filter(id=notification_id)
+    with transaction.atomic():
+        notifications = list(
+            queryset.select_for_update(skip_locked=True)
+            .select_related("order", "created_by")
+            .order_by("id")[:limit]
+        )
+        lease_until = now + timedelta(seconds=settings.ORDER_NOTIFICATION_LEASE)
+        OrderNotification.objects.filter(
+            id__in=[notification.id for notification in notifications]
+        ).update(status=OrderNotificationStatus.SENDING, next_attempt_at=lease_until)
+    return notifications
+
+
+def send_order_notification(notification, manager):
+    """
+    Send one claimed notification and update it: sent, pending again after a
+    backoff or failed once all attempts are used
+    @return: whether the notification was sent
+    """
+    success = False
+    try:
+        sender = import_string(ORDER_NOTIFICATION_SENDERS[notification.kind])
+        mail_to, cc_list = sender(notification, manager)
+        notification.mail_to = list(mail_to or [])
+        notification.cc_list = list(cc_list or [])
+        success = True
+    except Exception as e:
+        logging.exception(
+            f"[Order notification] {notification.kind} of order {notification.order_id} error: {e}"
+        )
+        notification.last_error = str(e)
+    notification.attempts += 1
+
+    if success:
+        notification.status = OrderNotificationStatus.SENT
+        notification.sent_at = timezone.now()
+        notification.last_error = None
+    elif notification.attempts < settings.ORDER_NOTIFICATION_MAX_ATTEMPTS:
+        notification.status = OrderNotificationStatus.PENDING
+        notification.next_attempt_at = timezone.now() + timedelta(
+            seconds=get_notification_backoff(notification.attempts)
+        )
+    else:
+        notification.status = OrderNotificationStatus.FAILED
+    notification.save(
+        update_fields=[
+            "status",
+            "attempts",
+            "next_attempt_at",
+            "last_error",
+            "mail_to",
+            "cc_list",
+            "sent_at",
+            "updated_at",
+        ]
+    )
+    return success
+
+
+def get_notification_backoff(attempts):
+    """Seconds to wait after the n-th failed attempt"""
+    return min(
+        settings.ORDER_NOTIFICATION_BACKOFF_BASE * 2 ** max(attempts - 1, 0),
+        settings.ORDER_NOTIFICATION_BACKOFF_MAX,
+    )
+
+
+def get_batch_recipients(key, resolve):
+    """
+    `resolve()` the recipients of an e-mail configuration `key` once per batch
+    of notifications, outside of a batch it is always called
+    """
+    recipients = _batch_recipients.get()
+    if recipients is None:
+        return resolve()
+    if key not in recipients:
+        recipients[key] = resolve()
+    return recipients[key]
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 
+from sap_master_data.cache import get_master_by_code
 from sap_migration.models import (
     CompanyMaster,
     Contract,
@@ -31,7 +32,7 @@ def sap_contract_mapping(rs, customer_no=""):
     )
 
     sold_to_code = rs[0].get("customerId")
-    sold_to = SoldToMaster.objects.filter(sold_to_code=sold_to_code).first()
+    sold_to = get_master_by_code(SoldToMaster, sold_to_code)
     if customer_no and "-" in customer_no:
         _, customer_name = customer_no.split(" - ")
         sold_to = SoldToMaster.objects.filter(
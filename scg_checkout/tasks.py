@@ -5,6 +5,8 @@ from celery.utils.log import get_task_logger
 from saleor.celeryconf import app
 from scg_checkout.contract_order_update import delete_contract_order_drafts
 from scg_checkout.graphql.implementations.orders import sync_i_plan_data, sync_sap_data
+from scg_checkout.notifications import send_order_notifications_batch
+from scgp_record_cleanup.implementation.purge import raise_on_purge_errors
 
 task_logger = get_task_logger(__name__)
 
@@ -13,8 +15,8 @@ task_logger = get_task_logger(__name__)
 def remove_all_contract_order_drafts():
     task_logger.info("Starting cron remove all contract order drafts")
     try:
-        delete_contract_order_drafts()
-        task_logger.info("Task finished!")
+        stats = raise_on_purge_errors(delete_contract_order_drafts())
+        task_logger.info(f"Task finished! {stats}")
     except Exception as ex:
         task_logger.error(str(ex))
         raise ex
@@ -28,8 +30,10 @@ def sync_orders_data():
     """
     task_logger.info("Starting cron update orders status (SAP ES-38)")
     try:
-        sync_sap_data()
+        stats = sync_sap_data()
         task_logger.info("Finished cron update orders status (SAP ES-38)!")
+        if stats:
+            task_logger.info(f"SAP ES-38 consumer stats: {stats}")
     except Exception as ex:
         task_logger.error(str(ex))
         raise ex
@@ -44,13 +48,31 @@ def sync_orders_data_iplan():
     task_logger.info("Starting cron update orders status (iPlan YT-65218)")
     try:
         t0 = time.time()
-        sync_i_plan_data()
+        stats = sync_i_plan_data()
         t1 = time.time()
         dt = (t1 - t0) * 1000
         task_logger.info(
             "Finished cron update orders status (iPlan YT-65218)! Processed Time: %d ms"
             % dt
         )
+        if stats:
+            task_logger.info(f"iPlan YT-65218 consumer stats: {stats}")
+    except Exception as ex:
+        task_logger.error(str(ex))
+        raise ex
+
+
+@app.task
+def send_order_notifications(notification_id=None):
+    """
+    Send due order e-mails of the outbox, the one just queued by a save
+    mutation when `notification_id` is given, failed ones are retried by beat
+    @return:
+    """
+    task_logger.info("Starting send order notifications")
+    try:
+        sent = send_order_notifications_batch(notification_id)
+        task_logger.info(f"Finished send order notifications, sent: {sent}")
     except Exception as ex:
         task_logger.error(str(ex))
         raise ex
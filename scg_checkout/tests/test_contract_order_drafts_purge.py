@@ -0,0 +1,92 @@
+from unittest import mock
+
+import pytest
+from django.db import DatabaseError
+from django.db.models.query import QuerySet
+
+from sap_migration.models import Order, OrderLines
+from scg_checkout.contract_order_update import delete_contract_order_drafts
+from scg_checkout.tasks import remove_all_contract_order_drafts
+from scgp_record_cleanup.implementation.purge import PurgeError
+
+
+def _make_drafts(orders):
+    drafts = orders[:2]
+    Order.objects.filter(pk__in=[order.pk for order in drafts]).update(status="draft")
+    Order.objects.filter(pk=orders[2].pk).update(status="confirmed")
+    OrderLines.objects.bulk_create(
+        [
+            OrderLines(order=order, item_no=item_no, po_no=order.po_no)
+            for order in drafts
+            for item_no in ("10", "20")
+        ]
+    )
+    return drafts
+
+
+def test_delete_contract_order_drafts_by_batches(sap_migration_order, settings):
+    settings.PURGE_BATCH_SIZE = 1
+    drafts = _make_drafts(sap_migration_order)
+
+    stats = delete_contract_order_drafts()
+
+    assert stats["complete"]
+    assert stats["batches"] == 2
+    assert stats["deleted"] >= 6
+    assert not Order.objects.filter(pk__in=[order.pk for order in drafts]).exists()
+    assert not OrderLines.all_objects.filter(order_id__in=[o.pk for o in drafts])
+    assert Order.objects.filter(pk=sap_migration_order[2].pk).exists()
+
+
+def test_delete_contract_order_drafts_stops_at_time_budget(
+    sap_migration_order, settings
+):
+    settings.PURGE_TIME_BUDGET = 0
+    drafts = _make_drafts(sap_migration_order)
+
+    stats = delete_contract_order_drafts()
+
+    assert not stats["complete"]
+    assert stats["deleted"] == 0
+    assert Order.objects.filter(pk__in=[order.pk for order in drafts]).count() == 2
+
+
+def _fail_first_delete():
+    delete = QuerySet.delete
+    calls = []
+
+    def first_delete_fails(queryset):
+        calls.append(queryset)
+        if len(calls) == 1:
+            raise DatabaseError("canceling statement due to lock timeout")
+        return delete(queryset)
+
+    return mock.patch.object(QuerySet, "delete", first_delete_fails)
+
+
+def test_delete_contract_order_drafts_skips_failed_batch(sap_migration_order, settings):
+    settings.PURGE_BATCH_SIZE = 1
+    drafts = _make_drafts(sap_migration_order)
+
+    with _fail_first_delete():
+        stats = delete_contract_order_drafts()
+
+    assert stats["complete"]
+    assert stats["errors"] == 1
+    assert stats["batches"] == 1
+    assert list(Order.objects.filter(pk__in=[order.pk for order in drafts])) == [
+        drafts[0]
+    ]
+
+
+def test_remove_all_contract_order_drafts_fails_on_failed_batch(
+    sap_migration_order, settings
+):
+    settings.PURGE_BATCH_SIZE = 1
+    drafts = _make_drafts(sap_migration_order)
+
+    with _fail_first_delete(), pytest.raises(PurgeError):
+        remove_all_contract_order_drafts()
+
+    # the other batches are still purged
+    assert Order.objects.filter(pk__in=[order.pk for order in drafts]).count() == 1
@@ -0,0 +1,259 @@
+import uuid
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from common.sap.response_cache import get_cached_sap_response, make_payload_hash
+from sap_master_data.models import Conversion2Master
+from sap_migration.models import (
+    Contract,
+    ContractMaterial,
+    MaterialMaster,
+    MaterialVariantMaster,
+)
+from scg_checkout.graphql.resolves.contracts import (
+    call_sap_api_get_contracts_export_pis,
+    is_contract_payload_unchanged,
+    map_sap_contract_item,
+    save_contract_payload_hash,
+    sync_contract_material,
+)
+
+ES14_DATA = {
+    "contractNo": "0000000001",
+    "pymTermKey": "NT30",
+    "contractItem": [{"itemNo": "10", "matNo": "MAT-001"}],
+}
+
+
+@pytest.fixture
+def sap_response_cache(settings):
+    settings.SAP_RESPONSE_CACHE_ENABLED = True
+    return settings
+
+
+def test_get_cached_sap_response_caches_responses_with_data(sap_response_cache):
+    key = str(uuid.uuid4())
+    call = mock.Mock(return_value={"data": [ES14_DATA]})
+
+    assert get_cached_sap_response("ES14", key, call, 60) == {"data": [ES14_DATA]}
+    assert get_cached_sap_response("ES14", key, call, 60) == {"data": [ES14_DATA]}
+    assert call.call_count == 1
+
+    get_cached_sap_response("ES14", key, call, 60, bypass_cache=True)
+    assert call.call_count == 2
+
+
+def test_get_cached_sap_response_does_not_cache_empty_response(sap_response_cache):
+    key = {"soldTo": str(uuid.uuid4()), "materials": ["MAT-001"]}
+    call = mock.Mock(return_value={"data": []})
+
+    get_cached_sap_response("ES15", key, call, 60)
+    get_cached_sap_response("ES15", key, call, 60)
+
+    assert call.call_count == 2
+
+
+def test_make_payload_hash_ignores_key_order():
+    assert make_payload_hash({"a": 1, "b": [1, 2]}) == make_payload_hash(
+        {"b": [1, 2], "a": 1}
+    )
+    assert make_payload_hash({"a": 1}) != make_payload_hash({"a": 2})
+
+
+@pytest.mark.django_db
+def test_contract_payload_hash_is_per_flow(settings):
+    settings.CONTRACT_SYNC_SKIP_UNCHANGED = True
+    contract = Contract.objects.create(code="0000000001")
+    payload_hash = make_payload_hash(ES14_DATA)
+
+    save_contract_payload_hash(contract, "contract", payload_hash)
+    contract.refresh_from_db()
+
+    assert is_contract_payload_unchanged(contract, "contract", payload_hash)
+    assert not is_contract_payload_unchanged(contract, "po_upload", payload_hash)
+    assert not is_contract_payload_unchanged(
+        contract, "contract", make_payload_hash({**ES14_DATA, "pymTermKey": "NT60"})
+    )
+    settings.CONTRACT_SYNC_SKIP_UNCHANGED = False
+    assert not is_contract_payload_unchanged(contract, "contract", payload_hash)
+
+
+@pytest.mark.django_db
+def test_sync_contract_material_skips_unchanged_payload(settings):
+    settings.CONTRACT_SYNC_SKIP_UNCHANGED = True
+    contract = Contract.objects.create(code="0000000001")
+    material = MaterialMaster.objects.create(material_code="MAT-001")
+    contract_material = ContractMaterial.objects.create(
+        contract=contract, material=material, item_no="10", is_active=True
+    )
+    ContractMaterial.objects.create(
+        contract=contract, material=material, item_no="20", is_active=False
+    )
+    save_contract_payload_hash(contract, "contract", make_payload_hash(ES14_DATA))
+    es26_response = {"orderHeaderIn": {}}
+
+    with mock.patch(
+        "scg_checkout.graphql.resolves.contracts.call_sap_api_get_contracts_export_pis",
+        return_value=(contract, {"data": [ES14_DATA]}),
+    ), mock.patch(
+        "scg_checkout.graphql.resolves.contracts.sync_contract_sale_detail"
+    ) as sync_contract_sale_detail:
+        result = sync_contract_material(
+            contract_no=contract.code, es26_response=es26_response
+        )
+
+    assert result == [contract_material.pk]
+    assert es26_response["contractItem"] == ES14_DATA["contractItem"]
+    sync_contract_sale_detail.assert_not_called()
+
+
+@pytest.fixture
+def es14_call():
+    with mock.patch(
+        "scg_checkout.graphql.resolves.contracts.get_plugins_manager"
+    ), mock.patch(
+        "scg_checkout.graphql.resolves.contracts.get_sap_contract_items"
+    ) as get_sap_contract_items:
+        yield get_sap_contract_items
+
+
+@pytest.mark.django_db
+def test_contract_header_is_not_written_for_unchanged_payload(settings, es14_call):
+    settings.CONTRACT_SYNC_SKIP_UNCHANGED = True
+    es14_call.return_value = {"data": [ES14_DATA]}
+    contract = Contract.objects.create(code="0000000001", contact_person="synced")
+    save_contract_payload_hash(contract, "contract", make_payload_hash(ES14_DATA))
+
+    with CaptureQueriesContext(connection) as context:
+        result, response = call_sap_api_get_contracts_export_pis(
+            "1", unchanged_flow="contract"
+        )
+
+    assert write_queries(context) == []
+    assert result == contract
+    assert response == {"data": [ES14_DATA]}
+    contract.refresh_from_db()
+    # the value of the last full sync is kept
+    assert contract.contact_person == "synced"
+
+
+@pytest.mark.django_db
+def test_contract_header_is_written_for_changed_payload(settings, es14_call):
+    settings.CONTRACT_SYNC_SKIP_UNCHANGED = True
+    changed_data = {**ES14_DATA, "poNo": "PO-2"}
+    es14_call.return_value = {"data": [changed_data]}
+    contract = Contract.objects.create(code="0000000001", po_no="PO-1")
+    save_contract_payload_hash(contract, "contract", make_payload_hash(ES14_DATA))
+
+    result, _ = call_sap_api_get_contracts_export_pis("1", unchanged_flow="contract")
+
+    assert result.pk == contract.pk
+    contract.refresh_from_db()
+    assert contract.po_no == "PO-2"
+
+
+def es14_item(item_no, mat_no, **kwargs):
+    return {
+        "itemNo": item_no,
+        "matNo": mat_no,
+        "matDescription": f"{mat_no} description",
+        "targetQty": 100.0,
+        "RemainQty": 40.0,
+        "remainQtyEx": 0,
+        "salesUnit": "TON",
+        "plant": "7554",
+        "matType": "81",
+        "matGroup1": "K01",
+        "conditions": [{"conditionRate": 25000.5}],
+        "commission_zcm1": [{"conditionRate": 1.5}],
+        "commission_zcm3": [{"conditionRate": 300, "currency": "THB"}],
+        **kwargs,
+    }
+
+
+def write_queries(context):
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].split(" ", 1)[0] in ("INSERT", "UPDATE", "DELETE")
+    ]
+
+
+@pytest.fixture
+def synced_contract(db):
+    contract = Contract.objects.create(code="0000000001")
+    for material_code in ("Z02CA-090D0980117N", "Z02CA-125D1170117N"):
+        MaterialMaster.objects.create(material_code=material_code)
+        Conversion2Master.objects.create(
+            material_code=material_code, from_value=1000.0, to_unit="TON"
+        )
+    items = {
+        "10": es14_item("10", "Z02CA-090D0980117N"),
+        "20": es14_item("20", "Z02CA-125D1170117N"),
+    }
+    map_sap_contract_item(contract, items, [])
+    return contract, items
+
+
+def contract_materials(contract):
+    return {
+        contract_material.item_no: contract_material
+        for contract_material in ContractMaterial.all_objects.filter(contract=contract)
+    }
+
+
+def test_map_sap_contract_item_resync_of_same_payload_writes_nothing(synced_contract):
+    contract, items = synced_contract
+    before = contract_materials(contract)
+
+    with CaptureQueriesContext(connection) as context:
+        result = map_sap_contract_item(contract, items, [])
+
+    assert write_queries(context) == []
+    assert sorted(result) == sorted(cm.pk for cm in before.values())
+    after = contract_materials(contract)
+    # the placeholder values of the first sync are kept
+    assert [after[no].delivery_over for no in after] == [
+        before[no].delivery_over for no in after
+    ]
+    assert after["10"].quantity_unit == "1000.0"
+    assert after["10"].commission == "1.5"
+    assert MaterialVariantMaster.objects.count() == 2
+
+
+def test_map_sap_contract_item_updates_changed_item(synced_contract):
+    contract, items = synced_contract
+    before = contract_materials(contract)
+    items = {**items, "10": {**items["10"], "RemainQty": 15.0}}
+
+    with CaptureQueriesContext(connection) as context:
+        map_sap_contract_item(contract, items, [])
+
+    assert len(write_queries(context)) == 1
+    after = contract_materials(contract)
+    assert after["10"].pk == before["10"].pk
+    assert after["10"].remaining_quantity == 15.0
+    assert after["10"].delivery_over == before["10"].delivery_over
+    assert after["20"].remaining_quantity == 40.0
+
+
+def test_map_sap_contract_item_inserts_new_item(synced_contract):
+    contract, items = synced_contract
+    before = contract_materials(contract)
+    items = {**items, "30": es14_item("30", "Z02CA-090D0980117N", RemainQty=5.0)}
+
+    with CaptureQueriesContext(connection) as context:
+        result = map_sap_contract_item(contract, items, [])
+
+    assert len(write_queries(context)) == 1
+    after = contract_materials(contract)
+    assert set(after) == {"10", "20", "30"}
+    assert after["30"].remaining_quantity == 5.0
+    assert after["30"].material.material_code == "Z02CA-090D0980117N"
+    assert {no: after[no].pk for no in before} == {
+        no: cm.pk for no, cm in before.items()
+    }
+    assert sorted(result) == sorted(cm.pk for cm in after.values())
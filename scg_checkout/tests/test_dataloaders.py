@@ -0,0 +1,426 @@
+from types import SimpleNamespace
+
+import pytest
+from promise import Promise
+
+from sap_master_data.models import (
+    Conversion2Master,
+    MaterialClassificationMaster,
+    MaterialMaster,
+)
+from sap_migration.models import (
+    ContractMaterial,
+    MaterialVariantMaster,
+    Order,
+    OrderLines,
+)
+from scg_checkout.graphql.enums import AlternatedMaterialLogChangeError
+from scg_checkout.graphql.helper import from_api_response_es26_to_change_order
+from scg_checkout.graphql.types import (
+    MaterialInfo,
+    OrderItems,
+    PreviewTempOrderLine,
+    TempOrderLine,
+    TempProduct,
+    TempProductVariant,
+)
+from scg_checkout.models import AlternatedMaterial
+
+N_LINES = 5
+SO_NO = "0410000001"
+CONTRACT_NO = "0040000001"
+NO_STOCK = AlternatedMaterialLogChangeError.NO_STOCK_ALT_MAT.value
+
+
+@pytest.fixture
+def materials(db):
+    materials = MaterialMaster.objects.bulk_create(
+        [
+            MaterialMaster(
+                material_code=f"Z02CA-09{i}D0980117N",
+                description_en=f"CA09{i}D 98" if i % 2 else None,
+            )
+            for i in range(N_LINES)
+        ]
+    )
+    # the last material has no classification, conversion nor contract item
+    for i, material in enumerate(materials[:-1]):
+        for grade, roll_width in ((f"C{i}", "980"), ("XX", "1100")):
+            MaterialClassificationMaster.objects.create(
+                material=material,
+                material_code=material.material_code,
+                grade=grade,
+                basis_weight=f"{i}5",
+                diameter="117N",
+                roll_width=roll_width,
+                roll_length="3000",
+            )
+        for calculation, to_unit in ((500 + i, "ROL"), (9, "TON"), (1500 + i, "ROL")):
+            Conversion2Master.objects.create(
+                material_code=material.material_code,
+                to_unit=to_unit,
+                calculation=calculation,
+            )
+        # the contract item with the least remaining quantity was the .first()
+        for item_no, remaining in (("10", 300 + i), ("20", 100 + i)):
+            ContractMaterial.objects.create(
+                contract_no=CONTRACT_NO,
+                material=material,
+                material_code=material.material_code,
+                item_no=item_no,
+                remaining_quantity=remaining,
+                remaining_quantity_ex=remaining / 10,
+            )
+    return materials
+
+
+@pytest.fixture
+def variants(materials):
+    # same codes, neither Standard nor Non-Standard
+    MaterialVariantMaster.objects.bulk_create(
+        [
+            MaterialVariantMaster(
+                material=materials[-1],
+                name=material.material_code,
+                code=material.material_code,
+            )
+            for material in materials
+        ]
+    )
+    return MaterialVariantMaster.objects.bulk_create(
+        [
+            MaterialVariantMaster(
+                material=material,
+                name=material.material_code,
+                code=material.material_code,
+                variant_type="Standard",
+            )
+            for material in materials
+        ]
+    )
+
+
+@pytest.fixture
+def order_lines(variants):
+    order = Order.objects.create(so_no=SO_NO)
+    contract_materials = ContractMaterial.objects.filter(item_no="10").order_by("pk")
+    order_lines = OrderLines.objects.bulk_create(
+        [OrderLines(order=order, item_no="10")]
+        + [
+            OrderLines(
+                order=order,
+                item_no=str(20 + i * 10),
+                contract_material=contract_material,
+            )
+            for i, contract_material in enumerate(contract_materials)
+        ]
+    )
+    for i, (order_line, variant) in enumerate(zip(order_lines, variants)):
+        if i % 2:
+            AlternatedMaterial.objects.create(
+                order=order, order_line=order_line, error_type=NO_STOCK
+            )
+        if i % 3:
+            AlternatedMaterial.objects.create(
+                order=order, order_line=order_line, old_product=variant
+            )
+    return list(OrderLines.objects.filter(order=order).order_by("pk"))
+
+
+@pytest.fixture
+def order_items(materials):
+    items = [
+        {
+            "itemNo": f"{10 + i * 10:06d}",
+            "material": material.material_code,
+            "contractNo": CONTRACT_NO,
+            "contractItemNo": "10" if i % 2 else None,
+            "orderQty": f"{i + 1}.5",
+            "salesUnit": "EA" if i % 2 else "ROL",
+            "saleQtyFactor": 500,
+        }
+        for i, material in enumerate(materials)
+    ]
+    variable_values = {
+        "sap_order_response": {
+            "data": [
+                {
+                    "orderHeaderIn": {
+                        "saleDocument": SO_NO,
+                        "contractNo": CONTRACT_NO,
+                    },
+                    "orderItems": [dict(item) for item in items],
+                    "orderText": [],
+                    "orderPartners": [],
+                }
+            ]
+        }
+    }
+    return items, variable_values
+
+
+def resolve_all(resolver, roots, variable_values=None):
+    """`resolver` of every root in one request, like graphene resolves a list"""
+    info = SimpleNamespace(
+        context=SimpleNamespace(user=None), variable_values=variable_values or {}
+    )
+    return Promise.all([resolver(root, info) for root in roots]).get()
+
+
+def legacy_material_class(material):
+    return MaterialClassificationMaster.objects.filter(
+        material_code=material.material_code
+    ).first()
+
+
+def legacy_grade(material):
+    material_class = legacy_material_class(material)
+    return material_class.grade if material_class else None
+
+
+def legacy_gram(material):
+    material_class = legacy_material_class(material)
+    return material_class.basis_weight if material_class else None
+
+
+def legacy_dia(material):
+    material_class = legacy_material_class(material)
+    return material_class.diameter[0:3] if material_class else None
+
+
+def legacy_width_of_roll(variant):
+    rs = variant.material.materialclassificationmaster_set.first()
+    return (rs.roll_width or 0) if rs else 0
+
+
+def legacy_length_of_roll(variant):
+    rs = variant.material.materialclassificationmaster_set.first()
+    return (rs.roll_length or 0) if rs else 0
+
+
+def legacy_weight(variant):
+    conversion_object = (
+        Conversion2Master.objects.filter(material_code=variant.code, to_unit="ROL")
+        .order_by("material_code", "-id")
+        .distinct("material_code")
+        .in_bulk(field_name="material_code")
+        .get(str(variant.code))
+    )
+    return round((conversion_object.calculation if conversion_object else 0) / 1000, 3)
+
+
+def legacy_remaining(order_line):
+    try:
+        contract_mat = ContractMaterial.objects.filter(
+            id=order_line.contract_material.id
+        ).first()
+        return contract_mat.remaining_quantity if contract_mat else 0
+    except AttributeError:
+        return 0
+
+
+def legacy_log_errors(order_line):
+    try:
+        return AlternatedMaterial.objects.get(
+            order_line_id=order_line.id, error_type=NO_STOCK
+        ).error_type
+    except AlternatedMaterial.DoesNotExist:
+        return None
+
+
+def legacy_log_old_product(order_line):
+    try:
+        alternated_material = AlternatedMaterial.objects.get(
+            order_line_id=order_line.id, error_type__isnull=True
+        )
+        old_product = MaterialVariantMaster.objects.get(
+            id=alternated_material.old_product_id
+        )
+    except (AlternatedMaterial.DoesNotExist, MaterialVariantMaster.DoesNotExist):
+        return None
+    mat_master = MaterialMaster.objects.filter(material_code=old_product.code).first()
+    if mat_master and mat_master.description_en:
+        return mat_master.description_en
+    return old_product.code
+
+
+@pytest.mark.parametrize("object_type", [MaterialInfo, TempProduct])
+@pytest.mark.parametrize(
+    "field, legacy",
+    [("grade", legacy_grade), ("gram", legacy_gram), ("dia", legacy_dia)],
+)
+def test_material_classification_fields(
+    materials, django_assert_num_queries, object_type, field, legacy
+):
+    expected = [legacy(material) for material in materials]
+
+    with django_assert_num_queries(1):
+        values = resolve_all(getattr(object_type, f"resolve_{field}"), materials)
+
+    assert values == expected
+    assert values[0] == {"grade": "C0", "gram": "05", "dia": "117"}[field]
+    assert values[-1] is None
+
+
+@pytest.mark.parametrize(
+    "field, legacy",
+    [
+        ("width_of_roll", legacy_width_of_roll),
+        ("length_of_roll", legacy_length_of_roll),
+        ("weight", legacy_weight),
+    ],
+)
+def test_material_variant_fields(variants, django_assert_num_queries, field, legacy):
+    expected = [legacy(variant) for variant in variants]
+
+    with django_assert_num_queries(1):
+        values = resolve_all(getattr(TempProductVariant, f"resolve_{field}"), variants)
+
+    assert values == expected
+    assert values[0] == {"width_of_roll": "980", "length_of_roll": "3000"}.get(
+        field, 1.5
+    )
+    assert values[-1] == 0
+
+
+def test_order_line_remaining(order_lines, django_assert_num_queries):
+    expected = [legacy_remaining(order_line) for order_line in order_lines]
+
+    with django_assert_num_queries(1):
+        values = resolve_all(TempOrderLine.resolve_remaining, order_lines)
+
+    assert values == expected
+    assert values[:2] == [0, 300]
+
+
+@pytest.mark.parametrize(
+    "field, legacy, num_queries",
+    [
+        ("log_errors", legacy_log_errors, 1),
+        # alternated materials, old products and their material masters
+        ("log_old_product", legacy_log_old_product, 3),
+    ],
+)
+def test_alternated_material_logs(
+    order_lines, django_assert_num_queries, field, legacy, num_queries
+):
+    expected = [legacy(order_line) for order_line in order_lines]
+
+    with django_assert_num_queries(num_queries):
+        values = resolve_all(
+            getattr(PreviewTempOrderLine, f"resolve_{field}"), order_lines
+        )
+
+    assert values == expected
+    assert any(values) and None in values
+
+
+def legacy_contract_material(variable_values, material_code):
+    info = SimpleNamespace(variable_values=variable_values)
+    contract_no = from_api_response_es26_to_change_order(
+        info, "orderHeaderIn", "contractNo"
+    )
+    return ContractMaterial.objects.filter(
+        contract_no=contract_no, material_code=material_code
+    ).first()
+
+
+def legacy_product_material(item):
+    material_variant = MaterialVariantMaster.objects.filter(
+        code=item.get("material", ""), variant_type__in=("Standard", "Non-Standard")
+    ).first()
+    return getattr(getattr(material_variant, "material", None), "material_code", "")
+
+
+def legacy_contract_product_id(item):
+    contract_no = item.get("contractNo", "")
+    material_code = item.get("material", "")
+    contract_item_no = item.get("contractItemNo")
+    product_material = legacy_product_material(item)
+    contract_material = []
+    if contract_item_no:
+        contract_material = ContractMaterial.objects.filter(
+            contract_no=contract_no,
+            material_code__in=(material_code, product_material),
+            item_no=contract_item_no,
+        )
+    if contract_item_no is None or not contract_material:
+        contract_material = ContractMaterial.objects.filter(
+            contract_no=contract_no,
+            material_code__in=(material_code, product_material),
+        )
+    contract_material = {x.material_code: x for x in contract_material}
+    contract_material_object = contract_material.get(
+        material_code
+    ) or contract_material.get(product_material)
+    return getattr(contract_material_object, "id", None)
+
+
+def legacy_item_remain(variable_values, item):
+    material_code = item.get("material")
+    contract_mat = legacy_contract_material(variable_values, material_code)
+    contract_remaining = contract_mat and contract_mat.remaining_quantity or 0
+    order_items = from_api_response_es26_to_change_order(
+        SimpleNamespace(variable_values=variable_values), "orderItems"
+    )
+    order_item_quantity = sum(
+        float(x.get("orderQty", 0))
+        for x in order_items
+        if x and x.get("material") == material_code
+    )
+    try:
+        for order_item in order_items:
+            if order_item.get("material") == material_code:
+                sale_qty_factor = (
+                    1000
+                    if order_item.get("salesUnit") == "EA"
+                    else order_item.get("saleQtyFactor")
+                )
+        contract_remaining *= 1000 / sale_qty_factor
+        return round(contract_remaining + order_item_quantity, 3)
+    except Exception:
+        return contract_remaining + order_item_quantity
+
+
+def legacy_remaining_quantity(variable_values, item):
+    contract_mat = legacy_contract_material(variable_values, item.get("material"))
+    return contract_mat and contract_mat.remaining_quantity or 0
+
+
+def legacy_remaining_quantity_ex(variable_values, item):
+    contract_mat = legacy_contract_material(variable_values, item.get("material"))
+    return contract_mat and contract_mat.remaining_quantity_ex or 0
+
+
+@pytest.mark.parametrize(
+    "field, legacy, num_queries",
+    [
+        ("remaining_quantity", legacy_remaining_quantity, 1),
+        ("remaining_quantity_ex", legacy_remaining_quantity_ex, 1),
+        ("item_remain", legacy_item_remain, 1),
+        ("product_material", lambda _, item: legacy_product_material(item), 1),
+        # standard variants and contract materials
+        ("contract_product_id", lambda _, item: legacy_contract_product_id(item), 2),
+    ],
+)
+def test_change_order_item_fields(
+    order_items, django_assert_num_queries, field, legacy, num_queries
+):
+    items, variable_values = order_items
+    expected = [legacy(variable_values, item) for item in items]
+
+    with django_assert_num_queries(num_queries):
+        values = resolve_all(
+            getattr(OrderItems, f"resolve_{field}"), items, variable_values
+        )
+
+    assert values == expected
+
+
+def test_change_order_item_remaining_is_of_the_first_contract_item(order_items):
+    items, variable_values = order_items
+
+    values = resolve_all(OrderItems.resolve_remaining_quantity, items, variable_values)
+
+    # contract items are ordered by remaining quantity, as .first() did
+    assert values == [100 + i for i in range(N_LINES - 1)] + [0]
@@ -0,0 +1,180 @@
+import itertools
+import random
+from datetime import datetime
+
+import pytest
+from django.db import transaction
+
+from sap_migration.models import Order, OrderLineDeliveries, OrderLines
+from scg_checkout.graphql.enums import DeliveryStatus
+from scg_checkout.graphql.implementations.orders import sap_convert_items_data
+
+SO_NO = "0410000001"
+ITEM_NOS = ["10", "20"]
+DELIVERIES = ["8000000001", "8000000002"]
+GI_STATUSES = [
+    DeliveryStatus.COMPLETED_DELIVERY.value,
+    DeliveryStatus.CANCEL.value,
+    DeliveryStatus.PARTIAL_DELIVERY.value,
+]
+DELIVERY_FIELDS = [
+    "order_line_id",
+    "sales_order",
+    "sales_order_item",
+    "delivery",
+    "actual_gi_date",
+    "gi_status",
+    "sales_org",
+    "distribution_channel",
+    "shipping_point",
+]
+
+
+def legacy_convert_item_data(line_data, object_line):
+    """sap_convert_items_data for one line, as ES38 was synced before batching"""
+    delivery = line_data.get("delivery")
+    if line_data.get("GiStatus") == DeliveryStatus.COMPLETED_DELIVERY.value:
+        actual_gi_date = datetime.strptime(line_data.get("actualGiDate"), "%d/%m/%Y")
+        OrderLineDeliveries.objects.create(
+            order_line_id=object_line.id,
+            sales_order=line_data.get("salesOrderItem"),
+            sales_order_item=line_data.get("salesOrderItem"),
+            delivery=delivery,
+            actual_gi_date=actual_gi_date,
+            gi_status=line_data.get("GiStatus"),
+            sales_org=line_data.get("salesOrg"),
+            distribution_channel=line_data.get("distributionChannel"),
+            shipping_point=line_data.get("shippingPoint"),
+        )
+    if line_data.get("GiStatus") == DeliveryStatus.CANCEL.value:
+        OrderLineDeliveries.objects.filter(
+            order_line_id=object_line.id, delivery=delivery
+        ).delete()
+    object_line.actual_gi_date = (
+        OrderLineDeliveries.objects.filter(order_line_id=object_line.id)
+        .order_by("actual_gi_date")
+        .values_list("actual_gi_date", flat=True)
+        .first()
+    )
+
+
+def legacy_convert_items_data(es38_lines):
+    for line_data, object_line in es38_lines:
+        legacy_convert_item_data(line_data, object_line)
+
+
+def es38_line(item_no, delivery, gi_status, day):
+    return {
+        "salesOrder": SO_NO,
+        "salesOrderItem": item_no.zfill(6),
+        "delivery": delivery,
+        "GiStatus": gi_status,
+        "actualGiDate": f"{day:02d}/03/2024",
+        "salesOrg": "0750",
+        "distributionChannel": "10",
+        "shippingPoint": "7501",
+    }
+
+
+@pytest.fixture
+def es38_order_lines(db):
+    order = Order.objects.create(so_no=SO_NO)
+    order_lines = OrderLines.objects.bulk_create(
+        [OrderLines(order=order, item_no=item_no) for item_no in ITEM_NOS]
+    )
+    # a delivery synced by an earlier message
+    OrderLineDeliveries.objects.create(
+        order_line=order_lines[0],
+        sales_order="000010",
+        sales_order_item="000010",
+        delivery=DELIVERIES[0],
+        actual_gi_date=datetime(2024, 2, 15).date(),
+        gi_status=DeliveryStatus.COMPLETED_DELIVERY.value,
+    )
+    return {order_line.item_no: order_line.pk for order_line in order_lines}
+
+
+def sync_and_rollback(convert, order_line_ids, lines_data):
+    """Line fields and deliveries after `convert`, the db is left untouched"""
+    with transaction.atomic():
+        # like sap_update_order, lines of the same item share one object
+        object_lines = {
+            order_line.item_no: order_line
+            for order_line in OrderLines.objects.filter(pk__in=order_line_ids.values())
+        }
+        convert(
+            [
+                (line_data, object_lines[str(int(line_data["salesOrderItem"]))])
+                for line_data in lines_data
+            ]
+        )
+        result = (
+            {
+                item_no: object_line.actual_gi_date
+                for item_no, object_line in object_lines.items()
+            },
+            sorted(
+                OrderLineDeliveries.objects.values_list(*DELIVERY_FIELDS),
+                key=repr,
+            ),
+        )
+        transaction.set_rollback(True)
+    return result
+
+
+def assert_same_as_legacy(order_line_ids, lines_data):
+    assert sync_and_rollback(
+        sap_convert_items_data, order_line_ids, lines_data
+    ) == sync_and_rollback(
+        legacy_convert_items_data, order_line_ids, lines_data
+    ), lines_data
+
+
+def all_lines():
+    return [
+        es38_line(item_no, delivery, gi_status, day)
+        for day, (item_no, delivery, gi_status) in enumerate(
+            itertools.product(ITEM_NOS, DELIVERIES, GI_STATUSES), start=1
+        )
+    ]
+
+
+@pytest.mark.parametrize("size", [1, 2])
+def test_sap_convert_items_data_matches_per_line_sync(es38_order_lines, size):
+    # every message of up to `size` lines, in every order
+    for lines_data in itertools.product(all_lines(), repeat=size):
+        assert_same_as_legacy(es38_order_lines, list(lines_data))
+
+
+def test_sap_convert_items_data_matches_per_line_sync_for_long_messages(
+    es38_order_lines,
+):
+    rand = random.Random(38)
+    lines = all_lines()
+    for _ in range(100):
+        lines_data = [rand.choice(lines) for _ in range(rand.randint(3, 8))]
+        assert_same_as_legacy(es38_order_lines, lines_data)
+
+
+def test_sap_convert_items_data_query_count_does_not_grow_with_lines(
+    es38_order_lines, django_assert_num_queries
+):
+    object_lines = {
+        order_line.item_no: order_line
+        for order_line in OrderLines.objects.filter(pk__in=es38_order_lines.values())
+    }
+    lines_data = [
+        es38_line(item_no, f"80000001{index:02d}", gi_status, index % 28 + 1)
+        for index, (item_no, gi_status) in enumerate(
+            itertools.product(ITEM_NOS * 10, GI_STATUSES[:2])
+        )
+    ]
+
+    # delete the cancelled, insert the new and read the earliest GI dates
+    with django_assert_num_queries(3):
+        sap_convert_items_data(
+            [
+                (line_data, object_lines[str(int(line_data["salesOrderItem"]))])
+                for line_data in lines_data
+            ]
+        )
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.utils import timezone
+
+from scg_checkout.models import (
+    OrderNotification,
+    OrderNotificationKind,
+    OrderNotificationStatus,
+)
+from scg_checkout.notifications import (
+    claim_order_notifications,
+    get_batch_recipients,
+    send_order_notifications_batch,
+)
+
+SENDER = "scg_checkout.graphql.implementations.iplan.send_create_order_notification"
+
+
+def _create_notification(order, **kwargs):
+    return OrderNotification.objects.create(
+        kind=OrderNotificationKind.CREATE_ORDER,
+        order=order,
+        payload={"partner_emails": ["partner@example.com"]},
+        **kwargs,
+    )
+
+
+def test_claim_order_notifications_only_due(sap_migration_order, settings):
+    settings.ORDER_NOTIFICATION_LEASE = 600
+    order = sap_migration_order[0]
+    due = _create_notification(order)
+    _create_notification(order, next_attempt_at=timezone.now() + timedelta(hours=1))
+    _create_notification(order, status=OrderNotificationStatus.SENT)
+
+    assert [n.id for n in claim_order_notifications(10)] == [due.id]
+
+    due.refresh_from_db()
+    assert due.status == OrderNotificationStatus.SENDING
+    assert due.next_attempt_at > timezone.now()
+    # leased, not claimed again until the lease expires
+    assert claim_order_notifications(10) == []
+
+
+@patch(SENDER)
+def test_send_order_notifications_batch_sent(sender, sap_migration_order):
+    sender.return_value = (["to@example.com"], ["cc@example.com"])
+    notification = _create_notification(sap_migration_order[0])
+
+    assert send_order_notifications_batch() == 1
+
+    notification.refresh_from_db()
+    assert notification.status == OrderNotificationStatus.SENT
+    assert notification.attempts == 1
+    assert notification.mail_to == ["to@example.com"]
+    assert notification.cc_list == ["cc@example.com"]
+    assert notification.sent_at is not None
+
+
+@patch(SENDER)
+def test_send_order_notifications_batch_retry_then_failed(
+    sender, sap_migration_order, settings
+):
+    settings.ORDER_NOTIFICATION_MAX_ATTEMPTS = 2
+    sender.side_effect = Exception("SMTP down")
+    notification = _create_notification(sap_migration_order[0])
+
+    assert send_order_notifications_batch() == 0
+    notification.refresh_from_db()
+    assert notification.status == OrderNotificationStatus.PENDING
+    assert notification.attempts == 1
+    assert notification.last_error == "SMTP down"
+    assert notification.next_attempt_at > timezone.now()
+
+    OrderNotification.objects.update(next_attempt_at=timezone.now())
+    assert send_order_notifications_batch() == 0
+    notification.refresh_from_db()
+    assert notification.status == OrderNotificationStatus.FAILED
+    assert notification.attempts == 2
+
+
+@patch(SENDER)
+def test_send_order_notifications_batch_resolves_recipients_once(
+    sender, sap_migration_order
+):
+    resolve = Mock(return_value=["internal@example.com"])
+
+    def send(notification, manager):
+        return get_batch_recipients(("internal", "create_order"), resolve), []
+
+    sender.side_effect = send
+    _create_notification(sap_migration_order[0])
+    _create_notification(sap_migration_order[1])
+
+    assert send_order_notifications_batch() == 2
+    resolve.assert_called_once()
@@ -0,0 +1,132 @@
+import itertools
+
+import pytest
+
+from sap_migration.graphql.enums import OrderType
+from sap_migration.models import Order, OrderLines
+from scg_checkout.graphql.enums import IPlanOrderItemStatus, IPlanOrderStatus
+from scg_checkout.graphql.helper import (
+    compute_order_status,
+    compute_order_status_from_counts,
+    save_orders_status,
+    update_order_status,
+    update_orders_status,
+)
+from scgp_export.graphql.enums import ItemCat
+
+LINE_STATUSES = [
+    IPlanOrderItemStatus.CANCEL.value,
+    IPlanOrderItemStatus.COMPLETE_DELIVERY.value,
+    IPlanOrderItemStatus.PARTIAL_DELIVERY.value,
+    IPlanOrderItemStatus.FULL_COMMITTED_ORDER.value,
+    IPlanOrderItemStatus.PRODUCING.value,
+    None,
+]
+
+
+def _counts(order_line_status):
+    return {
+        "total": len(order_line_status),
+        "unknown": order_line_status.count(None),
+        "cancel": order_line_status.count(IPlanOrderItemStatus.CANCEL.value),
+        "complete": order_line_status.count(
+            IPlanOrderItemStatus.COMPLETE_DELIVERY.value
+        ),
+        "partial": order_line_status.count(IPlanOrderItemStatus.PARTIAL_DELIVERY.value),
+        "full_committed": order_line_status.count(
+            IPlanOrderItemStatus.FULL_COMMITTED_ORDER.value
+        ),
+    }
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 4])
+def test_compute_order_status_from_counts_equivalence(size):
+    # every ordering, compute_order_status walks the lines in order
+    for order_line_status in itertools.product(LINE_STATUSES, repeat=size):
+        order_line_status = list(order_line_status)
+        assert compute_order_status_from_counts(
+            _counts(order_line_status) if order_line_status else None
+        ) == compute_order_status(order_line_status), order_line_status
+
+
+def _create_lines(order, statuses, **kwargs):
+    OrderLines.objects.bulk_create(
+        [
+            OrderLines(
+                order=order,
+                item_no=str((index + 1) * 10),
+                item_status_en=status,
+                **kwargs,
+            )
+            for index, status in enumerate(statuses)
+        ]
+    )
+
+
+def test_update_orders_status_matches_update_order_status(
+    sap_migration_order, django_assert_num_queries
+):
+    statuses = [
+        [
+            IPlanOrderItemStatus.CANCEL.value,
+            IPlanOrderItemStatus.COMPLETE_DELIVERY.value,
+        ],
+        [
+            IPlanOrderItemStatus.FULL_COMMITTED_ORDER.value,
+            IPlanOrderItemStatus.PRODUCING.value,
+        ],
+        [],
+    ]
+    for order, order_statuses in zip(sap_migration_order, statuses):
+        _create_lines(order, order_statuses)
+    order_ids = [order.id for order in sap_migration_order]
+
+    with django_assert_num_queries(1):
+        orders_status = update_orders_status(order_ids)
+
+    assert orders_status == {
+        order_id: update_order_status(order_id) for order_id in order_ids
+    }
+    assert [orders_status[order_id][0] for order_id in order_ids] == [
+        IPlanOrderStatus.COMPLETED_DELIVERY.value,
+        IPlanOrderStatus.PARTIAL_COMMITTED_ORDER.value,
+        IPlanOrderStatus.RECEIVED_ORDER.value,
+    ]
+
+
+def test_update_orders_status_excludes_export_container_items(sap_migration_order):
+    order = sap_migration_order[0]
+    _create_lines(order, [IPlanOrderItemStatus.COMPLETE_DELIVERY.value])
+    OrderLines.objects.create(
+        order=order,
+        item_no="20",
+        item_status_en=IPlanOrderItemStatus.PRODUCING.value,
+        item_cat_eo=ItemCat.ZKC0.value,
+        type=OrderType.EXPORT.value,
+    )
+
+    assert update_orders_status([order.id])[order.id][0] == (
+        IPlanOrderStatus.COMPLETED_DELIVERY.value
+    )
+
+
+def test_save_orders_status_writes_changed_orders(sap_migration_order):
+    order, unchanged_order, _ = sap_migration_order
+    _create_lines(order, [IPlanOrderItemStatus.CANCEL.value])
+    Order.objects.filter(pk=unchanged_order.pk).update(
+        status=IPlanOrderStatus.RECEIVED_ORDER.value,
+        status_thai=IPlanOrderStatus.IPLAN_ORDER_STATUS_TH.value.get(
+            IPlanOrderStatus.RECEIVED_ORDER.value
+        ),
+    )
+
+    changed_orders = save_orders_status(
+        Order.objects.filter(pk__in=[order.pk, unchanged_order.pk])
+    )
+
+    assert [changed.pk for changed in changed_orders] == [order.pk]
+    order.refresh_from_db()
+    assert order.status == IPlanOrderStatus.CANCEL.value
+    assert order.status_thai == IPlanOrderStatus.IPLAN_ORDER_STATUS_TH.value.get(
+        IPlanOrderStatus.CANCEL.value
+    )
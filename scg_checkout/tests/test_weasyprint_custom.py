@@ -0,0 +1,69 @@
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from unittest.mock import Mock, patch
+
+import pytest
+
+from scg_checkout.graphql.implementations import weasyprint_custom
+from scg_checkout.graphql.implementations.weasyprint_custom import (
+    PdfGenerator,
+    PdfRenderTimeout,
+    render_pdf,
+    render_pdfs,
+)
+
+HEADER_HTML = "<html><body><header><h1>Order confirmation</h1></header></body></html>"
+
+
+def _document(so_no):
+    return {
+        "main_html": f"<html><body><p>Order {so_no}</p></body></html>",
+        "header_html": HEADER_HTML,
+        "mt": "-90mm",
+        "mr": "-10mm",
+        "orientation": "portrait",
+    }
+
+
+def test_render_pdf():
+    pdf = render_pdf(**_document("0410000001"))
+    assert pdf.startswith(b"%PDF")
+
+
+def test_render_pdfs_one_document_per_order():
+    documents = [_document("0410000001"), _document("0410000002")]
+
+    with patch.object(
+        PdfGenerator, "render", side_effect=PdfGenerator.render, autospec=True
+    ) as render:
+        pdf = render_pdfs(documents)
+
+    assert pdf.startswith(b"%PDF")
+    assert render.call_count == 2
+
+
+def test_header_layout_is_reused():
+    weasyprint_custom._overlay_cache.clear()
+    with patch.object(
+        PdfGenerator,
+        "_layout_overlay_element",
+        side_effect=PdfGenerator._layout_overlay_element,
+        autospec=True,
+    ) as layout:
+        render_pdfs([_document("0410000001"), _document("0410000002")])
+    assert layout.call_count == 1
+
+
+def test_render_timeout_restarts_the_pool(settings):
+    settings.PDF_RENDER_TIMEOUT = 5
+    pool = Mock()
+    future = pool.submit.return_value
+    future.result.side_effect = FutureTimeoutError()
+
+    with patch.object(weasyprint_custom, "_get_pool", return_value=pool), patch.object(
+        weasyprint_custom, "_reset_pool"
+    ) as reset_pool, pytest.raises(PdfRenderTimeout, match="5 seconds"):
+        render_pdf(**_document("0410000001"))
+
+    future.result.assert_called_once_with(timeout=5)
+    future.cancel.assert_called_once_with()
+    reset_pool.assert_called_once_with(terminate=True)
@@ -1,5 +1,6 @@
 from django.db.models import Subquery
 
+from sap_master_data.cache import get_master_by_code
 from sap_master_data.models import SoldToChannelMaster
 from sap_migration.models import DistributionChannelMaster
 
@@ -20,6 +21,4 @@ class DistributionChannelMasterRepo:
 
     @classmethod
     def get_distribution_channel_by_code(cls, distribution_channel_code):
-        return DistributionChannelMaster.objects.filter(
-            code=distribution_channel_code
-        ).first()
+        return get_master_by_code(DistributionChannelMaster, distribution_channel_code)
@@ -1,5 +1,6 @@
 from django.db.models import Subquery
 
+from sap_master_data.cache import get_master_by_code
 from sap_master_data.models import SoldToChannelMaster
 from sap_migration.models import DivisionMaster
 
@@ -19,4 +20,4 @@ class DivisionMasterRepo:
 
     @classmethod
     def get_division_by_code(cls, division_code):
-        return DivisionMaster.objects.filter(code=division_code).first()
+        return get_master_by_code(DivisionMaster, division_code)
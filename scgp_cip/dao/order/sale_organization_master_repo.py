@@ -1,5 +1,6 @@
 from django.db.models import Q
 
+from sap_master_data.cache import get_master_by_code
 from sap_master_data.models import SalesOrganizationMaster
 from scgp_cip.common.constants import CIP
 
@@ -7,7 +8,7 @@ from scgp_cip.common.constants import CIP
 class SalesOrganizationMasterRepo:
     @classmethod
     def get_sale_organization_by_code(cls, sale_org_code):
-        return SalesOrganizationMaster.objects.filter(code=sale_org_code).first()
+        return get_master_by_code(SalesOrganizationMaster, sale_org_code)
 
     @classmethod
     def get_sales_org_by_user_order_by_bu(cls, scgp_user_id):
@@ -1,3 +1,4 @@
+from sap_master_data.cache import get_master_by_code
 from sap_master_data.models import SalesGroup
 from sap_migration.models import SalesGroupMaster
 
@@ -9,4 +10,4 @@ class SalesGroupMasterRepo:
 
     @classmethod
     def get_sales_group_by_sales_group_code(cls, sales_group_code):
-        return SalesGroup.objects.filter(sales_group_code=sales_group_code).first()
+        return get_master_by_code(SalesGroup, sales_group_code)
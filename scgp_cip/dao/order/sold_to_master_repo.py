@@ -1,5 +1,6 @@
 from django.db.models import Subquery
 
+from sap_master_data.cache import get_master_by_code
 from sap_master_data.models import (
     SoldToChannelMaster,
     SoldToChannelPartnerMaster,
@@ -55,7 +56,7 @@ class SoldToMasterRepo:
 
     @classmethod
     def get_sold_to_data(self, sold_to_code):
-        return SoldToMaster.objects.filter(sold_to_code=sold_to_code).first()
+        return get_master_by_code(SoldToMaster, sold_to_code)
 
     @classmethod
     def get_sold_to_partner_data(self, sold_to_code, partner_code):
@@ -1,4 +1,4 @@
-from django.db.models import IntegerField, Max, Q
+from django.db.models import F, IntegerField, Max, Q
 from django.db.models.functions import Cast
 
 from sap_migration.models import OrderLines
@@ -206,6 +206,26 @@ class OrderLineRepo:
             order__so_no=so_no, parent__item_no=parent_item_no
         ).first()
 
+    @classmethod
+    def get_order_lines_by_so_nos_and_item_nos(cls, so_nos, item_nos):
+        return (
+            OrderLines.objects.filter(order__so_no__in=so_nos, item_no__in=item_nos)
+            .annotate(order_so_no=F("order__so_no"))
+            .order_by("pk")
+        )
+
+    @classmethod
+    def get_order_lines_by_so_nos_and_parent_item_nos(cls, so_nos, parent_item_nos):
+        return (
+            OrderLines.objects.filter(
+                order__so_no__in=so_nos, parent__item_no__in=parent_item_nos
+            )
+            .annotate(
+                order_so_no=F("order__so_no"), parent_item_no=F("parent__item_no")
+            )
+            .order_by("pk")
+        )
+
     @classmethod
     def update_order_lines_parent_bom(cls, order, parent_line, child_item_nos):
         return OrderLines.objects.filter(
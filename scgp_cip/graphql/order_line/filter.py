@@ -1,16 +1,17 @@
 from saleor.graphql.core.filters import MetadataFilterBase
 from saleor.graphql.core.types import FilterInputObjectType
 import django_filters
+from common.search import search_by_text
 from sap_master_data.models import MaterialMaster
 from django.db.models import Value, F, Subquery, OuterRef
 from django.db.models.functions import Concat
 
 
 def search_materials_by_mat_code_or_desc(qs, _, value):
-    all_data = qs.annotate(search_text=Concat(F("material_code"), Value(' - '),
-                                              F("description_en")))
-    qs = all_data.filter(search_text__icontains=value).distinct()
-    return qs
+    # search_text is the display text of the suggestions
+    qs = search_by_text(qs, value, "material_code", "description_en").annotate(
+        search_text=Concat(F("material_code"), Value(' - '), F("description_en")))
+    return qs.distinct()
 
 
 def search_materials_by_cust_mat_code_or_desc(qs, _, value):
@@ -11,9 +11,9 @@ from scg_checkout.graphql.enums import OrderLineStatus
 from scg_checkout.graphql.types import SapOrderMessage, SapItemMessage
 from scgp_cip.graphql.order.cip_order_error import CipOrderError
 from scgp_cip.graphql.order.types import CipOrderOtcPartnerInput, CancelDeleteCipOrderLinesInput
-from scgp_cip.graphql.order_line.types import CipTempOrderLine
+from scgp_cip.graphql.order_line.types import CipTempOrderLine, CipAddOrderLinesError
 from scgp_cip.service.order_line_service import delete_order_lines, add_order_line, update_otc_ship_to, \
-    delete_otc_ship_to, cancel_delete_cip_order_lines, cancel_cip_order, undo_cip_order_lines
+    delete_otc_ship_to, add_order_lines, cancel_delete_cip_order_lines, cancel_cip_order, undo_cip_order_lines
 from sap_migration import models as migration_models
 from scgp_customer.error_codes import ScgpCustomerErrorCode
 
@@ -61,6 +61,28 @@ class AddOrderLine(ModelMutation):
         return cls(order_lines=order_lines, item_no_updated=item_no_updated)
 
 
+class AddOrderLines(ModelMutation):
+    order_lines = graphene.List(CipTempOrderLine)
+    material_errors = graphene.List(CipAddOrderLinesError)
+
+    class Arguments:
+        order_id = graphene.String(required=True)
+        material_codes = graphene.List(graphene.NonNull(graphene.String), required=True)
+
+    class Meta:
+        description = "add many products to order, materials with errors are skipped"
+        model = migration_models.OrderLines
+        object_type = CipTempOrderLine
+        return_field_name = "orderLine"
+        error_type_class = ContractCheckoutError
+        error_type_field = "checkout_errors"
+
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        order_lines, material_errors = add_order_lines(data["order_id"], data["material_codes"])
+        return cls(order_lines=order_lines, material_errors=material_errors)
+
+
 class UpdateOrderLineOtcShipTo(ModelMutation):
     id = graphene.ID()
 
@@ -5,7 +5,7 @@ from saleor.graphql.core.fields import FilterConnectionField
 from scgp_cip.common.enum import SearchMaterialBy
 from scgp_cip.graphql.order.mutations.cip_change_order_add_new_orderline import CipChangeOrderAddNewOrderLine
 from scgp_cip.graphql.order_line.filter import MaterialSearchFilterInput
-from scgp_cip.graphql.order_line.mutations.order_line import DeleteOrderLine, AddOrderLine, UpdateOrderLineOtcShipTo, \
+from scgp_cip.graphql.order_line.mutations.order_line import DeleteOrderLine, AddOrderLine, AddOrderLines, UpdateOrderLineOtcShipTo, \
     DeleteOrderLineOtcShipTo, CancelDeleteCipOrderLines, CancelCipOrder, CipUndoOrderLines
 from scgp_cip.graphql.order_line.resolves.order_line import resolve_get_plants_by_mat_code, \
     resolve_search_suggestion_material
@@ -43,6 +43,7 @@ class CIPOrderLineQueries(graphene.ObjectType):
 
 class CIPOrderLineMutation(graphene.ObjectType):
     add_order_line = AddOrderLine.Field()
+    add_order_lines = AddOrderLines.Field()
     delete_order_lines = DeleteOrderLine.Field()
     update_order_line_otc_ship_to = UpdateOrderLineOtcShipTo.Field()
     delete_order_line_otc_ship_to = DeleteOrderLineOtcShipTo.Field()
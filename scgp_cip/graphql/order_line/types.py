@@ -309,6 +309,11 @@ class CipAddOrderLineInput(InputObjectType):
     production_memo = graphene.String(required=False)
 
 
+class CipAddOrderLinesError(graphene.ObjectType):
+    material_code = graphene.String()
+    message = graphene.String()
+
+
 class MaterialSearchSuggestionResponse(graphene.ObjectType):
     id = graphene.ID()
     material_code = graphene.String()
@@ -29,6 +29,8 @@ from scg_checkout.graphql.validators import (
     validate_object,
     validate_objects,
 )
+from scg_checkout.models import OrderNotificationKind
+from scg_checkout.notifications import queue_order_notification
 from scgp_cip.common.constants import BOM_ITEM_CATEGORY_GROUP
 from scgp_cip.common.enum import (
     CipOrderInput,
@@ -79,9 +81,6 @@ from scgp_cip.service.helper.create_order_helper import (
     prepare_otc_partneraddress_update,
 )
 from scgp_cip.service.integration.integration_service import create_order, get_solution
-from scgp_cip.service.orders_pdf_and_email_service import (
-    send_mail_customer_create_order_cp,
-)
 from scgp_user_management.models import (
     EmailConfigurationFeatureChoices,
     EmailInternalMapping,
@@ -740,9 +739,11 @@ def process_es16_response(es16_response, info, order, order_lines):
         update_order(order, es16_response, order_lines)
         update_order_line(order, es16_response)
         partner_emails = get_partner_emails_from_es16_response(es16_response)
-        user = info.context.user
-        send_mail_customer_create_order_cp(
-            info, order, user, partner_emails=partner_emails
+        queue_order_notification(
+            OrderNotificationKind.CREATE_ORDER_CIP,
+            order,
+            info.context.user,
+            partner_emails=partner_emails,
         )
     response = {
         "success": sap_success,
@@ -2,6 +2,7 @@ import logging
 import uuid
 
 from common.helpers import DateHelper
+from sap_master_data.cache import get_master_by_code
 from sap_master_data import models as master_data_models
 from sap_migration import models as sap_migration_models
 from scg_checkout.graphql.enums import (
@@ -1534,32 +1535,28 @@ def prepare_orderlines_from_sap_response(
 def get_incoterms_id_from_code(code):
     if not code:
         return None
-    instance = master_data_models.Incoterms1Master.objects.filter(code=code).first()
+    instance = get_master_by_code(master_data_models.Incoterms1Master, code)
     return instance or None
 
 
 def get_distribution_channel_id_from_code(code):
     if not code:
         return None
-    instance = master_data_models.DistributionChannelMaster.objects.filter(
-        code=code
-    ).first()
+    instance = get_master_by_code(master_data_models.DistributionChannelMaster, code)
     return instance or None
 
 
 def get_sales_org_id_from_code(code):
     if not code:
         return None
-    instance = master_data_models.SalesOrganizationMaster.objects.filter(
-        code=code
-    ).first()
+    instance = get_master_by_code(master_data_models.SalesOrganizationMaster, code)
     return instance or None
 
 
 def get_division_id_from_code(code):
     if not code:
         return None
-    instance = master_data_models.DivisionMaster.objects.filter(code=code).first()
+    instance = get_master_by_code(master_data_models.DivisionMaster, code)
     return instance or None
 
 
@@ -1567,32 +1564,22 @@ def get_customer_group_id_from_code(code, group):
     if not code:
         return None
     if group == "customerGroup":
-        instance = master_data_models.CustomerGroupMaster.objects.filter(
-            code=code
-        ).first()
+        instance = get_master_by_code(master_data_models.CustomerGroupMaster, code)
     elif group == "customerGroup1":
-        instance = master_data_models.CustomerGroup1Master.objects.filter(
-            code=code
-        ).first()
+        instance = get_master_by_code(master_data_models.CustomerGroup1Master, code)
     elif group == "customerGroup2":
-        instance = master_data_models.CustomerGroup2Master.objects.filter(
-            code=code
-        ).first()
+        instance = get_master_by_code(master_data_models.CustomerGroup2Master, code)
     elif group == "customerGroup3":
-        instance = master_data_models.CustomerGroup3Master.objects.filter(
-            code=code
-        ).first()
+        instance = get_master_by_code(master_data_models.CustomerGroup3Master, code)
     elif group == "customerGroup4":
-        instance = master_data_models.CustomerGroup4Master.objects.filter(
-            code=code
-        ).first()
+        instance = get_master_by_code(master_data_models.CustomerGroup4Master, code)
     return instance or None
 
 
 def get_customer_group1_id_from_code(code):
     if not code:
         return None
-    instance = master_data_models.CustomerGroup1Master.objects.filter(code=code).first()
+    instance = get_master_by_code(master_data_models.CustomerGroup1Master, code)
     return instance or None
 
 
@@ -1613,16 +1600,14 @@ def get_sales_office_group_id_from_code(code):
 def get_currency_id_from_code(code):
     if not code:
         return None
-    instance = sap_migration_models.CurrencyMaster.objects.filter(code=code).first()
+    instance = get_master_by_code(sap_migration_models.CurrencyMaster, code)
     return instance or None
 
 
 def get_sold_to_id_from_sold_to_code(sold_to_code):
     if not sold_to_code:
         return None
-    instance = master_data_models.SoldToMaster.objects.filter(
-        sold_to_code=sold_to_code
-    ).first()
+    instance = get_master_by_code(master_data_models.SoldToMaster, sold_to_code)
     return instance or None
 
 
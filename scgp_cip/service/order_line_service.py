@@ -9,6 +9,12 @@ from django.utils import timezone
 from common.cp.cp_helper import filter_cp_order_line, is_cp_planning_required
 from common.cp.cp_service import prepare_cp_order_line_using_cp_item_messages
 from common.enum import EorderingItemStatusEN, EorderingItemStatusTH
+from sap_master_data.selling_profiles import (
+    get_bom_components,
+    get_sale_texts,
+    get_selling_profile,
+    get_selling_profiles,
+)
 from sap_migration import models as sap_migration_models
 from sap_migration.graphql.enums import OrderType
 from sap_migration.models import OrderLines, OrderOtcPartnerAddress
@@ -34,15 +40,10 @@ from scgp_cip.common.enum import (
 from scgp_cip.dao.order.order_otc_partner_address_repo import OrderOtcPartnerAddressRepo
 from scgp_cip.dao.order.order_repo import OrderRepo
 from scgp_cip.dao.order.sold_to_master_repo import SoldToMasterRepo
-from scgp_cip.dao.order_line.bom_material_repo import BomMaterialRepo
 from scgp_cip.dao.order_line.conversion2master_repo import Conversion2MasterRepo
 from scgp_cip.dao.order_line.material_master_repo import MaterialMasterRepo
-from scgp_cip.dao.order_line.material_sale_master_repo import MaterialSaleMasterRepo
 from scgp_cip.dao.order_line.order_line_repo import OrderLineRepo
 from scgp_cip.dao.order_line.sold_to_channel_master_repo import SoldToChannelMasterRepo
-from scgp_cip.dao.order_line.sold_to_material_master_repo import (
-    SoldToMaterialMasterRepo,
-)
 from scgp_cip.dao.order_line_cp.order_line_cp_repo import OrderLineCpRepo
 from scgp_cip.service.change_order_service import (
     change_order_update,
@@ -95,6 +96,119 @@ def add_order_line(request):
         raise ImproperlyConfigured(e)
 
 
+@transaction.atomic
+def add_order_lines(order_id, material_codes):
+    """
+    Add a line, with its BOM children, for every material of `material_codes`
+    after the last line of the order. Master data of all the materials is read
+    at once and the lines are inserted in bulk.
+    @return: created order lines, errors of the materials which were not added
+    """
+    try:
+        order = OrderRepo.get_order_by_id(order_id)
+        validate_order(order)
+        sold_to_channel_master = get_sold_to_channel_master(order)
+        sales_org_code = order.sales_organization.code
+        distribution_channel_code = order.distribution_channel.code
+        profiles = get_selling_profiles(
+            material_codes, sales_org_code, distribution_channel_code
+        )
+        today = timezone.now().date()
+        bom_components = {
+            material_code: get_bom_components(profile, today)
+            for material_code, profile in profiles.items()
+            if profile.item_category_group == BOM_ITEM_CATEGORY_GROUP
+        }
+        child_codes = {
+            component["material_code"]
+            for components in bom_components.values()
+            for component in components
+        }
+        child_profiles = get_selling_profiles(
+            child_codes, sales_org_code, distribution_channel_code
+        )
+        # materials without a profile, to tell which master data is missing
+        sap_materials = MaterialMasterRepo.get_materials_by_code_distinct_material_code(
+            (set(material_codes) - set(profiles)) | (child_codes - set(child_profiles))
+        )
+        sold_to = SoldToMasterRepo.get_sold_to_data(order.sold_to.sold_to_code)
+
+        errors = []
+        order_lines = []
+        bom_order_lines = []
+        item_no = OrderLineRepo.get_latest_item_no(order_id)
+        for material_code in material_codes:
+            error = get_add_order_line_error(
+                material_code, profiles, bom_components, child_profiles, sap_materials
+            )
+            if error:
+                errors.append({"material_code": material_code, "message": error})
+                continue
+            order_line = construct_order_line_object(
+                material_code,
+                order,
+                sold_to_channel_master,
+                selling_profile=profiles[material_code],
+                sold_to=sold_to,
+            )
+            item_no += 10
+            order_line.item_no = item_no
+            order_lines.append(order_line)
+            if not order_line.bom_flag:
+                continue
+            for component in bom_components[material_code]:
+                order_line_bom = construct_order_line_object(
+                    component["material_code"],
+                    order,
+                    sold_to_channel_master,
+                    selling_profile=child_profiles[component["material_code"]],
+                    sold_to=sold_to,
+                )
+                order_line_bom.bom_flag = True
+                item_no += 10
+                order_line_bom.item_no = item_no
+                bom_order_lines.append((order_line, order_line_bom))
+
+        OrderLineRepo.save_order_line_bulk(order_lines)
+        # parents have their id once inserted
+        for order_line, order_line_bom in bom_order_lines:
+            order_line_bom.parent = order_line
+        OrderLineRepo.save_order_line_bulk(
+            [order_line_bom for _, order_line_bom in bom_order_lines]
+        )
+        created_order_lines = order_lines + [
+            order_line_bom for _, order_line_bom in bom_order_lines
+        ]
+        created_order_lines.sort(key=lambda order_line: order_line.item_no)
+        return created_order_lines, errors
+    except Exception as e:
+        transaction.set_rollback(True)
+        if isinstance(e, ValidationError):
+            raise e
+        raise ImproperlyConfigured(e)
+
+
+def get_add_order_line_error(
+    material_code, profiles, bom_components, child_profiles, sap_materials
+):
+    """Reason why a line of the material can't be added, same as add_order_line"""
+    if material_code not in profiles:
+        if material_code not in sap_materials:
+            return "Material not found in SAP Master"
+        return "Material not found in sale master"
+    if material_code not in bom_components:
+        return None
+    if not bom_components[material_code]:
+        return "BOM child not found!"
+    for component in bom_components[material_code]:
+        if component["material_code"] in child_profiles:
+            continue
+        if component["material_code"] not in sap_materials:
+            return "Material not found in SAP Master"
+        return "Material not found in sale master"
+    return None
+
+
 def update_item_no(order_lines, item_no):
     for item in order_lines:
         item.item_no = item_no
@@ -180,67 +294,53 @@ def get_sold_to_channel_master(order):
     )
 
 
-def construct_order_line_object(material_code, order, sold_to_channel_master):
-    product_material = MaterialMasterRepo.get_material_by_material_code(material_code)
-    if not product_material:
-        raise ValidationError("Material not found in SAP Master")
-    material_sale_master = (
-        MaterialSaleMasterRepo.get_material_sale_master_by_material_code(
-            material_code,
-            order.sales_organization.code,
-            order.distribution_channel.code,
+def construct_order_line_object(
+    material_code, order, sold_to_channel_master, selling_profile=None, sold_to=None
+):
+    sales_org_code = order.sales_organization.code
+    distribution_channel_code = order.distribution_channel.code
+    if selling_profile is None:
+        selling_profile = get_selling_profile(
+            material_code, sales_org_code, distribution_channel_code
         )
-    )
-    if not material_sale_master:
+    if not selling_profile:
+        if not MaterialMasterRepo.get_material_by_material_code(material_code):
+            raise ValidationError("Material not found in SAP Master")
         raise ValidationError("Material not found in sale master")
     plant_code = (
-        material_sale_master.delivery_plant
-        if MaterialTypes.SERVICE_MATERIAL.value == product_material.material_type
+        selling_profile.delivery_plant
+        if MaterialTypes.SERVICE_MATERIAL.value == selling_profile.material_type
         else None
     )
-    sales_unit = material_sale_master.sales_unit or product_material.base_unit
-    sold_to_material = SoldToMaterialMasterRepo.get_sold_to_material_by_material_code(
-        material_code
-    )
-    conversion_master = (
-        Conversion2MasterRepo.get_conversion_by_material_code_and_tounit(
-            material_code, sales_unit
-        )
+    sales_unit = selling_profile.sales_unit
+    if sold_to is None:
+        sold_to = SoldToMasterRepo.get_sold_to_data(order.sold_to.sold_to_code)
+    sale_text1, sale_text2, sale_text3, sale_text4 = get_sale_texts(
+        selling_profile, sold_to.language
     )
-    language = SoldToMasterRepo.get_sold_to_data(order.sold_to.sold_to_code).language
     order_line = sap_migration_models.OrderLines(
         order_id=order.id,
-        material_id=product_material.id,
+        material_id=selling_profile.material_id,
         material_code=material_code,
-        customer_mat_35=sold_to_material.sold_to_material_code
-        if sold_to_material
-        else None,
+        customer_mat_35=selling_profile.customer_material_code,
         production_flag=ProductionFlag.PRODUCED.value,
         payment_term_item=order.payment_term,
         sales_unit=sales_unit,
         plant=plant_code,
         type=OrderType.DOMESTIC.value,
-        prc_group_1=material_sale_master.material_group1,
+        prc_group_1=selling_profile.material_group1,
         request_date=order.request_date,
-        weight_unit=conversion_master and conversion_master.from_unit or sales_unit,
-        weight=conversion_master and conversion_master.calculation or 1,
-        sale_text1=material_sale_master.sale_text1_en
-        if language == "E"
-        else material_sale_master.sale_text1_th,
-        sale_text2=material_sale_master.sale_text2_en
-        if language == "E"
-        else material_sale_master.sale_text2_th,
-        sale_text3=material_sale_master.sale_text3_en
-        if language == "E"
-        else material_sale_master.sale_text3_th,
-        sale_text4=material_sale_master.sale_text4_en
-        if language == "E"
-        else material_sale_master.sale_text4_th,
+        weight_unit=selling_profile.weight_unit or sales_unit,
+        weight=selling_profile.weight or 1,
+        sale_text1=sale_text1,
+        sale_text2=sale_text2,
+        sale_text3=sale_text3,
+        sale_text4=sale_text4,
     )
-    if material_sale_master.item_category_group == BOM_ITEM_CATEGORY_GROUP:
+    if selling_profile.item_category_group == BOM_ITEM_CATEGORY_GROUP:
         order_line.bom_flag = True
         order_line.weight = 0
-        order_line.weight_unit = product_material.weight_unit
+        order_line.weight_unit = selling_profile.material_weight_unit
     if sold_to_channel_master:
         order_line.price_currency = sold_to_channel_master.currency
         order_line.delivery_tol_over = sold_to_channel_master.over_delivery_tol
@@ -252,16 +352,28 @@ def construct_order_line_object(material_code, order, sold_to_channel_master):
 
 def get_bom_order_lines(order_line, order, sold_to_channel_master):
     bom_order_lines = []
-    bom_materials = BomMaterialRepo.get_bom_mat_by_parent_material_code_and_date(
-        order_line.material_code, timezone.now().date()
+    parent_profile = get_selling_profile(
+        order_line.material_code,
+        order.sales_organization.code,
+        order.distribution_channel.code,
+    )
+    bom_components = parent_profile and get_bom_components(
+        parent_profile, timezone.now().date()
     )
-    if not bom_materials:
+    if not bom_components:
         raise ValidationError("BOM child not found!")
-    for bom_material in bom_materials:
+    child_profiles = get_selling_profiles(
+        [component["material_code"] for component in bom_components],
+        order.sales_organization.code,
+        order.distribution_channel.code,
+    )
+    for component in bom_components:
+        material_code = component["material_code"]
         order_line_bom = construct_order_line_object(
-            bom_material.material_code,
+            material_code,
             order,
             sold_to_channel_master,
+            selling_profile=child_profiles.get(material_code),
         )
         order_line_bom.bom_flag = True
         order_line_bom.parent = order_line
@@ -17,6 +17,7 @@ from scg_checkout.graphql.implementations.iplan import (
     get_external_emails_by_config,
     get_sold_to_no_name,
 )
+from scg_checkout.notifications import get_batch_recipients
 from scgp_cip.dao.order.order_repo import OrderRepo
 from scgp_cip.dao.order_line.order_line_repo import OrderLineRepo
 from scgp_cip.graphql.order.resolves.orders import resolve_preview_domestic_page_order
@@ -79,9 +80,9 @@ def generate_pdf_file(info, order_id):
     )
 
 
-def send_mail_customer_create_order_cp(info, order, user, partner_emails=None):
+def send_mail_customer_create_order_cp(order, manager, user, partner_emails=None):
     try:
-        details = resolve_preview_domestic_page_order(info, order.id)
+        details = resolve_preview_domestic_page_order(None, order.id)
         order_header_data = details.get("preview_header_data")
         sales_organization = order_header_data["sale_organization"]
         sold_to_code = order.sold_to.sold_to_code
@@ -109,39 +110,75 @@ def send_mail_customer_create_order_cp(info, order, user, partner_emails=None):
             order, partner_emails, sold_to_code, user
         )
         subject = f"{sales_organization.short_name} Order submitted : {sold_to_code} {get_sold_to_no_name(sold_to_code, return_only_name=True)}"
-        send_mail_to_customer(
-            info, order.so_no, mail_to, cc_list, subject, content, True
+        send_order_confirmation_email(
+            manager, order.so_no, mail_to, cc_list, subject, content, True
         )
-
+        return mail_to, cc_list
     except Exception as e:
         raise ValueError(e)
 
 
+def send_create_order_cip_notification(notification, manager):
+    """Sender of OrderNotificationKind.CREATE_ORDER_CIP, see scg_checkout.notifications"""
+    return send_mail_customer_create_order_cp(
+        notification.order,
+        manager,
+        notification.created_by,
+        partner_emails=notification.payload.get("partner_emails"),
+    )
+
+
 def prepare_mail_to_cc_create_order(order, partner_emails, sold_to_code, user):
     order_lines_db = OrderLineRepo.find_all_order_line_by_order(order)
     product_group = [order_line.material_group2 for order_line in order_lines_db][0]
 
-    internal_emails = get_internal_emails_by_config(
-        EmailConfigurationFeatureChoices.CREATE_ORDER,
-        order.sales_organization.code,
-        product_group,
-        CIP_BU,
+    internal_emails = get_batch_recipients(
+        (
+            "internal",
+            EmailConfigurationFeatureChoices.CREATE_ORDER,
+            order.sales_organization.code,
+            str(product_group),
+            str(CIP_BU),
+        ),
+        lambda: get_internal_emails_by_config(
+            EmailConfigurationFeatureChoices.CREATE_ORDER,
+            order.sales_organization.code,
+            product_group,
+            CIP_BU,
+        ),
     )
-    external_email_to_list, external_cc_to_list = get_external_emails_by_config(
-        EmailConfigurationFeatureChoices.CREATE_ORDER,
-        sold_to_code,
-        product_group,
+    external_email_to_list, external_cc_to_list = get_batch_recipients(
+        (
+            "external",
+            EmailConfigurationFeatureChoices.CREATE_ORDER,
+            sold_to_code,
+            str(product_group),
+        ),
+        lambda: get_external_emails_by_config(
+            EmailConfigurationFeatureChoices.CREATE_ORDER,
+            sold_to_code,
+            product_group,
+        ),
     )
     if partner_emails is None:
         partner_emails = []
-    mail_to = list(set(external_email_to_list + [user.email]))
+    mail_to = list(set(external_email_to_list + ([user.email] if user else [])))
     cc_list = list(set(partner_emails + internal_emails + external_cc_to_list))
     return cc_list, mail_to
 
 
 def send_mail_to_customer(info, so_no, to, cc, subject, content, order_screen=False):
+    manager = info.context.manager = info.context.plugins
+    send_order_confirmation_email(
+        manager, so_no, to, cc, subject, content, order_screen
+    )
+
+
+def send_order_confirmation_email(
+    manager, so_no, to, cc, subject, content, order_screen=False
+):
     try:
-        pdf = generate_pdf_file(info, so_no)
+        pdf = generate_pdf_file(None, so_no)
         pdf_generated_date = (
             timezone.now().astimezone(pytz.timezone("Asia/Bangkok")).strftime("%d%m%Y")
         )
@@ -151,7 +188,6 @@ def send_mail_to_customer(info, so_no, to, cc, subject, content, order_screen=Fa
         else:
             file_name = f"Orders_{so_no}_{pdf_generated_date}"
 
-        manager = info.context.manager = info.context.plugins
         manager.scgp_send_order_confirmation_email(
             "scg.email",
             recipient_list=to,
@@ -0,0 +1,118 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from sap_master_data.models import (
+    BomMaterial,
+    DistributionChannelMaster,
+    MaterialMaster,
+    MaterialSaleMaster,
+    SalesOrganizationMaster,
+    SoldToMaster,
+)
+from sap_master_data.selling_profiles import refresh_selling_profiles
+from sap_migration.models import Order, OrderLines
+from scgp_cip.service.order_line_service import add_order_lines
+
+MATERIAL_CODES = ["MAT-001", "MAT-002", "MAT-003", "MAT-004"]
+
+
+def create_material(material_code, **sale_master_fields):
+    MaterialMaster.objects.create(material_code=material_code, base_unit="ROL")
+    MaterialSaleMaster.objects.create(
+        material_code=material_code,
+        sales_organization_code="0750",
+        distribution_channel_code="10",
+        **sale_master_fields,
+    )
+
+
+def create_bom(parent_material_code, *child_material_codes):
+    create_material(parent_material_code, item_category_group="LUMF")
+    today = datetime.date.today()
+    for item_number, child_material_code in enumerate(child_material_codes, 1):
+        BomMaterial.objects.create(
+            parent_material_code=parent_material_code,
+            item_number=str(item_number * 10),
+            material_code=child_material_code,
+            quantity=1,
+            unit="ROL",
+            valid_from=today - datetime.timedelta(days=1),
+            valid_to=today + datetime.timedelta(days=1),
+        )
+
+
+@pytest.fixture
+def cip_order(db):
+    sold_to = SoldToMaster.objects.create(sold_to_code="0000000001", language="E")
+    order = Order.objects.create(
+        sold_to=sold_to,
+        sales_organization=SalesOrganizationMaster.objects.create(code="0750"),
+        distribution_channel=DistributionChannelMaster.objects.create(code="10"),
+    )
+    OrderLines.objects.create(order=order, item_no="10", material_code="OLD-001")
+    return order
+
+
+@pytest.fixture
+def cip_materials(db):
+    for material_code in MATERIAL_CODES:
+        create_material(material_code)
+    create_material("CHILD-001")
+    create_bom("BOM-001", "CHILD-001")
+    refresh_selling_profiles(MATERIAL_CODES + ["CHILD-001", "BOM-001"])
+
+
+def test_add_order_lines_numbers_lines_after_existing_lines(cip_order, cip_materials):
+    order_lines, errors = add_order_lines(cip_order.id, ["BOM-001", "MAT-001"])
+
+    assert errors == []
+    assert [
+        (int(order_line.item_no), order_line.material_code)
+        for order_line in order_lines
+    ] == [(20, "BOM-001"), (30, "CHILD-001"), (40, "MAT-001")]
+    parent, child, _ = (
+        OrderLines.all_objects.get(order=cip_order, material_code=material_code)
+        for material_code in ["BOM-001", "CHILD-001", "MAT-001"]
+    )
+    assert parent.bom_flag and parent.parent_id is None
+    assert child.bom_flag and child.parent_id == parent.id
+
+
+def test_add_order_lines_material_errors(cip_order, cip_materials):
+    MaterialMaster.objects.create(material_code="NO-SALE-001")
+    create_bom("BOM-002")
+    create_bom("BOM-003", "NO-SALE-001")
+    create_bom("BOM-004", "NO-SAP-001")
+
+    order_lines, errors = add_order_lines(
+        cip_order.id,
+        ["NO-SAP-001", "NO-SALE-001", "BOM-002", "BOM-003", "BOM-004", "MAT-001"],
+    )
+
+    assert [order_line.material_code for order_line in order_lines] == ["MAT-001"]
+    assert int(order_lines[0].item_no) == 20
+    assert errors == [
+        {"material_code": "NO-SAP-001", "message": "Material not found in SAP Master"},
+        {
+            "material_code": "NO-SALE-001",
+            "message": "Material not found in sale master",
+        },
+        {"material_code": "BOM-002", "message": "BOM child not found!"},
+        {"material_code": "BOM-003", "message": "Material not found in sale master"},
+        {"material_code": "BOM-004", "message": "Material not found in SAP Master"},
+    ]
+
+
+def test_add_order_lines_query_count_does_not_depend_on_materials(
+    cip_order, cip_materials
+):
+    with CaptureQueriesContext(connection) as one_material:
+        add_order_lines(cip_order.id, MATERIAL_CODES[:1])
+    with CaptureQueriesContext(connection) as many_materials:
+        add_order_lines(cip_order.id, MATERIAL_CODES[1:])
+
+    assert len(many_materials) == len(one_material)
+    assert OrderLines.all_objects.filter(order=cip_order).count() == 5
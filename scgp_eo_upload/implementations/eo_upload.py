@@ -11,6 +11,7 @@ from django.utils import timezone
 import saleor.account.models
 from common.helpers import update_instance_fields
 from common.newrelic_metric import add_metric_process_order
+from common.sap.response_cache import make_payload_hash
 from saleor.order import OrderStatus
 from saleor.plugins.manager import get_plugins_manager
 from sap_migration import models
@@ -46,6 +47,7 @@ from scg_checkout.graphql.implementations.iplan import (
 from scg_checkout.graphql.resolves.contracts import (
     call_sap_api_get_contracts_export_pis,
     get_data_from_order_text_list,
+    is_contract_payload_unchanged,
     sync_contract_material,
     sync_contract_sale_detail,
     sync_lang_from_order_text_list_or_db,
@@ -912,7 +914,9 @@ def eo_upload_sync_contract(contract_id=None, contract_no=None, es26_response=No
         contract_no = contract_no or contract.code
     except Contract.DoesNotExist:
         pass
-    contract, response = call_sap_api_get_contracts_export_pis(contract_no)
+    contract, response = call_sap_api_get_contracts_export_pis(
+        contract_no, unchanged_flow="contract"
+    )
     currency = ""
 
     try:
@@ -921,6 +925,13 @@ def eo_upload_sync_contract(contract_id=None, contract_no=None, es26_response=No
             return list()
 
         response_data = response_data[0]
+        if is_contract_payload_unchanged(
+            contract, "contract", make_payload_hash(response_data)
+        ):
+            # already synced from the same ES14 data by sync_contract_material
+            if es26_response:
+                es26_response["contractItem"] = response_data.get("contractItem", [])
+            return contract
 
         # Save payment term code for contract
         update_instance_fields(
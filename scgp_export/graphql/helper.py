@@ -113,7 +113,10 @@ def handle_order_lines_from_es26(order, es26_response, is_created=None):
     if not list_contract_material_code:
         raise Exception("This order is not ref contract")
     if is_created:
-        sync_contract_material(contract_no=list_contract_material_code[0], es26_response=es26_response)
+        # remaining quantities of the contract changed with the new order
+        sync_contract_material(
+            contract_no=list_contract_material_code[0], es26_response=es26_response, bypass_cache=True
+        )
     mapping_material_variant_code_with_material_variant_id = sap_migration_models.MaterialVariantMaster.objects.filter(
         code__in=list_material_code).all()
     mapping_contract_material_code_with_contract_material = sap_migration_models.ContractMaterial.objects.filter(
@@ -429,7 +432,8 @@ def create_or_update_order(es26_response):
                 _order_from_es26["createDate"],
                 date_format_es26).strftime(date_format_to_database)
             if order.contract is None:
-                sync_contract_material(contract_no=contract_no, es26_response=es26_response, is_create=True)
+                sync_contract_material(contract_no=contract_no, es26_response=es26_response, is_create=True,
+                                       bypass_cache=True)
                 order.contract = get_contract_id_from_contract_no(contract_no)
                 order.sold_to = get_sold_to_id_from_contract_no(contract_no)
             order.save()
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+from enum import Enum
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+
+
+class CountMode(str, Enum):
+    # COUNT(*) on every page
+    EXACT = "exact"
+    # exact count, cached for CONNECTION_COUNT_CACHE_TTL by the query it counts
+    CACHED = "cached"
+    # exact count up to CONNECTION_COUNT_CAP, the cap ("10,000+") above it, cached
+    CAPPED = "capped"
+    # planner estimate above CONNECTION_COUNT_CAP, capped count below it, cached
+    ESTIMATE = "estimate"
+
+
+class ConnectionCount(NamedTuple):
+    value: int
+    is_exact: bool
+
+
+def count_queryset(qs: QuerySet, mode: Optional[CountMode] = None) -> ConnectionCount:
+    """Total count of a connection queryset, computed as `mode` says.
+
+    Defaults to `settings.CONNECTION_COUNT_MODE`. Every mode but EXACT caches
+    the count by a hash of the counted SQL, so the next pages of the same
+    listing (same filters, other cursor) do not count again.
+    """
+    mode = CountMode(mode or settings.CONNECTION_COUNT_MODE)
+    if mode == CountMode.EXACT:
+        return ConnectionCount(qs.count(), True)
+
+    cache_key = _get_cache_key(qs, mode)
+    if cache_key:
+        cached_count = cache.get(cache_key)
+        if cached_count is not None:
+            return ConnectionCount(*cached_count)
+    count = _count(qs, mode)
+    if cache_key:
+        cache.set(cache_key, tuple(count), timeout=settings.CONNECTION_COUNT_CACHE_TTL)
+    return count
+
+
+def estimate_count(qs: QuerySet) -> Optional[int]:
+    """Row count the planner expects for `qs`, None when it can't be explained"""
+    try:
+        sql, params = qs.order_by().query.sql_with_params()
+        with connections[qs.db].cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+    except EmptyResultSet:
+        return None
+    except DatabaseError as e:
+        logging.warning(f"[Connection count] could not estimate count: {e}")
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _count(qs: QuerySet, mode: CountMode) -> ConnectionCount:
+    if mode == CountMode.CACHED:
+        return ConnectionCount(qs.count(), True)
+    cap = settings.CONNECTION_COUNT_CAP
+    if mode == CountMode.ESTIMATE:
+        estimate = estimate_count(qs)
+        if estimate is not None and estimate > cap:
+            return ConnectionCount(estimate, False)
+    count = qs.order_by()[: cap + 1].count()
+    if count > cap:
+        return ConnectionCount(cap, False)
+    return ConnectionCount(count, True)
+
+
+def _get_cache_key(qs: QuerySet, mode: CountMode) -> Optional[str]:
+    try:
+        sql, params = qs.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    query_hash = hashlib.sha1(
+        json.dumps([qs.db, sql, params], default=str).encode("utf-8")
+    ).hexdigest()
+    return f"connection_count:{mode.value}:{query_hash}"
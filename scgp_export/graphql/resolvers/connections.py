@@ -24,6 +24,7 @@ from django.db.models import QuerySet, Q
 from graphene.relay import Connection
 
 from saleor.graphql.core.types import SortInputObjectType
+from scgp_export.graphql.resolvers.connection_counts import CountMode, count_queryset
 from saleor.graphql.utils.sorting import (
     REVERSED_DIRECTION,
     _sort_queryset_by_attribute,
@@ -36,27 +37,15 @@ def resolve_connection_slice(
         info,
         kwargs,
         connection_type: Any = Connection,
+        count_mode: Optional[CountMode] = None,
 ):
-    response = create_connection_slice(qs, info, kwargs, connection_type)
-
-    before = kwargs.get("before")
-    first = kwargs.get("first")
-    last = kwargs.get("last")
-
-    requested_count = first or last
-    total_count = response.total_count()
-
-    if last and not before:
-        latest_page_item_number = None
-    else:
-        total_page = (total_count + requested_count - 1) // requested_count
-        if total_page > 1:
-            latest_page_item_number = total_count % requested_count if total_count % requested_count != 0 else requested_count
-        else:
-            latest_page_item_number = total_count
-    response.latest_page_item_number = latest_page_item_number
+    """Connection slice with `latest_page_item_number`.
 
-    return response
+    The total count is computed as `count_mode` says (settings.CONNECTION_COUNT_MODE
+    by default), see `count_queryset`.
+    """
+    response = create_connection_slice(qs, info, kwargs, connection_type)
+    return set_connection_total_count(response, qs, kwargs, count_mode)
 
 
 def resolve_connection_slice_for_overdue(
@@ -64,17 +53,32 @@ def resolve_connection_slice_for_overdue(
         info,
         kwargs,
         connection_type: Any = Connection,
+        count_mode: Optional[CountMode] = None,
 ):
     response = create_connection_slice_for_overdue(qs, info, kwargs, connection_type)
+    return set_connection_total_count(response, qs, kwargs, count_mode)
+
 
+def set_connection_total_count(response, qs, kwargs, count_mode: Optional[CountMode] = None):
     before = kwargs.get("before")
     first = kwargs.get("first")
     last = kwargs.get("last")
 
     requested_count = first or last
-    total_count = response.total_count()
-
-    if last and not before:
+    if isinstance(qs, ChannelQsContext):
+        qs = qs.qs
+    if isinstance(qs, QuerySet):
+        total_count, is_exact = count_queryset(qs, count_mode)
+    else:
+        total_count = response.total_count
+        if callable(total_count):
+            total_count = total_count()
+        is_exact = True
+    response.total_count = total_count
+    response.total_count_is_exact = is_exact
+
+    if (last and not before) or not is_exact:
+        # the last page is unknown when the total count is capped or estimated
         latest_page_item_number = None
     else:
         total_page = (total_count + requested_count - 1) // requested_count
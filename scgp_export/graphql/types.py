@@ -11,6 +11,7 @@ from saleor.graphql.core.fields import (
 )
 from saleor.graphql.core.types import ModelObjectType
 from saleor.graphql.core.connection import CountableConnection
+from sap_master_data.cache import get_master_by_code
 from sap_migration.graphql.types import (
     SapContract,
     SalesOrganizationMaster,
@@ -75,6 +76,9 @@ from scgp_user_management.graphql.types import ScgpUser
 
 class ScgCountableConnection(CountableConnection):
     latest_page_item_number = graphene.Int(description="Item in last page.")
+    total_count_is_exact = graphene.Boolean(
+        description="False when totalCount is capped or estimated."
+    )
 
     class Meta:
         abstract = True
@@ -511,6 +515,9 @@ class ExportCartItem(ModelObjectType):
 
 class ScgCountableConnection(CountableConnection):
     latest_page_item_number = graphene.Int(description="Item in last page.")
+    total_count_is_exact = graphene.Boolean(
+        description="False when totalCount is capped or estimated."
+    )
 
     class Meta:
         abstract = True
@@ -788,25 +795,25 @@ class ExportOrderAllItemBySoNo(graphene.ObjectType):
     @staticmethod
     def resolve_sales_org(root, info):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'salesOrg')
-        sales_org = sap_master_models.SalesOrganizationMaster.objects.filter(code=code).first()
+        sales_org = get_master_by_code(sap_master_models.SalesOrganizationMaster, code)
         return f"{sales_org.code} - {sales_org.short_name}" if sales_org else ""
 
     @staticmethod
     def resolve_sales_org_name(root, info, **kwargs):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'salesOrg')
-        sales_org = sap_master_models.SalesOrganizationMaster.objects.filter(code=code).first()
+        sales_org = get_master_by_code(sap_master_models.SalesOrganizationMaster, code)
         return sales_org.name if sales_org else ""
 
     @staticmethod
     def resolve_distribution_channel(root, info, **kwargs):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'distributionChannel')
-        distribution_channel = sap_master_models.DistributionChannelMaster.objects.filter(code=code).first()
+        distribution_channel = get_master_by_code(sap_master_models.DistributionChannelMaster, code)
         return f"{distribution_channel.code} - {distribution_channel.name}" if distribution_channel else ""
 
     @staticmethod
     def resolve_division(root, info):
         div_code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'division')
-        division = sap_master_models.DivisionMaster.objects.filter(code=div_code).first()
+        division = get_master_by_code(sap_master_models.DivisionMaster, div_code)
         return f"{division.code} - {division.name}" if division else ""
 
     @staticmethod
@@ -828,7 +835,7 @@ class ExportOrderAllItemBySoNo(graphene.ObjectType):
     @staticmethod
     def resolve_sales_group_name(root, info, **kwargs):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'salesGroup')
-        sales_group = sap_master_models.SalesGroup.objects.filter(sales_group_code=code).first()
+        sales_group = get_master_by_code(sap_master_models.SalesGroup, code)
         return sales_group.sales_group_description if sales_group else ""
 
     @staticmethod
@@ -855,7 +862,7 @@ class ExportOrderAllItemBySoNo(graphene.ObjectType):
     @staticmethod
     def resolve_incoterms_1_name(root, info, **kwargs):
         code = from_api_response_es26_to_change_order(info, 'orderHeaderIn', 'incoterms1')
-        incoterms_1 = sap_master_models.Incoterms1Master.objects.filter(code=code).first()
+        incoterms_1 = get_master_by_code(sap_master_models.Incoterms1Master, code)
         return incoterms_1.description if incoterms_1 else ""
 
     @staticmethod
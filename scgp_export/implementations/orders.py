@@ -109,6 +109,7 @@ from scgp_export.implementations.sap import get_web_user_name
 from scgp_export.sns_helper.sns_connect import setup_client_sns
 from scgp_po_upload.graphql.helpers import html_to_pdf
 from scgp_po_upload.models import PoUploadFileLog
+from scgp_record_cleanup.implementation.purge import purge
 from scgp_require_attention_items.graphql.helper import (
     update_attention_type_r1,
     update_attention_type_r3,
@@ -1942,27 +1943,23 @@ def create_export_order_lines(order, order_lines_data):
     return order_lines
 
 
-@transaction.atomic
 def delete_all_export_order_drafts():
-    try:
-        order_ids = Order.objects.filter(status="draft").values_list("id")
-        order_line_ids = OrderLines.objects.filter(order_id__in=order_ids).values_list(
-            "id"
-        )
-
-        RequireAttention.objects.filter(
-            items__order_line_id__in=order_line_ids, items__type="export"
-        ).delete()
-        RequireAttentionIPlan.objects.filter(
-            items__order_line_id__in=order_line_ids, items__type="export"
-        ).delete()
+    """Delete draft orders with their lines, by batches committed one by one"""
+    return purge(
+        "export order drafts",
+        Order.objects.filter(status="draft"),
+        before_delete=delete_export_require_attentions,
+    )
 
-        OrderLines.objects.filter(pk__in=order_line_ids).delete()
 
-        return Order.objects.filter(pk__in=order_ids).delete()
-    except Exception as ex:
-        transaction.set_rollback(True)
-        raise ImproperlyConfigured(ex)
+def delete_export_require_attentions(order_ids):
+    order_line_ids = OrderLines.objects.filter(order_id__in=order_ids).values_list("id")
+    RequireAttention.objects.filter(
+        items__order_line_id__in=order_line_ids, items__type="export"
+    ).delete()
+    RequireAttentionIPlan.objects.filter(
+        items__order_line_id__in=order_line_ids, items__type="export"
+    ).delete()
 
 
 @transaction.atomic
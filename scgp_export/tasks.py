@@ -26,6 +26,7 @@ from scgp_eo_upload.constants import (
 from scgp_eo_upload.models import EoUploadLog, EoUploadLogOrderType
 from scgp_export.implementations.orders import delete_all_export_order_drafts
 from scgp_export.models import EOUploadSendMailSummaryLog
+from scgp_record_cleanup.implementation.purge import raise_on_purge_errors
 from scgp_user_management.models import EmailConfigurationFeatureChoices
 
 task_logger = get_task_logger(__name__)
@@ -35,8 +36,8 @@ task_logger = get_task_logger(__name__)
 def remove_all_export_order_drafts():
     task_logger.info("Starting cron remove all export order drafts")
     try:
-        delete_all_export_order_drafts()
-        task_logger.info("Task finished!")
+        stats = raise_on_purge_errors(delete_all_export_order_drafts())
+        task_logger.info(f"Task finished! {stats}")
     except Exception as ex:
         task_logger.error(str(ex))
         raise ex
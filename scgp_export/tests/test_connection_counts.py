@@ -0,0 +1,61 @@
+import pytest
+from django.core.cache import cache
+
+from scgp_export.graphql.resolvers.connection_counts import (
+    ConnectionCount,
+    CountMode,
+    count_queryset,
+)
+from scgp_export.models import ExportSoldTo
+
+
+@pytest.fixture(autouse=True)
+def clear_count_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_count_queryset_exact(scgp_export_sold_tos):
+    qs = ExportSoldTo.objects.all()
+    assert count_queryset(qs, CountMode.EXACT) == ConnectionCount(3, True)
+    ExportSoldTo.objects.filter(code="sold_to_3").delete()
+    assert count_queryset(qs, CountMode.EXACT) == ConnectionCount(2, True)
+
+
+def test_count_queryset_cached_by_query(scgp_export_sold_tos):
+    qs = ExportSoldTo.objects.order_by("code")
+    assert count_queryset(qs, CountMode.CACHED) == ConnectionCount(3, True)
+    ExportSoldTo.objects.filter(code="sold_to_3").delete()
+
+    # the next page of the same listing reuses the count, ordering aside
+    assert count_queryset(qs.order_by("-pk"), CountMode.CACHED) == ConnectionCount(
+        3, True
+    )
+    # other filters are counted again
+    assert count_queryset(
+        qs.filter(code__startswith="sold_to"), CountMode.CACHED
+    ) == ConnectionCount(2, True)
+
+
+def test_count_queryset_capped(scgp_export_sold_tos, settings):
+    settings.CONNECTION_COUNT_CAP = 2
+    assert count_queryset(ExportSoldTo.objects.all(), CountMode.CAPPED) == (
+        ConnectionCount(2, False)
+    )
+    assert count_queryset(
+        ExportSoldTo.objects.exclude(code="sold_to_3"), CountMode.CAPPED
+    ) == ConnectionCount(2, True)
+
+
+def test_count_queryset_estimate_small_result_is_exact(scgp_export_sold_tos, settings):
+    settings.CONNECTION_COUNT_CAP = 10000
+    assert count_queryset(
+        ExportSoldTo.objects.all(), CountMode.ESTIMATE
+    ) == ConnectionCount(3, True)
+
+
+def test_count_queryset_default_mode(scgp_export_sold_tos, settings):
+    settings.CONNECTION_COUNT_MODE = "capped"
+    settings.CONNECTION_COUNT_CAP = 1
+    assert count_queryset(ExportSoldTo.objects.all()) == ConnectionCount(1, False)
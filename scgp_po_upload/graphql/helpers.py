@@ -2,12 +2,26 @@ import json
 
 from django.template.loader import get_template
 
-from scg_checkout.graphql.implementations.weasyprint_custom import PdfGenerator
+from scg_checkout.graphql.implementations.weasyprint_custom import render_pdf, render_pdfs
 from scgp_po_upload.graphql.enums import IPlanAcknowledge, MessageErrorItem, BeingProcessConstants
 from sap_master_data.models import Conversion2Master
 
 
 def html_to_pdf(context_dict, header_html, content_html, mt="-90mm", mr="-10mm", orientation="portrait"):
+    return render_pdf(**_prepare_pdf_document(context_dict, header_html, content_html, mt, mr, orientation))
+
+
+def html_to_pdf_batch(context_dicts, header_html, content_html, mt="-90mm", mr="-10mm", orientation="portrait"):
+    """Same as html_to_pdf for many orders, rendered into one pdf"""
+    return render_pdfs(
+        [
+            _prepare_pdf_document(context_dict, header_html, content_html, mt, mr, orientation)
+            for context_dict in context_dicts
+        ]
+    )
+
+
+def _prepare_pdf_document(context_dict, header_html, content_html, mt, mr, orientation):
     remark = context_dict.get("remark_order_info", "")
     if remark:
         context_dict["remark_order_info"] = remark.splitlines()
@@ -17,8 +31,7 @@ def html_to_pdf(context_dict, header_html, content_html, mt="-90mm", mr="-10mm",
     header_render = header.render(context_dict)
     body = get_template(content_html)
     body_render = body.render(context_dict)
-    pdf = PdfGenerator(main_html=body_render, header_html=header_render, mt=mt, mr=mr, orientation=orientation)
-    return pdf.render_pdf()
+    return dict(main_html=body_render, header_html=header_render, mt=mt, mr=mr, orientation=orientation)
 
 
 def html_to_pdf_order_confirmation(context_dict, header_html, content_html, footer_html, mt="-80mm", mr="-10mm",
@@ -35,9 +48,8 @@ def html_to_pdf_order_confirmation(context_dict, header_html, content_html, foot
     body_render = body.render(context_dict)
     footer = get_template(footer_html)
     footer_render = footer.render(context_dict)
-    pdf = PdfGenerator(main_html=body_render, header_html=header_render, mt=mt, mr=mr, orientation=orientation,
-                       footer_html=footer_render)
-    return pdf.render_pdf()
+    return render_pdf(main_html=body_render, header_html=header_render, mt=mt, mr=mr, orientation=orientation,
+                      footer_html=footer_render)
 
 
 def get_i_plan_error_messages(i_plan_response):
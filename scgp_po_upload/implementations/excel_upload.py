@@ -9,7 +9,6 @@ from scgp_po_upload.graphql.enums import PoUploadType, SaveToSapStatus
 from scgp_po_upload.implementations.excel_upload_validation import (
     _validate_excel_upload_file,
 )
-from scgp_po_upload.implementations.po_upload import update_status_po_file_log
 from scgp_po_upload.models import PoUploadFileLog
 
 
@@ -43,7 +42,6 @@ def validate_excel_upload_file(
             f"[Excel Upload] validate_po_file: updated file log status id: '{file_log_instance.id}' status: '{file_log_instance.status}'"
         )
         write_to_queue(file_log_instance.id)
-        update_status_po_file_log(file_log_instance, SaveToSapStatus.UPLOAD_FILE)
         return orders, file_log_instance
     except ValidationError as e:
         raise e
@@ -73,7 +71,13 @@ def write_to_queue(file_log_instance_id):
         logging.info(f"[Excel Upload] sns_response: {sns_response}")
         if sns_response["ResponseMetadata"]["HTTPStatusCode"] != 200:
             raise ImproperlyConfigured(f"sns sent message failed: {sns_response}")
-        update_status_po_file_log(file_log_instance, SaveToSapStatus.IN_QUEUE)
+        # a worker may have claimed the file already, keep its status then
+        queued = PoUploadFileLog.objects.filter(
+            id=file_log_instance.id, status=SaveToSapStatus.UPLOAD_FILE
+        ).update(status=SaveToSapStatus.IN_QUEUE)
+        logging.info(
+            f"[Excel Upload] file log id: '{file_log_instance.id}' in queue: {bool(queued)}"
+        )
         return file_log_instance
     except PoUploadFileLog.DoesNotExist:
         raise ImproperlyConfigured(
@@ -14,8 +14,6 @@ from scg_checkout.graphql.enums import (
     ExcelUploadMapping,
     RealtimePartnerType,
 )
-from scgp_cip.dao.order_line.material_master_repo import MaterialMasterRepo
-from scgp_cip.dao.order_line.material_plant_master_repo import MaterialPlantMasterRepo
 from scgp_export.graphql.resolvers.orders import resolve_get_credit_limit
 from scgp_po_upload.error_codes import ScgpPoUploadErrorCode
 from scgp_po_upload.graphql.enums import SaveToSapStatus
@@ -23,6 +21,13 @@ from scgp_po_upload.models import PoUploadFileLog
 
 logger = logging.getLogger(__name__)
 
+PARTNER_ROLE_BY_FIELD = {
+    "ship_to": RealtimePartnerType.SHIP_TO.value,
+    "item_ship_to": RealtimePartnerType.SHIP_TO.value,
+    "bill_to": RealtimePartnerType.BILL_TO.value,
+    "payer": "RG",
+}
+
 
 def _validate_excel_upload_file(file, sale_org_input, distribution_channel):
     """
@@ -134,20 +139,20 @@ def validate_file_data(file, sale_org_input, distribution_channel):
 
         sheet_lines = df.values.tolist()
 
-        handled_lines = []
+        handled_lines = set()
         validation_errors = []
         error_line_data = {}
-        sold_to_db = get_sold_to_code_from_db(sheet_lines)
-        sap_materials_db = get_material_code_from_db(sheet_lines)
-
         if not sheet_lines:
             sheet_lines = [["" for col in column_map]]
+        master_data = SheetMasterData(
+            sheet_lines, column_map, sale_org_input, distribution_channel
+        )
 
         for index, line in enumerate(sheet_lines):
             line_no = index + 4
             line_data = {f.get("field"): line[f.get("index")] for f in column_map}
 
-            if line in handled_lines:
+            if tuple(line) in handled_lines:
                 add_to_error(validation_errors, line_no, "Duplicate Row")
                 error_line_data[line_no] = line_data
                 continue
@@ -155,11 +160,9 @@ def validate_file_data(file, sale_org_input, distribution_channel):
             errors = validate_sheet_line(
                 line_no,
                 line,
-                sold_to_db,
-                sap_materials_db,
+                master_data,
                 column_map,
                 sale_org_input,
-                distribution_channel,
             )
             if len(errors):
                 validation_errors += errors
@@ -167,7 +170,7 @@ def validate_file_data(file, sale_org_input, distribution_channel):
                 continue
 
             # Save handled line
-            handled_lines.append(line)
+            handled_lines.add(tuple(line))
 
         if len(validation_errors):
             validation_errors = sorted(validation_errors, key=lambda x: x["line"])
@@ -201,7 +204,7 @@ def is_valid_request_date(request_date):
     return True
 
 
-def validate_fields(line, field_map, line_no):
+def validate_fields(line, field_map, line_no, master_data):
     errors = []
 
     for field in field_map:
@@ -232,23 +235,9 @@ def validate_fields(line, field_map, line_no):
             add_to_error(errors, line_no, f"{title} exceeds maximum {size} digits")
 
         if col_value:
-            partner = None
-            if col_name == "ship_to" or col_name == "item_ship_to":
-                partner = return_partner_from_db(
-                    col_value, RealtimePartnerType.SHIP_TO.value
-                )
-                if not partner:
-                    add_to_error(errors, line_no, f"Invalid {title}")
-            if col_name == "bill_to":
-                partner = return_partner_from_db(
-                    col_value, RealtimePartnerType.BILL_TO.value
-                )
-                if not partner:
-                    add_to_error(errors, line_no, f"Invalid {title}")
-            if col_name == "payer":
-                partner = return_partner_from_db(col_value, "RG")
-                if not partner:
-                    add_to_error(errors, line_no, f"Invalid {title}")
+            partner_role = PARTNER_ROLE_BY_FIELD.get(col_name)
+            if partner_role and not master_data.has_partner(col_value, partner_role):
+                add_to_error(errors, line_no, f"Invalid {title}")
 
             if col_name == "request_quantity":
                 quantity = col_value.split(".")
@@ -262,48 +251,33 @@ def validate_fields(line, field_map, line_no):
     return errors
 
 
-def return_partner_from_db(partner_code, partner_role):
-    partner_code = partner_code.zfill(ExcelUploadMapping.SOLD_TO_CODE_LENGTH.value)
-    return master_models.SoldToChannelPartnerMaster.objects.filter(
-        partner_code=partner_code, partner_role=partner_role
-    ).first()
-
-
 def validate_sheet_line(
     line_no,
     line,
-    sold_to_db_dic,
-    materials_db,
+    master_data,
     field_map,
     sale_org_input,
-    distribution_channel,
 ):
     """
-    return list errors for each field validation
+    return list errors for each field validation, master data of the line is
+    looked up in `master_data` (SheetMasterData of the whole file)
     """
-    errors = validate_fields(line, field_map, line_no)
+    errors = validate_fields(line, field_map, line_no, master_data)
 
-    sold_to_code = line[2].strip()
+    sold_to_code = get_sold_to_code(line)
     sale_org_code = line[0].strip()
     material_code = line[10].strip()
     material_desc = line[11].strip()
     plant = line[14].strip()
 
-    sold_to_code = (
-        sold_to_code.zfill(ExcelUploadMapping.SOLD_TO_CODE_LENGTH.value)
-        if sold_to_code
-        else ""
-    )
-    sold_to_db = sold_to_db_dic.get(sold_to_code)
+    sold_to_db = master_data.sold_tos.get(sold_to_code)
 
     if sold_to_code != "" and not sold_to_db:
         add_to_error(errors, line_no, "Invalid Sold to code")
     if sold_to_db and sold_to_db.customer_block:
         add_to_error(errors, line_no, "Customer Blocked")
 
-    data_input = {"sold_to_code": sold_to_code, "sales_org_code": sale_org_input}
-    credit_limit = resolve_get_credit_limit(None, data_input)
-    if credit_limit.get("credit_block_status"):
+    if master_data.is_credit_blocked(sold_to_code):
         add_to_error(errors, line_no, "Credit Blocked")
 
     if sale_org_code != "" and sale_org_input != sale_org_code.zfill(
@@ -314,24 +288,9 @@ def validate_sheet_line(
         )
 
     if material_code or material_desc:
-        material = None
-        if material_code != "":
-            material = materials_db.get(material_code)
-            if not material:
-                cust_material = get_customer_material_by_code(
-                    sold_to_code, material_code, sale_org_input, distribution_channel
-                )
-                if cust_material:
-                    material = MaterialMasterRepo.get_material_by_material_code(
-                        cust_material.material_code
-                    )
-        elif material_desc != "":
-            material = get_material_by_desc(
-                material_desc, sale_org_input, distribution_channel
-            )
-
-        material_sale_master = material and get_material_sale_master_from_db(
-            material.material_code, sale_org_input, distribution_channel
+        material = master_data.get_material(sold_to_code, material_code, material_desc)
+        material_sale_master = material and master_data.material_sales.get(
+            material.material_code
         )
         if not material or not material_sale_master:
             add_to_error(errors, line_no, "Invalid Material")
@@ -342,13 +301,10 @@ def validate_sheet_line(
             and material_sale_master.status == "Inactive"
         ):
             add_to_error(errors, line_no, "Inactive Material")
-        elif material and check_material_on_hold(material.material_code):
+        elif material and material.material_code in master_data.on_hold_materials:
             add_to_error(errors, line_no, "On Hold Material")
         if material and plant:
-            plant_master = MaterialPlantMasterRepo.get_plant_by_material_code_and_plant(
-                material.material_code, plant
-            )
-            if not plant_master:
+            if (material.material_code, plant) not in master_data.material_plants:
                 add_to_error(errors, line_no, "Invalid Plant")
 
     else:
@@ -357,25 +313,160 @@ def validate_sheet_line(
     return errors
 
 
-def check_material_on_hold(material_code):
-    return PmtMaterialMaster.objects.filter(material_code=material_code, is_hold=True)
+def get_sold_to_code(line):
+    sold_to_code = line[2].strip()
+    return (
+        sold_to_code.zfill(ExcelUploadMapping.SOLD_TO_CODE_LENGTH.value)
+        if sold_to_code
+        else ""
+    )
 
 
-def get_customer_material_by_code(
-    sold_to, material_code, sale_org, distribution_channel
-):
-    return master_models.SoldToMaterialMaster.objects.filter(
-        sold_to_code=sold_to,
-        sold_to_material_code=material_code,
-        sales_organization_code=sale_org,
-        distribution_channel_code=distribution_channel,
-    ).first()
+def _first_by(queryset, *key_fields):
+    """{key: first row by pk}, as `.first()` would return for each key"""
+    rows = {}
+    for row in queryset.order_by("pk"):
+        rows.setdefault(tuple(getattr(row, f) for f in key_fields), row)
+    return rows
+
+
+class SheetMasterData:
+    """
+    Master data of every line of an uploaded file, loaded with one query per
+    master table for the distinct keys of the file. ES10 credit status is
+    fetched once per sold to (the sales org is the one of the upload).
+    """
+
+    def __init__(self, sheet_lines, field_map, sale_org, distribution_channel):
+        self.sale_org = sale_org
+        self.distribution_channel = distribution_channel
+        self._credit_blocks = {}
+
+        sold_to_codes = {get_sold_to_code(line) for line in sheet_lines} - {""}
+        material_codes = {line[10].strip() for line in sheet_lines} - {""}
+        material_descs = {
+            line[11].strip()
+            for line in sheet_lines
+            if not line[10].strip() and line[11].strip()
+        }
+
+        self.sold_tos = get_sold_to_code_from_db(sheet_lines)
+        self.materials = get_material_code_from_db(sheet_lines)
+        self.partners = self._load_partners(sheet_lines, field_map)
+
+        # lines with a customer material code instead of a SAP one
+        self.customer_materials = {}
+        customer_material_codes = material_codes - set(self.materials)
+        if sold_to_codes and customer_material_codes:
+            self.customer_materials = _first_by(
+                master_models.SoldToMaterialMaster.objects.filter(
+                    sold_to_code__in=sold_to_codes,
+                    sold_to_material_code__in=customer_material_codes,
+                    sales_organization_code=sale_org,
+                    distribution_channel_code=distribution_channel,
+                ),
+                "sold_to_code",
+                "sold_to_material_code",
+            )
+        self.customer_material_materials = {
+            code: material
+            for (code,), material in _first_by(
+                master_models.MaterialMaster.objects.filter(
+                    material_code__in={
+                        cust_material.material_code
+                        for cust_material in self.customer_materials.values()
+                    }
+                ),
+                "material_code",
+            ).items()
+        }
+
+        self.materials_by_desc = {}
+        if material_descs:
+            for material in master_models.MaterialMaster.objects.filter(
+                Q(description_en__in=material_descs)
+                | Q(description_th__in=material_descs)
+            ).order_by("pk"):
+                for desc in (material.description_en, material.description_th):
+                    if desc in material_descs:
+                        self.materials_by_desc.setdefault(desc, material)
+
+        candidate_codes = (
+            set(self.materials)
+            | set(self.customer_material_materials)
+            | {material.material_code for material in self.materials_by_desc.values()}
+        )
+        self.material_sales = {
+            code: row
+            for (code,), row in _first_by(
+                master_models.MaterialSaleMaster.objects.filter(
+                    material_code__in=candidate_codes,
+                    sales_organization_code=sale_org,
+                    distribution_channel_code=distribution_channel,
+                ),
+                "material_code",
+            ).items()
+        }
+        self.on_hold_materials = set(
+            PmtMaterialMaster.objects.filter(
+                material_code__in=candidate_codes, is_hold=True
+            ).values_list("material_code", flat=True)
+        )
+        plants = {line[14].strip() for line in sheet_lines} - {""}
+        self.material_plants = set()
+        if plants:
+            self.material_plants = set(
+                master_models.MaterialPlantMaster.objects.filter(
+                    material_code__in=candidate_codes, plant_code__in=plants
+                ).values_list("material_code", "plant_code")
+            )
 
+    @staticmethod
+    def _load_partners(sheet_lines, field_map):
+        partner_codes = {
+            line[field["index"]].zfill(ExcelUploadMapping.SOLD_TO_CODE_LENGTH.value)
+            for field in field_map
+            if field.get("field") in PARTNER_ROLE_BY_FIELD
+            for line in sheet_lines
+            if isinstance(line[field["index"]], str) and line[field["index"]]
+        }
+        if not partner_codes:
+            return set()
+        return set(
+            master_models.SoldToChannelPartnerMaster.objects.filter(
+                partner_code__in=partner_codes,
+                partner_role__in=set(PARTNER_ROLE_BY_FIELD.values()),
+            ).values_list("partner_code", "partner_role")
+        )
 
-def get_material_by_desc(material_desc, sale_org_code, distribution_channel):
-    return master_models.MaterialMaster.objects.filter(
-        Q(description_en=material_desc) | Q(description_th=material_desc)
-    ).first()
+    def has_partner(self, partner_code, partner_role):
+        partner_code = partner_code.zfill(ExcelUploadMapping.SOLD_TO_CODE_LENGTH.value)
+        return (partner_code, partner_role) in self.partners
+
+    def is_credit_blocked(self, sold_to_code):
+        if sold_to_code not in self._credit_blocks:
+            data_input = {"sold_to_code": sold_to_code, "sales_org_code": self.sale_org}
+            credit_limit = resolve_get_credit_limit(None, data_input)
+            self._credit_blocks[sold_to_code] = bool(
+                credit_limit.get("credit_block_status")
+            )
+        return self._credit_blocks[sold_to_code]
+
+    def get_material(self, sold_to_code, material_code, material_desc):
+        if material_code != "":
+            material = self.materials.get(material_code)
+            if not material:
+                cust_material = self.customer_materials.get(
+                    (sold_to_code, material_code)
+                )
+                if cust_material:
+                    material = self.customer_material_materials.get(
+                        cust_material.material_code
+                    )
+            return material
+        if material_desc != "":
+            return self.materials_by_desc.get(material_desc)
+        return None
 
 
 def raise_validation_errors(validation_errors, error_line_data):
@@ -424,12 +515,3 @@ def get_material_code_from_db(sheet_lines):
         .distinct("material_code")
         .in_bulk(field_name="material_code")
     )
-
-
-def get_material_sale_master_from_db(material_code, sale_org, distribution_channel):
-
-    return master_models.MaterialSaleMaster.objects.filter(
-        material_code=material_code,
-        sales_organization_code=sale_org,
-        distribution_channel_code=distribution_channel,
-    ).first()
@@ -1,11 +1,13 @@
+import copy
 import io
 import json
 import logging
 import re
 import time
 import uuid
+from collections import defaultdict
 from datetime import datetime
-from functools import reduce
+from functools import partial
 
 import magic
 import pandas as pd
@@ -26,7 +28,13 @@ from common.helpers import (
 )
 from common.mulesoft_api import MulesoftApiRequest
 from common.newrelic_metric import add_metric_process_order, force_update_attributes
+from common.sap.response_cache import get_cached_sap_response, make_payload_hash
 from common.sap.sap_api import SapApiRequest
+from common.sqs_consumer import SqsBatchConsumer
+from common.util.middleware.scgp_threadlocal_middleware import (
+    THREAD_LOCAL_KEY_METRIC,
+    add_to_thread_local,
+)
 from saleor.plugins.manager import get_plugins_manager
 from sap_master_data import models as master_models
 from sap_master_data.models import (
@@ -93,8 +101,10 @@ from scg_checkout.graphql.implementations.sap import (
 )
 from scg_checkout.graphql.resolves.contracts import (
     get_data_from_order_text_list,
+    is_contract_payload_unchanged,
     map_sap_contract_item,
     sap_mapping_contract_material_variant,
+    save_contract_payload_hash,
 )
 from scgp_cip.common.enum import CPRequestType
 from scgp_cip.dao.order.sale_organization_master_repo import SalesOrganizationMasterRepo
@@ -213,6 +223,51 @@ def retry_upload_file(id):
     return False
 
 
+# file statuses which are waiting for po_upload_to_sap
+PO_UPLOAD_CLAIMABLE_STATUSES = [
+    SaveToSapStatus.UPLOAD_FILE,
+    SaveToSapStatus.IN_QUEUE,
+]
+
+
+class PoUploadStageTimer:
+    """
+    Time spent by a file in each stage of save_po_order, in ms.
+    Stages are entered by update_status_po_file_log, a stage entered once per
+    order of the file is summed up.
+    """
+
+    STAGES = {
+        # read and validate the file, sync contracts with ES14
+        SaveToSapStatus.IN_PROGRESS: "es14_sync",
+        SaveToSapStatus.CALL_IPLAN_REQUEST: "iplan_request",
+        SaveToSapStatus.CALL_SAP: "es17",
+        SaveToSapStatus.CALL_IPLAN_CONFIRM: "iplan_confirm",
+    }
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.stage = None
+        self.stage_started_at = None
+        self.timings = defaultdict(float)
+
+    def enter(self, status):
+        stage = self.STAGES.get(status)
+        if stage == self.stage:
+            return
+        now = time.monotonic()
+        if self.stage:
+            self.timings[self.stage] += (now - self.stage_started_at) * 1000
+        self.stage, self.stage_started_at = stage, now
+
+    def finish(self):
+        self.enter(None)
+        return {
+            **{stage: int(ms) for stage, ms in self.timings.items()},
+            "total": int((time.monotonic() - self.started_at) * 1000),
+        }
+
+
 def po_upload_to_sap():
     """
     System will call I-Plan to reserve stock
@@ -220,6 +275,18 @@ def po_upload_to_sap():
     AND Get Response from SAP [Auto Accept or Roll Back]
     @return:
     """
+    manager = get_plugins_manager()
+    po_upload = manager.get_plugin("scg.sqs_po_upload")
+    if settings.PO_UPLOAD_BATCH_CONSUMER_ENABLED:
+        return SqsBatchConsumer(
+            po_upload.get_queue(),
+            handler=handle_po_upload_message,
+            name="PO Upload",
+            partition_keys=po_upload_message_partition_keys,
+            max_workers=settings.PO_UPLOAD_MAX_WORKERS,
+            time_budget=settings.PO_UPLOAD_TIME_BUDGET,
+        ).run()
+
     # need to check on different thread
     file_log = get_po_upload_running()
     if file_log:
@@ -227,8 +294,6 @@ def po_upload_to_sap():
             f"[PO Upload] po_upload_to_sap : file log {file_log.id} is running, skip"
         )
         return
-    manager = get_plugins_manager()
-    po_upload = manager.get_plugin("scg.sqs_po_upload")
     messages = po_upload.sqs_receive_message()
     logging.info(f"[PO Upload] po_upload_to_sap : get data from sqs {messages}")
     msgs = []
@@ -246,6 +311,86 @@ def po_upload_to_sap():
             handle_po_file(file_log, manager)
 
 
+def handle_po_upload_message(message):
+    """
+    Handle the file of a PO upload SQS message, the message is deleted
+    by SqsBatchConsumer once this returns
+    @param message: Message of SQS
+    """
+    file_id = json.loads(message.body).get("Message")
+    file_log = claim_po_upload_file(file_id)
+    if not file_log:
+        logging.info(
+            f"[PO Upload] file log {file_id} is handled by another worker or not waiting, skip"
+        )
+        return
+    file_log.stage_timer = PoUploadStageTimer()
+    try:
+        if PoUploadType.EXCEL == file_log.upload_type:
+            handle_excel_upload(file_log, get_plugins_manager())
+            if file_log.status == SaveToSapStatus.IN_PROGRESS:
+                # no upload data to process
+                update_status_po_file_log(file_log, SaveToSapStatus.FAIL)
+        else:
+            handle_po_file(file_log, get_plugins_manager())
+    except Exception:
+        update_status_po_file_log(file_log, SaveToSapStatus.FAIL)
+        raise
+    finally:
+        add_po_upload_stage_metrics(file_log, file_log.stage_timer.finish())
+
+
+def claim_po_upload_file(file_id):
+    """
+    Lock the file log with SELECT ... FOR UPDATE SKIP LOCKED and mark it in progress,
+    so each file is handled by one worker only
+    @param file_id: id of PoUploadFileLog
+    @return: file log, None when it is locked by another worker, not waiting or missing
+    """
+    with transaction.atomic():
+        file_log = (
+            PoUploadFileLog.objects.select_for_update(skip_locked=True)
+            .filter(id=file_id, status__in=PO_UPLOAD_CLAIMABLE_STATUSES)
+            .first()
+        )
+        if file_log:
+            update_status_po_file_log(file_log, SaveToSapStatus.IN_PROGRESS)
+    return file_log
+
+
+def po_upload_message_partition_keys(message):
+    """
+    Uploader of the file of a PO upload message, files of the same uploader
+    (and so mostly the same sold-tos and contracts) are handled in sequence
+    @param message: Message of SQS
+    @return: list of partition keys
+    """
+    file_id = json.loads(message.body).get("Message")
+    uploaded_by_id = (
+        PoUploadFileLog.objects.filter(id=file_id)
+        .values_list("uploaded_by_id", flat=True)
+        .first()
+    )
+    return [f"user:{uploaded_by_id}"] if uploaded_by_id else []
+
+
+def add_po_upload_stage_metrics(file_log, timings):
+    logging.info(f"[PO Upload] file log {file_log.id} stage timings (ms): {timings}")
+    ts = time.time()
+    attributes = {"fileId": file_log.id, "uploadType": file_log.upload_type}
+    for stage, value in timings.items():
+        add_to_thread_local(
+            THREAD_LOCAL_KEY_METRIC,
+            {
+                "metric_name": f"{settings.NEW_RELIC_PO_UPLOAD_METRIC_NAME}.{stage}",
+                "type": "gauge",
+                "value": value,
+                "timestamp": ts,
+                "attributes": attributes,
+            },
+        )
+
+
 def get_file_log_instance(msg):
     body = json.loads(msg)
     file_id = body.get("Message")
@@ -609,6 +754,25 @@ def fetch_product_group_of_first_item(sap_success_order_lines, contract_no):
     return product_group
 
 
+def prefetch_es14_contract_details(orders_data):
+    """Call ES14 once per distinct contract of the file, concurrently.
+
+    Returns a dict of contract number to ES14 response, or to the exception
+    raised by its call.
+    """
+    contract_numbers = list(
+        dict.fromkeys(order_data["contract_number"] for order_data in orders_data)
+    )
+    responses = SapApiRequest.batch_call(
+        [
+            partial(SapApiRequest.call_es_14_contract_detail, contract_no=contract_no)
+            for contract_no in contract_numbers
+        ],
+        return_exceptions=True,
+    )
+    return dict(zip(contract_numbers, responses))
+
+
 @transaction.atomic
 def save_po_order(file_log, manager):  # noqa: C901
     logging.info("[PO Upload] save_po_order: start ")
@@ -627,6 +791,7 @@ def save_po_order(file_log, manager):  # noqa: C901
         )
         validate_duplicate_po_for_customer_user(user, orders_data)
         validate_items_material(orders_data)
+        es14_responses = prefetch_es14_contract_details(orders_data)
         for order_data in orders_data:
             start_time = time.time()
             try:
@@ -640,9 +805,11 @@ def save_po_order(file_log, manager):  # noqa: C901
                                 item["sku_code"] + " " + error_message
                             )
                 try:
-                    response = SapApiRequest.call_es_14_contract_detail(
-                        contract_no=order_data["contract_number"]
-                    )
+                    response = es14_responses.get(order_data["contract_number"])
+                    if isinstance(response, Exception):
+                        raise response
+                    # orders of the same contract share one ES14 response
+                    response = copy.deepcopy(response)
                 except Exception as e:
                     logging.exception(
                         "[PO Upload] Exception during ES14 call for contract "
@@ -1841,20 +2008,47 @@ def po_upload_sync_contract(contract_no, sold_to, list_po_codes, commit, respons
         "prc_group1": list_items_mat_group,
     }
     contract_sale_detail = {**contract_sale_detail, **order_text_list_data}
-    sync_contract_sale_detail(contract, contract_sale_detail, commit)
-    list_condition = response_data.get("conditionList", [])
-    contract_item_objects = reduce(
-        lambda previous, current: {**previous, current.get("itemNo"): current},
-        list_items,
-        {},
-    )
+    contract_item_objects = {item.get("itemNo"): item for item in list_items}
+    # variants synced from the contract depend on the PO codes as well
+    payload_hash = make_payload_hash([response_data, sorted(set(list_po_codes))])
+    if is_contract_payload_unchanged(contract, "po_upload", payload_hash):
+        logging.info(
+            f"[PO Upload] po_upload_sync_contract: contract {contract_no} unchanged"
+        )
+        # what map_sap_contract_item returns: active rows of duplicated items
+        contract_materials = {}
+        for contract_material in (
+            ContractMaterial.all_objects.filter(
+                contract=contract, item_no__in=contract_item_objects.keys()
+            )
+            .select_related("material")
+            .order_by("pk")
+        ):
+            if contract_material.material.material_code == contract_item_objects[
+                contract_material.item_no
+            ].get("matNo"):
+                contract_materials.setdefault(
+                    (contract_material.item_no, contract_material.material_id), []
+                ).append(contract_material)
+        list_contract_material = [
+            contract_material
+            for rows in contract_materials.values()
+            if len(rows) > 1
+            for contract_material in rows
+            if contract_material.is_active
+        ]
+    else:
+        sync_contract_sale_detail(contract, contract_sale_detail, commit)
+        list_condition = response_data.get("conditionList", [])
 
-    set_contract_item_fields(contract_item_objects, list_condition)
+        set_contract_item_fields(contract_item_objects, list_condition)
 
-    kwargs = {"is_po_upload_flow": True, "list_po_codes": list_po_codes}
-    list_contract_material = map_sap_contract_item(
-        contract, contract_item_objects, order_text_list, **kwargs
-    )
+        kwargs = {"is_po_upload_flow": True, "list_po_codes": list_po_codes}
+        list_contract_material = map_sap_contract_item(
+            contract, contract_item_objects, order_text_list, **kwargs
+        )
+        if commit:
+            save_contract_payload_hash(contract, "po_upload", payload_hash)
 
     dict_materials = {}
     for contract_material in list_contract_material:
@@ -1967,9 +2161,14 @@ def get_all_variant_of_contract(contract, list_material_codes):
         log_val = {
             "contract_no": contract.code,
         }
-        response = MulesoftApiRequest.instance(
-            service_type=MulesoftServiceType.SAP.value, **log_val
-        ).request_mulesoft_post("sales/materials/search", param)
+        response = get_cached_sap_response(
+            SapEnpoint.ES_15.value,
+            (param["customerNo"], param["date"], sorted(set(list_material_codes))),
+            lambda: MulesoftApiRequest.instance(
+                service_type=MulesoftServiceType.SAP.value, **log_val
+            ).request_mulesoft_post("sales/materials/search", param),
+            settings.SAP_ES15_CACHE_TTL,
+        )
     except Exception as e:
         logging.exception(
             "[PO Upload] Exception during ES15 call for contract variant "
@@ -2898,6 +3097,9 @@ def _segregate_i_plan_success_order_line_to_sap_order_line(
 
 
 def update_status_po_file_log(file_log, status):
+    stage_timer = getattr(file_log, "stage_timer", None)
+    if stage_timer:
+        stage_timer.enter(status)
     file_log.status = status
     file_log.save()
     logging.info(
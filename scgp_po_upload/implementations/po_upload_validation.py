@@ -1,5 +1,6 @@
 import datetime
 import logging
+from functools import partial
 
 from django.core.exceptions import ValidationError
 from django.db.models import Q
@@ -413,11 +414,23 @@ def check_po_in_progress(orders):
 
 def validate_contract_for_not_found(orders):
     error_response = {}
+    # ES14 of each contract is independent, fetch them concurrently
+    contract_numbers = list(
+        dict.fromkeys(order.get("contract_number") for order in orders)
+    )
+    responses = SapApiRequest.batch_call(
+        [
+            partial(SapApiRequest.call_es_14_contract_detail, contract_no=contract_no)
+            for contract_no in contract_numbers
+        ],
+        return_exceptions=True,
+    )
+    contract_responses = dict(zip(contract_numbers, responses))
     for order in orders:
+        response = contract_responses.get(order.get("contract_number"))
         try:
-            response = SapApiRequest.call_es_14_contract_detail(
-                contract_no=order.get("contract_number")
-            )
+            if isinstance(response, Exception):
+                raise response
         except Exception as e:
             logging.exception(
                 "[PO Upload] Exception during ES14 call for contract "
@@ -1,8 +1,10 @@
 from celery.utils.log import get_task_logger
+from django.db import transaction
 
 from saleor.celeryconf import CustomLogBaseTask, app
 from scgp_po_upload.implementations.po_upload import po_upload_to_sap
 from scgp_po_upload.models import PoUploadFileLog, SaveToSapStatus
+from scgp_record_cleanup.implementation.purge import purge, raise_on_purge_errors
 
 task_logger = get_task_logger(__name__)
 
@@ -11,21 +13,36 @@ task_logger = get_task_logger(__name__)
 def delete_all_failed_file_logs():
     task_logger.info("Starting cron remove all failed files")
     try:
-        file_logs = PoUploadFileLog.objects.filter(
-            status=SaveToSapStatus.BEING_PROCESS
-        ).all()
-        for file_log_obj in file_logs:
-            try:
-                file_log_obj.file.delete()
-            except Exception as e:
-                task_logger.info(f"Error when delete file: {str(e)}")
-        file_logs.delete()
-        task_logger.info("Task finished!")
+        stats = purge(
+            "failed po upload file logs",
+            PoUploadFileLog.objects.filter(status=SaveToSapStatus.BEING_PROCESS),
+            before_delete=delete_file_log_files,
+        )
+        raise_on_purge_errors(stats)
+        task_logger.info(f"Task finished! {stats}")
     except Exception as ex:
         task_logger.error(str(ex))
         raise ex
 
 
+def delete_file_log_files(file_log_ids):
+    files = [
+        file_log.file
+        for file_log in PoUploadFileLog.objects.filter(pk__in=file_log_ids).only("file")
+        if file_log.file
+    ]
+
+    def delete_files():
+        for file in files:
+            try:
+                file.delete(save=False)
+            except Exception as e:
+                task_logger.info(f"Error when delete file: {str(e)}")
+
+    # files of a batch rolled back are kept
+    transaction.on_commit(delete_files)
+
+
 @app.task(name="scgp_po_upload.tasks.handle_po_upload", base=CustomLogBaseTask)
 def handle_po_upload():
     task_logger.info("Starting cron po upload!")
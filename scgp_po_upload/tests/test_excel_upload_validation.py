@@ -0,0 +1,175 @@
+from unittest import mock
+
+import pytest
+from django.db.models import Q
+
+from common.models import PmtMaterialMaster
+from sap_master_data import models as master_models
+from scgp_po_upload.implementations.excel_upload_validation import (
+    SheetMasterData,
+    get_sold_to_code,
+)
+
+SALE_ORG = "0750"
+DISTRIBUTION_CHANNEL = "10"
+FIELD_MAP = [{"index": 3, "field": "ship_to"}, {"index": 4, "field": "payer"}]
+
+
+def sheet_line(sold_to="", ship_to="", payer="", material="", desc="", plant=""):
+    line = [""] * 20
+    line[2], line[3], line[4] = sold_to, ship_to, payer
+    line[10], line[11], line[14] = material, desc, plant
+    return line
+
+
+# the lookups SheetMasterData replaced, run per line
+def old_get_material(sold_to_code, material_code, material_desc):
+    if material_code != "":
+        material = master_models.MaterialMaster.objects.filter(
+            material_code=material_code
+        ).first()
+        if not material:
+            cust_material = master_models.SoldToMaterialMaster.objects.filter(
+                sold_to_code=sold_to_code,
+                sold_to_material_code=material_code,
+                sales_organization_code=SALE_ORG,
+                distribution_channel_code=DISTRIBUTION_CHANNEL,
+            ).first()
+            if cust_material:
+                material = master_models.MaterialMaster.objects.filter(
+                    material_code=cust_material.material_code
+                ).first()
+        return material
+    if material_desc != "":
+        return master_models.MaterialMaster.objects.filter(
+            Q(description_en=material_desc) | Q(description_th=material_desc)
+        ).first()
+    return None
+
+
+def old_get_material_sale_master(material_code):
+    return master_models.MaterialSaleMaster.objects.filter(
+        material_code=material_code,
+        sales_organization_code=SALE_ORG,
+        distribution_channel_code=DISTRIBUTION_CHANNEL,
+    ).first()
+
+
+def old_has_partner(partner_code, partner_role):
+    return master_models.SoldToChannelPartnerMaster.objects.filter(
+        partner_code=partner_code.zfill(10), partner_role=partner_role
+    ).exists()
+
+
+@pytest.fixture
+def upload_master_data(db):
+    for code, desc_en, desc_th in [
+        ("MAT-001", "Paper A", "กระดาษ A"),
+        ("MAT-002", "Paper B", "Paper A"),
+        ("MAT-003", "Box", None),
+        ("MAT-004", "Box", "กล่อง"),
+    ]:
+        master_models.MaterialMaster.objects.create(
+            material_code=code, description_en=desc_en, description_th=desc_th
+        )
+    for code in ["MAT-001", "MAT-003", "MAT-003"]:
+        master_models.MaterialSaleMaster.objects.create(
+            material_code=code,
+            sales_organization_code=SALE_ORG,
+            distribution_channel_code=DISTRIBUTION_CHANNEL,
+        )
+    master_models.MaterialSaleMaster.objects.create(
+        material_code="MAT-002",
+        sales_organization_code="0710",
+        distribution_channel_code=DISTRIBUTION_CHANNEL,
+    )
+    for sold_to_code, customer_code, material_code, sale_org in [
+        ("0000000001", "CUST-1", "MAT-002", SALE_ORG),
+        ("0000000001", "CUST-1", "MAT-003", SALE_ORG),
+        ("0000000002", "CUST-1", "MAT-004", SALE_ORG),
+        ("0000000001", "CUST-2", "MAT-001", "0710"),
+        ("0000000001", "CUST-3", "MAT-999", SALE_ORG),
+    ]:
+        master_models.SoldToMaterialMaster.objects.create(
+            sold_to_code=sold_to_code,
+            sold_to_material_code=customer_code,
+            material_code=material_code,
+            sales_organization_code=sale_org,
+            distribution_channel_code=DISTRIBUTION_CHANNEL,
+        )
+    PmtMaterialMaster.objects.create(material_code="MAT-003", is_hold=True)
+    master_models.MaterialPlantMaster.objects.create(
+        material_code="MAT-001", plant_code="7554"
+    )
+    master_models.SoldToChannelPartnerMaster.objects.create(
+        partner_code="0000000011", partner_role="WE"
+    )
+    master_models.SoldToChannelPartnerMaster.objects.create(
+        partner_code="0000000012", partner_role="RG"
+    )
+
+
+def test_sheet_master_data_matches_per_line_lookups(upload_master_data):
+    sheet_lines = [
+        sheet_line("1", "11", "12", material="MAT-001", plant="7554"),
+        sheet_line("1", "12", "11", material="MAT-002", plant="7554"),
+        sheet_line("1", material="CUST-1", plant="7555"),
+        sheet_line("2", material="CUST-1"),
+        sheet_line("1", material="CUST-2"),
+        sheet_line("1", material="CUST-3"),
+        sheet_line("1", material="UNKNOWN"),
+        sheet_line("1", desc="Paper A"),
+        sheet_line("1", desc="Box"),
+        sheet_line("1", desc="กล่อง"),
+        sheet_line("1", desc="Unknown"),
+        sheet_line("1"),
+    ]
+
+    master_data = SheetMasterData(
+        sheet_lines, FIELD_MAP, SALE_ORG, DISTRIBUTION_CHANNEL
+    )
+
+    for line in sheet_lines:
+        sold_to_code = get_sold_to_code(line)
+        material = master_data.get_material(
+            sold_to_code, line[10].strip(), line[11].strip()
+        )
+        expected = old_get_material(sold_to_code, line[10].strip(), line[11].strip())
+        assert material == expected, line
+        if not material:
+            continue
+        assert master_data.material_sales.get(
+            material.material_code
+        ) == old_get_material_sale_master(material.material_code)
+        assert (material.material_code in master_data.on_hold_materials) == (
+            PmtMaterialMaster.objects.filter(
+                material_code=material.material_code, is_hold=True
+            ).exists()
+        )
+        assert (
+            (material.material_code, line[14]) in master_data.material_plants
+        ) == master_models.MaterialPlantMaster.objects.filter(
+            material_code=material.material_code, plant_code=line[14]
+        ).exists()
+    for line in sheet_lines[:2]:
+        for partner_code in (line[3], line[4]):
+            for role in ("WE", "RG"):
+                assert master_data.has_partner(partner_code, role) == (
+                    old_has_partner(partner_code, role)
+                )
+
+
+def test_sheet_master_data_fetches_credit_status_once_per_sold_to(db):
+    master_data = SheetMasterData([sheet_line("1")], [], SALE_ORG, DISTRIBUTION_CHANNEL)
+
+    with mock.patch(
+        "scgp_po_upload.implementations.excel_upload_validation"
+        ".resolve_get_credit_limit",
+        return_value={"credit_block_status": True},
+    ) as resolve_get_credit_limit:
+        assert master_data.is_credit_blocked("0000000001")
+        assert master_data.is_credit_blocked("0000000001")
+
+    resolve_get_credit_limit.assert_called_once_with(
+        None, {"sold_to_code": "0000000001", "sales_org_code": SALE_ORG}
+    )
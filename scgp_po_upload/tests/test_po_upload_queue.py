@@ -0,0 +1,74 @@
+import threading
+from unittest import mock
+
+import pytest
+from django.db import connections, transaction
+
+from scgp_po_upload.graphql.enums import PoUploadType, SaveToSapStatus
+from scgp_po_upload.implementations.excel_upload import write_to_queue
+from scgp_po_upload.implementations.po_upload import claim_po_upload_file
+from scgp_po_upload.models import PoUploadFileLog
+
+
+@pytest.fixture
+def po_upload_file_log(db):
+    return PoUploadFileLog.objects.create(
+        file_name="po.xlsx",
+        upload_type=PoUploadType.EXCEL,
+        status=SaveToSapStatus.UPLOAD_FILE,
+    )
+
+
+def test_claim_po_upload_file_claims_file_once(po_upload_file_log):
+    file_log = claim_po_upload_file(po_upload_file_log.id)
+
+    assert file_log.status == SaveToSapStatus.IN_PROGRESS
+    assert claim_po_upload_file(po_upload_file_log.id) is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_claim_po_upload_file_skips_file_locked_by_other_worker():
+    file_log = PoUploadFileLog.objects.create(
+        file_name="po.xlsx",
+        upload_type=PoUploadType.EXCEL,
+        status=SaveToSapStatus.IN_QUEUE,
+    )
+    locked = threading.Event()
+    release = threading.Event()
+
+    def other_worker():
+        try:
+            with transaction.atomic():
+                PoUploadFileLog.objects.select_for_update().get(id=file_log.id)
+                locked.set()
+                release.wait(10)
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=other_worker)
+    thread.start()
+    try:
+        assert locked.wait(10)
+        assert claim_po_upload_file(file_log.id) is None
+    finally:
+        release.set()
+        thread.join()
+
+    assert claim_po_upload_file(file_log.id).status == SaveToSapStatus.IN_PROGRESS
+
+
+def test_write_to_queue_keeps_status_of_claimed_file(po_upload_file_log):
+    def claim_on_send(**kwargs):
+        claim_po_upload_file(po_upload_file_log.id)
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+
+    manager = mock.Mock()
+    manager.get_plugin.return_value.sns_send_message.side_effect = claim_on_send
+    with mock.patch(
+        "scgp_po_upload.implementations.excel_upload.get_plugins_manager",
+        return_value=manager,
+    ):
+        write_to_queue(po_upload_file_log.id)
+
+    po_upload_file_log.refresh_from_db()
+    assert po_upload_file_log.status == SaveToSapStatus.IN_PROGRESS
@@ -0,0 +1,75 @@
+import logging
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+
+
+class PurgeError(Exception):
+    pass
+
+
+def purge(name, queryset, before_delete=None, batch_size=None, time_budget=None):
+    """
+    Delete the rows of `queryset` by batches of `batch_size` primary keys taken
+    in pk order, every batch in its own transaction, until no row is left or
+    `time_budget` seconds are spent.
+    Related rows are deleted by the Django collector, with plain SQL for the
+    ones having no cascade or signal of their own. Committed batches stay
+    deleted, the rows left by an interrupted or out of budget run are deleted
+    by the next one. A batch which fails is logged and skipped, see
+    raise_on_purge_errors.
+    `before_delete(pks)` is called in the transaction of each batch, before
+    its rows are deleted.
+    @return: stats of the run
+    """
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    if time_budget is None:
+        time_budget = settings.PURGE_TIME_BUDGET
+    model = queryset.model
+    stats = {"deleted": 0, "batches": 0, "errors": 0, "complete": False}
+    deleted_by_model = Counter()
+    started = time.monotonic()
+    last_pk = None
+    while time.monotonic() - started < time_budget:
+        batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        pks = list(batch.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            stats["complete"] = True
+            break
+        last_pk = pks[-1]
+        try:
+            with transaction.atomic():
+                if before_delete:
+                    before_delete(pks)
+                deleted, rows = model._base_manager.filter(pk__in=pks).delete()
+        except Exception as e:
+            stats["errors"] += 1
+            logging.exception(f"[Purge] {name}: batch up to pk {last_pk} error: {e}")
+            continue
+        stats["batches"] += 1
+        stats["deleted"] += deleted
+        deleted_by_model.update(rows)
+
+    seconds = time.monotonic() - started
+    stats["seconds"] = round(seconds, 1)
+    stats["rows_per_second"] = round(stats["deleted"] / seconds) if seconds else 0
+    if not stats["complete"]:
+        logging.warning(
+            f"[Purge] {name}: time budget of {time_budget}s spent, "
+            f"the next run continues from pk {last_pk}"
+        )
+    logging.info(f"[Purge] {name}: {stats}, rows by model: {dict(deleted_by_model)}")
+    return stats
+
+
+def raise_on_purge_errors(stats):
+    """
+    Raise PurgeError when batches of the run of `stats` failed, their rows
+    are left until the error is fixed.
+    @return: stats
+    """
+    if stats["errors"]:
+        raise PurgeError(f"{stats['errors']} batches failed to purge: {stats}")
+    return stats
@@ -7,6 +7,7 @@ from common.job.jobname import JobName
 from common.models import MulesoftLog
 from saleor import settings
 from sap_migration.models import SqsLog
+from scgp_record_cleanup.implementation.purge import purge, raise_on_purge_errors
 
 task_logger = get_task_logger(__name__)
 
@@ -21,20 +22,22 @@ def cleanup(job_type):
             days_range = timezone.now() - timezone.timedelta(
                 days=CLEAR_SQS_LOG_DATE_RANGE
             )
-            deleted_count = SqsLog.objects.filter(created_at__lt=days_range).delete()
+            stats = purge(job_type, SqsLog.objects.filter(created_at__lt=days_range))
             logging.info(
-                f"Successfully deleted {deleted_count} records. job type: {job_type}"
+                f"Successfully deleted {stats['deleted']} records. job type: {job_type}"
             )
+            raise_on_purge_errors(stats)
         elif job_type == JobName.CLEANUP_MULESOFTLOG.value:
             days_range = timezone.now() - timezone.timedelta(
                 days=CLEAR_MULES_SOFT_LOG_DATE_RANGE
             )
-            deleted_count = MulesoftLog.objects.filter(
-                created_at__lt=days_range
-            ).delete()
+            stats = purge(
+                job_type, MulesoftLog.objects.filter(created_at__lt=days_range)
+            )
             logging.info(
-                f"Successfully deleted {deleted_count} records. job type: {job_type}"
+                f"Successfully deleted {stats['deleted']} records. job type: {job_type}"
             )
+            raise_on_purge_errors(stats)
         else:
             logging.warning(f"Unknown job type: {job_type}")
     except Exception as e:
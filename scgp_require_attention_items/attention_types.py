@@ -0,0 +1,40 @@
+from typing import Iterable, List
+
+from django.db.models import Q
+
+REQUIRE_ATTENTION_TYPES = ("R1", "R2", "R3", "R4", "R5")
+
+
+def parse_attention_types(attention_type) -> List[str]:
+    """Flags of a comma separated attention type, e.g. "R1, R3" -> ["R1", "R3"]"""
+    return [
+        flag.strip().upper()
+        for flag in (attention_type or "").split(",")
+        if flag.strip()
+    ]
+
+
+def format_attention_types(flags: Iterable[str]) -> str:
+    return ", ".join(sorted(set(flags)))
+
+
+def has_attention_type(attention_type, flag) -> bool:
+    return flag in parse_attention_types(attention_type)
+
+
+def set_attention_type(attention_type, flag, flagged=True) -> str:
+    """Add (or remove when not `flagged`) a flag to a comma separated attention type"""
+    flags = set(parse_attention_types(attention_type))
+    if flagged:
+        flags.add(flag)
+    else:
+        flags.discard(flag)
+    return format_attention_types(flags)
+
+
+def attention_type_q(*flags) -> Q:
+    """
+    Order lines flagged with any of `flags`, with any flag when none is given.
+    Runs as a lookup on the GIN index of OrderLines.attention_type flags.
+    """
+    return Q(attention_type__flags__overlap=list(flags or REQUIRE_ATTENTION_TYPES))
@@ -22,7 +22,9 @@ from saleor.graphql.core.types import (
     FilterInputObjectType,
     DateRangeInput
 )
+from common.search import search_by_text
 from scg_checkout.graphql.helper import update_date_range_with_timezone
+from scgp_require_attention_items.attention_types import attention_type_q
 from scgp_export.graphql.enums import ScgpExportOrderStatus
 from scgp_require_attention_items.graphql.enums import (
     ScgpRequireAttentionTypeData,
@@ -39,8 +41,7 @@ from scgp_require_attention_items.graphql.sorters import SalesOrderSortingInput
 def search_require_attention_sold_to(qs, _, value):
     if not value:
         return qs
-    return qs.annotate(search_text=Concat('sold_to_code', Value(' - '), 'sold_to_name')).filter(
-        search_text__icontains=value)
+    return search_by_text(qs, value, 'sold_to_code', 'sold_to_name')
 
 
 def search_require_attention_ship_to(qs, _, value):
@@ -54,26 +55,22 @@ def search_require_attention_ship_to(qs, _, value):
 def search_require_attention_sale_employee(qs, _, value):
     if not value:
         return qs
-    return qs.filter(pk__in=Subquery(
-        sap_migrations_models.Order.objects.filter(sales_employee__icontains=value).distinct('sales_employee').values(
-            'pk')
+    orders = search_by_text(sap_migrations_models.Order.objects.all(), value, 'sales_employee')
+    return search_by_text(qs, value, 'sales_employee').filter(pk__in=Subquery(
+        orders.distinct('sales_employee').values('pk')
     ))
 
 
 def search_require_attention_material(qs, _, value):
     if not value:
         return qs
-    return qs.annotate(
-        search_text=Concat('material_code', Value(' - '), 'description_en')
-    ).filter(search_text__icontains=value)
+    return search_by_text(qs, value, 'material_code', 'description_en')
 
 
 def search_require_attention_material_grade_gram(qs, _, value):
     if not value:
         return qs
-    return qs.annotate(search_text=Concat('grade', Value(' '),
-                                          'basis_weight')).filter(
-        search_text__icontains=value)
+    return search_by_text(qs, value, 'grade', 'basis_weight')
 
 
 def search_sales_organization_by_bu(qs, _, value):
@@ -96,9 +93,9 @@ def search_require_attention_plant(qs, _, value):
 
 def filter_sold_to(qs, _, value):
     if value:
-        sold_to_codes = sap_master_data_models.SoldToMaster.objects.annotate(
-            search_text=Concat('sold_to_code', Value(' - '), 'sold_to_name')
-        ).filter(search_text__icontains=value).values_list('sold_to_code', flat=True).distinct()
+        sold_to_codes = search_by_text(
+            sap_master_data_models.SoldToMaster.objects.all(), value, 'sold_to_code', 'sold_to_name'
+        ).values_list('sold_to_code', flat=True).distinct()
         qs = qs.filter(order__contract__sold_to__sold_to_code__in=sold_to_codes)
     return qs
 
@@ -146,7 +143,7 @@ def filter_sale_group(qs, _, value):
 
 def filter_attention_type(qs, _, value):
     if value:
-        qs = qs.filter(attention_type__icontains=value[0])
+        qs = qs.filter(attention_type_q(value[0]))
     return qs
 
 
@@ -515,7 +512,7 @@ def filter_sale_order_by_status(qs, _, value):
 
 def filter_sale_order_by_require_attention_flag(qs, _, value):
     if value and value != 'All':
-        qs = qs.filter(attention_type__icontains=ScgpRequireAttentionTypeData.get(value).value)
+        qs = qs.filter(attention_type_q(ScgpRequireAttentionTypeData.get(value).value))
     return qs
 
 
@@ -594,15 +591,13 @@ class InputSalesOrder(InputObjectType):
 
 def suggestion_search_material_grade_gram(qs, _, value):
     if value:
-        return qs.annotate(search_text=Concat('code', Value(' - '), 'description_en')).filter(
-            search_text__icontains=value)
+        return search_by_text(qs, value, 'code', 'description_en')
     return qs
 
 
 def suggestion_search_code_slash_grade_gram(qs, _, value):
     if value:
-        return qs.annotate(search_text=Concat('code', Value(' / '), 'description_en')).filter(
-            search_text__icontains=value)
+        return search_by_text(qs, value, 'code', 'description_en')
     return qs
 
 
@@ -631,8 +626,7 @@ class ReportOrderPendingSoldToFilterInput(FilterInputObjectType):
 
 def suggestion_search_material_grade_gram_report_order_pending(qs, _, value):
     if value:
-        return qs.annotate(search_text=Concat('code', Value(' - '), 'description_th')).filter(
-            search_text__icontains=value)
+        return search_by_text(qs, value, 'code', 'description_th')
     return qs
 
 
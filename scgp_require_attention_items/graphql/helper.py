@@ -1,4 +1,3 @@
-import base64
 import json
 import logging
 import uuid
@@ -6,7 +5,6 @@ import re
 from datetime import datetime
 
 import openpyxl
-import petl as etl
 from django.db import transaction
 from django.db.models import QuerySet
 from django.utils import timezone as django_tz
@@ -19,8 +17,9 @@ from common.product_group import ProductGroup, ProductGroupDescription
 from saleor.account.models import User
 from common.enum import MulesoftServiceType
 from common.mulesoft_api import MulesoftApiRequest
+from common.util.xlsx_writer import StreamingXlsxWriter, XlsxCellStyle, export_xlsx_file
+from sap_master_data.cache import get_all_masters, get_master_by_code
 import sap_master_data.models
-from saleor.csv.utils.export import create_file_with_headers
 from sap_master_data import models as master_data_models
 from scg_checkout.graphql.enums import PendingOrderFieldHeaderColumn, ALIGNMENT_STYLE, ALIGNMENT_VERTICAL_TOP
 from sap_migration import models as sap_migrations_models
@@ -31,6 +30,7 @@ from scgp_cip.service.helper.order_line_helper import is_bom_parent, is_bom_chil
     separate_parent_and_bom_order_lines
 from scgp_export.graphql.enums import SapEnpoint, ItemCat, IPlanEndPoint
 from scgp_require_attention_items import models as scgp_require_attention_items_model
+from scgp_require_attention_items.attention_types import has_attention_type, set_attention_type
 from utils.enums import IPlanInquiryMethodCode
 
 KG_TO_TON = 1000
@@ -267,7 +267,7 @@ def stamp_class_mark_for_original_confirmed_date_from_i_plan(original_confirmed_
         if order_line.confirmed_date > original_confirmed_date:
             require_attention = scgp_require_attention_items_model.RequireAttention.objects \
                 .filter(id=order_line.id, type=order_line.type).first()
-            if "R1" in require_attention.attention_type:
+            if has_attention_type(require_attention.attention_type, "R1"):
                 add_class_mark_into_order_line(order_line, "C2", "C", 1, 4)
             else:
                 return
@@ -341,38 +341,24 @@ def update_attention_type_r1(order_lines):
         Unflag R1: request >= confirmed date or request >= confirm availability date
     """
     for lines in order_lines:
-        attention_type = lines.attention_type or ""
-        attention_list = [att.strip() for att in attention_type.split(",") if att.strip()]
-        r1_flagged = "R1" in attention_list
+        r1_flagged = has_attention_type(lines.attention_type, "R1")
         if lines.request_date and lines.confirmed_date:
-            request_before_confirmed = lines.request_date < lines.confirmed_date
-            if request_before_confirmed and not r1_flagged:
-                attention_list.append("R1")
-            elif not request_before_confirmed and r1_flagged:
-                attention_list.remove("R1")
-        lines.attention_type = ", ".join(sorted(attention_list)).strip(", ")
+            r1_flagged = lines.request_date < lines.confirmed_date
+        lines.attention_type = set_attention_type(lines.attention_type, "R1", r1_flagged)
     return order_lines
 
 
 def update_attention_type_r3(order_lines):
     for lines in order_lines:
-        attention_type = lines.attention_type
         if (
                 lines.iplan
                 and lines.sap_confirm_qty
                 and lines.iplan.iplant_confirm_quantity
                 and lines.iplan.on_hand_stock
         ):
-            iplan_confirm_quantity = lines.iplan.iplant_confirm_quantity
-            sap_confirm_qty = lines.sap_confirm_qty
-            if iplan_confirm_quantity != sap_confirm_qty:
-                attention_type = append_field(attention_type, "R3")
-                attention_type = sort_values(attention_type, 1, 5, "R")
-                lines.attention_type = attention_type
-            if iplan_confirm_quantity == lines.sap_confirm_qty and validate_attention_type("R3", attention_type):
-                tmp = lines.attention_type.split(", ")
-                tmp.remove("R3")
-                lines.attention_type = ", ".join(tmp)
+            lines.attention_type = set_attention_type(
+                lines.attention_type, "R3", lines.iplan.iplant_confirm_quantity != lines.sap_confirm_qty
+            )
     return order_lines
 
 
@@ -388,36 +374,15 @@ def parse_sap_date(date_str):
 def update_attention_type_r4(order_lines):
     for lines in order_lines:
         if lines.confirmed_date and lines.order.etd and lines.order.type == "export":
-            attention_type = lines.attention_type
-            confirmed_date = lines.confirmed_date
             etd = parse_sap_date(lines.order.etd)
             if not etd:
                 continue
-            if etd < confirmed_date:
-                attention_type = append_field(attention_type, "R4")
-                attention_type = sort_values(attention_type, 1, 5, "R")
-                lines.attention_type = attention_type
-            if etd >= confirmed_date and validate_attention_type("R4", attention_type):
-                if attention_type.count(",") > 0:
-                    new_attention_type = lines.attention_type.replace(", R4", "")
-                else:
-                    new_attention_type = lines.attention_type.replace("R4", "")
-                lines.attention_type = new_attention_type
+            lines.attention_type = set_attention_type(lines.attention_type, "R4", etd < lines.confirmed_date)
     return order_lines
 
 
-def validate_attention_type(attention_type, field):
-    if not field:
-        return False
-    return True if attention_type in field else False
-
-
 def get_attention_type(order_line_attention_type, attention_type):
-    if not order_line_attention_type:
-        return attention_type
-    if attention_type not in order_line_attention_type:
-        return ', '.join(sorted(map(lambda x: x.strip(), f"{order_line_attention_type}, {attention_type}".split(","))))
-    return order_line_attention_type
+    return set_attention_type(order_line_attention_type, attention_type)
 
 
 def update_attention_type_r5(order_lines):
@@ -841,7 +806,7 @@ def check_overdue_required_attention(order_line, date_field):
     date_field_data = getattr(order_line, date_field, None)
     if order_line and order_line.attention_type and date_field_data:
         current_date = datetime.now().date()
-        is_contain_r1 = "R1" in order_line.attention_type
+        is_contain_r1 = has_attention_type(order_line.attention_type, "R1")
         if current_date > date_field_data and is_contain_r1:
             return True
     return False
@@ -877,8 +842,10 @@ def get_request_date_of_order_line_in_database(order_line):
 
 
 def get_company_name():
-    name_list = sap_master_data.models.SalesOrganizationMaster.objects.all().values("code", "short_name")
-    mapping_data = {sale_org['code']: sale_org for sale_org in name_list}
+    sale_orgs = get_all_masters(sap_master_data.models.SalesOrganizationMaster)
+    mapping_data = {
+        sale_org.code: {"code": sale_org.code, "short_name": sale_org.short_name} for sale_org in sale_orgs
+    }
     return mapping_data
 
 
@@ -916,24 +883,65 @@ def check_line_is_container(line: dict):
     return False
 
 
-def make_order_line_for_list_order_line(order_line, mapping_order_with_order_no):
+def make_es25_order_line_enrichment(list_order_line, mapping_order_with_order_no):
+    """
+    Load eOrdering data of ES25 order lines with a few bulk queries instead of queries per line
+    @param list_order_line: order lines (dataItem) of ES25
+    @param mapping_order_with_order_no: orders (data) of ES25 by sdDoc
+    @return: dict of in-memory indexes used by make_order_line_for_list_order_line
+    """
+    so_nos = set()
+    item_nos = set()
+    bom_parent_item_nos = set()
+    for order_line in list_order_line:
+        item_no = order_line.get("itemNo", "").lstrip("0")
+        so_nos.add(order_line.get("sdDoc"))
+        item_nos.add(item_no)
+        if is_bom_parent(order_line.get("bomFlag", ""), order_line.get("parentItemNo", "")):
+            bom_parent_item_nos.add(item_no)
+
+    order_lines = {}
+    for order_line_in_database in OrderLineRepo.get_order_lines_by_so_nos_and_item_nos(so_nos, item_nos):
+        order_lines.setdefault((order_line_in_database.order_so_no, order_line_in_database.item_no),
+                               order_line_in_database)
+
+    bom_children = {}
+    if bom_parent_item_nos:
+        for child_order_line in OrderLineRepo.get_order_lines_by_so_nos_and_parent_item_nos(so_nos,
+                                                                                            bom_parent_item_nos):
+            bom_children.setdefault((child_order_line.order_so_no, child_order_line.parent_item_no),
+                                    child_order_line)
+
+    sale_org_codes = {order.get("salesOrg", "") for order in mapping_order_with_order_no.values()}
+    sale_org_short_names = dict(
+        sap_master_data.models.SalesOrganizationMaster.objects.filter(code__in=sale_org_codes).values_list(
+            "code", "short_name")
+    )
+    return {
+        "order_lines": order_lines,
+        "bom_children": bom_children,
+        "sale_org_short_names": sale_org_short_names,
+    }
+
+
+def make_order_line_for_list_order_line(order_line, mapping_order_with_order_no, enrichment=None):
     sd_doc = order_line.get("sdDoc")
     item_no = order_line.get("itemNo")
     original_request_date = order_line.get("shiptToPODate", "")
+    if enrichment is None:
+        enrichment = make_es25_order_line_enrichment([order_line], mapping_order_with_order_no)
 
-    order_line_in_database = sap_migrations_models.OrderLines.objects.filter(order__so_no=sd_doc,
-                                                                             item_no=item_no.lstrip("0")).first()
+    order_line_in_database = enrichment["order_lines"].get((sd_doc, item_no.lstrip("0")))
     sale_org_code = mapping_order_with_order_no.get(sd_doc).get('salesOrg', "")
     e_ordering_confirm_date = getattr(order_line_in_database, "confirmed_date", "")
 
     if is_bom_parent(order_line.get("bomFlag", ""), order_line.get("parentItemNo", "")):
-        child_order_line = OrderLineRepo.get_order_line_by_order_and_parent_item_no(sd_doc, item_no.lstrip("0"))
+        child_order_line = enrichment["bom_children"].get((sd_doc, item_no.lstrip("0")))
         e_ordering_confirm_date = getattr(child_order_line, "confirmed_date", "")
 
     if e_ordering_confirm_date:
         e_ordering_confirm_date = e_ordering_confirm_date.strftime(DATE_FORMAT_ISO)  # noqa
-    sale_org_short_name = sap_master_data.models.SalesOrganizationMaster.objects.filter(
-        code=sale_org_code).first().short_name
+    sale_org_short_name = enrichment["sale_org_short_names"].get(sale_org_code, "")
     status = order_line.get('status', "")
     net_value = order_line.get("netValue", 0)
     if isinstance(net_value, str):
@@ -997,10 +1005,13 @@ def calculate_qty_base(order_line, unit, qty_base):
     return f'{(float(qty_base) / 1000 if unit == "KG" else qty_base):.3f}'
 
 
-def make_list_order_line_for_sap_order_line(list_order_line_of_sold_to, mapping_order_with_order_no):
+def make_list_order_line_for_sap_order_line(list_order_line_of_sold_to, mapping_order_with_order_no,
+                                            enrichment=None):
+    if enrichment is None:
+        enrichment = make_es25_order_line_enrichment(list_order_line_of_sold_to, mapping_order_with_order_no)
     res = []
     for order_line in list_order_line_of_sold_to:
-        res.append(make_order_line_for_list_order_line(order_line, mapping_order_with_order_no))
+        res.append(make_order_line_for_list_order_line(order_line, mapping_order_with_order_no, enrichment))
     return res
 
 
@@ -1580,26 +1591,132 @@ def map_data_for_each_row_in_list_sales_order(order_line, is_order_tracking=Fals
     ]
 
 
+EXCEL_ALIGNMENT_LEFT_TOP = Alignment(horizontal='left', vertical='top')
+EXCEL_ALIGNMENT_RIGHT_TOP = Alignment(horizontal='right', vertical='top')
+
+
+def excel_qty_value(value):
+    return float(scg_round(value))
+
+
+def excel_amount_value(value):
+    return float(scg_round_2f(value))
+
+
+# header: (column width, wrap header text)
+SALES_ORDER_REPORT_COLUMNS = {
+    "Required attention flag": (None, True),
+    "Item Status": (27, False),
+    "SAP Status": (16, False),
+    "Order Tracking Status": (14, True),
+    "Create By": (54, False),
+    "Report create date-time": (24, False),
+    "Sale org": (27, False),
+    "Sales Group": (8, True),
+    "Sold to": (82, False),
+    "PO No.": (23, True),
+    "Original Request Date": (None, True),
+    "Create Date": (None, False),
+    "Req.Delivery Date": (None, True),
+    "Confirm date": (None, False),
+    "Order No.": (13, False),
+    "Order Item": (None, False),
+    "Material Code": (27, False),
+    "Material Description": (54, False),
+    "Order Qty.": (13, False),
+    "Confirm Order Qty.": (13, True),
+    "Delivery QTY.": (13, False),
+    "Pending Qty.": (13, False),
+    "Unit": (10, False),
+    "Plant": (10, False),
+    "Shipping Point": (12, True),
+    "Order Weight": (10, True),
+    "Delivery Weight": (10, True),
+    "Pending Weight": (10, True),
+    "Weight Unit": (10, True),
+    "Net Price": (15, False),
+    "Net Value": (15, False),
+    "Currency": (None, True),
+    "Pricing date": (None, True),
+    "Rejection": (None, True),
+    "Delivery block": (10, True),
+    "Overdue 1": (None, True),
+    "Overdue 2": (None, True),
+}
+SALES_ORDER_REPORT_QTY_STYLE = XlsxCellStyle(
+    alignment=EXCEL_ALIGNMENT_LEFT_TOP, number_format='#,##0.000', convert=excel_qty_value)
+SALES_ORDER_REPORT_WEIGHT_STYLE = XlsxCellStyle(
+    alignment=EXCEL_ALIGNMENT_RIGHT_TOP, number_format='#,##0.000', convert=excel_qty_value)
+SALES_ORDER_REPORT_AMOUNT_STYLE = XlsxCellStyle(
+    alignment=EXCEL_ALIGNMENT_LEFT_TOP, number_format='#,##0.00', convert=excel_amount_value)
+SALES_ORDER_REPORT_LEFT_STYLE = XlsxCellStyle(alignment=EXCEL_ALIGNMENT_LEFT_TOP)
+SALES_ORDER_REPORT_VALUE_STYLES = {
+    "PO No.": SALES_ORDER_REPORT_LEFT_STYLE,
+    "Order Qty.": SALES_ORDER_REPORT_QTY_STYLE,
+    "Confirm Order Qty.": SALES_ORDER_REPORT_QTY_STYLE,
+    "Delivery QTY.": SALES_ORDER_REPORT_QTY_STYLE,
+    "Pending Qty.": SALES_ORDER_REPORT_QTY_STYLE,
+    "Shipping Point": SALES_ORDER_REPORT_LEFT_STYLE,
+    "Order Weight": SALES_ORDER_REPORT_WEIGHT_STYLE,
+    "Delivery Weight": SALES_ORDER_REPORT_WEIGHT_STYLE,
+    "Pending Weight": SALES_ORDER_REPORT_WEIGHT_STYLE,
+    "Net Price": SALES_ORDER_REPORT_AMOUNT_STYLE,
+    "Net Value": SALES_ORDER_REPORT_AMOUNT_STYLE,
+    "Rejection": SALES_ORDER_REPORT_LEFT_STYLE,
+    "Overdue 1": SALES_ORDER_REPORT_LEFT_STYLE,
+    "Overdue 2": SALES_ORDER_REPORT_LEFT_STYLE,
+}
+
+
+def make_excel_writer_for_sales_order_report(file_headers):
+    """
+    Writer with the header row and the column styles of the sales order report
+    @return: writer, style by column of order line rows, style by column of summary rows
+    """
+    column_widths = {}
+    header_styles = {}
+    line_styles = {}
+    summary_styles = {}
+    for column, header in enumerate(file_headers, 1):
+        width, wrap_header = SALES_ORDER_REPORT_COLUMNS.get(header, (None, False))
+        if width:
+            column_widths[column] = width
+        header_styles[column] = XlsxCellStyle(alignment=ALIGNMENT_STYLE if wrap_header else ALIGNMENT_VERTICAL_TOP)
+        value_style = SALES_ORDER_REPORT_VALUE_STYLES.get(header)
+        if value_style:
+            line_styles[column] = value_style
+            # summary weights stay left aligned next to "Total (ทั้งหมด)"
+            summary_styles[column] = SALES_ORDER_REPORT_QTY_STYLE if value_style is SALES_ORDER_REPORT_WEIGHT_STYLE \
+                else value_style
+    writer = StreamingXlsxWriter(column_widths)
+    writer.append(file_headers, column_styles=header_styles, height=50)
+    return writer, line_styles, summary_styles
+
+
 def make_excel_from_list_of_sale_order_sap(list_of_sale_order_sap, is_order_tracking):
+    """
+    Sales order report in one pass, styles are applied while writing
+    @return: (base64 content, download url), see export_xlsx_file
+    """
     file_headers = file_headers_for_sold_to_group_in_list_sales_order(is_order_tracking)
-    temporary_file = create_file_with_headers(file_headers, ",", "xlsx")
+    writer, line_styles, summary_styles = make_excel_writer_for_sales_order_report(file_headers)
     for group in list_of_sale_order_sap:
-        row_group = [["Sold to - Code - Name"]]
+        row_group = ["Sold to - Code - Name"]
         order_lines = group['order_lines']
         sold_to_code_name = order_lines[0]["sold_to"]
-        row_group[0].append("")
-        row_group[0].append("")
+        row_group.append("")
+        row_group.append("")
         if is_order_tracking:
-            row_group[0].append("")
-        row_group[0].append(sold_to_code_name)
+            row_group.append("")
+        row_group.append(sold_to_code_name)
+        writer.append(row_group)
         for order_line in order_lines:
             _row = map_data_for_each_row_in_list_sales_order(order_line, is_order_tracking)
-            row_group.append(_row)
+            writer.append(_row, column_styles=line_styles)
         row_summary = ["Summary"]
         for i in range(16 if is_order_tracking else 15):
             row_summary.append("")
         summary = group['summary']
-        _row_val_for_summary = []
         i = 0
         for key, val in summary.items():
             i += 1
@@ -1624,12 +1741,11 @@ def make_excel_from_list_of_sale_order_sap(list_of_sale_order_sap, is_order_trac
                     row_summary.append("")
             else:
                 row_summary.append(val)
-        row_group.append(row_summary)
+        writer.append(row_summary, column_styles=summary_styles)
 
         quantity_data = summary['quantity_data'][1:]
         for data in quantity_data:
             row_summary = []
-            i = 0
             for i in range(17 if is_order_tracking else 16):
                 row_summary.append("")
             row_summary.append("Total(" + data['quantity_unit'] + ")")
@@ -1638,154 +1754,11 @@ def make_excel_from_list_of_sale_order_sap(list_of_sale_order_sap, is_order_trac
             row_summary.append(data['delivery_qty'])
             row_summary.append(data['pending_qty'])
             row_summary.append(data['quantity_unit'])
-            row_group.append(row_summary)
-
-        etl.io.xlsx.appendxlsx(row_group, temporary_file.name, write_header=True)
-
-    set_excel_column_style_for_sales_order_report(temporary_file)
-
-    with open(temporary_file.name, "rb") as exported_file:
-        base64_file = base64.b64encode(exported_file.read())
-    return base64_file.decode("utf-8")
-
-
-def set_excel_column_style_for_sales_order_report(temporary_file):
-    wb = openpyxl.load_workbook(temporary_file)
-    ws = wb.active
-    for i, row in enumerate(ws.iter_rows(values_only=False)):
-        row_bold = False
-        for cell in row:
-            if isinstance(cell.value, str):
-                if "Required attention flag" in cell.value:
-                    set_style(ws, f'{cell.column_letter}', cell.row, alignment_style=True, auto_size=False)
-                    ws.row_dimensions[cell.row].height = 50
-                if "Item Status" in cell.value:
-                    set_style(ws, 'B', cell.row, 27, False)
-                if "SAP Status" in cell.value:
-                    set_style(ws, f'{cell.column_letter}', cell.row, width=16, alignment_style=False, auto_size=True)
-                if "Order Tracking Status" in cell.value:
-                    set_style(ws, f'{cell.column_letter}', cell.row, width=14, alignment_style=True, auto_size=False)
-                if "Create By" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=54, alignment_style=False)
-                if "Report create date-time" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=24, alignment_style=False)
-                if "Sale org" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=27, alignment_style=False)
-                if "Sales Group" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=8, alignment_style=True,
-                              auto_size=False)
-                if "Sold to" == cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=82, alignment_style=False)
-                if "PO No." in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=23, alignment_style=True,
-                              auto_size=False,
-                              wrap_cell_value=True,
-                              min_row=cell.row + 1, min_col=cell.column, max_col=cell.column,
-                              cell_value_alignment_horizontal_left=True)
-                if "Original Request Date" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, alignment_style=True,
-                              auto_size=False)
-                if "Create Date" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, alignment_style=False,
-                              auto_size=True)
-                if "Req.Delivery Date" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, alignment_style=True,
-                              auto_size=False)
-                if "Confirm date" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, alignment_style=False,
-                              auto_size=True)
-                if "Order No." in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=13, alignment_style=False)
-                if "Order Item" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, alignment_style=False,
-                              auto_size=True)
-                if "Material Code" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=27, alignment_style=False)
-                if "Material Description" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=54, alignment_style=False)
-                if "Order Qty." in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=13, alignment_style=False,
-                              number_format='#,##0.000',
-                              two_decimal=False, min_row=2, min_col=cell.column, max_col=cell.column)
-                if "Confirm Order Qty." in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=13, alignment_style=True,
-                              auto_size=False,
-                              number_format='#,##0.000', min_row=2, min_col=cell.column, max_col=cell.column,
-                              two_decimal=False)
-                if "Delivery QTY." in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=13, alignment_style=False,
-                              number_format='#,##0.000', min_row=2, min_col=cell.column, max_col=cell.column,
-                              two_decimal=False)
-                if "Pending Qty." in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=13, alignment_style=False,
-                              number_format='#,##0.000', min_row=2, min_col=cell.column, max_col=cell.column,
-                              two_decimal=False)
-                if "Unit" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=10, alignment_style=False)
-                if "Plant" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=10, alignment_style=False)
-                if "Shipping Point" in cell.value:
-                    logging.info(f"cell value {cell.value} and cell letter {cell.column_letter}")
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=12, alignment_style=True,
-                              auto_size=False,
-                              cell_value_alignment_horizontal_left=True, min_row=2, min_col=cell.column,
-                              max_col=cell.column)
-                if "Order Weight" in cell.value:
-                    logging.info(f"cell value {cell.value} and cell letter {cell.column_letter}")
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=10, alignment_style=True,
-                              number_format='#,##0.000', min_row=2, min_col=cell.column, max_col=cell.column,
-                              two_decimal=False)
-                if "Delivery Weight" in cell.value:
-                    logging.info(f"cell value {cell.value} and cell letter {cell.column_letter}")
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=10, alignment_style=True,
-                              number_format='#,##0.000', min_row=2, min_col=cell.column, max_col=cell.column,
-                              two_decimal=False)
-                if "Pending Weight" in cell.value:
-                    logging.info(f"cell value {cell.value} and cell letter {cell.column_letter}")
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=10, alignment_style=True,
-                              number_format='#,##0.000', min_row=2, min_col=cell.column, max_col=cell.column,
-                              two_decimal=False)
-                if "Weight Unit" in cell.value:
-                    logging.info(f"cell value {cell.value} and cell letter {cell.column_letter}")
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=10, alignment_style=True,
-                              auto_size=False)
-                if "Net Price" in cell.value:
-                    logging.info(f"cell value {cell.value} and cell letter {cell.column_letter}")
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=15, alignment_style=False,
-                              number_format='#,##0.00', min_row=2, min_col=29, max_col=29, two_decimal=True,
-                              alignment_horizontal_right=True)
-                if "Net Value" in cell.value:
-                    logging.info(f"cell value {cell.value} and cell letter {cell.column_letter}")
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=15, alignment_style=False,
-                              number_format='#,##0.00', min_row=2, min_col=30, max_col=30, two_decimal=True,
-                              alignment_horizontal_right=True)
-                if "Currency" in cell.value:
-                    logging.info(f"cell value {cell.value} and cell letter {cell.column_letter}")
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, alignment_style=True,
-                              auto_size=' False')
-                if "Pricing date" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, alignment_style=True,
-                              auto_size=' False')
-
-                if "Rejection" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, alignment_style=True,
-                              auto_size=' False',
-                              cell_value_alignment_horizontal_left=True, min_row=1, min_col=cell.column,
-                              max_col=cell.column)
-                if "Delivery block" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, width=10, alignment_style=True,
-                              auto_size=' False')
-                if "Overdue 1" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, alignment_style=True,
-                              auto_size=' False',
-                              cell_value_alignment_horizontal_left=True, min_row=1, min_col=cell.column,
-                              max_col=cell.column)
-                if "Overdue 2" in cell.value:
-                    set_style(ws, column=f'{cell.column_letter}', row_number=cell.row, alignment_style=True,
-                              auto_size=' False',
-                              cell_value_alignment_horizontal_left=True, min_row=1, min_col=cell.column,
-                              max_col=cell.column)
-    wb.save(temporary_file.name)
+            writer.append(row_summary, column_styles=summary_styles)
+
+    temporary_file = writer.save()
+    file_name = f'Sales_Order_Report_{datetime.now(timezone("Asia/Bangkok")).strftime("%d%m%Y")}.xlsx'
+    return export_xlsx_file(temporary_file, file_name)
 
 
 def get_order_from_order_line(order_line):
@@ -1917,21 +1890,21 @@ def prepare_sale_org_list_for_es25_order_confirmation(filter_input):
 def get_distribution_channel_id_from_code(code):
     if not code:
         return None
-    instance = master_data_models.DistributionChannelMaster.objects.filter(code=code).first()
+    instance = get_master_by_code(master_data_models.DistributionChannelMaster, code)
     return instance or None
 
 
 def get_sales_org_id_from_code(code):
     if not code:
         return None
-    instance = master_data_models.SalesOrganizationMaster.objects.filter(code=code).first()
+    instance = get_master_by_code(master_data_models.SalesOrganizationMaster, code)
     return instance or None
 
 
 def get_division_id_from_code(code):
     if not code:
         return None
-    instance = master_data_models.DivisionMaster.objects.filter(code=code).first()
+    instance = get_master_by_code(master_data_models.DivisionMaster, code)
     return instance or None
 
 
@@ -1952,21 +1925,21 @@ def get_sales_orgs_by_codes(codes):
 def get_incoterms_id_from_code(code):
     if not code:
         return None
-    instance = master_data_models.Incoterms1Master.objects.filter(code=code).first()
+    instance = get_master_by_code(master_data_models.Incoterms1Master, code)
     return instance or None
 
 
 def get_customer_group_id_from_code(code):
     if not code:
         return None
-    instance = master_data_models.CustomerGroupMaster.objects.filter(code=code).first()
+    instance = get_master_by_code(master_data_models.CustomerGroupMaster, code)
     return instance or None
 
 
 def get_customer_group1_id_from_code(code):
     if not code:
         return None
-    instance = master_data_models.CustomerGroup1Master.objects.filter(code=code).first()
+    instance = get_master_by_code(master_data_models.CustomerGroup1Master, code)
     return instance or None
 
 
@@ -1987,7 +1960,7 @@ def get_sales_office_group_id_from_code(code):
 def get_currency_id_from_code(code):
     if not code:
         return None
-    instance = sap_migrations_models.CurrencyMaster.objects.filter(code=code).first()
+    instance = get_master_by_code(sap_migrations_models.CurrencyMaster, code)
     return instance or None
 
 
@@ -30,10 +30,12 @@ from scgp_require_attention_items.graphql.enums import (
 
 from sap_migration import models as sap_migrations_models
 from sap_master_data import models as sap_master_data_models
+from scgp_require_attention_items.attention_types import attention_type_q
 from scgp_require_attention_items.graphql.helper import (
     convert_to_ton,
     prepare_param_for_es25,
     make_list_order_line_for_sap_order_line,
+    make_es25_order_line_enrichment,
     make_summary_for_sold_to_from_order_line_in_es25,
     prepare_param_for_es25_order_pending,
     make_excel_from_list_of_sale_order_sap,
@@ -57,7 +59,7 @@ def resolve_require_attention_enum(enum):
 
 
 def resolve_filter_require_attention_view_all():
-    return sap_migrations_models.OrderLines.objects.filter(attention_type__icontains="R").exclude(
+    return sap_migrations_models.OrderLines.objects.filter(attention_type_q()).exclude(
         Q(order__status__in=["draft", "confirmed"])
     ).all()
 
@@ -71,7 +73,7 @@ def resolve_customer_contract_all():
 
 
 def resolve_filter_require_attention_view_by_role(role):
-    qs = sap_migrations_models.OrderLines.objects.filter(attention_type__icontains="R").exclude(
+    qs = sap_migrations_models.OrderLines.objects.filter(attention_type_q()).exclude(
         order__status__in=["draft", "confirmed"]
     ).exclude(
         status__in=["Disable", "Delete", ""]
@@ -665,7 +667,7 @@ def filter_sales_order_in_database(list_order_line_of_sold_to, mapping_order_wit
     kwargs_filter = Q(**{'order__so_no__in': list_so_no})
 
     if attention_type:
-        kwargs_filter &= Q(**{'attention_type__icontains': attention_type})
+        kwargs_filter &= attention_type_q(attention_type)
         list_so_no_and_item_no = sap_migrations_models.OrderLines.objects.filter(kwargs_filter).exclude(
             item_no__iexact='').exclude(item_no__isnull=True).values('order__so_no', 'item_no')
 
@@ -717,6 +719,9 @@ def resolve_list_of_sale_order_sap(input_data, info):
     sold_to_list = [order.get('soldTo') for order in sap_orders_from_api]
     filtered_otc_sold_to_list = SoldToMasterRepo.filter_otc_sold_to_from_sold_to_list(set(sold_to_list),
                                                                                       OTC_ACCOUNT_GROUPS)
+    order_lines_by_sd_doc = {}
+    for order_line in data_items_from_api:
+        order_lines_by_sd_doc.setdefault(order_line.get("sdDoc"), []).append(order_line)
 
     for order in sap_orders_from_api:
         sold_to = order.get('soldTo')
@@ -734,10 +739,12 @@ def resolve_list_of_sale_order_sap(input_data, info):
             sold_grouping_dic_key_sold_to[sold_grouping_dic_key] = sold_to
 
         mapping_sold_to_with_order[sold_grouping_dic_key].append(sales_document_number)
-        mapping_order_with_order_lines[sales_document_number] = [order_line for order_line in data_items_from_api if
-                                                                 order_line.get("sdDoc") == sales_document_number]
+        mapping_order_with_order_lines[sales_document_number] = order_lines_by_sd_doc.get(sales_document_number, [])
         mapping_order_with_order_no[sales_document_number] = order
 
+    # one set of queries for the eOrdering data of all lines, not per line
+    enrichment = make_es25_order_line_enrichment(data_items_from_api, mapping_order_with_order_no)
+
     for sold_to_code, list_order_no_of_sold_to in mapping_sold_to_with_order.items():
         list_order_line_of_sold_to = []
         for order_no in list_order_no_of_sold_to:
@@ -756,6 +763,7 @@ def resolve_list_of_sale_order_sap(input_data, info):
         order_lines = make_list_order_line_for_sap_order_line(
             list_order_line_of_sold_to,
             mapping_order_with_order_no,
+            enrichment,
         )
         row = {
             "total_sold_to": total_sold_to,
@@ -870,9 +878,11 @@ def resolve_download_list_of_sale_order_excel(input_data, info):
         return {}
     sort_data_in_desc_or_asc(input_data, list_of_sale_order_sap)
     is_order_tracking = input_data.get('is_order_tracking', False)
-    list_of_sale_order_sap_to_excel = make_excel_from_list_of_sale_order_sap(list_of_sale_order_sap, is_order_tracking)
+    list_of_sale_order_sap_to_excel, download_url = make_excel_from_list_of_sale_order_sap(list_of_sale_order_sap,
+                                                                                         is_order_tracking)
     return {
-        'excel': list_of_sale_order_sap_to_excel
+        'excel': list_of_sale_order_sap_to_excel,
+        'download_url': download_url,
     }
 
 
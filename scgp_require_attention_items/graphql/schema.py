@@ -29,6 +29,7 @@ from scgp_export.graphql.resolvers.connections import (
     resolve_connection_slice,
     resolve_connection_slice_for_overdue
 )
+from scgp_export.graphql.resolvers.connection_counts import CountMode
 from scgp_export.graphql.types import ExportOrder, StockOnHandReport
 from scgp_require_attention_items.graphql.enums import ScgpRequireAttentionTypeData, SourceOfAppData
 from scgp_require_attention_items.graphql.filters import (
@@ -229,7 +230,7 @@ class RequireAttentionItemsQueries(graphene.ObjectType):
         if confirmed_date:
             validate_overdue_2(confirmed_date)
         return resolve_connection_slice_for_overdue(
-            qs, info, kwargs, RequireAttentionItemsCountTableConnection
+            qs, info, kwargs, RequireAttentionItemsCountTableConnection, CountMode.CAPPED
         )
 
     @staticmethod
@@ -25,6 +25,7 @@ from scgp_export.graphql.resolvers.connections import resolve_connection_slice
 from scgp_export.graphql.resolvers.export_sold_tos import resolve_display_text,resolve_sold_to_name
 
 from scgp_export.graphql.types import ScgCountableConnection
+from scgp_require_attention_items.attention_types import has_attention_type
 from scgp_require_attention_items.graphql.enums import (
     SaleOrderStatusEnum,
     MaterialPricingGroupEnum,
@@ -398,9 +399,7 @@ class RequireAttentionItemView(ModelObjectType):
 
     @staticmethod
     def resolve_flag_r5(root, info):
-        if root.attention_type and "R5" in root.attention_type:
-            return True
-        return False
+        return has_attention_type(root.attention_type, "R5")
 
     @staticmethod
     def resolve_item_status_en(root, info):
@@ -1229,6 +1228,7 @@ class ReasonForRejectInput(graphene.InputObjectType):
 
 class SAPListOfSaleOrderAndExcel(graphene.ObjectType):
     excel = graphene.String()
+    download_url = graphene.String(description="Link to download a large excel instead of base64 excel")
     list_of_sale_order_sap = graphene.List(
         SAPListOfSaleOrder
     )
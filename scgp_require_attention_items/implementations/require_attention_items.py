@@ -1,11 +1,13 @@
 import copy
 import datetime
 import logging
+from functools import partial
 
 from django.core.exceptions import ImproperlyConfigured, ValidationError
 from django.db import transaction
 from django.db.models import F
 
+from common.mulesoft_api import MulesoftApiRequest
 from sap_migration import models as sap_migrations_models
 from scg_checkout.graphql.enums import IPlanOrderStatus
 from scg_checkout.graphql.helper import update_order_status
@@ -13,13 +15,12 @@ from scg_checkout.graphql.resolves.orders import call_sap_es26
 from scgp_export.graphql.enums import ScgpExportOrder
 from scgp_export.graphql.helper import handle_item_no_flag, sync_export_order_from_es26
 from scgp_export.implementations.orders import validate_when_status_is_partial_delivery
+from scgp_require_attention_items.attention_types import set_attention_type
 from scgp_require_attention_items.error_codes import ScgpRequireAttentionItemsErrorCode
 from scgp_require_attention_items.graphql.helper import (
     add_class_mark_into_order_line,
-    append_field,
     is_valid_param_e21,
     send_params_to_es21,
-    sort_values,
     stamp_class_mark_for_require_attention_change_request_date,
 )
 from scgp_require_attention_items.graphql.resolvers.require_attention_items import (
@@ -228,22 +229,9 @@ def accept_confirm_date(lines, info):
 
 
 def update_attention_type_accept_confirmed_date(order_line, request_date):
-    attention_type = order_line.attention_type
-    attention_type_comma = attention_type.count(",")
-    confirmed_date = order_line.confirmed_date
-    if request_date == confirmed_date and (
-        "R1" in attention_type if attention_type else False
-    ):
-        if attention_type_comma > 0:
-            new_attention_type = order_line.attention_type.replace("R1, ", "")
-            order_line.attention_type = new_attention_type
-        else:
-            new_attention_type = order_line.attention_type.replace("R1", "")
-            order_line.attention_type = new_attention_type
-    if request_date != confirmed_date:
-        attention_type = append_field(attention_type, "R1")
-        attention_type = sort_values(attention_type, 1, 4, "R")
-        order_line.attention_type = attention_type
+    order_line.attention_type = set_attention_type(
+        order_line.attention_type, "R1", request_date != order_line.confirmed_date
+    )
     order_line.save()
 
 
@@ -362,10 +350,7 @@ def edit_require_attention_items(lines, info):
             failed, success = handle_edit_success_failed(
                 order_lines, order, lines, manager, failed, success, line_dict, params
             )
-
-            so_no = order.so_no
-            response = call_sap_es26(so_no=so_no, sap_fn=manager.call_api_sap_client)
-            sync_export_order_from_es26(response)
+        sync_orders_from_es26(orders, manager)
         return success, failed
 
     except Exception as e:
@@ -396,6 +381,20 @@ def handle_edit_success_failed(
     return failed, success
 
 
+def sync_orders_from_es26(orders, manager):
+    """Refresh the edited orders from ES26, the SAP calls run concurrently"""
+    responses = MulesoftApiRequest.batch_call(
+        [
+            partial(
+                call_sap_es26, so_no=order.so_no, sap_fn=manager.call_api_sap_client
+            )
+            for order in orders
+        ]
+    )
+    for response in responses:
+        sync_export_order_from_es26(response)
+
+
 def handle_input_order_lines(lines):
     line_dict = {int(line["id"]): line for line in lines}
     if not lines:
@@ -426,9 +425,7 @@ def accept_confirm_date_items(lines, info):
                 success,
                 params,
             )
-            so_no = order.so_no
-            response = call_sap_es26(so_no=so_no, sap_fn=manager.call_api_sap_client)
-            sync_export_order_from_es26(response)
+        sync_orders_from_es26(orders, manager)
         return success, failed
 
     except Exception as e:
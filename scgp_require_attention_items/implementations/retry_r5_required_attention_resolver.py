@@ -1,34 +1,49 @@
 import ast
 import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 
 from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
 
 from common.enum import MulesoftServiceType
 from common.helpers import parse_json_if_possible
-from common.models import MulesoftLog
+from common.models import MulesoftLog, MulesoftRetry, MulesoftRetryStatus
 from common.mulesoft_api import MulesoftApiRequest
+from common.util.log_shipper import ship_logs
+from common.util.middleware.scgp_threadlocal_middleware import (
+    THREAD_LOCAL_KEY_M,
+    THREAD_LOCAL_KEY_METRIC,
+    clear_thread_local,
+    get_active_thread_local,
+)
 from sap_migration.models import OrderLines
 from scg_checkout.graphql.helper import get_iplan_error_messages
+from scgp_require_attention_items.attention_types import (
+    attention_type_q,
+    set_attention_type,
+)
 from scgp_export.graphql.enums import SapEnpoint
 from scgp_po_upload.graphql.enums import IPlanAcknowledge
 from scgp_require_attention_items.graphql.enums import IPlanEndpoint
 
 RETRY_COUNT = settings.RETRY_COUNT
-BATCH_SIZE = settings.BATCH_SIZE
 FEATURE_SPLIT_ITEM = "SplitItem"
 
 
 def cancel_retry_and_reset_required_atttn(api_log):
     # identify order line ids against which R5 flag will be reset
-    order_lines = OrderLines.objects.filter(order_id=api_log.orderid).all()
+    order_lines = OrderLines.objects.filter(order_id=api_log.orderid).filter(
+        attention_type_q("R5")
+    )
     for order_line in order_lines:
-        tmp = order_line.attention_type.split(", ")
-        if "R5" in tmp:
-            tmp.remove("R5")
-        order_line.attention_type = ", ".join(tmp)
-        order_line.save()
+        order_line.attention_type = set_attention_type(
+            order_line.attention_type, "R5", flagged=False
+        )
+    OrderLines.objects.bulk_update(order_lines, ["attention_type"])
 
     # update retry count to 0 in mulesoft api log table
     api_log.retry = False
@@ -58,7 +73,9 @@ def retry_iplan_update_order_split(api_log):
         logging.warning(
             f"[R5-Retry][YT-65838 split order] skipping call to Yt-65838 as split_items is empty:{split_elements}"
         )
-        return
+        # nothing left to split, the retry is finished
+        cancel_retry_and_reset_required_atttn(api_log)
+        return True
     order_line_split_request["updateId"] = str(uuid.uuid1().int)
     split_items_request = {"OrderLineSplitRequest": order_line_split_request}
     try:
@@ -83,14 +100,15 @@ def retry_iplan_update_order_split(api_log):
                 "[R5-Retry][YT-65838 split order]  Failed to retry API request for Yt-65838."
             )
             increment_retry_count(api_log)
-        else:
-            cancel_retry_and_reset_required_atttn(api_log)
-
+            return False
+        cancel_retry_and_reset_required_atttn(api_log)
+        return True
     except Exception as e:
         logging.exception(
             f"[R5-Retry][YT-65838 split order]  Exception while split: {e}"
         )
         increment_retry_count(api_log)
+        return False
 
 
 def get_iplan_split_error_messages(iplan_response):
@@ -123,13 +141,15 @@ def retry_iplan_confirm(api_log):
                 f"iplan_confirm retry api failed because of : {i_plan_error_messages}"
             )
             increment_retry_count(api_log)
-            return
+            return False
         cancel_retry_and_reset_required_atttn(api_log)
+        return True
     except Exception:
         logging.exception(
             "Some error has occurred while invoking call_iplan_confirm_update_order api"
         )
         increment_retry_count(api_log)
+        return False
 
 
 def retry_es_21(api_log):
@@ -157,13 +177,15 @@ def retry_es_21(api_log):
         if error_messages:
             logging.error("ES21 retry api failed because of ", error_messages)
             increment_retry_count(api_log)
-            return
+            return False
         cancel_retry_and_reset_required_atttn(api_log)
+        return True
     except Exception:
         logging.exception(
             "Some error has occurred while invoking call_es_21_update_order api "
         )
         increment_retry_count(api_log)
+        return False
 
 
 def populate_new_request_id(api_log, param_name):
@@ -211,37 +233,144 @@ def retry_iplan_update_order(api_log):
                 f"I_PLAN_UPDATE_ORDER retry api failed because of : {i_plan_error_messages}"
             )
             increment_retry_count(api_log)
-            return
+            return False
         cancel_retry_and_reset_required_atttn(api_log)
+        return True
     except Exception:
         logging.exception(
             "Some error has occurred while invoking call_I_PLAN_UPDATE_ORDER_update_order api"
         )
         increment_retry_count(api_log)
+        return False
+
+
+def get_retry_function(url):
+    if SapEnpoint.ES_21.value in url:
+        return retry_es_21
+    if IPlanEndpoint.IPLAN_CONFIRM_URL.value in url:
+        return retry_iplan_confirm
+    if IPlanEndpoint.I_PLAN_UPDATE_ORDER.value in url:
+        return retry_iplan_update_order
+    if IPlanEndpoint.I_PLAN_SPLIT.value in url:
+        return retry_iplan_update_order_split
+    return None
 
 
 def retry_r5_required_attention_resolver():
+    """
+    Retry the queued Mulesoft api calls (MulesoftRetry) which are due.
+    Orders are retried in parallel, the retries of an order one after another
+    in the order they were queued.
+    """
     try:
         logging.info("Going to start retrying process!")
-
-        log_count = MulesoftLog.objects.filter(
-            retry=True, retry_count__lte=RETRY_COUNT
-        ).count()
-
-        for i in range(0, log_count, BATCH_SIZE):
-            api_log_list_batch = MulesoftLog.objects.filter(
-                retry=True, retry_count__lte=RETRY_COUNT
-            ).order_by("updated_at")[i : i + BATCH_SIZE]
-
-            for api_log in api_log_list_batch:
-
-                if SapEnpoint.ES_21.value in api_log.url:
-                    retry_es_21(api_log)
-                elif IPlanEndpoint.IPLAN_CONFIRM_URL.value in api_log.url:
-                    retry_iplan_confirm(api_log)
-                elif IPlanEndpoint.I_PLAN_UPDATE_ORDER.value in api_log.url:
-                    retry_iplan_update_order(api_log)
-                elif IPlanEndpoint.I_PLAN_SPLIT.value in api_log.url:
-                    retry_iplan_update_order_split(api_log)
+        retries = claim_retries(settings.R5_RETRY_BATCH_SIZE)
+        if not retries:
+            return
+        logging.info(f"[R5-Retry] claimed {len(retries)} retries")
+        max_workers = min(settings.R5_RETRY_MAX_WORKERS, len(retries))
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="r5-retry"
+        ) as executor:
+            list(executor.map(run_order_retries, retries))
     except Exception as e:
         logging.exception("An error occurred while processing: %s", str(e))
+
+
+def claim_retries(limit, orderid=None):
+    """
+    Lease due retries with SELECT ... FOR UPDATE SKIP LOCKED.
+    Only the oldest unfinished retry of an order can be claimed, so retries of an
+    order never run concurrently or out of order.
+    @param limit: max number of retries to claim
+    @param orderid: claim the next retry of this order only
+    @return: list of claimed MulesoftRetry
+    """
+    now = timezone.now()
+    unfinished = [MulesoftRetryStatus.PENDING, MulesoftRetryStatus.RUNNING]
+    older_unfinished = MulesoftRetry.objects.filter(
+        orderid=OuterRef("orderid"), id__lt=OuterRef("id"), status__in=unfinished
+    )
+    queryset = MulesoftRetry.objects.filter(
+        ~Exists(older_unfinished), status__in=unfinished, next_attempt_at__lte=now
+    )
+    if orderid is not None:
+        queryset = queryset.filter(orderid=orderid)
+    with transaction.atomic():
+        retries = list(
+            queryset.select_for_update(skip_locked=True).order_by("id")[:limit]
+        )
+        lease_until = now + timedelta(seconds=settings.R5_RETRY_LEASE)
+        MulesoftRetry.objects.filter(id__in=[retry.id for retry in retries]).update(
+            status=MulesoftRetryStatus.RUNNING, next_attempt_at=lease_until
+        )
+    return retries
+
+
+def run_order_retries(retry):
+    """Run a claimed retry, then the next retries of its order while they succeed"""
+    clear_thread_local()
+    try:
+        while retry:
+            if not run_retry(retry) or retry.orderid is None:
+                break
+            retry = next(iter(claim_retries(1, orderid=retry.orderid)), None)
+        ship_logs(
+            get_active_thread_local(THREAD_LOCAL_KEY_M),
+            get_active_thread_local(THREAD_LOCAL_KEY_METRIC),
+        )
+    except Exception as e:
+        logging.exception(f"[R5-Retry] error when retrying order {retry.orderid}: {e}")
+    finally:
+        clear_thread_local()
+        connections.close_all()
+
+
+def run_retry(retry):
+    """
+    Run one retry and update it: done, pending again after a backoff or failed
+    once all attempts are used
+    @return: whether the retry succeeded
+    """
+    api_log = MulesoftLog.objects.filter(id=retry.mulesoft_log_id).first()
+    retry_function = api_log and get_retry_function(api_log.url or "")
+    success = False
+    if not api_log:
+        retry.last_error = "Mulesoft api log not found"
+    elif not retry_function:
+        retry.last_error = f"No retry for {api_log.url}"
+    else:
+        try:
+            success = retry_function(api_log) is True
+        except Exception as e:
+            logging.exception(f"[R5-Retry] retry {retry.id} error: {e}")
+            retry.last_error = str(e)[:255]
+        retry.attempts += 1
+
+    if success:
+        retry.status = MulesoftRetryStatus.DONE
+    elif retry_function and retry.attempts <= RETRY_COUNT:
+        retry.status = MulesoftRetryStatus.PENDING
+        retry.next_attempt_at = timezone.now() + timedelta(
+            seconds=get_retry_backoff(retry.attempts)
+        )
+    else:
+        retry.status = MulesoftRetryStatus.FAILED
+    retry.save(
+        update_fields=[
+            "status",
+            "attempts",
+            "next_attempt_at",
+            "last_error",
+            "updated_at",
+        ]
+    )
+    return success
+
+
+def get_retry_backoff(attempts):
+    """Seconds to wait after the n-th failed attempt"""
+    return min(
+        settings.R5_RETRY_BACKOFF_BASE * 2 ** max(attempts - 1, 0),
+        settings.R5_RETRY_BACKOFF_MAX,
+    )
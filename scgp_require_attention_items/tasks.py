@@ -13,6 +13,7 @@ from saleor.celeryconf import CustomLogBaseTask, app
 from saleor.plugins.manager import PluginsManager, get_plugins_manager
 from sap_migration import models as sap_migrations_models
 from scgp_record_cleanup.implementation.sqslog_cleanup import cleanup
+from scgp_require_attention_items.attention_types import attention_type_q
 from scgp_user_management.models import EmailConfigurationInternal, EmailInternalMapping
 
 # TODO: check import error on worker
@@ -28,19 +29,11 @@ def send_email_via_r2_and_r4():
         sap_migrations_models.OrderLines.objects.filter(
             order__distribution_channel__code="30"
         )
-        .filter(Q(attention_type__icontains="R2") | Q(attention_type__icontains="R4"))
+        .filter(attention_type_q("R2", "R4"))
         .values("order__distribution_channel__code")
-        .annotate(r2=Count("id", filter=Q(attention_type__icontains="R2")))
-        .annotate(r4=Count("id", filter=Q(attention_type__icontains="R4")))
-        .annotate(
-            r2_r4=Count(
-                "id",
-                filter=(
-                    Q(attention_type__icontains="R2")
-                    | Q(attention_type__icontains="R4")
-                ),
-            )
-        )
+        .annotate(r2=Count("id", filter=attention_type_q("R2")))
+        .annotate(r4=Count("id", filter=attention_type_q("R4")))
+        .annotate(r2_r4=Count("id"))
     )
     if not order_lines:
         return
@@ -0,0 +1,83 @@
+from unittest import mock
+
+import pytest
+
+from sap_master_data.models import DistributionChannelMaster
+from sap_migration.models import Order, OrderLines
+from scgp_require_attention_items.attention_types import (
+    attention_type_q,
+    has_attention_type,
+    parse_attention_types,
+    set_attention_type,
+)
+from scgp_require_attention_items.tasks import send_email_via_r2_and_r4
+
+
+def test_parse_attention_types():
+    assert parse_attention_types("R1, r3,,R5 ") == ["R1", "R3", "R5"]
+    assert parse_attention_types("") == []
+    assert parse_attention_types(None) == []
+
+
+def test_set_attention_type_adds_and_removes_flag():
+    assert set_attention_type("R3, R1", "R2") == "R1, R2, R3"
+    assert set_attention_type("R1, R2", "R2") == "R1, R2"
+    assert set_attention_type("R1, R2", "R2", flagged=False) == "R1"
+    assert set_attention_type("R1", "R2", flagged=False) == "R1"
+    assert set_attention_type(None, "R5") == "R5"
+    assert set_attention_type("", "R5", flagged=False) == ""
+
+
+def test_has_attention_type_matches_whole_flags():
+    assert has_attention_type("R1, R5", "R5")
+    assert not has_attention_type("R15", "R5")
+    assert not has_attention_type("R1, R15", "R5")
+    assert not has_attention_type("", "R5")
+    assert not has_attention_type(None, "R5")
+
+
+@pytest.fixture
+def flagged_order_lines(db):
+    order = Order.objects.create(
+        distribution_channel=DistributionChannelMaster.objects.create(code="30")
+    )
+    other_order = Order.objects.create(
+        distribution_channel=DistributionChannelMaster.objects.create(code="10")
+    )
+    order_lines = {
+        attention_type: OrderLines.objects.create(
+            order=order, attention_type=attention_type
+        )
+        for attention_type in ["R2", "R4", "R2, R4", "R1,r4", "R14", "R25", "", None]
+    }
+    OrderLines.objects.create(order=other_order, attention_type="R2, R4")
+    return order_lines
+
+
+def test_attention_type_q_filters_by_flag(flagged_order_lines):
+    def attention_types(*flags):
+        return set(
+            OrderLines.objects.filter(
+                attention_type_q(*flags), order__distribution_channel__code="30"
+            ).values_list("attention_type", flat=True)
+        )
+
+    assert attention_types("R4") == {"R4", "R2, R4", "R1,r4"}
+    assert attention_types("R2", "R4") == {"R2", "R4", "R2, R4", "R1,r4"}
+    assert attention_types() == {"R2", "R4", "R2, R4", "R1,r4"}
+    assert attention_types("R5") == set()
+
+
+def test_send_email_via_r2_and_r4_counts_flags(flagged_order_lines):
+    manager = mock.Mock()
+    with mock.patch(
+        "scgp_require_attention_items.tasks.get_plugins_manager",
+        return_value=manager,
+    ), mock.patch("scgp_require_attention_items.tasks.PluginsManager"):
+        send_email_via_r2_and_r4()
+
+    message = manager.send_mail_via_attention_type.call_args.kwargs["template_data"][
+        "message"
+    ]
+    assert message.startswith("มีรายการติด Flag required attention 4 รายการ")
+    assert message.endswith("R2 2 รายการ, R4 3 รายการ")
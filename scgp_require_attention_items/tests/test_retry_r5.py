@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from freezegun import freeze_time
+
+from common.models import MulesoftLog, MulesoftRetry, MulesoftRetryStatus
+from scgp_require_attention_items.graphql.enums import IPlanEndpoint
+from scgp_require_attention_items.implementations import (
+    retry_r5_required_attention_resolver as resolver,
+)
+
+
+def create_retry(orderid, **kwargs):
+    api_log = MulesoftLog.objects.create(
+        url=IPlanEndpoint.I_PLAN_UPDATE_ORDER.value, orderid=orderid, retry=True
+    )
+    return MulesoftRetry.objects.create(
+        mulesoft_log=api_log, url=api_log.url, orderid=orderid, **kwargs
+    )
+
+
+@pytest.fixture
+def retry_settings(settings):
+    settings.R5_RETRY_LEASE = 300
+    settings.R5_RETRY_BACKOFF_BASE = 60
+    settings.R5_RETRY_BACKOFF_MAX = 200
+    return settings
+
+
+@pytest.mark.django_db
+@freeze_time("2024-01-01 00:00:00")
+def test_claim_retries_claims_oldest_due_retry_of_each_order(retry_settings):
+    now = timezone.now()
+    first = create_retry(1)
+    create_retry(1)
+    other_order = create_retry(2)
+    create_retry(3, next_attempt_at=now + timedelta(minutes=1))
+    create_retry(4, status=MulesoftRetryStatus.DONE)
+
+    claimed = resolver.claim_retries(10)
+
+    assert [retry.id for retry in claimed] == [first.id, other_order.id]
+    for retry in MulesoftRetry.objects.filter(id__in=[first.id, other_order.id]):
+        assert retry.status == MulesoftRetryStatus.RUNNING
+        assert retry.next_attempt_at == now + timedelta(seconds=300)
+    # leased, and the second retry of order 1 waits for the first one
+    assert resolver.claim_retries(10) == []
+
+
+@pytest.mark.django_db
+def test_claim_retries_reclaims_expired_lease(retry_settings):
+    with freeze_time("2024-01-01 00:00:00"):
+        retry = create_retry(1)
+        resolver.claim_retries(10)
+
+    with freeze_time("2024-01-01 00:04:59"):
+        assert resolver.claim_retries(10) == []
+    with freeze_time("2024-01-01 00:05:00"):
+        assert [retry.id for retry in resolver.claim_retries(10)] == [retry.id]
+
+
+@pytest.mark.django_db
+@freeze_time("2024-01-01 00:00:00")
+def test_run_retry_backs_off_until_failed(retry_settings, monkeypatch):
+    monkeypatch.setattr(
+        resolver, "get_retry_function", lambda url: lambda api_log: False
+    )
+    retry = create_retry(1)
+
+    backoffs = []
+    while retry.status != MulesoftRetryStatus.FAILED:
+        assert resolver.run_retry(retry) is False
+        if retry.status == MulesoftRetryStatus.PENDING:
+            backoffs.append((retry.next_attempt_at - timezone.now()).seconds)
+
+    assert backoffs == [60, 120, 200] + [200] * (resolver.RETRY_COUNT - 3)
+    assert retry.attempts == resolver.RETRY_COUNT + 1
+
+
+@pytest.mark.django_db
+def test_retry_split_without_items_finishes_retry():
+    api_log = MulesoftLog.objects.create(
+        url=IPlanEndpoint.I_PLAN_SPLIT.value,
+        request='{"OrderLineSplitRequest": {"OrderLineSplitPart": []}}',
+        retry=True,
+    )
+
+    assert resolver.retry_iplan_update_order_split(api_log) is True
+    api_log.refresh_from_db()
+    assert api_log.retry is False
@@ -0,0 +1,188 @@
+import base64
+import io
+
+import openpyxl
+import pytest
+from openpyxl.utils import get_column_letter
+
+from scgp_require_attention_items.graphql.helper import (
+    file_headers_for_sold_to_group_in_list_sales_order,
+    make_excel_from_list_of_sale_order_sap,
+)
+
+SOLD_TO = "0001001001 - Sold to name"
+
+
+def order_line(**kwargs):
+    return {
+        "e_ordering_required_attention_flag": "R1",
+        "e_ordering_item_status": "Confirmed",
+        "sap_status": "Open",
+        "e_ordering_create_by": "Tester",
+        "sales_org": "0750 - SCG Packaging",
+        "sales_group": "101",
+        "sold_to": SOLD_TO,
+        "po_no": "PO-0001",
+        "original_request_date": "01/03/2024",
+        "create_date": "20/02/2024",
+        "req_delivery_date": "05/03/2024",
+        "e_ordering_confirm_date": "04/03/2024",
+        "order_no": "0410000001",
+        "item_no": "10",
+        "mat_no": "Z02CA-090D0980117N",
+        "mat_desc": "CA090D 98",
+        "order_qty": "1234.5",
+        "confirm_order_qty": "1000",
+        "delivery_qty": "0.1234",
+        "pending_qty": "1234.5",
+        "unit": "ROL",
+        "plant": "7554",
+        "shipping_point": "7501",
+        "order_weight": "2.5",
+        "delivery_weight": "0",
+        "pending_weight": "2.5",
+        "weight_unit": "TON",
+        "net_price": "25000.456",
+        "net_value": "62501.14",
+        "currency": "THB",
+        "rejection": "",
+        "delivery_block": "",
+        "e_ordering_overdue_1": True,
+        "e_ordering_overdue_2": False,
+        **kwargs,
+    }
+
+
+def quantity_data(unit, qty):
+    return {
+        "order_qty": qty,
+        "confirm_order_qty": qty,
+        "delivery_qty": "0.000",
+        "pending_qty": qty,
+        "quantity_unit": unit,
+    }
+
+
+SALE_ORDERS = [
+    {
+        "order_lines": [order_line(), order_line(item_no="20", po_no="PO-0002")],
+        "summary": {
+            "quantity_data": [
+                quantity_data("ROL", "2469.000"),
+                quantity_data("TON", "5.000"),
+            ],
+            "order_weight": "5.000",
+            "delivery_weight": "0.000",
+            "pending_weight": "5.000",
+            "weight_unit": "TON",
+            "net_price": "50000.91",
+            "net_value": "125002.28",
+            "currency": "THB",
+        },
+    }
+]
+
+
+@pytest.fixture
+def report(settings):
+    settings.EXCEL_EXPORT_INLINE_MAX_SIZE = 10 * 1024 * 1024
+    base64_file, download_url = make_excel_from_list_of_sale_order_sap(
+        SALE_ORDERS, is_order_tracking=False
+    )
+    assert download_url is None
+    return openpyxl.load_workbook(io.BytesIO(base64.b64decode(base64_file))).active
+
+
+def column(header):
+    headers = file_headers_for_sold_to_group_in_list_sales_order()
+    return get_column_letter(headers.index(header) + 1)
+
+
+def test_sales_order_report_rows(report):
+    rows = [list(row) for row in report.iter_rows(values_only=True)]
+
+    assert rows[0] == file_headers_for_sold_to_group_in_list_sales_order()
+    assert rows[1][:5] == ["Sold to - Code - Name", None, None, SOLD_TO, None]
+    assert len(rows) == 6
+    line = dict(zip(rows[0], rows[2]))
+    assert line["Order No."] == "0410000001"
+    assert line["PO No."] == "PO-0001"
+    assert line["Original Request Date"] == "01.03.2024"
+    assert line["Overdue 1"] == "Yes"
+    assert line["Overdue 2"] is None
+    assert dict(zip(rows[0], rows[3]))["PO No."] == "PO-0002"
+    # summary of the first unit next to the totals, other units below
+    assert rows[4][0] == "Summary"
+    assert rows[4][16:31] == [
+        "Total(ROL)",
+        2469,
+        2469,
+        0,
+        2469,
+        "ROL",
+        None,
+        "Total (ทั้งหมด)",
+        5,
+        0,
+        5,
+        "TON",
+        50000.91,
+        125002.28,
+        "THB",
+    ]
+    assert rows[5][16:22] == ["Total(TON)", 5, 5, 0, 5, "TON"]
+
+
+def test_sales_order_report_numbers_are_rounded_numbers(report):
+    # the former restyling pass rounded qty / weight to 3 and amounts to 2 digits
+    assert report[f"{column('Order Qty.')}3"].value == 1234.5
+    assert report[f"{column('Confirm Order Qty.')}3"].value == 1000
+    assert report[f"{column('Delivery QTY.')}3"].value == 0.123
+    assert report[f"{column('Order Weight')}3"].value == 2.5
+    assert report[f"{column('Net Price')}3"].value == 25000.46
+    assert report[f"{column('Net Value')}3"].value == 62501.14
+
+
+def test_sales_order_report_styles(report):
+    header_row, line_row, summary_row = 1, 3, 5
+    assert report.row_dimensions[header_row].height == 50
+    # widths of the former restyling pass
+    for header, width in [
+        ("Item Status", 27),
+        ("Sold to", 82),
+        ("PO No.", 23),
+        ("Order Qty.", 13),
+        ("Shipping Point", 12),
+        ("Order Weight", 10),
+        ("Net Price", 15),
+    ]:
+        assert report.column_dimensions[column(header)].width == width, header
+    # wrapped headers
+    for header, wrap in [
+        ("Required attention flag", True),
+        ("PO No.", True),
+        ("Confirm Order Qty.", True),
+        ("Item Status", False),
+        ("Order Qty.", False),
+    ]:
+        cell = report[f"{column(header)}{header_row}"]
+        assert bool(cell.alignment.wrap_text) is wrap, header
+        assert cell.alignment.vertical == "top"
+    # values
+    for header, number_format, horizontal in [
+        ("Order Qty.", "#,##0.000", "left"),
+        ("Pending Qty.", "#,##0.000", "left"),
+        ("Order Weight", "#,##0.000", "right"),
+        ("Net Price", "#,##0.00", "left"),
+        ("Net Value", "#,##0.00", "left"),
+    ]:
+        cell = report[f"{column(header)}{line_row}"]
+        assert cell.number_format == number_format, header
+        assert cell.alignment.horizontal == horizontal, header
+        assert cell.alignment.vertical == "top", header
+    for header in ("PO No.", "Shipping Point", "Overdue 1"):
+        assert report[f"{column(header)}{line_row}"].alignment.horizontal == "left"
+    # summary weights are left aligned next to "Total (ทั้งหมด)"
+    summary_weight = report[f"{column('Order Weight')}{summary_row}"]
+    assert summary_weight.number_format == "#,##0.000"
+    assert summary_weight.alignment.horizontal == "left"
@@ -0,0 +1,44 @@
+import pytest
+
+from common.search import TYPEAHEAD_ORDERING, normalize_search_text
+from sap_master_data.models import SoldToMaster
+from scgp_require_attention_items.graphql.filters import (
+    search_require_attention_sold_to,
+)
+
+
+@pytest.fixture
+def sold_tos_for_search(db):
+    return SoldToMaster.objects.bulk_create(
+        [
+            SoldToMaster(sold_to_code="0000000010", sold_to_name="Alpha"),
+            SoldToMaster(sold_to_code="0000000001", sold_to_name="Beta 0000000010"),
+            SoldToMaster(sold_to_code="0000000011", sold_to_name="Gamma"),
+            SoldToMaster(sold_to_code="0000000003", sold_to_name="Siam - Paper"),
+            SoldToMaster(sold_to_code="0000000004", sold_to_name="Paper/Siam Ltd"),
+        ]
+    )
+
+
+def search_sold_tos(value):
+    return [
+        (sold_to.sold_to_code, sold_to.typeahead_rank)
+        for sold_to in search_require_attention_sold_to(
+            SoldToMaster.objects.all(), None, value
+        ).order_by(*TYPEAHEAD_ORDERING)
+    ]
+
+
+def test_normalize_search_text():
+    assert normalize_search_text(" abc - name/ x ") == "ABC NAME X"
+    assert normalize_search_text(None) == ""
+
+
+def test_search_by_text_ranks_prefix_matches_first(sold_tos_for_search):
+    # by text only 0000000001 would come first
+    assert search_sold_tos("0000000010") == [("0000000010", 0), ("0000000001", 1)]
+
+
+def test_search_by_text_matches_across_separators(sold_tos_for_search):
+    assert search_sold_tos("siam/paper") == [("0000000003", 1)]
+    assert search_sold_tos("0000000004 paper-siam") == [("0000000004", 0)]
@@ -0,0 +1,175 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from saleor.account.models import User
+from saleor.plugins.manager import get_plugins_manager
+from scgp_user_management.graphql.helpers import fullname_parse
+from scgp_user_management.models import ScgpUser
+
+TOKEN_URL = "https://scgp-gdc-api-dev.azurewebsites.net/api/token"
+USER_DATA_URL = "https://scgp-gdc-apiother-dev.azurewebsites.net/Api/GDCEmployeeInfo/EmployeeInfoByADUser"
+
+# id of the last ScgpUser synced by an unfinished run, the next run resumes after it
+CHECKPOINT_KEY = "gdc_user_sync:last_scgp_user_id"
+
+SYNCED_USER_FIELDS = ["first_name", "last_name", "email", "updated_at"]
+
+
+def get_gdc_access_key(application_id, secret_key):
+    headers = {
+        "Content-Type": "application/x-www-form-urlencoded",
+        "ApplicationId": application_id,
+        "SecretKey": secret_key,
+    }
+    data = {"grant_type": "password"}
+    response = requests.get(
+        TOKEN_URL, headers=headers, data=data, timeout=settings.GDC_API_TIMEOUT
+    ).json()
+    return response.get("access_token", None)
+
+
+def get_gdc_user_data(access_key, username, session=None):
+    data = {"username": username, "referenceToken": access_key}
+    response = (session or requests).post(
+        USER_DATA_URL, json=data, timeout=settings.GDC_API_TIMEOUT
+    )
+    response = response.json()
+    try:
+        return response["responseData"][0]
+    except IndexError:
+        return None
+
+
+def get_dgc_auths():
+    manager = get_plugins_manager()
+    _plugin = manager.get_plugin("scg.gdc")
+    config = _plugin.config
+    return config.application_id, config.secret_key
+
+
+def create_gdc_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=settings.GDC_SYNC_MAX_WORKERS
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def sync_gdc_users():
+    """
+    Update name and e-mail of the users having an AD user from GDC.
+    Users are fetched GDC_SYNC_MAX_WORKERS at a time on one keep-alive session,
+    only changed ones are written, a chunk at a time. Progress is checkpointed
+    after every chunk, an interrupted run is resumed by the next one.
+    @return: stats of the run
+    """
+    application_id, secret_key = get_dgc_auths()
+    access_token = get_gdc_access_key(application_id, secret_key)
+
+    last_id = cache.get(CHECKPOINT_KEY) or 0
+    if last_id:
+        logging.info(f"[GDC sync] resuming after scgp user {last_id}")
+    scgp_users = (
+        ScgpUser.objects.exclude(ad_user__isnull=True)
+        .exclude(ad_user__exact="")
+        .select_related("user")
+        .order_by("id")
+    )
+    stats = {"fetched": 0, "updated": 0, "unchanged": 0, "not_found": 0, "errors": 0}
+
+    def fetch(scgp_user):
+        try:
+            return get_gdc_user_data(access_token, scgp_user.ad_user, session)
+        except Exception as e:
+            logging.warning(f"[GDC sync] fetch {scgp_user.ad_user} error: {e}")
+            return e
+
+    with create_gdc_session() as session, ThreadPoolExecutor(
+        max_workers=settings.GDC_SYNC_MAX_WORKERS, thread_name_prefix="gdc-sync"
+    ) as executor:
+        while True:
+            chunk = list(
+                scgp_users.filter(id__gt=last_id)[: settings.GDC_SYNC_CHUNK_SIZE]
+            )
+            if not chunk:
+                break
+            changed_users = []
+            for scgp_user, user_data in zip(chunk, executor.map(fetch, chunk)):
+                if isinstance(user_data, Exception):
+                    stats["errors"] += 1
+                    continue
+                if not user_data:
+                    stats["not_found"] += 1
+                    continue
+                stats["fetched"] += 1
+                if apply_gdc_user_data(scgp_user, user_data):
+                    changed_users.append(scgp_user.user)
+                else:
+                    stats["unchanged"] += 1
+            saved = save_users(changed_users)
+            stats["updated"] += saved
+            stats["errors"] += len(changed_users) - saved
+            last_id = chunk[-1].id
+            cache.set(CHECKPOINT_KEY, last_id, timeout=settings.GDC_SYNC_CHECKPOINT_TTL)
+    cache.delete(CHECKPOINT_KEY)
+    return stats
+
+
+def apply_gdc_user_data(scgp_user, user_data):
+    """Set the GDC data on the user, @return: whether anything changed"""
+    user = scgp_user.user
+    first_name, last_name = fullname_parse(user_data["e_FullName"])
+    values = {
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": user_data["email"] or f"{scgp_user.ad_user}@scgp.mock",
+    }
+    changed = False
+    for field, value in values.items():
+        if getattr(user, field) != value:
+            setattr(user, field, value)
+            changed = True
+    if changed:
+        user.updated_at = timezone.now()
+
+    # Temporary disable base on data issue, need to confirm later
+    # company_code = user_data["companyCode"]
+    # sale_org_ids = get_sale_orgs_by_code(company_code)
+    # scgp_user.scgp_sales_organizations.set(sale_org_ids)
+    #
+    # bus = get_bus_from_sale_orgs(sale_org_ids)
+    # scgp_user.scgp_bus.set(bus)
+    return changed
+
+
+def save_users(users):
+    """
+    bulk_update the synced fields, one by one when the chunk is rejected
+    (e.g. an e-mail already used by another user)
+    @return: number of users saved
+    """
+    if not users:
+        return 0
+    try:
+        with transaction.atomic():
+            User.objects.bulk_update(users, SYNCED_USER_FIELDS)
+        return len(users)
+    except IntegrityError:
+        saved = 0
+        for user in users:
+            try:
+                with transaction.atomic():
+                    user.save(update_fields=SYNCED_USER_FIELDS)
+                saved += 1
+            except IntegrityError as e:
+                logging.warning(f"[GDC sync] user {user.pk} not saved: {e}")
+        return saved
@@ -0,0 +1,73 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from scgp_user_management.implementations import gdc_sync
+from scgp_user_management.implementations.gdc_sync import (
+    CHECKPOINT_KEY,
+    sync_gdc_users,
+)
+
+GDC_USERS = {
+    "aduser 1": {"e_FullName": "Somchai Jaidee", "email": "somchai@scg.com"},
+    "aduser 3": {"e_FullName": "test 3", "email": "test3mail.com"},
+}
+
+
+@pytest.fixture(autouse=True)
+def gdc_api():
+    cache.delete(CHECKPOINT_KEY)
+    with patch.object(
+        gdc_sync, "get_dgc_auths", return_value=("app", "secret")
+    ), patch.object(gdc_sync, "get_gdc_access_key", return_value="token"), patch.object(
+        gdc_sync,
+        "get_gdc_user_data",
+        side_effect=lambda token, ad_user, session: GDC_USERS.get(ad_user),
+    ) as get_gdc_user_data:
+        yield get_gdc_user_data
+    cache.delete(CHECKPOINT_KEY)
+
+
+def test_sync_gdc_users_updates_changed_users_only(scgp_users_test):
+    stats = sync_gdc_users()
+
+    assert stats == {
+        "fetched": 2,
+        "updated": 1,
+        "unchanged": 1,
+        "not_found": 0,
+        "errors": 0,
+    }
+    user = scgp_users_test[0].user
+    user.refresh_from_db()
+    assert (user.first_name, user.last_name, user.email) == (
+        "Somchai",
+        "Jaidee",
+        "somchai@scg.com",
+    )
+    assert cache.get(CHECKPOINT_KEY) is None
+
+
+def test_sync_gdc_users_resumes_from_checkpoint(scgp_users_test, gdc_api):
+    cache.set(CHECKPOINT_KEY, scgp_users_test[0].id)
+
+    stats = sync_gdc_users()
+
+    assert [call.args[1] for call in gdc_api.call_args_list] == ["aduser 3"]
+    assert stats["updated"] == 0
+    assert cache.get(CHECKPOINT_KEY) is None
+
+
+def test_sync_gdc_users_fetch_error_skips_user(scgp_users_test, gdc_api):
+    def get_gdc_user_data(token, ad_user, session):
+        if ad_user == "aduser 3":
+            raise ConnectionError("timeout")
+        return GDC_USERS[ad_user]
+
+    gdc_api.side_effect = get_gdc_user_data
+
+    stats = sync_gdc_users()
+
+    assert stats["errors"] == 1
+    assert stats["updated"] == 1